@@ -13,36 +13,29 @@ Behavior:
   - Validates that source file exists and proposed name is non-empty.
   - Applies conflict-safe renames (adds incremental suffix if target exists).
   - Skips rows with identical names (no-op).
+  - Plans the whole batch first (swaps/chains are ordered), renames in parallel
+    (--workers) and keeps a write-ahead journal (--journal-dir, default:
+    rename_journal/ next to the CSV).
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
-import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
 
-def _safe_rename(src: Path, dst: Path) -> Path:
-    if not dst.exists():
-        os.rename(str(src), str(dst))
-        return dst
-    base = dst.stem
-    ext = dst.suffix
-    i = 2
-    while True:
-        candidate = dst.with_name(f"{base} ({i}){ext}")
-        if not candidate.exists():
-            os.rename(str(src), str(candidate))
-            return candidate
-        i += 1
+from renamepdfepub.rename_plan import MAX_WORKERS, bulk_rename  # noqa: E402
 
 
 def main() -> int:
     p = argparse.ArgumentParser(description='Apply batch renames from CSV (Arquivo,Proposto)')
     p.add_argument('--csv', required=True, help='Path to CSV with columns Arquivo,Proposto')
     p.add_argument('--apply', action='store_true', help='Apply renames (otherwise dry-run)')
+    p.add_argument('--workers', type=int, default=MAX_WORKERS, help='Parallel rename workers')
+    p.add_argument('--journal-dir', help='Write-ahead rename journal directory (default: next to the CSV)')
     args = p.parse_args()
 
     csv_path = Path(args.csv)
@@ -64,9 +57,8 @@ def main() -> int:
             rows.append({'src': r.get('Arquivo') or r.get('File') or '',
                          'dst': r.get('Proposto') or r.get('Proposed') or ''})
 
-    changed = 0
     skipped = 0
-    errors = 0
+    pairs = []
     for row in rows:
         src = Path(row['src'])
         dst_name = (row['dst'] or '').strip()
@@ -80,19 +72,24 @@ def main() -> int:
         if not args.apply:
             print(f"[PREVIEW] {src.name} -> {dst.name}")
             continue
-        try:
-            final_dst = _safe_rename(src, dst)
-            print(f"[RENAMED] {src.name} -> {final_dst.name}")
-            changed += 1
-        except Exception as e:
-            print(f"[ERROR] Failed to rename {src} -> {dst}: {e}")
-            errors += 1
-
-    if args.apply:
-        print(f"Done. Renamed: {changed}, Skipped: {skipped}, Errors: {errors}")
-    else:
+        pairs.append((str(src), str(dst)))
+
+    if not args.apply:
         print(f"Dry-run. Candidates: {len(rows)}, Skipped: {skipped}")
-    return 0 if errors == 0 else 1
+        return 0
+
+    journal_dir = args.journal_dir or str(csv_path.parent / 'rename_journal')
+    stats = bulk_rename(pairs, on_conflict='suffix', journal_dir=journal_dir, max_workers=args.workers)
+    for src, dst, status in stats['results']:
+        if status == 'renamed':
+            print(f"[RENAMED] {Path(src).name} -> {Path(dst).name}")
+        elif status.startswith('error'):
+            print(f"[ERROR] Failed to rename {src} -> {dst}: {status[7:]}")
+        else:
+            skipped += 1
+    print(f"Done. Renamed: {stats['renamed']}, Skipped: {skipped}, Errors: {stats['errors']} "
+          f"({stats['files_per_second']} files/s, journal run {stats.get('run_id')})")
+    return 0 if stats['errors'] == 0 else 1
 
 
 if __name__ == '__main__':
@@ -15,7 +15,8 @@ Commands (wraps the canonical core + helpers):
   gui                                  -> start_gui.py
   streamlit                            -> streamlit run src/gui/streamlit_interface.py
   algorithms                           -> start_cli.py algorithms
-  report-html --json FILE [--output OUT]
+  report-html (--json FILE | --db DB [--run RUN_ID]) [--output OUT]
+  rollback (--run RUN_ID | --list) [--journal-dir DIR] [--dry-run]
 
 Examples:
   python3 scripts/launcher_cli.py scan books -r -t 8 -o out.json
@@ -131,10 +132,21 @@ def main():
     sub.add_parser('algorithms', help='Run algorithm comparison suite')
 
     # report-html
-    rh = sub.add_parser('report-html', help='Generate HTML from JSON report')
-    rh.add_argument('--json', required=True)
+    rh = sub.add_parser('report-html', help='Generate HTML from JSON report or scan results database')
+    rh_src = rh.add_mutually_exclusive_group(required=True)
+    rh_src.add_argument('--json')
+    rh_src.add_argument('--db')
+    rh.add_argument('--run')
     rh.add_argument('--output')
 
+    # rollback
+    rb = sub.add_parser('rollback', help='Undo a journaled rename run')
+    rb_target = rb.add_mutually_exclusive_group(required=True)
+    rb_target.add_argument('--run')
+    rb_target.add_argument('--list', action='store_true')
+    rb.add_argument('--journal-dir')
+    rb.add_argument('--dry-run', action='store_true')
+
     args, extra = p.parse_known_args()
     start_cli = ROOT / 'start_cli.py'
 
@@ -231,11 +243,24 @@ def main():
 
     if args.cmd == 'report-html':
         gen = ROOT / 'simple_report_generator.py'
-        cmd = [sys.executable, str(gen), '--json', args.json]
+        cmd = [sys.executable, str(gen)]
+        cmd += ['--json', args.json] if args.json else ['--db', args.db]
+        if args.run:
+            cmd += ['--run', args.run]
         if args.output:
             cmd += ['--output', args.output]
         sys.exit(run(cmd + extra))
 
+    if args.cmd == 'rollback':
+        script = ROOT / 'scripts' / 'rollback_renames.py'
+        cmd = [sys.executable, str(script)]
+        cmd += ['--list'] if args.list else ['--run', args.run]
+        if args.journal_dir:
+            cmd += ['--journal-dir', args.journal_dir]
+        if args.dry_run:
+            cmd.append('--dry-run')
+        sys.exit(run(cmd + extra))
+
     if args.cmd == 'rename-from-db':
         script = ROOT / 'scripts' / 'rename_from_db.py'
         cmd = [
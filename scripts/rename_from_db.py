@@ -18,24 +18,11 @@ import argparse
 import os
 import sqlite3
 import sys
-import unicodedata
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
 
-def _clean_string(s: str, underscore: bool = False) -> str:
-    s = unicodedata.normalize('NFKD', s)
-    s = s.encode('ASCII', 'ignore').decode('ASCII')
-    # allow alnum, space, dash and underscore
-    out = ''.join(ch if (ch.isalnum() or ch in (' ', '-', '_')) else ' ' for ch in s)
-    out = ' '.join(out.split())
-    if underscore:
-        out = out.replace(' ', '_')
-    return out.strip()
-
-
-def _first_two_authors(authors: str) -> str:
-    parts = [a.strip() for a in (authors or '').split(',') if a.strip()]
-    return ', '.join(parts[:2]) if parts else ''
+from renamepdfepub.naming import compile_template, first_authors, known, year_of  # noqa: E402
 
 
 def main() -> int:
@@ -74,23 +61,20 @@ def main() -> int:
         return 1
 
     title, authors, publisher, published, isbn = row
-    title = '' if not title or str(title).lower() == 'unknown' else str(title)
-    authors = '' if not authors or str(authors).lower() == 'unknown' else str(authors)
-    publisher = '' if not publisher or str(publisher).lower() == 'unknown' else str(publisher)
-    year = ''
-    if published:
-        published = str(published)
-        year = published.split('-')[0] if '-' in published else published
-    author_display = _first_two_authors(authors)
+    try:
+        template = compile_template(args.pattern, 'ascii_underscore' if args.underscore else 'ascii')
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
 
     # Build new base name
-    new_base = args.pattern.format(
-        title=_clean_string(title, underscore=args.underscore),
-        author=_clean_string(author_display, underscore=args.underscore),
-        year=_clean_string(year, underscore=args.underscore),
-        publisher=_clean_string(publisher, underscore=args.underscore),
-        isbn=_clean_string(isbn or '', underscore=args.underscore),
-    ).strip()
+    new_base = template.render({
+        'title': known(title),
+        'author': first_authors(known(authors)),
+        'year': year_of(published),
+        'publisher': known(publisher),
+        'isbn': isbn or '',
+    })
     if not new_base:
         print("[ERROR] Pattern produced empty name.")
         return 1
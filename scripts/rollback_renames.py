@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Undo a journaled rename run (renamer --apply, rename-apply-csv, core --rename).
+
+Usage:
+  List runs:
+    python3 scripts/rollback_renames.py --list
+
+  Preview:
+    python3 scripts/rollback_renames.py --run 20250101_120000_000000 --dry-run
+
+  Roll back:
+    python3 scripts/rollback_renames.py --run 20250101_120000_000000
+
+Behavior:
+  - Reads <journal-dir>/<run>.jsonl (default: reports/rename_journal).
+  - Moves every renamed file back to its original path, in parallel (--workers).
+  - Skips files changed since the run and original paths taken in the meantime.
+  - The rollback is journaled as a new run, so it can be rolled back too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from renamepdfepub.rename_journal import DEFAULT_JOURNAL_DIR, list_runs, read_run  # noqa: E402
+from renamepdfepub.rename_plan import MAX_WORKERS, rollback_run  # noqa: E402
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description='Roll back a journaled rename run')
+    p.add_argument('--run', help='Run id to roll back')
+    p.add_argument('--journal-dir', default=DEFAULT_JOURNAL_DIR, help='Rename journal directory')
+    p.add_argument('--workers', type=int, default=MAX_WORKERS, help='Parallel rename workers')
+    p.add_argument('--dry-run', action='store_true', help='Only show what would be renamed back')
+    p.add_argument('--list', action='store_true', help='List journaled runs')
+    args = p.parse_args()
+
+    if args.list:
+        for run_id in list_runs(args.journal_dir):
+            run = read_run(args.journal_dir, run_id)
+            done = sum(1 for op in run['ops'] if op['state'] == 'done')
+            state = 'committed' if run['committed'] else 'incomplete'
+            undone = f", rolled back by {', '.join(run['rolled_back_by'])}" if run['rolled_back_by'] else ''
+            print(f"{run_id}  {done}/{len(run['ops'])} applied, {state}{undone}")
+        return 0
+    if not args.run:
+        p.error('--run is required (use --list to see runs)')
+    if not (Path(args.journal_dir) / f"{args.run}.jsonl").exists():
+        print(f"[ERROR] Journal not found for run {args.run} in {args.journal_dir}")
+        return 1
+
+    stats = rollback_run(args.journal_dir, args.run, max_workers=args.workers, dry_run=args.dry_run)
+    for current, original, status in stats['results']:
+        if status == 'pending':
+            print(f"[PREVIEW] {Path(current).name} -> {Path(original).name}")
+        elif status == 'renamed':
+            print(f"[RESTORED] {Path(current).name} -> {Path(original).name}")
+        elif status.startswith('error'):
+            print(f"[ERROR] Failed to restore {current} -> {original}: {status[7:]}")
+        else:
+            print(f"[SKIPPED] {current} ({status})")
+    if args.dry_run:
+        print(f"Dry-run. To restore: {stats['planned']}, Skipped: {stats['skipped']}")
+        return 0
+    print(f"Done. Restored: {stats['renamed']}, Skipped: {stats['skipped']}, Errors: {stats['errors']} "
+          f"({stats['files_per_second']} files/s, journal run {stats.get('run_id')})")
+    return 0 if stats['errors'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,7 @@ Gera um relatorio HTML simples a partir de dados reais (ASCII only).
 
 - Le o relatorio mais recente em reports/metadata_report_*.json, se existir
 - Opcional: usar um JSON especifico via --json caminho/arquivo.json
+- Opcional: usar o banco de resultados via --db reports/scan_results.db [--run RUN_ID]
 - Mostra metricas basicas: total, sucesso, falhas, campos ausentes
 - Salva advanced_algorithms_report.html na raiz (pode ser alterado via --output)
 
@@ -16,6 +17,7 @@ import json
 from pathlib import Path
 from datetime import datetime
 import argparse
+import sys
 
 ROOT = Path(__file__).parent
 REPORTS = ROOT / "reports"
@@ -52,6 +54,35 @@ def summarize_from_json(data: dict) -> dict:
     }
 
 
+def summarize_from_store(db_path: Path, run_id: str | None = None) -> dict:
+    """Resume uma execucao do banco de resultados com consultas agregadas."""
+    sys.path.insert(0, str(ROOT / "src"))
+    from renamepdfepub.results_store import ResultsStore
+
+    store = ResultsStore(str(db_path))
+    try:
+        by_status = store.aggregate("status", run_id=run_id)
+        publishers = store.aggregate("publisher", run_id=run_id, status="resolved")
+        resolved = store.query(run_id=run_id, status="resolved")
+    finally:
+        store.close()
+    missing = {"title": 0, "authors": 0, "publisher": 0, "year": 0, "isbn": 0}
+    for row in resolved:
+        for field, value in (("title", row["title"]), ("authors", row["authors"]),
+                             ("publisher", row["publisher"]), ("year", row["year"]),
+                             ("isbn", row["isbn_13"] or row["isbn_10"])):
+            if not value:
+                missing[field] += 1
+    counts = {status: stats["count"] for status, stats in by_status.items()}
+    return {
+        "total": sum(counts.values()),
+        "success": counts.get("success", 0) + counts.get("recovered", 0),
+        "failed": counts.get("failure", 0),
+        "missing": missing,
+        "publishers": {pub: stats["count"] for pub, stats in publishers.items() if pub},
+    }
+
+
 def summarize_from_books() -> dict:
     if not BOOKS.exists():
         return {"total": 0, "success": 0, "failed": 0, "missing": {}, "publishers": {}}
@@ -108,9 +139,17 @@ def main():
     parser = argparse.ArgumentParser(description="Gerador HTML simples (ASCII only)")
     parser.add_argument("--json", dest="json_path", help="Arquivo JSON especifico a usar")
     parser.add_argument("--output", dest="output_html", help="Arquivo HTML de saida")
+    parser.add_argument("--db", dest="db_path", help="Banco de resultados (reports/scan_results.db)")
+    parser.add_argument("--run", dest="run_id", help="Execucao do banco a usar (padrao: a mais recente)")
     args = parser.parse_args()
 
     data = None
+    summary = None
+    if args.db_path:
+        if Path(args.db_path).exists():
+            summary = summarize_from_store(Path(args.db_path), args.run_id)
+        else:
+            print(f"[WARNING] Banco nao encontrado: {args.db_path}")
     if args.json_path:
         p = Path(args.json_path)
         if p.exists():
@@ -120,13 +159,10 @@ def main():
                 data = None
         else:
             print(f"[WARNING] JSON nao encontrado: {p}")
-    if data is None:
-        data = load_latest_report()
-
-    if isinstance(data, dict):
-        summary = summarize_from_json(data)
-    else:
-        summary = summarize_from_books()
+    if summary is None:
+        if data is None:
+            data = load_latest_report()
+        summary = summarize_from_json(data) if isinstance(data, dict) else summarize_from_books()
 
     html = render_html(summary)
     out = Path(args.output_html) if args.output_html else DEFAULT_OUT
@@ -102,7 +102,8 @@ class AlgorithmIntegrator:
                 'function': self.metadata_enricher_adapter,
                 'weight': 1.3,
                 'confidence_boost': 0.18,
-                'description': 'Enriquece metadados com dados externos'
+                'description': 'Enriquece metadados com dados externos',
+                'memoize': False  # depende de fontes externas
             }
         except ImportError:
             pass
@@ -420,7 +421,8 @@ def register_algorithms_with_cache_system(cache_system):
             cache_system.register_algorithm(
                 name=algo_name,
                 algorithm_func=algo_info['function'],
-                weight=algo_info['weight']
+                weight=algo_info['weight'],
+                memoize=algo_info.get('memoize', True)
             )
             registered_count += 1
             
@@ -20,7 +20,6 @@ Uso:
 import asyncio
 import argparse
 import os
-import shutil
 import json
 import logging
 from pathlib import Path
@@ -32,14 +31,18 @@ import re
 # Imports dos nossos sistemas
 from amazon_api_integration import AmazonBooksAPI, BatchBookProcessor, BookMetadata
 from .v3_complete_system import V3CompleteSystem
+from renamepdfepub.rename_journal import DEFAULT_JOURNAL_DIR, RenameJournal
 
 class FileRenamer:
     """
     Sistema inteligente de renomeação de arquivos
     """
     
-    def __init__(self, backup_enabled: bool = True):
+    def __init__(self, backup_enabled: bool = True, journal_dir: str = DEFAULT_JOURNAL_DIR):
+        # backup_enabled liga o journal de renomeação (desfeito com rollback --run <id>)
         self.backup_enabled = backup_enabled
+        self.journal_dir = journal_dir
+        self.journal: Optional[RenameJournal] = None
         self.setup_logging()
         self.supported_formats = {'.pdf', '.epub', '.mobi', '.azw', '.azw3'}
         
@@ -162,33 +165,29 @@ class FileRenamer:
         
         return filename
 
-    def create_backup(self, file_path: Path) -> bool:
+    def rename_with_journal(self, file_path: Path, new_path: Path) -> None:
         """
-        Cria backup do arquivo original
+        Renomeia registrando no journal (caminho antigo/novo, inode, tamanho, mtime).
+
+        Substitui a cópia de backup: o journal basta para desfazer uma
+        renomeação pura, sem duplicar o arquivo.
         """
         if not self.backup_enabled:
-            return True
-        
-        try:
-            backup_dir = file_path.parent / "backup_originals"
-            backup_dir.mkdir(exist_ok=True)
-            
-            backup_path = backup_dir / file_path.name
-            
-            # Se backup já existe, adiciona timestamp
-            if backup_path.exists():
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                stem = backup_path.stem
-                suffix = backup_path.suffix
-                backup_path = backup_dir / f"{stem}_{timestamp}{suffix}"
-            
-            shutil.copy2(file_path, backup_path)
-            self.logger.info(f"💾 Backup criado: {backup_path}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f" Erro ao criar backup para {file_path}: {e}")
-            return False
+            file_path.rename(new_path)
+            return
+        if self.journal is None:
+            self.journal = RenameJournal(self.journal_dir)
+            self.logger.info(f"🧾 Journal de renomeação: {self.journal.path}")
+        self.journal.rename(str(file_path), str(new_path))
+
+    def finish_journal(self, summary: Optional[Dict] = None) -> Optional[str]:
+        """Fecha o journal da execução; retorna o run id usado por rollback --run."""
+        if self.journal is None:
+            return None
+        run_id = self.journal.run_id
+        self.journal.commit(summary)
+        self.journal = None
+        return run_id
 
     async def rename_single_file(self, file_path: Path) -> Tuple[bool, str, Optional[BookMetadata]]:
         """
@@ -230,12 +229,8 @@ class FileRenamer:
                 suffix = new_path.suffix
                 new_path = file_path.parent / f"{stem}_{timestamp}{suffix}"
             
-            # Cria backup
-            if not self.create_backup(file_path):
-                return False, "Falha ao criar backup", metadata
-            
-            # Renomeia arquivo
-            file_path.rename(new_path)
+            # Renomeia arquivo (journal em vez de cópia de backup)
+            self.rename_with_journal(file_path, new_path)
             
             success_msg = f" Renomeado: {file_path.name} → {new_path.name}"
             self.logger.info(success_msg)
@@ -433,8 +428,14 @@ class AutoRenameSystem:
         if self.stats['start_time'] and self.stats['end_time']:
             duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
         
+        rename_run = self.file_renamer.finish_journal({
+            'successful': self.stats['successful'],
+            'failed': self.stats['failed'],
+        })
+        
         return {
             'summary': {
+                'rename_run': rename_run,
                 'total_files': self.stats['total_files'],
                 'successful': self.stats['successful'],
                 'failed': self.stats['failed'],
@@ -500,6 +501,8 @@ def print_report(report: Dict):
     
     if summary['duration_seconds']:
         print(f"⏱ Tempo total: {summary['duration_seconds']:.1f}s")
+    if summary.get('rename_run'):
+        print(f"🧾 Desfazer: python start_cli.py rollback --run {summary['rename_run']}")
     
     # Detalhes dos resultados se disponível
     if 'results' in report and len(report['results']) <= 10:  # Só mostra detalhes para poucos arquivos
@@ -540,13 +543,15 @@ Exemplos de uso:
     group.add_argument('--batch', '-b', help='Arquivo com lista de arquivos para processar')
     
     parser.add_argument('--output', '-o', help='Arquivo de saída para relatório JSON')
-    parser.add_argument('--no-backup', action='store_true', help='Desabilita criação de backup')
+    parser.add_argument('--no-backup', action='store_true', help='Desabilita o journal de renomeação (sem rollback)')
+    parser.add_argument('--journal-dir', default=DEFAULT_JOURNAL_DIR, help='Diretório do journal de renomeação')
     
     args = parser.parse_args()
     
     try:
         # Configura sistema
         system = AutoRenameSystem()
+        system.file_renamer.journal_dir = args.journal_dir
         if args.no_backup:
             system.file_renamer.backup_enabled = False
         
@@ -8,12 +8,21 @@ Suporta:
 - Controle por tempo, iterações ou performance desejada
 - Cache de metadados e "best guess" para arquivos não baixados
 - Integração com Google Drive, OneDrive e listas de arquivos
-- Tabelas separadas para dados consolidados vs predições
+- Tabelas separadas para dados consolidados vs predições, num único banco
+  SQLite (seleção e promoção feitas por consultas indexadas)
+- Conexão SQLite persistente (WAL), leitura das predições do lote numa
+  única consulta e gravação em lote (executemany)
+- Agendamento por convergência: histórico de ganho por arquivo, backoff dos
+  arquivos em platô, prioridade por ganho esperado / custo e reuso da saída
+  de algoritmos cujas entradas não mudaram
 """
 
+import os
 import time
 import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union, Callable, Any
@@ -22,6 +31,49 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import hashlib
 import logging
 
+# Configuração aplicada a cada conexão persistente
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",  # ~16 MB de páginas em memória
+)
+# Parâmetros por consulta "IN (...)" (limite antigo do SQLite é 999)
+SQLITE_MAX_PARAMS = 900
+
+CACHE_DB_NAME = "iterative_cache.db"
+# Bancos separados das versões anteriores: (arquivo, tabela, colunas migradas)
+LEGACY_DATABASES = (
+    ("consolidated_data.db", "consolidated_cache",
+     "file_path, file_hash, confidence_score, metadata, iteration_created, "
+     "last_updated, source_type"),
+    ("best_guess_predictions.db", "prediction_cache",
+     "file_path, predicted_metadata, confidence_score, prediction_basis, "
+     "iteration_created, last_updated, remote_source, is_downloaded"),
+    ("performance_metrics.db", "performance_metrics",
+     "iteration, metric_name, metric_value, processing_time, files_processed, timestamp"),
+)
+
+# Confiança a partir da qual uma predição é promovida a dado consolidado
+CONSOLIDATION_THRESHOLD = 0.8
+
+# Estado do agendador por arquivo (colunas de prediction_cache)
+SCHEDULE_COLUMNS = (
+    ("expected_gain", "REAL"),             # média móvel do ganho de confiança
+    ("processing_cost", "REAL"),           # média móvel do tempo dos algoritmos (s)
+    ("plateau_count", "INTEGER DEFAULT 0"),  # iterações seguidas sem ganho
+    ("next_round", "INTEGER DEFAULT 0"),   # primeira iteração em que volta a ser elegível
+    ("priority", "REAL"),                  # ganho esperado por unidade de custo
+)
+# Peso da observação mais recente nas médias móveis de ganho e custo
+SCHEDULE_SMOOTHING = 0.5
+# Custo relativo mínimo (evita prioridade infinita para arquivos "gratuitos")
+MIN_RELATIVE_COST = 0.05
+
+HASH_CHUNK_SIZE = 1 << 20
+# Arquivos maiores que 3 amostras têm hash parcial: tamanho + início, meio e fim
+HASH_SAMPLE_SIZE = 1 << 20
+
 @dataclass
 class IterationConfig:
     """Configuração para controle de iterações"""
@@ -31,7 +83,9 @@ class IterationConfig:
     performance_metric: str = "accuracy"  # accuracy, speed, completeness
     batch_size: int = 50
     thread_count: int = 4
-    cache_interval: int = 10  # salvar cache a cada N iterações
+    cache_interval: int = 10  # consolidar cache a cada N iterações
+    plateau_threshold: float = 0.005  # ganho mínimo para o arquivo não estar em platô
+    max_backoff_iterations: int = 64  # espera máxima de um arquivo em platô
 
 @dataclass
 class CacheEntry:
@@ -53,24 +107,48 @@ class IterativeCacheSystem:
         self.cache_dir = cache_dir or Path("data/cache/iterative")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Bancos de dados separados
-        self.consolidated_db = self.cache_dir / "consolidated_data.db"
-        self.predictions_db = self.cache_dir / "best_guess_predictions.db"
-        self.performance_db = self.cache_dir / "performance_metrics.db"
+        # Banco único: consolidados, predições e métricas em tabelas separadas
+        self.db_path = self.cache_dir / CACHE_DB_NAME
+        
+        # Conexão reaproveitada entre chamadas e threads (acesso serializado pelo lock)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.RLock()
         
-        self._init_databases()
         self.logger = self._setup_logging()
+        self._init_databases()
+        self._migrate_legacy_databases()
         
         # Algoritmos disponíveis (será expandido)
         self.algorithms = {}
+        # Iteração no relógio persistente do agendador (continua entre sessões)
         self.current_iteration = 0
         self.session_start = datetime.now()
+        # Média móvel do custo por arquivo na sessão (base do custo relativo)
+        self._mean_cost: Optional[float] = None
         
+    @contextmanager
+    def _db(self):
+        """Conexão persistente do banco, com lock; faz commit (ou rollback) ao sair"""
+        with self._db_lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                for pragma in SQLITE_PRAGMAS:
+                    self._conn.execute(pragma)
+            with self._conn:
+                yield self._conn
+    
+    def close(self):
+        """Fecha a conexão persistente"""
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     def _init_databases(self):
-        """Inicializa os bancos de dados SQLite"""
+        """Inicializa as tabelas e índices do banco SQLite"""
         
-        # Banco de dados consolidados (dados confirmados)
-        with sqlite3.connect(self.consolidated_db) as conn:
+        with self._db() as conn:
+            # Dados consolidados (dados confirmados)
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS consolidated_cache (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -84,8 +162,7 @@ class IterativeCacheSystem:
                 )
             ''')
             
-        # Banco de predições (best guess para arquivos não baixados)
-        with sqlite3.connect(self.predictions_db) as conn:
+            # Predições (best guess para arquivos não baixados)
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS prediction_cache (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -96,12 +173,12 @@ class IterativeCacheSystem:
                     iteration_created INTEGER NOT NULL,
                     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     remote_source TEXT,  -- gdrive_id, onedrive_url, etc
-                    is_downloaded BOOLEAN DEFAULT FALSE
+                    is_downloaded BOOLEAN DEFAULT FALSE,
+                    iteration_updated INTEGER  -- última iteração que gravou a predição
                 )
             ''')
             
-        # Banco de métricas de performance
-        with sqlite3.connect(self.performance_db) as conn:
+            # Métricas de performance
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS performance_metrics (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -113,6 +190,81 @@ class IterativeCacheSystem:
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+            
+            # Última saída de cada algoritmo por arquivo, com o hash das entradas usadas
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS algorithm_runs (
+                    file_path TEXT NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    input_hash TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    processing_time REAL NOT NULL,
+                    PRIMARY KEY (file_path, algorithm)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Colunas do agendador (também em bancos criados antes delas)
+            existing = {row[1] for row in conn.execute('PRAGMA table_info(prediction_cache)')}
+            for column, column_type in SCHEDULE_COLUMNS:
+                if column not in existing:
+                    conn.execute(f'ALTER TABLE prediction_cache ADD COLUMN {column} {column_type}')
+            
+            # Seleção por iteração: percorre o índice já na ordem do ORDER BY
+            # (substitui o antigo índice por confiança, idx_prediction_selection)
+            conn.execute('DROP INDEX IF EXISTS idx_prediction_selection')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_prediction_schedule
+                ON prediction_cache (is_downloaded, priority DESC, last_updated, next_round)
+            ''')
+            # Promoção do lote recém-gravado
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_prediction_iteration
+                ON prediction_cache (iteration_updated, confidence_score)
+            ''')
+            # Estatísticas e melhores predições
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_prediction_confidence
+                ON prediction_cache (confidence_score)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_metrics_name_iteration
+                ON performance_metrics (metric_name, iteration)
+            ''')
+    
+    def _migrate_legacy_databases(self):
+        """Importa (uma vez) os bancos separados de versões anteriores e os renomeia"""
+        for filename, table, columns in LEGACY_DATABASES:
+            legacy_path = self.cache_dir / filename
+            if not legacy_path.exists():
+                continue
+            
+            with self._db() as conn:
+                # ATTACH/DETACH não podem rodar dentro de uma transação
+                conn.commit()
+                conn.execute("ATTACH DATABASE ? AS legacy", (str(legacy_path),))
+                try:
+                    has_table = conn.execute(
+                        "SELECT 1 FROM legacy.sqlite_master WHERE type = 'table' AND name = ?",
+                        (table,)
+                    ).fetchone()
+                    if has_table:
+                        conn.execute(f'''
+                            INSERT OR IGNORE INTO main.{table} ({columns})
+                            SELECT {columns} FROM legacy.{table}
+                        ''')
+                    conn.commit()
+                finally:
+                    conn.execute("DETACH DATABASE legacy")
+            
+            legacy_path.rename(legacy_path.with_name(filename + ".migrated"))
+            self.logger.info(f"Banco {filename} migrado para {CACHE_DB_NAME}")
+        
+        # Linhas sem histórico (migradas ou anteriores ao agendador): prioridade = margem
+        with self._db() as conn:
+            conn.execute('''
+                UPDATE prediction_cache SET priority = 1.0 - confidence_score
+                WHERE priority IS NULL
+            ''')
     
     def _setup_logging(self) -> logging.Logger:
         """Configura logging específico para o sistema iterativo"""
@@ -129,44 +281,54 @@ class IterativeCacheSystem:
             
         return logger
     
-    def register_algorithm(self, name: str, algorithm_func: Callable, 
-                          weight: float = 1.0):
-        """Registra um algoritmo para uso nas iterações"""
+    def register_algorithm(self, name: str, algorithm_func: Callable,
+                          weight: float = 1.0, memoize: bool = True):
+        """
+        Registra um algoritmo para uso nas iterações.
+        
+        Com memoize=True o algoritmo é tratado como função do caminho, do
+        conteúdo do arquivo e da predição atual: se nada disso mudou desde a
+        última execução, a saída anterior é reaproveitada. Use memoize=False
+        para algoritmos que dependem de fontes externas (APIs, rede).
+        """
         self.algorithms[name] = {
             'func': algorithm_func,
             'weight': weight,
+            'memoize': memoize,
             'performance_history': []
         }
         self.logger.info(f"Algoritmo registrado: {name} (peso: {weight})")
     
     def add_file_list(self, file_paths: List[str], source_type: str = "local"):
         """Adiciona lista de arquivos para processamento iterativo"""
-        added_count = 0
+        rows = []
         
-        with sqlite3.connect(self.predictions_db) as conn:
-            for file_path in file_paths:
-                try:
-                    # Cria predição inicial baseada no nome do arquivo
-                    initial_prediction = self._create_initial_prediction(file_path)
-                    
-                    conn.execute('''
-                        INSERT OR IGNORE INTO prediction_cache 
-                        (file_path, predicted_metadata, confidence_score, 
-                         prediction_basis, iteration_created, remote_source)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        file_path,
-                        json.dumps(initial_prediction['metadata']),
-                        initial_prediction['confidence'],
-                        initial_prediction['basis'],
-                        0,  # iteration 0 = initial
-                        initial_prediction.get('remote_source', '')
-                    ))
-                    added_count += 1
-                    
-                except Exception as e:
-                    self.logger.error(f"Erro ao adicionar {file_path}: {e}")
+        for file_path in file_paths:
+            try:
+                # Cria predição inicial baseada no nome do arquivo
+                initial_prediction = self._create_initial_prediction(file_path)
+                rows.append((
+                    file_path,
+                    json.dumps(initial_prediction['metadata']),
+                    initial_prediction['confidence'],
+                    initial_prediction['basis'],
+                    0,  # iteration 0 = initial
+                    initial_prediction.get('remote_source', ''),
+                    1.0 - initial_prediction['confidence']  # prioridade inicial = margem
+                ))
+                
+            except Exception as e:
+                self.logger.error(f"Erro ao adicionar {file_path}: {e}")
         
+        with self._db() as conn:
+            conn.executemany('''
+                INSERT OR IGNORE INTO prediction_cache 
+                (file_path, predicted_metadata, confidence_score, 
+                 prediction_basis, iteration_created, remote_source, priority)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        
+        added_count = len(rows)
         self.logger.info(f"Adicionados {added_count} arquivos do tipo {source_type}")
         return added_count
     
@@ -177,26 +339,28 @@ class IterativeCacheSystem:
         remote_files: {file_path: remote_id/url}
         """
         file_paths = []
+        rows = []
         
-        with sqlite3.connect(self.predictions_db) as conn:
-            for file_path, remote_id in remote_files.items():
-                initial_prediction = self._create_initial_prediction(file_path)
-                initial_prediction['remote_source'] = remote_id
-                
-                conn.execute('''
-                    INSERT OR REPLACE INTO prediction_cache 
-                    (file_path, predicted_metadata, confidence_score, 
-                     prediction_basis, iteration_created, remote_source)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    file_path,
-                    json.dumps(initial_prediction['metadata']),
-                    initial_prediction['confidence'],
-                    initial_prediction['basis'],
-                    0,
-                    remote_id
-                ))
-                file_paths.append(file_path)
+        for file_path, remote_id in remote_files.items():
+            initial_prediction = self._create_initial_prediction(file_path)
+            rows.append((
+                file_path,
+                json.dumps(initial_prediction['metadata']),
+                initial_prediction['confidence'],
+                initial_prediction['basis'],
+                0,
+                remote_id,
+                1.0 - initial_prediction['confidence']
+            ))
+            file_paths.append(file_path)
+        
+        with self._db() as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO prediction_cache 
+                (file_path, predicted_metadata, confidence_score, 
+                 prediction_basis, iteration_created, remote_source, priority)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
         
         self.logger.info(f"Adicionados {len(file_paths)} arquivos remotos ({source_type})")
         return file_paths
@@ -302,16 +466,26 @@ class IterativeCacheSystem:
                                 file_filter: Optional[Callable] = None):
         """
         Executa processamento iterativo principal
+        
+        A cada iteração o agendador escolhe os arquivos elegíveis com maior
+        ganho esperado por unidade de custo; arquivos em platô esperam um
+        número crescente de iterações (backoff) antes de voltar. O loop para
+        quando nenhum arquivo é elegível e adiantar o relógio até o próximo
+        não trouxe melhoria.
         """
         self.logger.info(f"Iniciando processamento iterativo com config: {config}")
         
         start_time = time.time()
         iteration = 0
         best_performance = 0.0
+        # Relógio do agendador continua de onde a última sessão parou
+        round_offset = self._last_round()
+        consolidated_round = round_offset
+        improved_since_wait = True
         
         while self._should_continue(iteration, start_time, best_performance, config):
             iteration += 1
-            self.current_iteration = iteration
+            self.current_iteration = round_offset + iteration
             
             self.logger.info(f"=== ITERAÇÃO {iteration} ===")
             
@@ -321,13 +495,31 @@ class IterativeCacheSystem:
             )
             
             if not files_to_process:
-                self.logger.info("Nenhum arquivo para processar nesta iteração")
-                break
+                next_round = self._next_scheduled_round()
+                if (next_round is None or next_round <= self.current_iteration
+                        or not improved_since_wait):
+                    self.logger.info("Nenhum arquivo elegível: predições convergiram")
+                    break
+                
+                # Todos em backoff: adianta o relógio até o próximo arquivo elegível
+                round_offset += next_round - self.current_iteration
+                self.current_iteration = next_round
+                improved_since_wait = False
+                files_to_process = self._select_files_for_iteration(
+                    config.batch_size, file_filter
+                )
+                if not files_to_process:
+                    break
             
             # Processa lote de arquivos
             iteration_results = self._process_iteration_batch(
                 files_to_process, config
             )
+            if iteration_results['improved_predictions']:
+                improved_since_wait = True
+            
+            # Grava predições, histórico de convergência e saídas dos algoritmos
+            self._save_iteration_results(iteration_results, config)
             
             # Calcula métricas de performance
             performance = self._calculate_iteration_performance(
@@ -338,24 +530,25 @@ class IterativeCacheSystem:
             self._save_performance_metrics(iteration, performance, 
                                          len(files_to_process))
             
-            # Atualiza cache se necessário
+            # Consolida cache se necessário
             if iteration % config.cache_interval == 0:
-                self._update_cache_from_results(iteration_results)
+                self._consolidate_predictions(consolidated_round)
+                consolidated_round = self.current_iteration
             
             # Verifica se atingiu performance desejada
             if performance > best_performance:
                 best_performance = performance
-                
+            
             self.logger.info(
                 f"Iteração {iteration}: "
                 f"arquivos={len(files_to_process)}, "
+                f"algoritmos reaproveitados={iteration_results['skipped_algorithms']}, "
                 f"performance={performance:.3f}"
             )
-            
-            # Pausa breve para não sobrecarregar
-            time.sleep(0.1)
         
         # Salva cache final
+        if self.current_iteration > consolidated_round:
+            self._consolidate_predictions(consolidated_round)
         final_stats = self._generate_final_statistics(iteration, start_time)
         self.logger.info(f"Processamento concluído: {final_stats}")
         
@@ -386,15 +579,17 @@ class IterativeCacheSystem:
         """Seleciona arquivos para processar na iteração atual"""
         files = []
         
-        # Prioriza arquivos com menor confiança (mais margem para melhoria)
-        with sqlite3.connect(self.predictions_db) as conn:
+        # Prioriza maior ganho esperado por unidade de custo (arquivos novos:
+        # margem até confiança 1.0), pulando os que estão em backoff;
+        # idx_prediction_schedule entrega as linhas já ordenadas, sem sort
+        with self._db() as conn:
             cursor = conn.execute('''
-                SELECT file_path, confidence_score 
-                FROM prediction_cache 
-                WHERE is_downloaded = FALSE
-                ORDER BY confidence_score ASC, last_updated ASC
+                SELECT file_path, confidence_score
+                FROM prediction_cache
+                WHERE is_downloaded = FALSE AND next_round <= ?
+                ORDER BY priority DESC, last_updated ASC
                 LIMIT ?
-            ''', (batch_size,))
+            ''', (self.current_iteration, batch_size))
             
             for row in cursor.fetchall():
                 file_path = row[0]
@@ -404,20 +599,43 @@ class IterativeCacheSystem:
         
         return files
     
-    def _process_iteration_batch(self, files: List[str], 
+    def _last_round(self) -> int:
+        """Última iteração gravada no banco (relógio persistente do agendador)"""
+        with self._db() as conn:
+            cursor = conn.execute('SELECT MAX(iteration_updated) FROM prediction_cache')
+            return cursor.fetchone()[0] or 0
+    
+    def _next_scheduled_round(self) -> Optional[int]:
+        """Iteração em que o próximo arquivo em backoff volta a ser elegível"""
+        with self._db() as conn:
+            cursor = conn.execute('''
+                SELECT MIN(next_round) FROM prediction_cache WHERE is_downloaded = FALSE
+            ''')
+            return cursor.fetchone()[0]
+    
+    def _process_iteration_batch(self, files: List[str],
                                 config: IterationConfig) -> Dict:
         """Processa um lote de arquivos usando algoritmos registrados"""
         results = {
             'processed_files': [],
             'improved_predictions': [],
             'consolidated_data': [],
-            'errors': []
+            'errors': [],
+            'skipped_algorithms': 0,
+            'schedules': {}
         }
         
+        # Predições, estado do agendador e últimas saídas dos algoritmos do
+        # lote inteiro, lidos de uma vez
+        predictions = self._load_predictions(files, results['schedules'])
+        previous_runs = self._load_algorithm_runs(files)
+        
         # Processamento paralelo
         with ThreadPoolExecutor(max_workers=config.thread_count) as executor:
             future_to_file = {
-                executor.submit(self._process_single_file, file_path): file_path
+                executor.submit(self._process_single_file, file_path,
+                                predictions.get(file_path),
+                                previous_runs.get(file_path)): file_path
                 for file_path in files
             }
             
@@ -427,12 +645,13 @@ class IterativeCacheSystem:
                 try:
                     file_result = future.result()
                     results['processed_files'].append(file_result)
+                    results['skipped_algorithms'] += file_result['skipped_algorithms']
                     
                     # Categoriza resultado
                     if file_result['improved']:
                         results['improved_predictions'].append(file_result)
                     
-                    if file_result['confidence'] >= 0.8:  # Alta confiança
+                    if file_result['confidence'] >= CONSOLIDATION_THRESHOLD:  # Alta confiança
                         results['consolidated_data'].append(file_result)
                         
                 except Exception as e:
@@ -441,23 +660,53 @@ class IterativeCacheSystem:
         
         return results
     
-    def _process_single_file(self, file_path: str) -> Dict:
-        """Processa um arquivo individual com todos os algoritmos"""
+    def _process_single_file(self, file_path: str,
+                             current_prediction: Optional[Dict] = None,
+                             previous_runs: Optional[Dict] = None) -> Dict:
+        """
+        Processa um arquivo individual com todos os algoritmos
+        
+        previous_runs: {algoritmo: (hash das entradas, saída)} da última
+        execução; algoritmos memoizáveis cujas entradas não mudaram não rodam
+        de novo, a saída anterior é reaproveitada. As saídas só são guardadas
+        quando a predição volta inalterada (senão a próxima entrada é outra).
+        """
         
-        # Carrega predição atual
-        current_prediction = self._load_current_prediction(file_path)
+        # Carrega predição atual (se não veio pré-carregada com o lote)
+        if current_prediction is None:
+            current_prediction = self._load_current_prediction(file_path)
+        if previous_runs is None:
+            previous_runs = self._load_algorithm_runs([file_path]).get(file_path, {})
+        # Sem execução anterior guardada não há o que comparar
+        input_hash = (self._algorithm_input_hash(file_path, current_prediction)
+                      if previous_runs else None)
         
         # Aplica todos os algoritmos registrados
         algorithm_results = {}
+        new_runs = {}
+        skipped = 0
+        processing_time = 0.0
         total_weight = 0
         
         for algo_name, algo_info in self.algorithms.items():
+            previous = previous_runs.get(algo_name)
+            if algo_info['memoize'] and previous and previous[0] == input_hash:
+                # Mesmas entradas da última execução: a saída não pode mudar
+                algorithm_results[algo_name] = previous[1]
+                total_weight += algo_info['weight']
+                skipped += 1
+                continue
+            
             try:
                 # Executa algoritmo
+                started = time.perf_counter()
                 algo_result = algo_info['func'](file_path, current_prediction)
+                elapsed = time.perf_counter() - started
+                processing_time += elapsed
                 algorithm_results[algo_name] = algo_result
+                new_runs[algo_name] = (algo_result, elapsed)
                 total_weight += algo_info['weight']
-                
+            
             except Exception as e:
                 self.logger.error(f"Erro no algoritmo {algo_name} para {file_path}: {e}")
                 continue
@@ -471,6 +720,10 @@ class IterativeCacheSystem:
         old_confidence = current_prediction.get('confidence_score', 0.0)
         new_confidence = combined_result['confidence']
         improved = new_confidence > old_confidence
+        unchanged = (new_confidence == old_confidence and
+                     combined_result['metadata'] == current_prediction.get('metadata'))
+        if unchanged and new_runs and input_hash is None:
+            input_hash = self._algorithm_input_hash(file_path, current_prediction)
         
         return {
             'file_path': file_path,
@@ -479,29 +732,89 @@ class IterativeCacheSystem:
             'improved': improved,
             'confidence': new_confidence,
             'metadata': combined_result['metadata'],
-            'algorithm_results': algorithm_results
+            'algorithm_results': algorithm_results,
+            'input_hash': input_hash,
+            'new_runs': new_runs,
+            'unchanged': unchanged,
+            'skipped_algorithms': skipped,
+            'processing_time': processing_time
         }
     
+    def _algorithm_input_hash(self, file_path: str, current_prediction: Dict) -> str:
+        """Hash das entradas dos algoritmos: caminho, predição atual e estado do arquivo local"""
+        try:
+            stat = os.stat(file_path)
+            file_state = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            file_state = None
+        
+        payload = json.dumps([file_path, current_prediction, file_state],
+                             sort_keys=True, default=str)
+        return hashlib.md5(payload.encode('utf-8')).hexdigest()
+    
     def _load_current_prediction(self, file_path: str) -> Dict:
         """Carrega predição atual do arquivo"""
-        with sqlite3.connect(self.predictions_db) as conn:
-            cursor = conn.execute('''
-                SELECT predicted_metadata, confidence_score, prediction_basis
-                FROM prediction_cache 
-                WHERE file_path = ?
-            ''', (file_path,))
-            
-            row = cursor.fetchone()
-            if row:
-                return {
-                    'metadata': json.loads(row[0]),
-                    'confidence_score': row[1],
-                    'prediction_basis': row[2]
-                }
+        prediction = self._load_predictions([file_path]).get(file_path)
+        if prediction:
+            return prediction
         
         # Se não encontrou, cria predição inicial
         return self._create_initial_prediction(file_path)
     
+    def _load_predictions(self, file_paths: List[str],
+                          schedules: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """
+        Carrega as predições atuais de vários arquivos (consultas IN em blocos)
+        
+        Se schedules for passado, recebe também o estado do agendador de cada
+        arquivo (fica fora da predição, que é entrada dos algoritmos).
+        """
+        predictions = {}
+        
+        with self._db() as conn:
+            for start in range(0, len(file_paths), SQLITE_MAX_PARAMS):
+                chunk = file_paths[start:start + SQLITE_MAX_PARAMS]
+                cursor = conn.execute(f'''
+                    SELECT file_path, predicted_metadata, confidence_score, prediction_basis,
+                           expected_gain, processing_cost, plateau_count
+                    FROM prediction_cache
+                    WHERE file_path IN ({', '.join('?' * len(chunk))})
+                ''', chunk)
+                
+                for (file_path, metadata_json, confidence, basis,
+                     expected_gain, cost, plateau_count) in cursor:
+                    predictions[file_path] = {
+                        'metadata': json.loads(metadata_json),
+                        'confidence_score': confidence,
+                        'prediction_basis': basis
+                    }
+                    if schedules is not None:
+                        schedules[file_path] = {
+                            'expected_gain': expected_gain,
+                            'processing_cost': cost,
+                            'plateau_count': plateau_count or 0
+                        }
+        
+        return predictions
+    
+    def _load_algorithm_runs(self, file_paths: List[str]) -> Dict[str, Dict[str, tuple]]:
+        """Últimas saídas dos algoritmos: {arquivo: {algoritmo: (hash das entradas, saída)}}"""
+        runs: Dict[str, Dict[str, tuple]] = {}
+        
+        with self._db() as conn:
+            for start in range(0, len(file_paths), SQLITE_MAX_PARAMS):
+                chunk = file_paths[start:start + SQLITE_MAX_PARAMS]
+                cursor = conn.execute(f'''
+                    SELECT file_path, algorithm, input_hash, result
+                    FROM algorithm_runs
+                    WHERE file_path IN ({', '.join('?' * len(chunk))})
+                ''', chunk)
+                
+                for file_path, algorithm, input_hash, result_json in cursor:
+                    runs.setdefault(file_path, {})[algorithm] = (input_hash, json.loads(result_json))
+        
+        return runs
+    
     def _combine_algorithm_results(self, algorithm_results: Dict, 
                                   current_prediction: Dict) -> Dict:
         """Combina resultados de múltiplos algoritmos"""
@@ -563,74 +876,165 @@ class IterativeCacheSystem:
         """Salva métricas de performance no banco"""
         processing_time = time.time() - self.session_start.timestamp()
         
-        with sqlite3.connect(self.performance_db) as conn:
+        with self._db() as conn:
             conn.execute('''
                 INSERT INTO performance_metrics 
                 (iteration, metric_name, metric_value, processing_time, files_processed)
                 VALUES (?, ?, ?, ?, ?)
             ''', (iteration, 'performance', performance, processing_time, files_processed))
     
-    def _update_cache_from_results(self, results: Dict):
-        """Atualiza cache com os resultados da iteração"""
-        
-        # Atualiza predições
-        with sqlite3.connect(self.predictions_db) as conn:
-            for file_result in results['processed_files']:
-                conn.execute('''
-                    UPDATE prediction_cache 
-                    SET predicted_metadata = ?, confidence_score = ?, 
-                        last_updated = CURRENT_TIMESTAMP
-                    WHERE file_path = ?
-                ''', (
-                    json.dumps(file_result['metadata']),
-                    file_result['new_confidence'],
-                    file_result['file_path']
-                ))
+    def _save_iteration_results(self, results: Dict, config: IterationConfig):
+        """Grava predições, estado do agendador e saídas reaproveitáveis dos algoritmos do lote"""
+        schedules = results.get('schedules', {})
+        prediction_rows = []
+        run_rows = []
         
-        # Move dados consolidados para banco principal
-        with sqlite3.connect(self.consolidated_db) as conn:
-            for consolidated in results['consolidated_data']:
-                file_hash = self._calculate_file_hash(consolidated['file_path'])
-                
-                conn.execute('''
-                    INSERT OR REPLACE INTO consolidated_cache 
-                    (file_path, file_hash, confidence_score, metadata, 
-                     iteration_created, source_type)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    consolidated['file_path'],
-                    file_hash,
-                    consolidated['new_confidence'],
-                    json.dumps(consolidated['metadata']),
-                    self.current_iteration,
-                    'iterative_processing'
-                ))
+        for file_result in results['processed_files']:
+            file_path = file_result['file_path']
+            schedule = self._next_schedule(file_result, schedules.get(file_path, {}), config)
+            prediction_rows.append((
+                json.dumps(file_result['metadata']),
+                file_result['new_confidence'],
+                self.current_iteration,
+                *schedule,
+                file_path
+            ))
+            # Saída só serve de memo se a próxima entrada for a mesma (predição inalterada)
+            if not file_result.get('unchanged'):
+                continue
+            for algo_name, (algo_result, elapsed) in file_result['new_runs'].items():
+                if self.algorithms.get(algo_name, {}).get('memoize', True):
+                    run_rows.append((file_path, algo_name, file_result['input_hash'],
+                                     json.dumps(algo_result, default=str), elapsed))
+        
+        # Uma transação para o lote todo
+        with self._db() as conn:
+            conn.executemany('''
+                UPDATE prediction_cache
+                SET predicted_metadata = ?, confidence_score = ?,
+                    last_updated = CURRENT_TIMESTAMP, iteration_updated = ?,
+                    expected_gain = ?, processing_cost = ?, plateau_count = ?,
+                    next_round = ?, priority = ?
+                WHERE file_path = ?
+            ''', prediction_rows)
+            conn.executemany('''
+                INSERT OR REPLACE INTO algorithm_runs
+                (file_path, algorithm, input_hash, result, processing_time)
+                VALUES (?, ?, ?, ?, ?)
+            ''', run_rows)
     
-    def _calculate_file_hash(self, file_path: str) -> Optional[str]:
-        """Calcula hash do arquivo se ele existir localmente"""
-        path_obj = Path(file_path)
-        if path_obj.exists():
-            with open(path_obj, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        return None
+    def _next_schedule(self, file_result: Dict, previous: Dict,
+                       config: IterationConfig) -> tuple:
+        """
+        Novo estado do agendador de um arquivo processado:
+        (ganho esperado, custo, iterações em platô, próxima iteração, prioridade)
+        
+        Ganho e custo são médias móveis; a prioridade é o ganho esperado
+        (limitado à margem até confiança 1.0) dividido pelo custo relativo à
+        média da sessão. Sem ganho relevante o arquivo entra em backoff
+        exponencial (2, 4, 8... iterações, até max_backoff_iterations).
+        """
+        new_confidence = file_result['new_confidence']
+        gain = max(new_confidence - file_result['old_confidence'], 0.0)
+        headroom = max(1.0 - new_confidence, 0.0)
+        
+        previous_gain = previous.get('expected_gain')
+        if previous_gain is None:
+            previous_gain = max(1.0 - file_result['old_confidence'], 0.0)
+        expected_gain = SCHEDULE_SMOOTHING * gain + (1 - SCHEDULE_SMOOTHING) * previous_gain
+        
+        # Custo só é observado quando algum algoritmo rodou de fato
+        cost = previous.get('processing_cost')
+        if file_result.get('new_runs'):
+            observed = file_result['processing_time']
+            cost = observed if cost is None else (
+                SCHEDULE_SMOOTHING * observed + (1 - SCHEDULE_SMOOTHING) * cost
+            )
+            self._mean_cost = observed if self._mean_cost is None else (
+                SCHEDULE_SMOOTHING * observed + (1 - SCHEDULE_SMOOTHING) * self._mean_cost
+            )
+        relative_cost = cost / self._mean_cost if cost and self._mean_cost else 1.0
+        
+        if gain < config.plateau_threshold:
+            plateau_count = previous.get('plateau_count', 0) + 1
+            wait = min(2 ** plateau_count, config.max_backoff_iterations)
+        else:
+            plateau_count = 0
+            wait = 1
+        
+        priority = min(expected_gain, headroom) / max(relative_cost, MIN_RELATIVE_COST)
+        return expected_gain, cost, plateau_count, self.current_iteration + wait, priority
+    
+    def _consolidate_predictions(self, since_iteration: int) -> int:
+        """Promove a consolidados as predições de alta confiança gravadas depois de since_iteration"""
+        with self._db() as conn:
+            # idx_prediction_iteration: só as linhas gravadas desde a última consolidação
+            cursor = conn.execute('''
+                SELECT file_path FROM prediction_cache
+                WHERE iteration_updated > ? AND confidence_score >= ?
+            ''', (since_iteration, CONSOLIDATION_THRESHOLD))
+            promoted = [row[0] for row in cursor.fetchall()]
+            
+            conn.execute('''
+                INSERT OR REPLACE INTO consolidated_cache
+                (file_path, confidence_score, metadata, iteration_created, source_type)
+                SELECT file_path, confidence_score, predicted_metadata,
+                       iteration_updated, 'iterative_processing'
+                FROM prediction_cache
+                WHERE iteration_updated > ? AND confidence_score >= ?
+            ''', (since_iteration, CONSOLIDATION_THRESHOLD))
+        
+        # Hash só dos arquivos presentes localmente, calculado fora do lock
+        file_hashes = []
+        for file_path in promoted:
+            file_hash = self._calculate_file_hash(file_path)
+            if file_hash:
+                file_hashes.append((file_hash, file_path))
+        
+        if file_hashes:
+            with self._db() as conn:
+                conn.executemany('''
+                    UPDATE consolidated_cache SET file_hash = ? WHERE file_path = ?
+                ''', file_hashes)
+        
+        return len(promoted)
+    
+    def _calculate_file_hash(self, file_path: str,
+                             sample_size: int = HASH_SAMPLE_SIZE) -> Optional[str]:
+        """
+        Calcula hash do arquivo se ele existir localmente.
+        
+        Arquivos de até 3 amostras são lidos inteiros, em blocos (mesmo MD5
+        de antes); nos maiores o hash é parcial: tamanho + início, meio e fim.
+        """
+        if not os.path.isfile(file_path):
+            return None
+        
+        size = os.path.getsize(file_path)
+        digest = hashlib.md5()
+        with open(file_path, 'rb') as f:
+            if size <= 3 * sample_size:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            else:
+                digest.update(str(size).encode())
+                for offset in (0, (size - sample_size) // 2, size - sample_size):
+                    f.seek(offset)
+                    digest.update(f.read(sample_size))
+        return digest.hexdigest()
     
     def _generate_final_statistics(self, iterations: int, start_time: float) -> Dict:
         """Gera estatísticas finais do processamento"""
         elapsed_time = time.time() - start_time
         
-        with sqlite3.connect(self.predictions_db) as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM prediction_cache')
-            total_predictions = cursor.fetchone()[0]
-            
+        with self._db() as conn:
             cursor = conn.execute('''
-                SELECT COUNT(*) FROM prediction_cache 
-                WHERE confidence_score >= 0.8
-            ''')
-            high_confidence = cursor.fetchone()[0]
-        
-        with sqlite3.connect(self.consolidated_db) as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM consolidated_cache')
-            consolidated_count = cursor.fetchone()[0]
+                SELECT
+                    (SELECT COUNT(*) FROM prediction_cache),
+                    (SELECT COUNT(*) FROM prediction_cache WHERE confidence_score >= ?),
+                    (SELECT COUNT(*) FROM consolidated_cache)
+            ''', (CONSOLIDATION_THRESHOLD,))
+            total_predictions, high_confidence, consolidated_count = cursor.fetchone()
         
         return {
             'iterations_completed': iterations,
@@ -644,14 +1048,14 @@ class IterativeCacheSystem:
     
     def _calculate_average_confidence(self) -> float:
         """Calcula confiança média atual"""
-        with sqlite3.connect(self.predictions_db) as conn:
+        with self._db() as conn:
             cursor = conn.execute('SELECT AVG(confidence_score) FROM prediction_cache')
             result = cursor.fetchone()[0]
             return result if result else 0.0
     
     def _get_performance_trend(self) -> List[float]:
         """Obtém tendência de performance das últimas iterações"""
-        with sqlite3.connect(self.performance_db) as conn:
+        with self._db() as conn:
             cursor = conn.execute('''
                 SELECT metric_value FROM performance_metrics 
                 WHERE metric_name = 'performance'
@@ -663,7 +1067,7 @@ class IterativeCacheSystem:
         """Obtém predições para arquivos específicos ou padrões"""
         predictions = {}
         
-        with sqlite3.connect(self.predictions_db) as conn:
+        with self._db() as conn:
             for pattern in file_patterns:
                 cursor = conn.execute('''
                     SELECT file_path, predicted_metadata, confidence_score, remote_source
@@ -707,7 +1111,7 @@ class IterativeCacheSystem:
     
     def _get_top_predictions(self, limit: int) -> List[Dict]:
         """Obtém as melhores predições"""
-        with sqlite3.connect(self.predictions_db) as conn:
+        with self._db() as conn:
             cursor = conn.execute('''
                 SELECT file_path, predicted_metadata, confidence_score
                 FROM prediction_cache 
@@ -742,7 +1146,7 @@ class IterativeCacheSystem:
         health = {}
         
         # Distribuição de confiança
-        with sqlite3.connect(self.predictions_db) as conn:
+        with self._db() as conn:
             cursor = conn.execute('''
                 SELECT 
                     COUNT(CASE WHEN confidence_score < 0.3 THEN 1 END) as low,
@@ -20,6 +20,7 @@ import shutil
 import sqlite3
 import statistics
 import sys
+import threading
 import time
 import traceback
 import unicodedata
@@ -34,11 +35,11 @@ from rich.progress import (
     TimeElapsedColumn,
 )
 from concurrent import futures
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 try:
     from core.metadata_utils import normalize_authors
     from core.normalization import canonical_publisher
@@ -49,6 +50,36 @@ except ModuleNotFoundError:
     _sys.path.insert(0, str(_Path(__file__).resolve().parents[1]))
     from core.metadata_utils import normalize_authors
     from core.normalization import canonical_publisher
+from renamepdfepub.epub_reader import (
+    is_valid_isbn,
+    iter_document_texts as iter_epub_documents,
+    read_package as read_epub_package,
+    strip_tags,
+)
+from renamepdfepub.mobi_reader import read_header as read_mobi_header, read_text as read_mobi_text
+from renamepdfepub.filename_lane import FilenameLane, LocalCatalog
+from renamepdfepub.api_metrics import WindowedMetrics, prometheus_text
+from renamepdfepub.hint_cache import HintCache
+from renamepdfepub.live_stats import LiveStatsPublisher
+from renamepdfepub.naming import FILESYSTEM, compile_template
+from renamepdfepub.extraction_supervisor import (
+    ExtractionSupervisor,
+    PoisonFileRegistry,
+    SupervisedExtractionError,
+)
+from renamepdfepub.ocr_pipeline import OcrPipeline
+from renamepdfepub.offline_catalog import OfflineCatalog
+from renamepdfepub.pdf_backends import (
+    calibrate as calibrate_pdf_backends,
+    extract_text as extract_pdf_text,
+    load_order as load_pdf_backend_order,
+)
+from renamepdfepub.pdf_document import open_document as open_pdf_document
+from renamepdfepub.rename_journal import DEFAULT_JOURNAL_DIR, RenameJournal
+from renamepdfepub.rename_plan import bulk_rename
+from renamepdfepub.report_stream import StreamingReportWriter
+from renamepdfepub.results_store import ResultsStore
+from renamepdfepub.scan_scheduler import ScanScheduler, estimate_cost
 from urllib.parse import quote
 
 # Third-party Imports: HTTP and API Related
@@ -98,17 +129,6 @@ try:
 except Exception:
     BeautifulSoup = None
 
-try:
-    from ebooklib import epub, ITEM_DOCUMENT
-except Exception:
-    epub = None
-    ITEM_DOCUMENT = None
-
-try:
-    import mobi
-except Exception:
-    mobi = None
-
 # Third-party Imports: Data Visualization
 try:
     import plotly.graph_objects as go
@@ -125,13 +145,15 @@ class DependencyManager:
         self._init_logging()
 
         self.available_extractors = {
-            'pypdf2': True,  # Já sabemos que está disponível pois é requisito
+            'pypdf2': PyPDF2 is not None,
             'pdfplumber': False,
             'pdfminer': False,
             'tesseract': False,
             'pdf2image': False
         }
         self._check_dependencies()
+        # Ordem dos backends de texto: calibrada (pdf_backends.json) ou padrão
+        self.pdf_backend_order = load_pdf_backend_order()
     
     def _check_dependencies(self):
         """Verifica quais dependências estão disponíveis."""
@@ -182,6 +204,10 @@ class DependencyManager:
         """Retorna lista de extractors disponíveis."""
         return [k for k, v in self.available_extractors.items() if v]
 
+    def get_best_pdf_extractor(self) -> Optional[str]:
+        """Retorna o backend de texto preferido segundo a ordem calibrada."""
+        return self.pdf_backend_order[0] if self.pdf_backend_order else None
+
     @property
     def has_ocr_support(self) -> bool:
         """Verifica se o suporte a OCR está disponível."""
@@ -907,6 +933,11 @@ class MetadataRecoveryEngine:
         return recovered_items
 
     def _attempt_recovery(self, file_path: str, details: Dict, runtime_stats: Dict) -> Optional[BookMetadata]:
+        if details.get('quarantined'):
+            # Não reabre no processo principal um arquivo que estourou prazo/memória
+            self.logger.debug("Skipping recovery of quarantined file %s", file_path)
+            return None
+
         text, methods = self._extract_text_for_recovery(file_path)
 
         details.setdefault('recovery_attempts', []).append({
@@ -1026,39 +1057,126 @@ class FastMetadataPreprocessor:
         pdf_processor: 'PDFProcessor',
         ebook_processor: 'EbookProcessor',
         logger: logging.Logger,
+        metadata_cache: Optional['MetadataCache'] = None,
+        min_confidence: float = 0.8,
+        hint_cache: Optional[HintCache] = None,
     ) -> None:
         self.pdf_processor = pdf_processor
         self.ebook_processor = ebook_processor
         self.logger = logger.getChild('preprocessor')
         self.text_analyzer = MetadataTextAnalyzer()
+        self.metadata_cache = metadata_cache
+        self.min_confidence = min_confidence
+        self.hint_cache = hint_cache
+        self._v3_extractor = None
+        self._stats_lock = threading.Lock()
 
-    def generate_hints(self, file_groups: Dict[str, List[str]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
-        hints: Dict[str, Dict[str, Any]] = {}
-        stats = {
+    @staticmethod
+    def new_stats() -> Dict[str, int]:
+        return {
             'scanned': 0,
             'with_text': 0,
             'filename_only': 0,
+            'filename_resolved': 0,
+            'cached': 0,
             'isbn_hits': 0,
             'applied': 0,
             'promoted': 0,
         }
 
-        for group_files in file_groups.values():
-            for file_path in group_files:
-                stats['scanned'] += 1
-                hint = self._hint_from_filename(Path(file_path).stem)
-                text_hint = self._quick_scan(file_path)
-                if text_hint:
-                    stats['with_text'] += 1
-                    if text_hint.get('isbn'):
-                        stats['isbn_hits'] += 1
-                    hint.update({k: v for k, v in text_hint.items() if v})
-                else:
-                    stats['filename_only'] += 1
+    def generate_hints(self, file_groups: Dict[str, List[str]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+        """Gera todas as dicas de uma vez (sequencial); o processamento principal usa prepare/scan_file."""
+        hints, pending, stats = self.prepare(file_groups)
+        for file_path in pending:
+            hints[file_path] = self.scan_file(file_path, hints[file_path], stats)
+        return hints, stats
 
-                hints[file_path] = self._finalize_hint(hint)
+    def prepare(self, file_groups: Dict[str, List[str]]) -> Tuple[Dict[str, Dict[str, Any]], List[str], Dict[str, int]]:
+        """
+        Passada sem leitura de conteúdo: faixa por nome de arquivo e dicas persistidas.
 
-        return hints, stats
+        Returns:
+            (dicas, arquivos que ainda precisam de varredura de conteúdo, estatísticas).
+            As dicas dos arquivos pendentes contêm apenas o que veio do nome.
+        """
+        stats = self.new_stats()
+        hints: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+
+        # Nomes de arquivo contra o catálogo local (uma leitura em lote)
+        all_files = [file_path for group_files in file_groups.values() for file_path in group_files]
+        lane_hints, lane_pending, lane_stats = self._filename_lane().resolve(all_files)
+        # Dicas de execuções anteriores, válidas enquanto o arquivo não mudar (tamanho/mtime)
+        cached = self.hint_cache.get_many(lane_pending) if self.hint_cache is not None else {}
+
+        for file_path in all_files:
+            hint = lane_hints[file_path]
+            if hint.get('resolved'):
+                stats['filename_resolved'] += 1
+                hint = self._finalize_hint(hint)
+            elif file_path in cached:
+                stats['cached'] += 1
+                hint = cached[file_path]
+            else:
+                hints[file_path] = hint
+                pending.append(file_path)
+                continue
+            stats['scanned'] += 1
+            if hint.get('isbn'):
+                stats['isbn_hits'] += 1
+            hints[file_path] = hint
+
+        self.logger.info(
+            "Filename lane: %d catalog hits, %d ISBNs in filenames, %d cached hints, %d files need content",
+            lane_stats['catalog_hits'], lane_stats['filename_isbns'], stats['cached'], len(pending)
+        )
+        return hints, pending, stats
+
+    def scan_file(self, file_path: str, hint: Dict[str, Any], stats: Dict[str, int]) -> Dict[str, Any]:
+        """Varredura rápida de conteúdo de um arquivo pendente; persiste a dica resultante."""
+        text_hint = self._quick_scan(file_path)
+        merged = dict(hint)
+        if text_hint:
+            merged.update({k: v for k, v in text_hint.items() if v})
+        merged = self._finalize_hint(merged)
+
+        with self._stats_lock:
+            stats['scanned'] = stats.get('scanned', 0) + 1
+            if text_hint:
+                stats['with_text'] = stats.get('with_text', 0) + 1
+                if text_hint.get('isbn'):
+                    stats['isbn_hits'] = stats.get('isbn_hits', 0) + 1
+            else:
+                stats['filename_only'] = stats.get('filename_only', 0) + 1
+
+        if self.hint_cache is not None:
+            try:
+                self.hint_cache.put(file_path, merged)
+            except sqlite3.Error as exc:
+                self.logger.debug("Could not persist hint for %s: %s", file_path, exc)
+        return merged
+
+    def _filename_lane(self) -> FilenameLane:
+        catalog = LocalCatalog.from_cache(self.metadata_cache) if self.metadata_cache is not None else LocalCatalog()
+        return FilenameLane(
+            catalog,
+            parsers=[self._hint_from_filename, self._v3_fields],
+            min_confidence=self.min_confidence,
+        )
+
+    def _v3_fields(self, stem: str) -> Optional[Dict[str, Any]]:
+        """Campos do extrator V3 (importado sob demanda: configura logging ao importar)."""
+        if self._v3_extractor is None:
+            try:
+                from core.algorithms_v3 import AdvancedMetadataExtractor
+            except ImportError:
+                self._v3_extractor = False
+            else:
+                self._v3_extractor = AdvancedMetadataExtractor()
+        if not self._v3_extractor:
+            return None
+        metadata = self._v3_extractor.extract_v3_metadata(stem)
+        return {key: metadata.get(key) for key in ('title', 'author', 'publisher', 'year')}
 
     def _hint_from_filename(self, stem: str) -> Dict[str, Any]:
         if not stem:
@@ -1224,7 +1342,6 @@ class ISBNExtractor:
     def __init__(self):
         self._init_logging()
         # Padrões de ISBN
-        self._ebooklib_missing_logged = False
         self._bs4_missing_logged = False
 
         self.isbn_patterns = [
@@ -1474,23 +1591,16 @@ class ISBNExtractor:
         return normalized
 
     def _extract_info_from_epub(self, epub_path: str) -> Dict:
-        """Extração mais robusta de metadados EPUB."""
-        if epub is None:
-            if not self._ebooklib_missing_logged:
-                self.logger.warning(
-                    "Dependência opcional 'ebooklib' não encontrada. Extração de metadados EPUB será ignorada."
-                )
-                self._ebooklib_missing_logged = True
-            return {}
-
+        """Extração mais robusta de metadados EPUB (pacote OPF compartilhado)."""
         try:
-            book = epub.read_epub(epub_path)
+            package = read_epub_package(epub_path)
+            date = package.first("date")
             metadata = {
-                "Year": str(book.get_metadata("DC", "date")[0][0])[:4] if book.get_metadata("DC", "date") else "Unknown",
-                "ISBN": str(book.get_metadata("DC", "identifier")[0][0]) if book.get_metadata("DC", "identifier") else "Unknown",
-                "Author": ", ".join([str(author[0]) for author in book.get_metadata("DC", "creator")]) if book.get_metadata("DC", "creator") else "Unknown",
-                "Publisher": str(book.get_metadata("DC", "publisher")[0][0]) if book.get_metadata("DC", "publisher") else "Unknown",
-                "Title": str(book.get_metadata("DC", "title")[0][0]) if book.get_metadata("DC", "title") else "Unknown",
+                "Year": date[:4] if date else "Unknown",
+                "ISBN": package.first("identifier") or "Unknown",
+                "Author": ", ".join(package.get("creator")) or "Unknown",
+                "Publisher": package.first("publisher") or "Unknown",
+                "Title": package.first("title") or "Unknown",
             }
             return metadata
         except Exception as e:
@@ -1518,24 +1628,23 @@ class ISBNExtractor:
     def _extract_from_pdf_metadata(self, pdf_path: str) -> Set[str]:
         """Extrai ISBNs dos metadados do PDF."""
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                metadata = reader.metadata if reader.metadata else {}
+            with open_pdf_document(pdf_path) as document:
+                metadata = document.info
                 
                 found_isbns = set()
                 
-                # Procura em campos comuns de metadados
+                # Procura em campos comuns de metadados (Info e XMP)
                 fields_to_check = ['ISBN', 'Subject', 'Keywords', 'Title', 'Description']
-                for field in fields_to_check:
-                    if field in metadata:
-                        # Procura por padrões de ISBN no valor do campo
-                        text = str(metadata[field])
-                        for pattern in self.isbn_patterns:
-                            matches = re.finditer(pattern, text, re.IGNORECASE)
-                            for match in matches:
-                                isbn = self._normalize_isbn(match.group(1))
-                                if self._validate_isbn(isbn):
-                                    found_isbns.add(isbn)
+                values = [metadata[field] for field in fields_to_check if field in metadata]
+                values += document.xmp_values('isbn', 'identifier', 'title', 'description', 'subject')
+                for text in values:
+                    # Procura por padrões de ISBN no valor do campo
+                    for pattern in self.isbn_patterns:
+                        matches = re.finditer(pattern, text, re.IGNORECASE)
+                        for match in matches:
+                            isbn = self._normalize_isbn(match.group(1))
+                            if self._validate_isbn(isbn):
+                                found_isbns.add(isbn)
                 
                 return found_isbns
         except Exception as e:
@@ -1670,17 +1779,16 @@ class ISBNExtractor:
         if is_packt:
             # Para Packt, verifica mais páginas e especialmente a página de copyright
             try:
-                with open(pdf_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
+                with open_pdf_document(pdf_path) as document:
                     text = ""
                     # Verifica páginas iniciais onde geralmente está o ISBN
-                    for i in range(min(5, len(reader.pages))):
-                        text += reader.pages[i].extract_text() + "\n"
+                    for i in range(min(5, document.page_count)):
+                        text += document.page_text(i) + "\n"
                         
                     # Se não encontrou ISBN, procura na página de copyright
                     if not re.search(r'ISBN', text, re.IGNORECASE):
-                        for i in range(5, min(15, len(reader.pages))):
-                            page_text = reader.pages[i].extract_text()
+                        for i in range(5, min(15, document.page_count)):
+                            page_text = document.page_text(i)
                             if re.search(r'copyright|isbn', page_text, re.IGNORECASE):
                                 text += page_text + "\n"
                                 break
@@ -1822,6 +1930,11 @@ class MetadataFetcher:
         self.validator = MetadataValidator()
         self.metrics = MetricsCollector()
 
+        # Catálogo offline local (dump importado com --import-catalog), consultado antes das APIs
+        self.offline_catalog = OfflineCatalog(publisher_normalizer=canonical_publisher)
+        # ISBNs da varredura atual já resolvidos em lote (ISBN -> registro, ou None se ausente)
+        self._offline_prefetched: Dict[str, Optional[Dict[str, Any]]] = {}
+
         # Circuit breaker simples por API
         self._api_failure_counts = Counter()
         self._api_circuit_until: Dict[str, float] = {}
@@ -1882,6 +1995,7 @@ class MetadataFetcher:
 
         # Confidence adjustments
         self.confidence_adjustments = {
+            'offline_catalog': 0.93,
             'openlibrary': 0.85,
             'google_books': 0.90,
             'google_books_br': 0.90,
@@ -1991,6 +2105,9 @@ class MetadataFetcher:
         if api_name.startswith('isbnlib') and self._get_isbnlib_module() is None:
             return True
 
+        if api_name == 'offline_catalog' and not self.offline_catalog.available:
+            return True
+
         return False
 
     def _make_request(self, api_name: str, url: str, **kwargs) -> requests.Response:
@@ -2128,6 +2245,7 @@ class MetadataFetcher:
     def _configure_confidence_scores(self):
         """Configure confidence scores for different APIs."""
         self.confidence_adjustments = {
+            'offline_catalog': 0.93,
             'openlibrary': 0.85,
             'google_books': 0.90,
             'google_books_br': 0.90,
@@ -2221,6 +2339,15 @@ class MetadataFetcher:
             ]
             api_groups[0]['apis'] = brazilian_apis + api_groups[0]['apis']
 
+        # Catálogo offline: latência zero, sem rede nem rate limit, antes de qualquer API
+        api_groups.insert(0, {
+            'name': 'offline',
+            'apis': [('offline_catalog', self.fetch_offline_catalog)],
+            'min_confidence': 0.85,
+            'timeout': 0,
+            'rate_limited': False
+        })
+
         all_results = []
         tried_apis = set()
         errors = defaultdict(list)
@@ -2244,7 +2371,7 @@ class MetadataFetcher:
                 while retry_count < max_retries:
                     try:
                         # Verifica rate limit
-                        wait_time = self.rate_limiter.should_wait(api_name)
+                        wait_time = self.rate_limiter.should_wait(api_name) if group.get('rate_limited', True) else 0
                         if wait_time > 0:
                             time.sleep(wait_time)
 
@@ -2612,6 +2739,43 @@ class MetadataFetcher:
             self._handle_api_error('openlibrary', e, isbn)
             return None
 
+    def prefetch_offline_catalog(self, isbns: Iterable[Optional[str]]) -> int:
+        """
+        Resolve os ISBNs já conhecidos de uma varredura com uma única consulta em lote.
+
+        fetch_offline_catalog usa o resultado (inclusive as ausências) em vez de
+        consultar o banco arquivo a arquivo.
+
+        Returns:
+            int: Quantos ISBNs foram encontrados no catálogo
+        """
+        wanted = {isbn for isbn in isbns if isbn}
+        if not wanted or not self.offline_catalog.available:
+            self._offline_prefetched = {}
+            return 0
+        found = self.offline_catalog.lookup_many(wanted)
+        self._offline_prefetched = {isbn: found.get(isbn) for isbn in wanted}
+        return len(found)
+
+    def fetch_offline_catalog(self, isbn: str) -> Optional[BookMetadata]:
+        """Busca no catálogo offline local (indexado por ISBN-13; ISBN-10 é convertido)."""
+        if isbn in self._offline_prefetched:
+            record = self._offline_prefetched[isbn]
+        else:
+            record = self.offline_catalog.lookup(isbn)
+        if not record or not record.get('authors'):
+            return None
+        return BookMetadata(
+            title=record['title'],
+            authors=record['authors'],
+            publisher=record.get('publisher') or 'Unknown',
+            published_date=record.get('published_date') or 'Unknown',
+            isbn_13=record['isbn_13'],
+            isbn_10=record.get('isbn_10'),
+            confidence_score=self.confidence_adjustments['offline_catalog'],
+            source='offline_catalog'
+        )
+
     def fetch_google_books(self, isbn: str, country: str = None, lang: str = None) -> Optional[BookMetadata]:
         """Versão melhorada do Google Books com suporte a regionalização."""
         try:
@@ -4277,10 +4441,11 @@ class MetadataFetcher:
         return updated
 
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, ocr_workers: int = 2):
         self._init_logging() 
         self.isbn_extractor = ISBNExtractor()
         self.dependency_manager = DependencyManager()
+        self.ocr_pipeline = OcrPipeline(max_workers=ocr_workers)
         self.logger.info(f"Extractores disponíveis: {', '.join(self.dependency_manager.get_available_extractors())}")
         if self.dependency_manager.has_ocr_support:
             self.logger.info("Suporte a OCR está disponível")
@@ -4314,58 +4479,49 @@ class PDFProcessor:
         methods_tried = []
         methods_succeeded = []
         
-        # 1. PyPDF2
+        # Handle único por arquivo (reaproveitado se o chamador já abriu o PDF)
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                methods_tried.append('PyPDF2')
-                
-                for page_num in range(min(max_pages, len(reader.pages))):
-                    text += reader.pages[page_num].extract_text() + "\n"
-                    
-                if text.strip():
-                    methods_succeeded.append('PyPDF2')
-        except Exception as e:
-            self.logger.debug(f"PyPDF2 extraction failed: {str(e)}")
-        
-        # 2. pdfplumber se PyPDF2 falhar
-        if not text.strip() and 'pdfplumber' in self.dependency_manager.get_available_extractors():
-            if pdfplumber is None:
-                self.logger.debug("pdfplumber marcado como disponível, mas o módulo não pôde ser importado.")
-            else:
-                try:
-                    methods_tried.append('pdfplumber')
-
-                    with pdfplumber.open(pdf_path) as pdf:
-                        for page in pdf.pages[:max_pages]:
-                            text += page.extract_text() + "\n"
+            with open_pdf_document(pdf_path) as document:
+                text = self._extract_pdf_layers(document, pdf_path, max_pages, methods_tried, methods_succeeded)
+        except OSError as e:
+            self.logger.debug(f"Falha ao abrir PDF {pdf_path}: {str(e)}")
+        return self._clean_text(text), methods_tried
 
-                        if text.strip():
-                            methods_succeeded.append('pdfplumber')
-                except Exception as e:
-                    self.logger.debug(f"pdfplumber extraction failed: {str(e)}")
+    def _extract_pdf_layers(self, document, pdf_path: str, max_pages: int,
+                            methods_tried: List[str], methods_succeeded: List[str]) -> str:
+        """Camada de texto (backends na ordem calibrada) e OCR sobre o handle compartilhado."""
+        # 1. Backends de texto (pypdf, pdfminer, pdfplumber, PyMuPDF) na ordem de pdf_backends.json
+        text, backends_tried, backend = extract_pdf_text(
+            document, max_pages, order=self.dependency_manager.pdf_backend_order
+        )
+        methods_tried.extend(backends_tried)
+        if backend:
+            methods_succeeded.append(backend)
+        else:
+            self.logger.debug(f"Nenhum backend de texto extraiu conteúdo de {pdf_path}: {backends_tried}")
         
-        # 3. OCR se texto ainda não foi extraído
+        # 2. OCR se texto ainda não foi extraído
         if not text.strip() and self.dependency_manager.has_ocr_support:
-            if pytesseract is None or convert_from_path is None:
+            if not self.ocr_pipeline.available:
                 self.logger.debug("Suporte a OCR sinalizado, mas dependências 'pytesseract' ou 'pdf2image' não estão disponíveis.")
             else:
                 try:
                     methods_tried.append('OCR')
 
-                    images = convert_from_path(pdf_path, last_page=max_pages)
-                    ocr_text = ""
-
-                    for image in images:
-                        ocr_text += pytesseract.image_to_string(image) + "\n"
+                    # Página a página, em pool próprio, parando no primeiro ISBN válido
+                    ocr_result = self.ocr_pipeline.extract(pdf_path, max_pages=max_pages)
+                    self.logger.debug(
+                        f"OCR: {ocr_result.pages_processed} páginas, {ocr_result.cache_hits} do cache"
+                        + (f", ISBN {ocr_result.isbn}" if ocr_result.isbn else "")
+                    )
 
-                    if ocr_text.strip():
-                        text = ocr_text
+                    if ocr_result.text.strip():
+                        text = ocr_result.text
                         methods_succeeded.append('OCR')
                 except Exception as e:
                     self.logger.debug(f"OCR extraction failed: {str(e)}")
         
-        return self._clean_text(text), methods_tried
+        return text
 
     def _is_text_corrupted(self, text: str) -> bool:
         """Verifica se o texto está corrompido."""
@@ -4509,14 +4665,15 @@ class PDFProcessor:
         """Extrai metadados internos do PDF."""
         self.logger.info(f"Extraindo metadados de: {pdf_path}")
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                metadata = reader.metadata if reader.metadata else {}
+            with open_pdf_document(pdf_path) as document:
+                metadata = dict(document.info)
+                xmp_isbns = document.xmp_values('isbn')
+                if 'ISBN' not in metadata and xmp_isbns:
+                    metadata['ISBN'] = xmp_isbns[0]
                 
                 if 'ISBN' in metadata:
                     isbn = re.sub(r'[^0-9X]', '', metadata['ISBN'].upper())
-                    if not (self.isbn_extractor.validate_isbn_10(isbn) or 
-                           self.isbn_extractor.validate_isbn_13(isbn)):
+                    if not self.isbn_extractor._validate_isbn(isbn):
                         self.logger.warning(f"ISBN inválido encontrado nos metadados: {isbn}")
                         del metadata['ISBN']
                     else:
@@ -4526,14 +4683,60 @@ class PDFProcessor:
         except Exception as e:
             self.logger.error(f"Erro ao extrair metadados de {pdf_path}: {str(e)}")
             return {}
+
+
+def extract_local_metadata(file_path: str, pdf_processor: 'PDFProcessor',
+                           ebook_processor: 'EbookProcessor',
+                           isbn_extractor: 'ISBNExtractor') -> Tuple[str, List[str], Dict, List[str]]:
+    """
+    Local (no network) stage for one file: text, embedded metadata and ISBNs.
+
+    Runs in-process or, in supervised mode, inside a disposable worker.
+
+    Returns:
+        Tuple of (text, methods tried, embedded metadata, ISBNs found in the text)
+    """
+    file_ext = Path(file_path).suffix.lower()[1:]
+    if file_ext == 'pdf':
+        # Um único handle compartilhado por texto, metadados e busca de ISBN
+        with open_pdf_document(file_path):
+            text, methods = pdf_processor.extract_text_from_pdf(file_path)
+            file_metadata = pdf_processor.extract_metadata_from_pdf(file_path)
+            isbns = isbn_extractor.extract_from_text(text, source_path=file_path) if text else set()
+        return text, methods, file_metadata, sorted(isbns)
+
+    if file_ext == 'epub':
+        text, methods = ebook_processor.extract_text_from_epub(file_path)
+    else:
+        text, methods = ebook_processor.extract_text_from_mobi(file_path)
+    file_metadata = ebook_processor.extract_metadata(file_path)
+    isbns = isbn_extractor.extract_from_text(text, source_path=file_path) if text else set()
+    return text, methods, file_metadata, sorted(isbns)
+
+
+_WORKER_COMPONENTS: Dict[str, Any] = {}
+
+
+def _supervised_local_metadata(file_path: str) -> Tuple[str, List[str], Dict, List[str]]:
+    """Entry point of supervised workers; processors are built once per process."""
+    if not _WORKER_COMPONENTS:
+        # OCR dentro do worker roda em série: o supervisor já limita o paralelismo
+        _WORKER_COMPONENTS['pdf'] = PDFProcessor(ocr_workers=1)
+        _WORKER_COMPONENTS['ebook'] = EbookProcessor()
+        _WORKER_COMPONENTS['isbn'] = ISBNExtractor()
+    return extract_local_metadata(
+        file_path, _WORKER_COMPONENTS['pdf'], _WORKER_COMPONENTS['ebook'], _WORKER_COMPONENTS['isbn']
+    )
+
         
 class BookMetadataExtractor:
-    def __init__(self, isbndb_api_key: Optional[str] = None):
+    def __init__(self, isbndb_api_key: Optional[str] = None, ocr_workers: int = 2):
         """
         Initialize the extractor with required components.
         
         Args:
             isbndb_api_key: Optional API key for ISBNdb service
+            ocr_workers: Worker processes reserved for OCR of scanned PDFs
         """
         # Set up reports directory first
         self.reports_dir = Path("reports")
@@ -4546,7 +4749,7 @@ class BookMetadataExtractor:
         
         self.isbn_extractor = ISBNExtractor()
         self.metadata_fetcher = MetadataFetcher(isbndb_api_key=isbndb_api_key)
-        self.pdf_processor = PDFProcessor()
+        self.pdf_processor = PDFProcessor(ocr_workers=ocr_workers)
         self.ebook_processor = EbookProcessor()
         self.cache = MetadataCache()
         self.api = APIHandler()
@@ -4558,11 +4761,28 @@ class BookMetadataExtractor:
         # Initialize file grouping support
         self.file_group = BookFileGroup()
 
-        # Fast heuristic preprocessor
+        # Slow/poison files seen by the supervised mode (poison_files.json)
+        self.poison_registry = PoisonFileRegistry()
+        self.extraction_supervisor: Optional[ExtractionSupervisor] = None
+        self.max_quarantine_strikes = 2
+
+        # Relatórios: JSONL/HTML incrementais (stream_reports) e modo compacto sem amostras de texto
+        self.stream_reports = False
+        self.compact_reports = False
+        self._report_stream: Optional[StreamingReportWriter] = None
+        # Tabela de resultados por arquivo (uma partição por execução) para consultas sem reler o JSON
+        self.results_store = ResultsStore(str(self.reports_dir / "scan_results.db"))
+        self._results_run: Optional[str] = None
+        # Métricas vivas: anel mapeado em memória lido pelo dashboard, publicado por tempo
+        self.live_publisher = LiveStatsPublisher(str(self.reports_dir / "live_api_stats.ring"))
+
+        # Fast heuristic preprocessor (filename lane resolves against the local cache)
         self.fast_preprocessor = FastMetadataPreprocessor(
             pdf_processor=self.pdf_processor,
             ebook_processor=self.ebook_processor,
-            logger=self.logger
+            logger=self.logger,
+            metadata_cache=self.cache,
+            hint_cache=HintCache()
         )
 
         # Secondary recovery engine for failed files
@@ -4636,25 +4856,9 @@ class BookMetadataExtractor:
             return ""
         
         try:
-            # Remove caracteres inválidos para sistemas de arquivos
-            filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-            
-            # Normaliza caracteres Unicode (converte acentos e caracteres especiais)
-            filename = unicodedata.normalize('NFKD', filename)
-            filename = filename.encode('ASCII', 'ignore').decode('ASCII')
-            
-            # Remove espaços duplicados e normaliza espaços
-            filename = ' '.join(filename.split())
-            
-            # Limita tamanho para evitar problemas com sistemas de arquivos
-            max_length = 200
-            if len(filename) > max_length:
-                # Preserva extensão ao truncar
-                name, ext = os.path.splitext(filename)
-                trunc_length = max_length - len(ext) - 3  # -3 para '...'
-                filename = name[:trunc_length] + '...' + ext
-                
-            return filename.strip()
+            # Remove caracteres inválidos, normaliza Unicode/espaços e limita a 200
+            # caracteres preservando a extensão (tabelas pré-computadas em naming)
+            return FILESYSTEM(filename)
             
         except Exception as e:
             self.logger.error(f"Erro ao limpar nome de arquivo: {str(e)}")
@@ -4727,48 +4931,7 @@ class BookMetadataExtractor:
             if isinstance(metadata, BookMetadata):
                 metadata = asdict(metadata)
 
-            def clean_name_part(text: str) -> str:
-                """Limpa parte do nome do arquivo para compatibilidade."""
-                if not text:
-                    return ""
-                # Remove caracteres especiais e espaços extras
-                text = text.strip()
-                # Substitui vírgulas por hífen
-                text = text.replace(',', '-')
-                # Substitui espaços em branco por underscore
-                text = text.replace(' ', '_')
-                # Remove outros caracteres problemáticos
-                text = re.sub(r'[<>:"/\\|?*]', '', text)
-                return text
-                
-            # Extrai e limpa campos
-            publisher = clean_name_part(self.normalize_publisher(metadata.get('publisher', 'Unknown')))
-            year = metadata.get('published_date', 'Unknown').split('-')[0]
-            title = clean_name_part(metadata.get('title', 'Unknown'))[:50]
-            authors = metadata.get('authors', [])
-            author = clean_name_part(', '.join(authors[:2])) if authors else ''
-            isbn = metadata.get('isbn_13') or metadata.get('isbn_10', '')
-            
-            # Monta as partes do nome
-            name_parts = []
-            
-            if publisher and publisher != 'Unknown':
-                name_parts.append(publisher)
-                
-            if year and year != 'Unknown':
-                name_parts.append(year)
-                
-            if title:
-                name_parts.append(title)
-                
-            if author:
-                name_parts.append(author)
-                
-            if isbn:
-                name_parts.append(isbn)
-                
-            # Une as partes com underscore
-            base_name = '_'.join(filter(None, name_parts))
+            base_name = self._rename_base_name(metadata)
             
             # Processa arquivos
             files_to_rename = []
@@ -4808,11 +4971,16 @@ class BookMetadataExtractor:
                         
                     renames.append((old_path, new_path))
             
-            # Executa renomeações
+            # Executa renomeações (o diário substitui cópias de backup: rollback --run <id>)
             if not simulate and success and renames:
-                for old_path, new_path in renames:
-                    old_path.rename(new_path)
-                    self.logger.info(f"Arquivo renomeado: {new_path}")
+                journal = RenameJournal(DEFAULT_JOURNAL_DIR)
+                try:
+                    for old_path, new_path in renames:
+                        journal.rename(str(old_path), str(new_path))
+                        self.logger.info(f"Arquivo renomeado: {new_path}")
+                finally:
+                    journal.commit({'renamed': len(renames)})
+                self.logger.info(f"Diário de renomeação: {journal.run_id}")
                     
             return success
             
@@ -4820,6 +4988,88 @@ class BookMetadataExtractor:
             self.logger.error(f"Erro ao renomear arquivos: {str(e)}")
             return False
 
+    def _rename_base_name(self, metadata: Dict) -> str:
+        """Nome base Editora_Ano_Título_Autores_ISBN usado por rename_file e rename_files."""
+        def clean_name_part(text: str) -> str:
+            """Limpa parte do nome do arquivo para compatibilidade."""
+            if not text:
+                return ""
+            # Remove caracteres especiais e espaços extras
+            text = text.strip()
+            # Substitui vírgulas por hífen
+            text = text.replace(',', '-')
+            # Substitui espaços em branco por underscore
+            text = text.replace(' ', '_')
+            # Remove outros caracteres problemáticos
+            text = re.sub(r'[<>:"/\\|?*]', '', text)
+            return text
+                
+        # Extrai e limpa campos
+        publisher = clean_name_part(self.normalize_publisher(metadata.get('publisher', 'Unknown')))
+        year = metadata.get('published_date', 'Unknown').split('-')[0]
+        title = clean_name_part(metadata.get('title', 'Unknown'))[:50]
+        authors = metadata.get('authors', [])
+        author = clean_name_part(', '.join(authors[:2])) if authors else ''
+        isbn = metadata.get('isbn_13') or metadata.get('isbn_10', '')
+            
+        # Monta as partes do nome
+        name_parts = []
+            
+        if publisher and publisher != 'Unknown':
+            name_parts.append(publisher)
+                
+        if year and year != 'Unknown':
+            name_parts.append(year)
+                
+        if title:
+            name_parts.append(title)
+                
+        if author:
+            name_parts.append(author)
+                
+        if isbn:
+            name_parts.append(isbn)
+                
+        # Une as partes com underscore
+        return '_'.join(filter(None, name_parts))
+
+    def rename_files(self, results: List[Union[Dict, BookMetadata]], max_workers: int = 8,
+                     journal_dir: str = DEFAULT_JOURNAL_DIR) -> Dict:
+        """
+        Renomeia um lote inteiro com um único plano.
+
+        Trocas e cadeias de nomes são ordenadas, destinos ocupados são pulados,
+        a execução é paralela e cada passo fica no diário write-ahead.
+
+        Returns:
+            Estatísticas de bulk_rename (renamed, errors, files_per_second, run_id, results)
+        """
+        pairs = []
+        for metadata in results:
+            if not metadata:
+                continue
+            if isinstance(metadata, BookMetadata):
+                metadata = asdict(metadata)
+            base_name = self._rename_base_name(metadata)
+            if not base_name:
+                continue
+            for old_path in metadata.get('file_paths') or [metadata.get('file_path')]:
+                if old_path:
+                    old_path = Path(old_path)
+                    pairs.append((str(old_path), str(old_path.parent / f"{base_name}{old_path.suffix}")))
+
+        stats = bulk_rename(pairs, on_conflict='skip', journal_dir=journal_dir, max_workers=max_workers)
+        for old_path, new_path, status in stats['results']:
+            if status == 'exists':
+                self.logger.error(f"Arquivo já existe: {new_path}")
+            elif status.startswith('error') or status == 'missing':
+                self.logger.error(f"Falha ao renomear {old_path}: {status}")
+        self.logger.info(
+            f"Renomeados {stats['renamed']} arquivos ({stats['files_per_second']} arquivos/s, "
+            f"diário {stats.get('run_id')})"
+        )
+        return stats
+
     def process_single_file(self, file_path: str, runtime_stats: Dict) -> Optional[BookMetadata]:
         """
         Processa um único arquivo extraindo metadados com tratamento especial para Casa do Código e Packt.
@@ -4834,6 +5084,27 @@ class BookMetadataExtractor:
             hint = hints.get(file_path, {})
             if hint:
                 preprocessor_stats['applied'] = preprocessor_stats.get('applied', 0) + 1
+                if hint.get('source') == 'local_catalog' and hint.get('title'):
+                    # Resolvido pelo nome do arquivo contra o catálogo local: não abre o arquivo
+                    isbn = hint.get('isbn') or ''
+                    metadata = BookMetadata(
+                        title=hint['title'],
+                        authors=hint.get('authors') or ['Unknown Author'],
+                        publisher=self.normalize_publisher(hint.get('publisher') or 'Unknown'),
+                        published_date=hint.get('published_date') or 'Unknown',
+                        isbn_13=isbn if len(isbn) == 13 else None,
+                        isbn_10=isbn if len(isbn) == 10 else None,
+                        confidence_score=hint.get('confidence', 0.0),
+                        source='local_catalog',
+                        file_path=str(file_path)
+                    )
+                    runtime_stats['successful_files'].append(file_path)
+                    preprocessor_stats['promoted'] = preprocessor_stats.get('promoted', 0) + 1
+                    try:
+                        self._add_publisher_stats(asdict(metadata), runtime_stats)
+                    except Exception:
+                        pass
+                    return metadata
                 fast_isbn = hint.get('isbn')
                 if fast_isbn:
                     runtime_stats['api_errors'].setdefault(file_path, [])
@@ -4856,14 +5127,9 @@ class BookMetadataExtractor:
 
             # Extrai texto baseado no tipo de arquivo
             if file_ext == 'pdf':
-                text, methods = self.pdf_processor.extract_text_from_pdf(file_path)
-                file_metadata = self.pdf_processor.extract_metadata_from_pdf(file_path)
+                text, methods, file_metadata, text_isbns = self._extract_local(file_path)
             elif file_ext in ('epub', 'mobi'):
-                if file_ext == 'epub':
-                    text, methods = self.ebook_processor.extract_text_from_epub(file_path)
-                else:
-                    text, methods = self.ebook_processor.extract_text_from_mobi(file_path)
-                file_metadata = self.ebook_processor.extract_metadata(file_path)
+                text, methods, file_metadata, text_isbns = self._extract_local(file_path)
 
                 # Se encontrou metadados válidos da Casa do Código, retorna imediatamente
                 if file_metadata and file_metadata.get('isbn', '').startswith('978855519'):
@@ -4915,8 +5181,8 @@ class BookMetadataExtractor:
                 }
                 return None
 
-            # Extrai ISBNs
-            isbns = self.isbn_extractor.extract_from_text(text, source_path=file_path)
+            # ISBNs encontrados no texto (já extraídos no estágio local)
+            isbns = set(text_isbns)
             if file_metadata and 'isbn' in file_metadata:
                 isbns.add(file_metadata['isbn'])
 
@@ -4973,6 +5239,15 @@ class BookMetadataExtractor:
             }
             return None
 
+        except SupervisedExtractionError as e:
+            runtime_stats['failure_details'][file_path] = {
+                'error': f"supervisor_{e.reason}",
+                'elapsed': round(e.elapsed, 2),
+                'peak_rss_mb': round(e.peak_rss / (1024 * 1024), 1),
+                'quarantined': True
+            }
+            self.logger.warning(f"Arquivo em quarentena ({e.reason}): {file_path}")
+            return None
         except Exception as e:
             runtime_stats['failure_details'][file_path] = {
                 'error': str(e),
@@ -4983,6 +5258,32 @@ class BookMetadataExtractor:
         finally:
             runtime_stats['processing_times'][file_path] = time.time() - start_time
 
+    def enable_supervision(self, max_workers: int = 4, timeout: float = 120.0,
+                           max_rss_mb: Optional[float] = 1536, recycle_every: int = 50) -> None:
+        """
+        Run the local extraction stage of each file in supervised worker processes.
+
+        Args:
+            max_workers: Concurrent worker processes
+            timeout: Wall-clock deadline per file, in seconds
+            max_rss_mb: Resident memory ceiling per worker, in MiB
+            recycle_every: Files served before a worker is replaced
+        """
+        self.extraction_supervisor = ExtractionSupervisor(
+            _supervised_local_metadata,
+            max_workers=max_workers,
+            timeout=timeout,
+            max_rss_mb=max_rss_mb,
+            recycle_every=recycle_every,
+            registry=self.poison_registry
+        )
+
+    def _extract_local(self, file_path: str) -> Tuple[str, List[str], Dict, List[str]]:
+        """Local extraction stage, supervised when enable_supervision() was called."""
+        if self.extraction_supervisor is not None:
+            return self.extraction_supervisor.run(file_path)
+        return extract_local_metadata(file_path, self.pdf_processor, self.ebook_processor, self.isbn_extractor)
+
     def _adjust_publisher_metadata(self, metadata: BookMetadata, file_path: str) -> BookMetadata:
         """Adjust metadata based on publisher-specific rules."""
         file_lower = file_path.lower()
@@ -5109,15 +5410,7 @@ class BookMetadataExtractor:
         successful_results = runtime_stats.get('successful_results', [])
         processed_files = runtime_stats.get('processed_files', [])
         preprocessor_stats = runtime_stats.get('preprocessor_stats', {}) or {}
-        preprocessed_hints = runtime_stats.get('preprocessed_hints', {}) or {}
-
-        hint_summary = {
-            'total_hints': len(preprocessed_hints),
-            'isbn_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('isbn')),
-            'title_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('title')),
-            'author_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('authors')),
-            'publisher_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('publisher')),
-        }
+        hint_summary = self._hint_summary(runtime_stats.get('preprocessed_hints', {}) or {})
         
         total_files = len(processed_files)
         successful = len(successful_results)
@@ -5160,8 +5453,18 @@ class BookMetadataExtractor:
                 'preprocessor_hint_summary': hint_summary
             }
         }
-
-    def _generate_html_report(self, data: Dict, output_file: Path):
+
+    @staticmethod
+    def _hint_summary(preprocessed_hints: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        return {
+            'total_hints': len(preprocessed_hints),
+            'isbn_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('isbn')),
+            'title_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('title')),
+            'author_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('authors')),
+            'publisher_hints': sum(1 for hint in preprocessed_hints.values() if hint.get('publisher')),
+        }
+
+    def _generate_html_report(self, data: Dict, output_file: Path):
         """
         Gera relatório HTML com visualizações e estatísticas detalhadas.
         Todo o template HTML está contido neste método para evitar dependências externas.
@@ -5327,6 +5630,8 @@ class BookMetadataExtractor:
             ('scanned', 'Files Scanned'),
             ('with_text', 'With Text Extracted'),
             ('filename_only', 'Filename Only Hints'),
+            ('filename_resolved', 'Resolved From Filename'),
+            ('cached', 'Reused From Cache'),
             ('isbn_hits', 'ISBN Hints'),
             ('applied', 'Hints Applied'),
             ('promoted', 'Hints Promoted')
@@ -5446,35 +5751,31 @@ class BookMetadataExtractor:
             self.logger.error(traceback.format_exc())
             raise
 
-    def suggest_filename(self, metadata: Dict) -> str:
+    def suggest_filename(self, metadata: Union[Dict, BookMetadata]) -> str:
         """
         Sugere nome de arquivo baseado nos metadados usando o padrão definido.
         
+        O padrão é compilado uma vez (naming.compile_template) e os campos
+        normalizados ficam em cache entre chamadas.
+        
         Args:
-            metadata: Dicionário com metadados do livro
+            metadata: Metadados do livro (dict ou BookMetadata)
             
         Returns:
             str: Nome de arquivo sugerido com extensão apropriada
         """
-        # Extrai e limpa os valores
-        title = self._clean_filename(metadata.get('title', 'Unknown Title'))[:50]
-        authors = normalize_authors(metadata.get('authors', ['Unknown Author']))
-        author = self._clean_filename(', '.join(authors[:2]))[:30]
-        year = metadata.get('published_date', 'Unknown').split('-')[0]
-        publisher = self._clean_filename(self.normalize_publisher(metadata.get('publisher', '')))
-        isbn = metadata.get('isbn_13') or metadata.get('isbn_10') or ''
-
-        # Gera nome base usando o padrão
-        base_name = self.file_naming_pattern.format(
-            title=title,
-            author=author,
-            year=year,
-            publisher=publisher,
-            isbn=isbn
-        )
-        
-        # Limpa o nome final
-        base_name = self._clean_filename(base_name)
+        if isinstance(metadata, BookMetadata):
+            metadata = asdict(metadata)
+        authors = normalize_authors(metadata.get('authors') or ['Unknown Author'])
+
+        # Título limitado a 50 e autores a 30 caracteres (estilo 'filesystem')
+        base_name = compile_template(self.file_naming_pattern, 'filesystem').render({
+            'title': metadata.get('title') or 'Unknown Title',
+            'author': ', '.join(authors[:2]),
+            'year': (metadata.get('published_date') or 'Unknown').split('-')[0],
+            'publisher': self.normalize_publisher(metadata.get('publisher', '')),
+            'isbn': metadata.get('isbn_13') or metadata.get('isbn_10') or '',
+        })
         
         # Gera nomes para múltiplos formatos se necessário
         if metadata.get('formats'):
@@ -5676,10 +5977,23 @@ class BookMetadataExtractor:
             self.logger.warning(f"No files found in {directory_path}")
             return []
 
+        if self.stream_reports:
+            self._report_stream = StreamingReportWriter(self.reports_dir, compact=self.compact_reports)
+        try:
+            self._results_run = self.results_store.start_run(config=runtime_stats['run_config'])
+        except sqlite3.Error as e:
+            self.logger.warning(f"Results store unavailable: {e}")
+            self._results_run = None
+
         self._run_preprocessor(file_groups, runtime_stats)
 
         # Process files with progress display
-        results = self._process_with_progress(file_groups, runtime_stats, max_workers)
+        try:
+            results = self._process_with_progress(file_groups, runtime_stats, max_workers)
+        finally:
+            if self.extraction_supervisor is not None:
+                runtime_stats['supervisor_stats'] = dict(self.extraction_supervisor.stats)
+                self.extraction_supervisor.shutdown()
 
         # Secondary recovery pass
         recovered_results = self.recovery_engine.recover_missing_metadata(runtime_stats)
@@ -5690,6 +6004,8 @@ class BookMetadataExtractor:
                 len(recovered_results)
             )
         
+        self._finish_results_run(runtime_stats)
+
         # Generate reports before printing summary
         try:
             self._generate_reports(runtime_stats)
@@ -5743,25 +6059,46 @@ class BookMetadataExtractor:
         return self.file_group.group_files([str(f) for f in all_files])
 
     def _run_preprocessor(self, file_groups: Dict[str, List[str]], runtime_stats: Dict) -> None:
-        """Execute the fast metadata preprocessor and persist its hints."""
+        """
+        Execute the cheap part of the fast preprocessor (filename lane and cached hints).
+
+        Files that still need a content scan are listed in runtime_stats['pending_hints'];
+        their scan runs on the scheduler workers right before each file is processed.
+        """
+        runtime_stats['preprocessed_hints'] = {}
+        runtime_stats['pending_hints'] = set()
+        runtime_stats['preprocessor_stats'] = FastMetadataPreprocessor.new_stats()
         if not file_groups:
-            runtime_stats['preprocessed_hints'] = {}
-            runtime_stats['preprocessor_stats'] = {'scanned': 0, 'with_text': 0, 'filename_only': 0, 'isbn_hits': 0, 'applied': 0, 'promoted': 0}
             return
 
         try:
-            hints, stats = self.fast_preprocessor.generate_hints(file_groups)
+            hints, pending, stats = self.fast_preprocessor.prepare(file_groups)
             runtime_stats['preprocessed_hints'] = hints
+            runtime_stats['pending_hints'] = set(pending)
             runtime_stats['preprocessor_stats'] = stats
             self.logger.info(
-                "Fast preprocessor generated hints for %d files (%d ISBN hits)",
+                "Fast preprocessor resolved %d files up front (%d ISBN hits, %d from cache); %d scanned on demand",
                 stats.get('scanned', 0),
-                stats.get('isbn_hits', 0)
+                stats.get('isbn_hits', 0),
+                stats.get('cached', 0),
+                len(pending)
             )
         except Exception as exc:
             self.logger.error(f"Fast preprocessor failed: {exc}")
-            runtime_stats['preprocessed_hints'] = {}
-            runtime_stats['preprocessor_stats'] = {'scanned': 0, 'with_text': 0, 'filename_only': 0, 'isbn_hits': 0, 'applied': 0, 'promoted': 0}
+
+    def _process_scheduled(self, file_path: str, runtime_stats: Dict) -> Optional[BookMetadata]:
+        """Completa a dica do arquivo (se pendente) no próprio worker e processa o arquivo."""
+        pending = runtime_stats.get('pending_hints')
+        if pending and file_path in pending:
+            pending.discard(file_path)
+            hints = runtime_stats['preprocessed_hints']
+            try:
+                hints[file_path] = self.fast_preprocessor.scan_file(
+                    file_path, hints.get(file_path, {}), runtime_stats['preprocessor_stats']
+                )
+            except Exception as exc:
+                self.logger.debug("Fast scan failed for %s: %s", file_path, exc)
+        return self.process_single_file(file_path, runtime_stats)
 
     def _process_with_progress(self, file_groups: Dict[str, List[str]], 
                              runtime_stats: Dict, max_workers: int) -> List[BookMetadata]:
@@ -5776,6 +6113,17 @@ class BookMetadataExtractor:
         Returns:
             List of successfully processed BookMetadata objects
         """
+        # Custo estimado só por stat e nome (PDFs são sondados no worker):
+        # baratos/com ISBN primeiro, pesados em faixa própria
+        hints = runtime_stats.get('preprocessed_hints', {})
+        # ISBNs já conhecidos pelas dicas: uma só consulta ao catálogo offline para o lote
+        self.metadata_fetcher.prefetch_offline_catalog(hint.get('isbn') for hint in hints.values())
+        scheduled = [
+            estimate_cost(best_source, hint=hints.get(best_source), deferred=deferred, payload=group_files)
+            for best_source, group_files, deferred in self._quarantine_lanes(file_groups, runtime_stats)
+            if best_source
+        ]
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -5785,97 +6133,124 @@ class BookMetadataExtractor:
             transient=True
         ) as progress:
             task = progress.add_task(
-                f"Processing {len(file_groups)} files...",
-                total=len(file_groups)
+                f"Processing {len(scheduled)} files...",
+                total=len(scheduled)
             )
 
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = []
-
-                # Submit all tasks
-                for base_name, group_files in file_groups.items():
-                    best_source = self.file_group.find_best_isbn_source(group_files)
-                    if best_source:
-                        future = executor.submit(
-                            self.process_single_file,
-                            best_source,
-                            runtime_stats
-                        )
-                        futures.append((future, group_files))
+            scheduler = ScanScheduler(max_workers=max_workers, heavy_workers=1)
+            pending = scheduler.submit(
+                scheduled,
+                lambda item: self._process_scheduled(item.path, runtime_stats)
+            )
 
-                # Process results
-                processed_count = 0
-                for future, group_files in futures:
+            try:
+                # Process results as they complete
+                for future in as_completed(pending):
+                    group_files = pending[future].payload
+                    file_path = pending[future].path
                     try:
                         metadata = future.result()
                         if metadata:
                             runtime_stats['successful_results'].append(metadata)
                             ext = Path(group_files[0]).suffix.lower()[1:]
                             runtime_stats['format_stats'][ext]['success'] += 1
+                            self._record_outcome(file_path, metadata, runtime_stats)
                         else:
                             ext = Path(group_files[0]).suffix.lower()[1:]
                             runtime_stats['format_stats'][ext]['failed'] += 1
+                            self._record_outcome(
+                                file_path, None, runtime_stats, runtime_stats['failure_details'].get(file_path)
+                            )
                     except Exception as e:
                         self.logger.debug(f"Error processing {group_files[0]}: {str(e)}")
+                        self._record_outcome(
+                            file_path, None, runtime_stats, {'error': 'processing_error', 'details': str(e)}
+                        )
                     finally:
                         progress.advance(task)
-                        processed_count += 1
-                        # Exporta métricas vivas a cada 3 arquivos processados
-                        if processed_count % 3 == 0:
-                            try:
-                                self._export_live_stats()
-                            except Exception:
-                                pass
-
+                        # Publicação limitada por tempo (live_publisher.min_interval), não por contagem
+                        self._export_live_stats()
+            finally:
+                scheduler.shutdown()
+                self._export_live_stats(final=True)
+            runtime_stats['scheduler_stats'] = dict(
+                scheduler.stats,
+                heavy_files=sum(1 for item in scheduled if item.heavy)
+            )
+
         return runtime_stats['successful_results']
 
-    def _export_live_stats(self):
-        """Exporta métricas agregadas para uso no Streamlit (reports/live_api_stats.json)."""
-        try:
-            stats = self.metrics.get_overall_stats()
-            total_all = 0
-            success_all = 0
-            per_api = {}
-            for api, s in stats.items():
-                if not s:
-                    continue
-                total = int(s.get('total_calls', 0))
-                success = int(s.get('success_count', round((s.get('success_rate', 0)/100)*total)))
-                per_api[api] = {
-                    'total': total,
-                    'success': success,
-                    'success_rate': float(s.get('success_rate', 0.0)),
-                    'avg_time': float(s.get('avg_response_time', 0.0)),
-                    'errors': s.get('error_types', {}),
-                    'recent_errors': s.get('recent_errors', []),
-                    'recent_failures': s.get('recent_failures', []),
+    def _quarantine_lanes(self, file_groups: Dict[str, List[str]],
+                          runtime_stats: Dict) -> List[Tuple[Optional[str], List[str], bool]]:
+        """
+        Pick the source file of each group and flag quarantined ones.
+        
+        Files killed `max_quarantine_strikes` times (same size/mtime) are skipped.
+        
+        Returns:
+            List of (best source file, group files, deferred) tuples
+        """
+        regular, deferred = [], []
+        for group_files in file_groups.values():
+            best_source = self.file_group.find_best_isbn_source(group_files)
+            strikes = self.poison_registry.strikes(best_source) if best_source else 0
+            if strikes >= self.max_quarantine_strikes:
+                runtime_stats['failure_details'][best_source] = {
+                    'error': 'quarantined',
+                    'strikes': strikes,
+                    'quarantined': True
                 }
-                total_all += total
-                success_all += success
-            disabled = [api for api, cfg in self.API_CONFIGS.items() if not cfg.get('enabled', True)]
-            # Circuit detail (tempo restante)
-            now_ts = time.time()
-            open_circuits = [api for api, until in self._api_circuit_until.items() if now_ts < until]
-            circuits_detail = {api: max(0.0, self._api_circuit_until.get(api, 0) - now_ts) for api in open_circuits}
-            payload = {
-                'timestamp': time.time(),
-                'overall': {
-                    'total': total_all,
-                    'success': success_all,
-                    'success_rate': (success_all/total_all*100) if total_all else 0.0,
-                },
-                'per_api': per_api,
-                'disabled_apis': disabled,
-                'open_circuits': sorted(open_circuits),
-                'open_circuits_detail': circuits_detail,
-            }
-            reports = Path('reports')
-            reports.mkdir(exist_ok=True)
-            out = reports / 'live_api_stats.json'
-            with open(out, 'w', encoding='utf-8') as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
+                ext = Path(best_source).suffix.lower()[1:]
+                runtime_stats['format_stats'][ext]['failed'] += 1
+                continue
+            (deferred if strikes else regular).append((best_source, group_files, bool(strikes)))
+        if deferred:
+            self.logger.info(f"{len(deferred)} arquivo(s) em quarentena adiados para o fim da fila")
+        return regular + deferred
+
+    def _export_live_stats(self, final: bool = False):
+        """
+        Publica métricas agregadas para o Streamlit no anel reports/live_api_stats.ring.
+
+        Fora do final da varredura, publica no máximo uma vez por live_publisher.min_interval;
+        o anel é o único canal ao vivo. O retrato reports/live_api_stats.json e o
+        reports/api_metrics.prom são gravados apenas no final (final=True).
+        """
+        try:
+            if not final:
+                self.live_publisher.maybe_publish(self._live_stats_payload)
+                return
+            payload = self._live_stats_payload()
+            self.live_publisher.publish(payload)
+            self.reports_dir.mkdir(exist_ok=True)
+            out = self.reports_dir / 'live_api_stats.json'
+            tmp = out.with_name(out.name + '.tmp')
+            tmp.write_text(json.dumps(payload, ensure_ascii=False, default=str), encoding='utf-8')
+            os.replace(tmp, out)
+            self._write_prometheus_metrics()
         except Exception as e:
             self.logger.debug(f"live stats export failed: {e}")
+
+    def _write_prometheus_metrics(self):
+        """Grava reports/api_metrics.prom (textfile para coleta local), com troca atômica."""
+        out = self.reports_dir / 'api_metrics.prom'
+        tmp = out.with_name(out.name + '.tmp')
+        tmp.write_text(self.metadata_fetcher.metrics.to_prometheus(), encoding='utf-8')
+        os.replace(tmp, out)
+
+    def _live_stats_payload(self) -> Dict:
+        """Agregados correntes das APIs (O(nº de APIs)) com estado dos circuitos."""
+        fetcher = self.metadata_fetcher
+        payload = fetcher.metrics.live_snapshot()
+        now_ts = time.time()
+        open_circuits = sorted(api for api, until in fetcher._api_circuit_until.items() if now_ts < until)
+        payload.update({
+            'timestamp': now_ts,
+            'disabled_apis': [api for api, cfg in fetcher.API_CONFIGS.items() if not cfg.get('enabled', True)],
+            'open_circuits': open_circuits,
+            'open_circuits_detail': {api: max(0.0, fetcher._api_circuit_until[api] - now_ts) for api in open_circuits},
+        })
+        return payload
 
     def _print_summary(self, runtime_stats: Dict):
         """
@@ -6845,6 +7220,10 @@ class BookMetadataExtractor:
             self.logger.error("Invalid runtime_stats data")
             return
 
+        if self._report_stream is not None:
+            self._finish_report_stream(runtime_stats)
+            return
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         try:
@@ -6878,9 +7257,19 @@ class BookMetadataExtractor:
                 "successful_extractions": report_data['details']['successful'],
                 "failed_extractions": runtime_stats['failure_details']
             }
-            
+            if self.compact_reports:
+                # Sem dicas por arquivo nem amostras de texto das falhas
+                del json_data["preprocessor_hints"]
+                json_data["failed_extractions"] = {
+                    path: {k: v for k, v in details.items() if k != 'text_sample'}
+                    for path, details in runtime_stats['failure_details'].items()
+                }
+
             with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
+                if self.compact_reports:
+                    json.dump(json_data, f, ensure_ascii=False, separators=(',', ':'))
+                else:
+                    json.dump(json_data, f, indent=2, ensure_ascii=False)
                 
             # Move log file to reports directory
             log_file = Path("book_metadata.log")
@@ -6906,6 +7295,82 @@ class BookMetadataExtractor:
             self.logger.error(f"Error generating reports: {str(e)}")
             self.logger.error(traceback.format_exc())
 
+    def _record_outcome(self, file_path: str, metadata: Optional[BookMetadata], runtime_stats: Dict,
+                        failure: Optional[Dict] = None) -> None:
+        """Registra o resultado de um arquivo nos relatórios incrementais e na tabela de resultados."""
+        if self._report_stream is not None:
+            if metadata:
+                self._report_stream.record_success(metadata)
+            else:
+                self._report_stream.record_failure(file_path, failure)
+        if self._results_run is not None:
+            elapsed = runtime_stats['processing_times'].get(file_path)
+            try:
+                if metadata:
+                    self.results_store.record_success(self._results_run, metadata, elapsed=elapsed)
+                else:
+                    self.results_store.record_failure(
+                        self._results_run, file_path, (failure or {}).get('error'), elapsed=elapsed
+                    )
+            except sqlite3.Error as e:
+                self.logger.debug(f"Results store write failed for {file_path}: {e}")
+
+    def _finish_results_run(self, runtime_stats: Dict) -> None:
+        """Grava as recuperações da segunda passada e fecha a partição da execução."""
+        run_id, self._results_run = self._results_run, None
+        if run_id is None:
+            return
+        try:
+            for metadata in runtime_stats.get('recovery_results', []) or []:
+                self.results_store.record_success(run_id, metadata, status='recovered')
+            self.results_store.finish_run(run_id, {
+                'total_files': len(runtime_stats.get('processed_files', [])),
+                'successful': len(runtime_stats.get('successful_results', [])),
+                'recovered': len(runtime_stats.get('recovery_results', []) or []),
+                'elapsed_seconds': round(time.time() - runtime_stats.get('start_time', time.time()), 1),
+            })
+            runtime_stats['results_run'] = run_id
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not finalize results run {run_id}: {e}")
+
+    def _finish_report_stream(self, runtime_stats: Dict) -> None:
+        """Fecha os relatórios incrementais: recuperações da segunda passada e agregados finais."""
+        writer, self._report_stream = self._report_stream, None
+        try:
+            for metadata in runtime_stats.get('recovery_results', []) or []:
+                writer.record_success(metadata, status='recovered')
+            processing_times = list(runtime_stats.get('processing_times', {}).values())
+            writer.close({
+                'total_files': len(runtime_stats.get('processed_files', [])),
+                'average_time': round(statistics.mean(processing_times), 3) if processing_times else 0.0,
+                'elapsed_seconds': round(time.time() - runtime_stats.get('start_time', time.time()), 1),
+                'format_stats': {fmt: dict(stats) for fmt, stats in runtime_stats.get('format_stats', {}).items()},
+                'preprocessor_stats': runtime_stats.get('preprocessor_stats', {}),
+                'preprocessor_hint_summary': self._hint_summary(runtime_stats.get('preprocessed_hints', {}) or {}),
+                'scheduler_stats': runtime_stats.get('scheduler_stats', {}),
+                'run_config': runtime_stats.get('run_config', {}),
+            })
+
+            log_path = self.reports_dir / f"report_{writer.timestamp}_metadata.log"
+            log_file = Path("book_metadata.log")
+            if log_file.exists():
+                shutil.move(log_file, log_path)
+
+            runtime_stats['generated_reports'] = [
+                {'type': 'HTML', 'path': str(writer.html_path)},
+                {'type': 'JSONL', 'path': str(writer.jsonl_path)},
+                {'type': 'LOG', 'path': str(log_path)}
+            ]
+            self.logger.info(f"Streaming reports finalized in {self.reports_dir}")
+            print("\nArquivos Gerados:")
+            print("-" * 40)
+            print(f"HTML  {writer.html_path}")
+            print(f"JSONL {writer.jsonl_path}")
+            print(f"LOG   {log_path}")
+        except Exception as e:
+            self.logger.error(f"Error finalizing streaming reports: {str(e)}")
+            self.logger.error(traceback.format_exc())
+
     def _init_logging(self):
         """Initialize logging configuration."""
         self.logger = logging.getLogger('book_metadata_extractor')  # Use o nome específico da classe
@@ -7254,64 +7719,6 @@ class BookMetadataExtractor:
             """)
         return '\n'.join(rows)
 
-    def suggest_filename(self, metadata: BookMetadata) -> str:
-            """
-            Sugere um nome de arquivo baseado nos metadados do livro.
-            
-            Args:
-                metadata: Objeto BookMetadata contendo os metadados do livro
-                
-            Returns:
-                String com o nome de arquivo sugerido, incluindo extensão
-                
-            O nome do arquivo é gerado seguindo o padrão:
-            titulo-autores-ano.extensao
-            
-            Onde:
-            - título é limitado a 50 caracteres
-            - autores são os dois primeiros autores separados por vírgula
-            - ano é extraído da data de publicação
-            - extensão é mantida do arquivo original
-            """
-            def clean_string(s: str) -> str:
-                """Limpa uma string para uso em nome de arquivo."""
-                # Normaliza caracteres Unicode
-                s = unicodedata.normalize('NFKD', s)
-                # Remove caracteres acentuados
-                s = s.encode('ASCII', 'ignore').decode('ASCII')
-                # Mantém apenas caracteres alfanuméricos e alguns separadores
-                s = re.sub(r'[^\w\s-]', '', s)
-                # Substitui espaços por underscores e remove espaços extras
-                return s.strip().replace(' ', '_')
-            
-            # Limpa e limita o título
-            title = clean_string(metadata.title)
-            max_title_length = 50
-            if len(title) > max_title_length:
-                # Se precisar truncar, tenta não cortar no meio de uma palavra
-                title = title[:max_title_length].rsplit('_', 1)[0] + '...'
-            
-            # Pega no máximo os dois primeiros autores
-            authors = clean_string(', '.join(normalize_authors(metadata.authors)[:2]))
-            
-            # Extrai o ano da data de publicação
-            if metadata.published_date and '-' in metadata.published_date:
-                year = metadata.published_date.split('-')[0]
-            else:
-                year = metadata.published_date or 'unknown_year'
-            
-            # Monta o nome base do arquivo
-            base_name = f"{title}-{authors}-{year}"
-
-            # Se o livro tem múltiplos formatos
-            if hasattr(metadata, 'formats') and metadata.formats:
-                # Retorna um dicionário com um nome para cada formato
-                return {fmt: f"{base_name}.{fmt}" for fmt in metadata.formats}
-            
-            # Se não, usa a extensão do arquivo original
-            ext = Path(metadata.file_path).suffix.lower()[1:]
-            return f"{base_name}.{ext}"
-
 class APIRateLimiter:
     def __init__(self):
         self.last_calls = defaultdict(float)
@@ -7638,20 +8045,23 @@ class ErrorHandler:
         }
 
 class MetricsCollector:
-    """Coleta e análise de métricas."""
-    def __init__(self):
+    """
+    Coleta e análise de métricas.
+
+    Chamadas ficam em janelas de memória fixa por API (baldes de bucket_seconds
+    cobrindo window segundos); taxa de sucesso e tempo médio saem em O(1).
+    A janela é a única fonte: o painel ao vivo (live_snapshot), get_api_stats e
+    o texto Prometheus são vistas dela.
+    """
+    def __init__(self, window: float = 3600.0, bucket_seconds: float = 60.0):
         self._init_logging()
-        self.metrics = defaultdict(list)
+        self.metrics = WindowedMetrics(window=window, bucket_seconds=bucket_seconds)
         self.errors = defaultdict(Counter)
         self.recent = defaultdict(list)    # api_name -> [{'type': str, 'ts': float}]
-        self.failures = defaultdict(list)  # api_name -> [{'type': str, 'status': int|None, 'msg': str, 'isbn': str|None, 'ts': float}]
+        self.failures = defaultdict(list)  # api_name -> [{'type': str, 'status': int|None, 'msg': str, 'isbn': str|None, 'ts': float}]
         
     def add_metric(self, api_name: str, response_time: float, success: bool):
-        self.metrics[api_name].append({
-            'timestamp': time.time(),
-            'response_time': response_time,
-            'success': success
-        })
+        self.metrics.add(api_name, response_time, success)
 
     def _init_logging(self):
         """Initialize logging configuration."""
@@ -7711,26 +8121,54 @@ class MetricsCollector:
             pass
         
     def get_api_stats(self, api_name: str) -> Dict:
-        """Retorna estatísticas para uma API."""
-        if api_name not in self.metrics:
+        """Retorna estatísticas da janela corrente para uma API."""
+        stats = self.metrics.stats(api_name)
+        if not stats:
             return {}
-            
-        metrics = self.metrics[api_name]
-        recent_metrics = [m for m in metrics if time.time() - m['timestamp'] < 3600]
-        
-        if not recent_metrics:
-            return {}
-            
-        success_count = sum(1 for m in recent_metrics if m['success'])
-        
-        return {
-            'total_calls': len(recent_metrics),
-            'success_count': success_count,
-            'success_rate': (success_count / len(recent_metrics)) * 100,
-            'avg_response_time': statistics.mean(m['response_time'] for m in recent_metrics),
+        stats.update({
             'error_types': dict(self.errors[api_name]),
             'recent_errors': list(self.recent.get(api_name, [])),
             'recent_failures': list(self.failures.get(api_name, []))
+        })
+        return stats
+
+    def get_latency_percentiles(self, api_name: str) -> Dict[str, float]:
+        """p50/p95/p99 da latência na janela (funde os sketches dos baldes)."""
+        return {f"p{int(q * 100)}": value for q, value in self.metrics.quantiles(api_name).items()}
+
+    def to_prometheus(self) -> str:
+        """Métricas da janela no formato texto do Prometheus."""
+        return prometheus_text(self.metrics, {api: dict(counts) for api, counts in self.errors.items()})
+
+    def live_snapshot(self) -> Dict:
+        """Agregados da janela por API e no total, no formato publicado no anel do dashboard."""
+        per_api = {}
+        for api_name in self.metrics:
+            stats = self.get_api_stats(api_name)
+            if not stats:
+                continue
+            percentiles = self.get_latency_percentiles(api_name)
+            per_api[api_name] = {
+                'total': stats['total_calls'],
+                'success': stats['success_count'],
+                'success_rate': stats['success_rate'],
+                'avg_time': round(stats['avg_response_time'], 4),
+                'p50': round(percentiles.get('p50', 0.0), 4),
+                'p95': round(percentiles.get('p95', 0.0), 4),
+                'p99': round(percentiles.get('p99', 0.0), 4),
+                'errors': stats['error_types'],
+                'recent_errors': stats['recent_errors'],
+                'recent_failures': stats['recent_failures'],
+            }
+        total = sum(stats['total'] for stats in per_api.values())
+        success = sum(stats['success'] for stats in per_api.values())
+        return {
+            'overall': {
+                'total': total,
+                'success': success,
+                'success_rate': (success / total * 100) if total else 0.0,
+            },
+            'per_api': per_api,
         }
         
     def get_overall_stats(self) -> Dict:
@@ -7743,11 +8181,12 @@ class MetricsCollector:
 class EbookProcessor:
     """Enhanced processor for ebook files (EPUB and MOBI) with working implementation from isbn_diagnostic."""
     
+    # PalmDOC text records decompressed when EXTH has no ISBN
+    MOBI_TEXT_RECORDS = 4
+    
     def __init__(self):
         """Initialize the ebook processor with logging support."""
         self._init_logging()
-        self._ebooklib_missing_logged = False
-        self._bs4_missing_logged = False
         
         # ISBN patterns ordered by reliability and specificity
         self.isbn_patterns = [
@@ -7779,6 +8218,11 @@ class EbookProcessor:
             r'97[89](?:[- ]?\d){10}',
             r'\d{9}[\dXx]'
         ]
+        self._compiled_isbn_patterns = [
+            re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in self.isbn_patterns
+        ]
+        self._isbn_context_pattern = re.compile(r'ISBN|97[89]|Casa do Código', re.IGNORECASE)
+        self._copyright_pattern = re.compile(r'(?:Copyright|\u00A9|©).{0,500}', re.IGNORECASE | re.DOTALL)
         
         # Add publisher identifier prefixes
         self.publisher_prefixes = {
@@ -7831,97 +8275,76 @@ class EbookProcessor:
         """
         Extract text content from EPUB files with enhanced ISBN detection and logging.
 
+        Reads the zip directly: the OPF package (shared with the metadata
+        extractors) first, then copyright/front-matter documents in spine
+        order plus the last few, stopping as soon as a valid ISBN is found.
+
         Args:
             epub_path: Path to the EPUB file
 
         Returns:
             Tuple containing extracted text and list of methods attempted
         """
-        if epub is None or ITEM_DOCUMENT is None:
-            if not self._ebooklib_missing_logged:
-                self.logger.warning(
-                    "Dependência opcional 'ebooklib' não encontrada. Extração de texto EPUB será ignorada."
-                )
-                self._ebooklib_missing_logged = True
-            return "", []
-
-        if BeautifulSoup is None:
-            if not self._bs4_missing_logged:
-                self.logger.warning(
-                    "Dependência opcional 'beautifulsoup4' não encontrada. Extração de texto EPUB será ignorada."
-                )
-                self._bs4_missing_logged = True
-            return "", []
-
-        methods_tried = ["ebooklib"]
+        methods_tried = ["epub-stream"]
         text_sections = []
         found_isbns = set()
 
         self.logger.info(f"Processing EPUB file: {epub_path}")
-        
+
         try:
-            book = epub.read_epub(epub_path)
-            
-            # Log metadata availability
+            package = read_epub_package(epub_path)
+
+            # Dublin Core identifiers answer most books without reading content
             self.logger.debug("Checking Dublin Core metadata...")
-            dc_identifiers = book.get_metadata('DC', 'identifier')
-            if dc_identifiers:
-                self.logger.debug(f"Found {len(dc_identifiers)} DC identifiers")
-                
-                for ident in dc_identifiers:
-                    self.logger.debug(f"Processing identifier: {ident}")
-                    isbn_match = re.search(r'(?:97[89]\d{10})|(?:\d{9}[\dXx])', str(ident[0]))
-                    if isbn_match:
-                        isbn = isbn_match.group(0)
-                        found_isbns.add(isbn)
-                        text_sections.append(f"ISBN: {isbn}")
-                        self.logger.info(f"Found ISBN in DC metadata: {isbn}")
-
-            # Process document items
+            for isbn in package.isbns:
+                found_isbns.add(isbn)
+                text_sections.append(f"ISBN: {isbn}")
+                self.logger.info(f"Found ISBN in DC metadata: {isbn}")
+            if found_isbns:
+                return "\n\n".join(text_sections), methods_tried
+
+            # Process front-matter documents until a valid ISBN shows up
             self.logger.debug("Processing EPUB content...")
             items_processed = 0
-            for item in book.get_items():
-                if item.get_type() == ITEM_DOCUMENT:
-                    items_processed += 1
-                    try:
-                        content = item.get_content().decode('utf-8', errors='ignore')
-                        soup = BeautifulSoup(content, 'html.parser')
-                        text = soup.get_text()
-                        
-                        # Log content length for debugging
-                        self.logger.debug(f"Processing item {items_processed}: {len(text)} characters")
-                        
-                        # Look for ISBNs using all patterns
-                        for pattern in self.isbn_patterns:
-                            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-                            for match in matches:
-                                # Extract and clean ISBN
-                                isbn_raw = match.group(1) if match.groups() else match.group(0)
-                                isbn = re.sub(r'[^0-9X]', '', isbn_raw.upper())
-                                
-                                # Validate ISBN format
-                                if len(isbn) == 13 and isbn.startswith(('978', '979')):
-                                    found_isbns.add(isbn)
-                                    text_sections.append(f"ISBN: {isbn}")
-                                    self.logger.info(f"Found ISBN-13 in content: {isbn}")
-                                elif len(isbn) == 10:
-                                    found_isbns.add(isbn)
-                                    text_sections.append(f"ISBN: {isbn}")
-                                    self.logger.info(f"Found ISBN-10 in content: {isbn}")
-                        
-                        # Add context for ISBN sections
-                        if re.search(r'ISBN|97[89]|Casa do Código', text, re.IGNORECASE):
-                            self.logger.debug("Found ISBN-related content, adding context")
-                            text_sections.insert(0, text)
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error processing item {items_processed}: {str(e)}")
-                        continue
+            for href, text in iter_epub_documents(package):
+                items_processed += 1
+                valid_isbn_found = False
+
+                # Log content length for debugging
+                self.logger.debug(f"Processing item {items_processed} ({href}): {len(text)} characters")
+
+                # Look for ISBNs using all patterns
+                for pattern in self._compiled_isbn_patterns:
+                    for match in pattern.finditer(text):
+                        # Extract and clean ISBN
+                        isbn_raw = match.group(1) if match.groups() else match.group(0)
+                        isbn = re.sub(r'[^0-9X]', '', isbn_raw.upper())
+
+                        # Validate ISBN format
+                        if len(isbn) == 13 and isbn.startswith(('978', '979')):
+                            found_isbns.add(isbn)
+                            text_sections.append(f"ISBN: {isbn}")
+                            self.logger.info(f"Found ISBN-13 in content: {isbn}")
+                        elif len(isbn) == 10:
+                            found_isbns.add(isbn)
+                            text_sections.append(f"ISBN: {isbn}")
+                            self.logger.info(f"Found ISBN-10 in content: {isbn}")
+                        else:
+                            continue
+                        valid_isbn_found = valid_isbn_found or is_valid_isbn(isbn)
+
+                # Add context for ISBN sections
+                if self._isbn_context_pattern.search(text):
+                    self.logger.debug("Found ISBN-related content, adding context")
+                    text_sections.insert(0, text)
+
+                if valid_isbn_found:
+                    break
 
             # Final logging
             self.logger.info(f"Processed {items_processed} items")
             self.logger.info(f"Found {len(found_isbns)} unique ISBNs: {sorted(found_isbns)}")
-            
+
             if not found_isbns:
                 self.logger.warning(f"No ISBNs found in {epub_path}")
                 # Log a sample of the content for debugging
@@ -7930,7 +8353,7 @@ class EbookProcessor:
                     self.logger.debug(f"Content sample: {sample}")
 
             return "\n\n".join(text_sections), methods_tried
-            
+
         except Exception as e:
             self.logger.error(f"EPUB extraction error in {epub_path}: {str(e)}")
             self.logger.error(traceback.format_exc())
@@ -7972,43 +8395,40 @@ class EbookProcessor:
         return main_title
 
     def extract_text_from_mobi(self, mobi_path: str) -> Tuple[str, List[str]]:
-        """Extract text content from MOBI files."""
-        methods_tried = ["mobi-raw"]
+        """
+        Extract text content from MOBI/AZW files.
+
+        The PalmDB/MOBI/EXTH headers are read through mmap (ISBN, title,
+        author, publisher, date) without decoding the book body; only when
+        EXTH carries no ISBN are the first PalmDOC text records decompressed
+        to look for the copyright section.
+        """
+        methods_tried = ["mobi-header"]
         text_sections = []
 
         try:
-            with open(mobi_path, 'rb') as file:
-                # Tenta múltiplos encodings comuns em MOBIs
-                for encoding in ['utf-8', 'cp1252', 'latin1', 'iso-8859-1']:
-                    try:
-                        content = file.read().decode(encoding, errors='ignore')
-                        file.seek(0)  # Reset para próxima tentativa
-                        
-                        # Procura primeiro por seção de copyright que geralmente tem ISBN
-                        copyright_match = re.search(
-                            r'(?:Copyright|\u00A9|©).{0,500}?(?=\n\n|\Z)',
-                            content,
-                            re.IGNORECASE | re.DOTALL
-                        )
-                        if copyright_match:
-                            text_sections.append(copyright_match.group(0))
-                            break
-                    except:
-                        continue
+            header = read_mobi_header(mobi_path)
+            if header.isbn:
+                text_sections.append(f"ISBN: {header.isbn}")
+            for label, value in (
+                ("Title", header.title),
+                ("Author", ", ".join(header.authors)),
+                ("Publisher", header.publisher),
+                ("Published", header.published_date),
+            ):
+                if value:
+                    text_sections.append(f"{label}: {value}")
 
-            # Processamento existente como fallback
-            if not text_sections:
-                methods_tried.append("mobi-structured")
-                try:
-                    book = mobi.Mobi(file)
-                    book.parse()
-                    if hasattr(book, 'book_header'):
-                        if hasattr(book.book_header, 'title'):
-                            text_sections.append(
-                                book.book_header.title.decode('utf-8', errors='ignore')
-                            )
-                except:
-                    pass
+            if not header.isbn:
+                methods_tried.append("mobi-palmdoc")
+                content = strip_tags(read_mobi_text(mobi_path, max_records=self.MOBI_TEXT_RECORDS))
+                
+                # Procura primeiro por seção de copyright que geralmente tem ISBN
+                copyright_match = self._copyright_pattern.search(content)
+                if copyright_match:
+                    text_sections.append(copyright_match.group(0))
+                elif content:
+                    text_sections.append(content)
 
         except Exception as e:
             self.logger.error(f"MOBI extraction failed for {mobi_path}: {str(e)}")
@@ -8068,33 +8488,16 @@ class EbookProcessor:
         
         try:
             if ext == '.epub':
-                if epub is None:
-                    if not self._ebooklib_missing_logged:
-                        self.logger.warning(
-                            "Dependência opcional 'ebooklib' não encontrada. Extração de metadados EPUB será ignorada."
-                        )
-                        self._ebooklib_missing_logged = True
-                    return metadata
-
-                if BeautifulSoup is None:
-                    if not self._bs4_missing_logged:
-                        self.logger.warning(
-                            "Dependência opcional 'beautifulsoup4' não encontrada. Extração de metadados EPUB será ignorada."
-                        )
-                        self._bs4_missing_logged = True
-                    return metadata
+                package = read_epub_package(file_path)
 
-                book = epub.read_epub(file_path)
-                
                 # Extract Dublin Core metadata first
                 self.logger.debug("Checking Dublin Core metadata...")
-                
+
                 # Get all DC metadata
                 dc_metadata_found = False
                 for field in ['title', 'creator', 'publisher', 'date', 'identifier']:
-                    field_data = book.get_metadata('DC', field)
-                    if field_data:
-                        value = str(field_data[0][0])
+                    value = package.first(field)
+                    if value:
                         if field == 'identifier':
                             isbn_match = re.search(
                                 r'(?:97[89]\d{10})|(?:\d{9}[\dXx])',
@@ -8108,7 +8511,7 @@ class EbookProcessor:
                             # Aplica a normalização aqui
                             metadata[field] = self._normalize_text(value)
                             self.logger.debug(f"Found {field}: {metadata[field]}")
-                
+
                 # If no ISBN in DC metadata, try content scanning
                 if 'isbn' not in metadata:
                     self.logger.debug("No ISBN in DC metadata, scanning content...")
@@ -8191,9 +8594,19 @@ class EbookProcessor:
                 self.logger.warning(f"Incomplete metadata found in {file_path}: {metadata}")
                 return metadata  # Return partial metadata instead of empty dict
                 
-            elif ext == '.mobi':
-                # [MOBI processing code remains the same]
-                pass
+            elif ext in ('.mobi', '.azw', '.azw3'):
+                header = read_mobi_header(file_path)
+                if header.title:
+                    metadata['title'] = self._normalize_text(header.title)
+                if header.authors:
+                    metadata['creator'] = self._normalize_text(', '.join(header.authors))
+                if header.publisher:
+                    metadata['publisher'] = self._normalize_text(header.publisher)
+                if header.published_date:
+                    metadata['date'] = header.published_date
+                if header.isbn:
+                    metadata['isbn'] = header.isbn
+                    self.logger.info(f"Found ISBN in EXTH header: {header.isbn}")
                 
         except Exception as e:
             self.logger.error(f"Metadata extraction failed for {file_path}: {str(e)}")
@@ -8728,6 +9141,31 @@ def main():
                        type=int,
                        default=4,
                        help='Número de threads para processamento (padrão: %(default)s)')
+    parser.add_argument('--ocr-workers',
+                       type=int,
+                       default=2,
+                       help='Processos dedicados ao OCR de PDFs escaneados (padrão: %(default)s)')
+    parser.add_argument('--supervised',
+                       action='store_true',
+                       help='Extrai cada arquivo em processos supervisionados (prazo, memória, quarentena)')
+    parser.add_argument('--file-timeout',
+                       type=float,
+                       default=120.0,
+                       help='Prazo por arquivo no modo supervisionado, em segundos (padrão: %(default)s)')
+    parser.add_argument('--max-rss-mb',
+                       type=float,
+                       default=1536,
+                       help='Memória máxima por worker no modo supervisionado, em MiB (padrão: %(default)s)')
+    parser.add_argument('--recycle-every',
+                       type=int,
+                       default=50,
+                       help='Arquivos por worker antes de reciclá-lo (padrão: %(default)s)')
+    parser.add_argument('--stream-reports',
+                       action='store_true',
+                       help='Escreve relatórios JSONL/HTML incrementais durante a varredura (bibliotecas grandes)')
+    parser.add_argument('--compact-reports',
+                       action='store_true',
+                       help='Relatórios compactos: sem amostras de texto das falhas nem dicas por arquivo')
     parser.add_argument('--limit',
                        type=int,
                        default=0,
@@ -8742,6 +9180,20 @@ def main():
     parser.add_argument('--update-cache',
                        action='store_true',
                        help='Atualiza registros com baixa confiança')
+    parser.add_argument('--calibrate-pdf-backends',
+                       type=int,
+                       nargs='?',
+                       const=20,
+                       default=None,
+                       metavar='N',
+                       help='Mede velocidade e taxa de ISBN dos backends de PDF em N arquivos e salva a ordem (padrão: 20)')
+    parser.add_argument('--import-catalog',
+                       metavar='DUMP',
+                       help='Importa um dump de catálogo (OpenLibrary TSV, JSONL ou TSV com cabeçalho; aceita .gz) '
+                            'para o catálogo offline consultado antes das APIs')
+    parser.add_argument('--catalog-format',
+                       choices=['openlibrary', 'jsonl', 'tsv'],
+                       help='Formato do dump de --import-catalog (detectado pela extensão/conteúdo se omitido)')
     parser.add_argument('--confidence-threshold',
                        type=float,
                        default=0.7,
@@ -8771,7 +9223,7 @@ def main():
     
     try:
         # Inicializa o extrator
-        extractor = BookMetadataExtractor(isbndb_api_key=args.isbndb_key)
+        extractor = BookMetadataExtractor(isbndb_api_key=args.isbndb_key, ocr_workers=args.ocr_workers)
         
         # Operações de cache
         if args.rescan_cache:
@@ -8787,6 +9239,37 @@ def main():
             )
             print(f"Atualizados {updated} registros no cache")
             return
+
+        if args.import_catalog:
+            catalog = extractor.metadata_fetcher.offline_catalog
+            print(f"\nImportando catálogo offline de {args.import_catalog}...")
+            started = time.time()
+            stats = catalog.import_dump(args.import_catalog, fmt=args.catalog_format)
+            print(f"  {stats['lines']:,} linhas lidas, {stats['editions']:,} edições, "
+                  f"{stats['authors']:,} autores, {stats['skipped']:,} ignoradas "
+                  f"em {time.time() - started:.1f}s")
+            print(f"Catálogo {catalog.db_path}: {stats['editions_total']:,} ISBNs indexados")
+            return
+
+        if args.calibrate_pdf_backends:
+            if not args.directory:
+                print("\nERRO: --calibrate-pdf-backends requer um diretório com PDFs")
+                sys.exit(1)
+            directory = Path(args.directory)
+            pdfs = sorted(directory.rglob('*.pdf') if args.recursive else directory.glob('*.pdf'))
+            # Amostra espalhada pela biblioteca (determinística)
+            step = max(1, len(pdfs) // args.calibrate_pdf_backends)
+            sample = [str(path) for path in pdfs[::step][:args.calibrate_pdf_backends]]
+            print(f"\nCalibrando backends de texto PDF com {len(sample)} arquivos...")
+            scores = calibrate_pdf_backends(sample)
+            for score in scores:
+                print(f"  {score.name:<12} {score.chars_per_sec:>12,.0f} chars/s  "
+                      f"ISBN {score.isbn_hit_rate:>5.0%}  falhas {score.failures}")
+            if scores:
+                print(f"Ordem salva em pdf_backends.json: {' → '.join(score.name for score in scores)}")
+            else:
+                print("Nenhum backend de texto PDF disponível.")
+            return
             
         # Verifica diretório
         if not args.directory:
@@ -8805,6 +9288,18 @@ def main():
         else:
             print("Modo não-recursivo: processando apenas o diretório principal")
         
+        if args.supervised:
+            extractor.enable_supervision(
+                max_workers=args.threads,
+                timeout=args.file_timeout,
+                max_rss_mb=args.max_rss_mb,
+                recycle_every=args.recycle_every
+            )
+            print(f"Modo supervisionado: prazo {args.file_timeout:.0f}s, limite {args.max_rss_mb:.0f} MiB por arquivo")
+
+        extractor.stream_reports = args.stream_reports
+        extractor.compact_reports = args.compact_reports
+        
         # Configura padrão de nomeação se necessário
         if args.rename:
             extractor.set_naming_pattern(args.name_pattern)
@@ -8838,12 +9333,14 @@ def main():
         # Aplica renomeação real quando solicitado
         try:
             if args.rename and results:
-                for item in results:
-                    if item is None:
-                        continue
-                    # aceita BookMetadata ou dict
-                    meta_dict = asdict(item) if hasattr(item, '__dict__') else dict(item)
-                    extractor.rename_file(meta_dict, simulate=False)
+                # Lote único: plano com trocas/cadeias ordenadas, execução paralela e diário
+                rename_stats = extractor.rename_files(
+                    [item for item in results if item is not None], max_workers=args.threads
+                )
+                print(f"\nRenomeados: {rename_stats['renamed']} | Erros: {rename_stats['errors']} | "
+                      f"{rename_stats['files_per_second']} arquivos/s | diário: {rename_stats.get('run_id')}")
+                if rename_stats['renamed']:
+                    print(f"Desfazer: python start_cli.py rollback --run {rename_stats.get('run_id')}")
         except Exception:
             # Mantém robustez do CLI sem interromper o restante
             pass
@@ -6,22 +6,46 @@ Sistema para renomeacao automatica de livros PDF/EPUB
 
 import streamlit as st
 import sys
+import logging
 import subprocess
 from pathlib import Path
 from typing import Tuple, List, Set
 
+# 'streamlit run src/gui/streamlit_interface.py' so coloca src/gui no sys.path;
+# os pacotes do projeto (renamepdfepub, core) ficam em src
+_SRC_DIR = str(Path(__file__).resolve().parents[1])
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+logger = logging.getLogger(__name__)
+
 # Configuracao da pagina
 st.set_page_config(
     page_title="RenamePDFEPUB - Renomeador de Livros",
     layout="wide"
 )
 
+
+@st.cache_resource(show_spinner=False)
+def _load_autocompleter(db_path: str, db_mtime: float):
+    """Indice de sugestoes do catalogo, reconstruido quando o DB muda."""
+    try:
+        from renamepdfepub.cli.query_preprocessor import AutoCompleter
+    except Exception:
+        logger.warning("Sugestoes do catalogo desativadas: falha ao importar o AutoCompleter", exc_info=True)
+        return None
+    completer = AutoCompleter()
+    completer.load_catalog(db_path)
+    return completer
+
 class RenamePDFEPUBInterface:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent.parent
         self.books_dir = self.project_root / "books"
         self.reports_dir = self.project_root / "reports"
         self.live_stats_file = self.reports_dir / "live_api_stats.json"
+        self.live_stats_ring = self.reports_dir / "live_api_stats.ring"
+        self.results_db = self.reports_dir / "scan_results.db"
         self.default_scan_path = str(self.books_dir)
         self.db_path = self.project_root / "metadata_cache.db"
 
@@ -104,47 +128,31 @@ class RenamePDFEPUBInterface:
         except Exception:
             return []
 
-    # --------------------------- Naming helpers -----------------------------
-    @staticmethod
-    def _clean_string_name(s: str, underscore: bool = False) -> str:
-        import unicodedata
-        if not s:
-            return ''
-        s = unicodedata.normalize('NFKD', s)
-        s = s.encode('ASCII', 'ignore').decode('ASCII')
-        out = ''.join(ch if (ch.isalnum() or ch in (' ', '-', '_')) else ' ' for ch in s)
-        out = ' '.join(out.split())
-        if underscore:
-            out = out.replace(' ', '_')
-        return out.strip()
+    def _suggest(self, partial: str, max_suggestions: int = 5) -> List[str]:
+        if len(partial.strip()) < 2 or not self.db_path.exists():
+            return []
+        completer = _load_autocompleter(str(self.db_path), self.db_path.stat().st_mtime)
+        if completer is None:
+            return []
+        return completer.get_suggestions(partial, max_suggestions).suggestions
 
+    # --------------------------- Naming helpers -----------------------------
     @staticmethod
-    def _first_two_authors_str(authors: str) -> str:
-        parts = [a.strip() for a in (authors or '').split(',') if a.strip()]
-        return ', '.join(parts[:2]) if parts else ''
+    def _name_fields_from_row(row: dict) -> dict:
+        from renamepdfepub.naming import first_authors, known
+        return {
+            'title': known(row.get('T\u00edtulo')),
+            'author': first_authors(known(row.get('Autores'))),
+            'publisher': known(row.get('Editora')),
+            'year': known(row.get('Ano')),
+            'isbn': row.get('ISBN-13') or row.get('ISBN-10') or '',
+        }
 
-    def _build_name_from_row(self, row: dict, pattern: str, underscore: bool) -> str:
-        title = row.get('T\u00edtulo') or ''
-        if str(title).lower() == 'unknown':
-            title = ''
-        authors = row.get('Autores') or ''
-        if str(authors).lower() == 'unknown':
-            authors = ''
-        publisher = row.get('Editora') or ''
-        if str(publisher).lower() == 'unknown':
-            publisher = ''
-        year = row.get('Ano') or ''
-        if str(year).lower() == 'unknown':
-            year = ''
-        isbn = row.get('ISBN-13') or row.get('ISBN-10') or ''
-        author_disp = self._first_two_authors_str(authors)
-        return pattern.format(
-            title=self._clean_string_name(title, underscore),
-            author=self._clean_string_name(author_disp, underscore),
-            year=self._clean_string_name(year, underscore),
-            publisher=self._clean_string_name(publisher, underscore),
-            isbn=self._clean_string_name(isbn, underscore)
-        ).strip()
+    def _build_names(self, rows: List[dict], pattern: str, underscore: bool) -> List[str]:
+        """Render a batch of names; the compiled template and its field cache survive reruns."""
+        from renamepdfepub.naming import compile_template
+        template = compile_template(pattern, 'ascii_underscore' if underscore else 'ascii')
+        return template.render_many(self._name_fields_from_row(row) for row in rows)
     
     # --------------------------- Pattern helpers ----------------------------
     def _validate_pattern(self, pattern: str) -> Tuple[bool, List[str], Set[str]]:
@@ -361,7 +369,10 @@ class RenamePDFEPUBInterface:
         st.markdown("---")
 
     def _load_latest_report(self):
-        """Carrega o relatorio JSON mais recente em reports/ (se existir)."""
+        """Resumo da ultima varredura: banco de resultados, ou o JSON mais recente em reports/."""
+        data = self._load_latest_run()
+        if data:
+            return data
         try:
             if not self.reports_dir.exists():
                 return None
@@ -376,6 +387,68 @@ class RenamePDFEPUBInterface:
         except Exception:
             return None
 
+    def _load_latest_run(self):
+        """Ultima execucao concluida em reports/scan_results.db, no formato do relatorio JSON."""
+        if not self.results_db.exists():
+            return None
+        try:
+            from renamepdfepub.results_store import ResultsStore
+        except Exception:
+            logger.warning("Dashboard sem o banco de resultados: falha ao importar ResultsStore", exc_info=True)
+            return None
+        import sqlite3
+        store = ResultsStore(str(self.results_db))
+        try:
+            run_id = store.latest_run()
+            if not run_id:
+                return None
+            by_status = store.aggregate('status', run_id=run_id)
+            publishers = store.aggregate('publisher', run_id=run_id, status='resolved')
+            resolved = store.query(run_id=run_id, status='resolved')
+        except sqlite3.Error:
+            logger.warning("Falha ao consultar %s", self.results_db, exc_info=True)
+            return None
+        finally:
+            store.close()
+        missing = {'title': 0, 'authors': 0, 'publisher': 0, 'year': 0, 'isbn': 0}
+        for row in resolved:
+            for field, value in (('title', row['title']), ('authors', row['authors']),
+                                 ('publisher', row['publisher']), ('year', row['year']),
+                                 ('isbn', row['isbn_13'] or row['isbn_10'])):
+                if not value:
+                    missing[field] += 1
+        counts = {status: stats['count'] for status, stats in by_status.items()}
+        return {
+            'run_id': run_id,
+            'summary': {
+                'total_files': sum(counts.values()),
+                'successful': counts.get('success', 0) + counts.get('recovered', 0),
+                'failed': counts.get('failure', 0),
+                'missing_fields': {field: count for field, count in missing.items() if count},
+            },
+            'publisher_stats': {pub: stats['count'] for pub, stats in publishers.items() if pub},
+        }
+
+    def _load_live_stats(self):
+        """Ultimo retrato das APIs: anel mapeado em memoria, ou o JSON gravado no fim da varredura."""
+        live = None
+        try:
+            from renamepdfepub.live_stats import read_live_stats
+        except Exception:
+            logger.warning("Painel em tempo real sem o anel: falha ao importar renamepdfepub.live_stats", exc_info=True)
+        else:
+            if self.live_stats_ring.exists():
+                live = read_live_stats(str(self.live_stats_ring))
+        if not live and self.live_stats_file.exists():
+            try:
+                import json
+                with open(self.live_stats_file, 'r', encoding='utf-8') as f:
+                    live = json.load(f)
+            except (OSError, ValueError):
+                logger.warning("Falha ao ler %s", self.live_stats_file, exc_info=True)
+                live = None
+        return live
+
     def render_dashboard(self):
         """Exibe metricas reais a partir do relatorio em reports/."""
         st.header("Dashboard")
@@ -475,15 +548,7 @@ class RenamePDFEPUBInterface:
         with cols[1]:
             st.caption("Atualize enquanto a varredura estiver em execucao.")
 
-        live = None
-        try:
-            if self.live_stats_file.exists():
-                import json
-                with open(self.live_stats_file, 'r', encoding='utf-8') as f:
-                    live = json.load(f)
-        except Exception:
-            live = None
-
+        live = self._load_live_stats()
         if not live:
             st.info("M\u00e9tricas em tempo real indispon\u00edveis. Inicie uma varredura para gerar live_api_stats.json.")
             return
@@ -511,7 +576,7 @@ class RenamePDFEPUBInterface:
         st.write("Fontes")
         # Tabela simples com os principais campos
         for api, stats in sorted(per_api.items()):
-            st.write(f"- {api}: {stats.get('success',0)}/{stats.get('total',0)} ({stats.get('success_rate',0.0):.1f}%) - {stats.get('avg_time',0.0):.2f}s")
+            st.write(f"- {api}: {stats.get('success',0)}/{stats.get('total',0)} ({stats.get('success_rate',0.0):.1f}%) - {stats.get('avg_time',0.0):.2f}s (p95 {stats.get('p95',0.0):.2f}s)")
             errs = stats.get('errors') or {}
             recents = stats.get('recent_errors') or []
             rfail = stats.get('recent_failures') or []
@@ -735,8 +800,12 @@ class RenamePDFEPUBInterface:
             c1, c2, c3, c4 = st.columns(4)
             with c1:
                 q_title = st.text_input("T\u00edtulo cont\u00e9m", value="")
+                for hint in self._suggest(q_title):
+                    st.caption(hint)
             with c2:
                 q_author = st.text_input("Autor cont\u00e9m", value="")
+                for hint in self._suggest(q_author):
+                    st.caption(hint)
             with c3:
                 q_publisher = st.text_input("Editora cont\u00e9m", value="")
             with c4:
@@ -765,7 +834,9 @@ class RenamePDFEPUBInterface:
                 st.dataframe(df, use_container_width=True, hide_index=True)
             except Exception:
                 for r in rows[:200]:
-                    st.write(f"- {r['T\u00edtulo']} | {r['Autores']} | {r['Editora']} | {r['Ano']} | {r['ISBN-13']}")
+                    # Python < 3.12: sem barra invertida dentro da expressao do f-string
+                    title = r['T\u00edtulo']
+                    st.write(f"- {title} | {r['Autores']} | {r['Editora']} | {r['Ano']} | {r['ISBN-13']}")
             # Export
             csv_data = self._rows_to_csv(rows)
             st.download_button(
@@ -787,9 +858,9 @@ class RenamePDFEPUBInterface:
                             st.warning(e)
                         preview_rows = []
                     else:
+                        batch = rows[: int(limit_prev)]
                         preview_rows = []
-                        for r in rows[: int(limit_prev)]:
-                            newbase = self._build_name_from_row(r, patt, und)
+                        for r, newbase in zip(batch, self._build_names(batch, patt, und)):
                             ext = Path(r.get('Arquivo','')).suffix
                             preview_rows.append({'Arquivo': r.get('Arquivo',''), 'Proposto': (newbase + ext) if newbase else ''})
                     prev_csv = self._rows_to_csv(preview_rows)
@@ -1169,9 +1240,9 @@ class RenamePDFEPUBInterface:
                             st.warning(e)
                         preview_rows = []
                     else:
+                        batch = inc_rows[:500]
                         preview_rows = []
-                        for r in inc_rows[:500]:
-                            newbase = self._build_name_from_row(r, patt, und)
+                        for r, newbase in zip(batch, self._build_names(batch, patt, und)):
                             ext = Path(r.get('Arquivo','')).suffix
                             preview_rows.append({'Arquivo': r.get('Arquivo',''), 'Proposto': (newbase + ext) if newbase else ''})
                     prev_csv = self._rows_to_csv(preview_rows)
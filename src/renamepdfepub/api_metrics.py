@@ -0,0 +1,218 @@
+"""Fixed-memory sliding-window API metrics.
+
+Each API gets a ring of time buckets (default: 60 one-minute buckets, i.e.
+the last hour). A bucket holds the call count, successes, summed latency and
+a small t-digest of its latencies. Window totals are kept as running sums:
+a bucket's contribution is subtracted when it is recycled, so the windowed
+success rate and mean latency are O(1) to read, and memory does not grow
+with the number of calls. Percentiles merge the digests of the live
+buckets. Lifetime call, success and latency totals are kept next to the
+window, so counters that must never go down come from the same series.
+
+prometheus_text() renders the windows in the Prometheus text exposition
+format for a local scraper or textfile collector.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+try:
+    from .live_stats import TDigest
+except ImportError:
+    from live_stats import TDigest
+
+WINDOW_SECONDS = 3600.0
+BUCKET_SECONDS = 60.0
+BUCKET_COMPRESSION = 50
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _Bucket:
+    __slots__ = ('count', 'success', 'latency_sum', 'digest')
+
+    def __init__(self):
+        self.count = 0
+        self.success = 0
+        self.latency_sum = 0.0
+        self.digest = TDigest(BUCKET_COMPRESSION)
+
+
+class WindowedSeries:
+    """
+    Ring of time buckets for one API (not thread-safe, see WindowedMetrics).
+
+    Args:
+        window: Seconds covered by the ring
+        bucket_seconds: Width of each bucket
+        clock: Wall-clock time source
+    """
+
+    def __init__(self, window: float = WINDOW_SECONDS, bucket_seconds: float = BUCKET_SECONDS,
+                 clock: Callable[[], float] = time.time):
+        self.bucket_seconds = bucket_seconds
+        self.size = max(1, int(round(window / bucket_seconds)))
+        self.clock = clock
+        self._buckets: List[Optional[_Bucket]] = [None] * self.size
+        self._head = int(clock() // bucket_seconds)
+        self.count = 0
+        self.success = 0
+        self.latency_sum = 0.0
+        self.lifetime_count = 0
+        self.lifetime_success = 0
+        self.lifetime_latency_sum = 0.0
+
+    def add(self, latency: float, success: bool) -> None:
+        index = self._advance()
+        slot = index % self.size
+        bucket = self._buckets[slot]
+        if bucket is None:
+            bucket = self._buckets[slot] = _Bucket()
+        bucket.count += 1
+        bucket.success += bool(success)
+        bucket.latency_sum += latency
+        bucket.digest.add(latency)
+        self.count += 1
+        self.success += bool(success)
+        self.latency_sum += latency
+        self.lifetime_count += 1
+        self.lifetime_success += bool(success)
+        self.lifetime_latency_sum += latency
+
+    def totals(self) -> tuple:
+        """(calls, successes, summed latency) over the window."""
+        self._advance()
+        return self.count, self.success, self.latency_sum
+
+    def lifetime(self) -> tuple:
+        """(calls, successes, summed latency) since the series was created; never decreases."""
+        return self.lifetime_count, self.lifetime_success, self.lifetime_latency_sum
+
+    def quantiles(self, qs: Sequence[float] = QUANTILES) -> Dict[float, float]:
+        self._advance()
+        merged = TDigest()
+        for bucket in self._buckets:
+            if bucket is not None and bucket.count:
+                merged.merge(bucket.digest)
+        return {q: merged.quantile(q) for q in qs}
+
+    def _advance(self) -> int:
+        """Recycle buckets that left the window; amortised O(1) per bucket width."""
+        index = int(self.clock() // self.bucket_seconds)
+        if index > self._head:
+            for expired in range(max(self._head + 1, index - self.size + 1), index + 1):
+                slot = expired % self.size
+                bucket = self._buckets[slot]
+                if bucket is not None:
+                    self.count -= bucket.count
+                    self.success -= bucket.success
+                    self.latency_sum = self.latency_sum - bucket.latency_sum if self.count else 0.0
+                    self._buckets[slot] = None
+            self._head = index
+        return self._head
+
+
+class WindowedMetrics:
+    """Thread-safe WindowedSeries per API."""
+
+    def __init__(self, window: float = WINDOW_SECONDS, bucket_seconds: float = BUCKET_SECONDS,
+                 clock: Callable[[], float] = time.time):
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._series: Dict[str, WindowedSeries] = {}
+
+    def __contains__(self, api_name: str) -> bool:
+        return api_name in self._series
+
+    def __iter__(self):
+        return iter(list(self._series))
+
+    def add(self, api_name: str, latency: float, success: bool) -> None:
+        with self._lock:
+            series = self._series.get(api_name)
+            if series is None:
+                series = self._series[api_name] = WindowedSeries(self.window, self.bucket_seconds, self.clock)
+            series.add(latency, success)
+
+    def stats(self, api_name: str) -> Dict[str, float]:
+        """Windowed call count, successes, success rate (%) and mean latency; {} when idle."""
+        with self._lock:
+            series = self._series.get(api_name)
+            if series is None:
+                return {}
+            count, success, latency_sum = series.totals()
+        if not count:
+            return {}
+        return {
+            'total_calls': count,
+            'success_count': success,
+            'success_rate': success / count * 100,
+            'avg_response_time': latency_sum / count,
+        }
+
+    def lifetime(self, api_name: str) -> tuple:
+        """(calls, successes, summed latency) since the first call of the API."""
+        with self._lock:
+            series = self._series.get(api_name)
+            return series.lifetime() if series is not None else (0, 0, 0.0)
+
+    def quantiles(self, api_name: str, qs: Sequence[float] = QUANTILES) -> Dict[float, float]:
+        with self._lock:
+            series = self._series.get(api_name)
+            return series.quantiles(qs) if series is not None else {}
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def prometheus_text(metrics: WindowedMetrics, errors: Optional[Mapping[str, Mapping[str, int]]] = None,
+                    prefix: str = 'renamepdfepub_api', qs: Iterable[float] = QUANTILES) -> str:
+    """
+    Prometheus text exposition of the metrics.
+
+    Latency quantiles and the success ratio describe the window; the summary's
+    _sum and _count are lifetime totals, since Prometheus treats them as
+    counters (rate() breaks when they go down).
+
+    Args:
+        metrics: Windows to export
+        errors: Cumulative error counts per API and error type
+        prefix: Metric name prefix
+        qs: Latency quantiles to export
+    """
+    qs = tuple(qs)
+    window = int(metrics.window)
+    lines = [
+        f'# HELP {prefix}_latency_seconds API latency (quantiles over the last {window}s)',
+        f'# TYPE {prefix}_latency_seconds summary',
+    ]
+    ratios = []
+    for api in sorted(metrics):
+        calls, _, latency_sum = metrics.lifetime(api)
+        if not calls:
+            continue
+        name = _label(api)
+        stats = metrics.stats(api)
+        if stats:
+            for q, value in metrics.quantiles(api, qs).items():
+                lines.append(f'{prefix}_latency_seconds{{api="{name}",quantile="{q}"}} {value:.6g}')
+            ratios.append(f'{prefix}_success_ratio{{api="{name}"}} {stats["success_rate"] / 100:.6g}')
+        lines.append(f'{prefix}_latency_seconds_sum{{api="{name}"}} {latency_sum:.6g}')
+        lines.append(f'{prefix}_latency_seconds_count{{api="{name}"}} {calls}')
+    lines += [
+        f'# HELP {prefix}_success_ratio Share of successful API calls over the last {window}s',
+        f'# TYPE {prefix}_success_ratio gauge',
+    ] + ratios
+    if errors:
+        lines += [f'# HELP {prefix}_errors_total API errors by type', f'# TYPE {prefix}_errors_total counter']
+        for api in sorted(errors):
+            for error_type, count in sorted(errors[api].items()):
+                lines.append(f'{prefix}_errors_total{{api="{_label(api)}",type="{_label(error_type)}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+__all__ = ['WindowedSeries', 'WindowedMetrics', 'prometheus_text', 'WINDOW_SECONDS', 'BUCKET_SECONDS', 'QUANTILES']
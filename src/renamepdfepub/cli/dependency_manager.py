@@ -10,6 +10,8 @@ Originalmente extraído de renomeia_livro.py para modularização da arquitetura
 import logging
 from typing import List
 
+from ..pdf_backends import available_backends, load_order
+
 
 class DependencyManager:
     """
@@ -26,7 +28,7 @@ class DependencyManager:
         self._init_logging()
 
         self.available_extractors = {
-            'pypdf2': True,  # Já sabemos que está disponível pois é requisito
+            'pypdf2': 'pypdf' in available_backends(),
             'pdfplumber': False,
             'pdfminer': False,
             'tesseract': False,
@@ -100,6 +102,19 @@ class DependencyManager:
         """
         return self.available_extractors.get(extractor_name, False)
     
+    def get_pdf_backend_order(self) -> List[str]:
+        """
+        Retorna a ordem dos backends de texto PDF.
+        
+        Usa a ordem calibrada em pdf_backends.json (veja
+        renamepdfepub.pdf_backends.calibrate) ou, sem calibração, a ordem padrão
+        pymupdf → pypdf → pdfminer → pdfplumber restrita aos instalados.
+        
+        Returns:
+            List[str]: Nomes dos backends, do preferido ao último recurso
+        """
+        return load_order()
+    
     def get_best_pdf_extractor(self) -> str:
         """
         Retorna o melhor extractor de PDF disponível.
@@ -107,15 +122,9 @@ class DependencyManager:
         Returns:
             str: Nome do melhor extractor disponível
         """
-        # Ordem de preferência baseada na qualidade de extração
-        preference_order = ['pdfplumber', 'pdfminer', 'pypdf2']
-        
-        for extractor in preference_order:
-            if self.available_extractors.get(extractor, False):
-                return extractor
-        
-        # Fallback para pypdf2 que é obrigatório
-        return 'pypdf2'
+        order = self.get_pdf_backend_order()
+        # Fallback para pypdf2, o requisito mínimo do projeto
+        return order[0] if order else 'pypdf2'
     
     def get_dependency_report(self) -> dict:
         """
@@ -127,6 +136,8 @@ class DependencyManager:
         return {
             'available_extractors': self.available_extractors.copy(),
             'best_pdf_extractor': self.get_best_pdf_extractor(),
+            'pdf_backends': available_backends(),
+            'pdf_backend_order': self.get_pdf_backend_order(),
             'ocr_support': self.has_ocr_support,
             'total_available': len(self.get_available_extractors()),
             'total_possible': len(self.available_extractors)
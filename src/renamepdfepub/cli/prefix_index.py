@@ -0,0 +1,232 @@
+"""
+Prefix Index - Índice de prefixos ponderado para auto-completar.
+
+Trie comprimida (radix) em que cada nó mantém em cache os top-k termos da
+sua subárvore ordenados por peso. Uma consulta percorre apenas o prefixo e
+devolve a lista já ordenada, em O(len(prefixo) + k), independente do
+tamanho do vocabulário.
+
+Atualizações são incrementais: adicionar peso a um termo só revisita os nós
+do caminho até ele. Pesos só crescem (frequências), o que mantém os caches
+de top-k exatos sem recomputar subárvores.
+"""
+
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class _Node:
+    """Nó da trie comprimida."""
+
+    __slots__ = ('label', 'children', 'key', 'top')
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.children: Dict[str, '_Node'] = {}
+        self.key: Optional[str] = None
+        # (-weight, key) sorted ascending: heaviest first, ties alphabetical
+        self.top: List[Tuple[float, str]] = []
+
+
+class PrefixIndex:
+    """
+    Índice de prefixos com completação top-k por peso.
+
+    As chaves são normalizadas (minúsculas, espaços colapsados); a forma de
+    exibição guardada é a primeira vista para cada chave.
+    """
+
+    def __init__(self, top_k: int = 10, max_key_length: int = 120):
+        """
+        Inicializa o índice.
+
+        Args:
+            top_k: Tamanho do cache de melhores termos por nó
+            max_key_length: Comprimento máximo das chaves indexadas
+        """
+        self.top_k = top_k
+        self.max_key_length = max_key_length
+        self._root = _Node()
+        self._weights: Dict[str, float] = {}
+        self._display: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def __contains__(self, text: str) -> bool:
+        return self.normalize(text) in self._weights
+
+    def normalize(self, text: str) -> str:
+        """Normaliza um texto para uso como chave."""
+        return ' '.join(text.lower().split())[:self.max_key_length]
+
+    def weight(self, text: str) -> float:
+        """Peso acumulado de um termo (0.0 se ausente)."""
+        return self._weights.get(self.normalize(text), 0.0)
+
+    def add(self, text: str, weight: float = 1.0) -> None:
+        """
+        Adiciona um termo ou soma peso a um termo existente.
+
+        Args:
+            text: Termo a indexar
+            weight: Peso a somar (positivo)
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        key = self.normalize(text)
+        if not key:
+            return
+        with self._lock:
+            path = self._insert(key, text, weight)
+            entry = (-self._weights[key], key)
+            for node in path:
+                self._offer(node, entry)
+
+    def extend(self, items: Iterable[Tuple[str, float]]) -> int:
+        """
+        Adiciona vários termos de uma vez.
+
+        Os pesos são agregados antes da inserção e os caches de top-k são
+        reconstruídos em uma única passada, o que torna a carga inicial de
+        catálogos grandes bem mais barata que chamadas repetidas a add().
+
+        Args:
+            items: Pares (termo, peso)
+
+        Returns:
+            int: Número de termos distintos recebidos
+        """
+        aggregated: Dict[str, float] = {}
+        displays: Dict[str, str] = {}
+        for text, weight in items:
+            if weight <= 0:
+                raise ValueError("weight must be positive")
+            key = self.normalize(text)
+            if not key:
+                continue
+            aggregated[key] = aggregated.get(key, 0.0) + weight
+            displays.setdefault(key, text)
+
+        with self._lock:
+            for key, weight in aggregated.items():
+                self._insert(key, displays[key], weight)
+            self._rebuild_top(self._root)
+        return len(aggregated)
+
+    def complete(self, prefix: str, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Retorna os k termos de maior peso que começam com o prefixo.
+
+        Args:
+            prefix: Prefixo digitado
+            k: Número máximo de termos
+
+        Returns:
+            List[Tuple[str, float]]: Pares (termo, peso), do mais pesado ao mais leve
+        """
+        key = self.normalize(prefix)
+        if k <= 0:
+            return []
+        with self._lock:
+            node = self._find(key)
+            if node is None:
+                return []
+            if k <= self.top_k:
+                entries = node.top[:k]
+            else:
+                entries = self._collect(node, k)
+            return [(self._display[term], -neg_weight) for neg_weight, term in entries]
+
+    def clear(self) -> None:
+        """Remove todos os termos."""
+        with self._lock:
+            self._root = _Node()
+            self._weights.clear()
+            self._display.clear()
+
+    def _find(self, key: str) -> Optional[_Node]:
+        node = self._root
+        rest = key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                return None
+            label = child.label
+            if label.startswith(rest):
+                # Prefix ends inside (or exactly at the end of) this edge
+                return child
+            if not rest.startswith(label):
+                return None
+            rest = rest[len(label):]
+            node = child
+        return node
+
+    def _insert(self, key: str, text: str, weight: float) -> List[_Node]:
+        """Insere a chave, soma o peso e retorna o caminho da raiz ao nó terminal."""
+        node = self._root
+        path = [node]
+        rest = key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                child = _Node(rest)
+                node.children[rest[0]] = child
+                path.append(child)
+                node = child
+                break
+            label = child.label
+            common = _common_prefix_length(label, rest)
+            if common < len(label):
+                # Split the edge; the new middle node covers the same subtree
+                middle = _Node(label[:common])
+                middle.top = list(child.top)
+                middle.children[label[common]] = child
+                child.label = label[common:]
+                node.children[rest[0]] = middle
+                child = middle
+            path.append(child)
+            node = child
+            rest = rest[common:]
+
+        node.key = key
+        self._weights[key] = self._weights.get(key, 0.0) + weight
+        self._display.setdefault(key, ' '.join(text.split())[:self.max_key_length])
+        return path
+
+    def _offer(self, node: _Node, entry: Tuple[float, str]) -> None:
+        key = entry[1]
+        top = [item for item in node.top if item[1] != key]
+        top.append(entry)
+        top.sort()
+        del top[self.top_k:]
+        node.top = top
+
+    def _rebuild_top(self, node: _Node) -> List[Tuple[float, str]]:
+        candidates: List[Tuple[float, str]] = []
+        if node.key is not None:
+            candidates.append((-self._weights[node.key], node.key))
+        for child in node.children.values():
+            candidates.extend(self._rebuild_top(child))
+        node.top = heapq.nsmallest(self.top_k, candidates)
+        return node.top
+
+    def _collect(self, node: _Node, k: int) -> List[Tuple[float, str]]:
+        entries: List[Tuple[float, str]] = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.key is not None:
+                entries.append((-self._weights[current.key], current.key))
+            stack.extend(current.children.values())
+        return heapq.nsmallest(k, entries)
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    limit = min(len(a), len(b))
+    index = 0
+    while index < limit and a[index] == b[index]:
+        index += 1
+    return index
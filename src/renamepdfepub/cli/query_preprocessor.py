@@ -10,11 +10,16 @@ Funcionalidades:
 """
 
 import re
+import json
 import time
-from typing import Dict, List, Any, Optional, Tuple, Set
-from dataclasses import dataclass, field
-from collections import Counter
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Set
+from dataclasses import dataclass, field, replace
+from collections import Counter, OrderedDict
 from ..search_algorithms.base_search import SearchQuery
+from .prefix_index import PrefixIndex
 
 
 @dataclass
@@ -31,6 +36,17 @@ class QueryAnalysis:
     processing_time: float = 0.0
 
 
+def _detached(analysis: QueryAnalysis, **changes: Any) -> QueryAnalysis:
+    """Copia da análise sem compartilhar dicts/listas com o cache."""
+    return replace(
+        analysis,
+        detected_entities={kind: list(values) for kind, values in analysis.detected_entities.items()},
+        suggested_corrections=list(analysis.suggested_corrections),
+        confidence_scores=dict(analysis.confidence_scores),
+        **changes
+    )
+
+
 @dataclass
 class SuggestionResult:
     """Resultado de sugestões automáticas."""
@@ -40,6 +56,50 @@ class SuggestionResult:
     confidence: float = 0.0
 
 
+# Module-level compiled patterns shared by every detector call
+_NON_ISBN_CHARS = re.compile(r'[^\dXx]')
+_NAME_PATTERN = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b')
+_QUOTED_PATTERN = re.compile(r'["\'"](.*?)["\'""]')
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_EDGE_PUNCTUATION_PATTERN = re.compile(r'^[^\w\d]+|[^\w\d]+$')
+_SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s]')
+_ISBN_HINT_PATTERN = re.compile(r'ISBN|978|979', re.IGNORECASE)
+_BOOLEAN_OPERATOR_PATTERN = re.compile(r'\b(?:and|or|not)\b', re.IGNORECASE)
+
+
+@dataclass
+class QueryTokens:
+    """Tokenização única de uma query, compartilhada por todos os detectores."""
+    text: str
+    lower: str
+    words: List[str]
+    lower_words: List[str]
+    word_set: Set[str]
+    names: List[str]
+
+    @classmethod
+    def from_text(cls, text: str) -> 'QueryTokens':
+        """
+        Tokeniza o texto uma única vez.
+        
+        Args:
+            text: Texto da query
+            
+        Returns:
+            QueryTokens: Visões do texto usadas pelos detectores
+        """
+        lower = text.lower()
+        return cls(
+            text=text,
+            lower=lower,
+            words=text.split(),
+            lower_words=lower.split(),
+            word_set=set(_WORD_PATTERN.findall(lower)),
+            names=_NAME_PATTERN.findall(text)
+        )
+
+
 class EntityDetector:
     """Detector de entidades em queries de busca."""
     
@@ -55,6 +115,18 @@ class EntityDetector:
         'portuguese': ['por', 'autor', 'autora', 'escrito por', 'dr.', 'dra.', 'prof.', 'profa.']
     }
     
+    # Compiled "<indicator>: Name" patterns per language
+    AUTHOR_INDICATOR_PATTERNS = {
+        language: [
+            re.compile(rf'{re.escape(indicator)}[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', re.IGNORECASE)
+            for indicator in indicators
+        ]
+        for language, indicators in AUTHOR_INDICATORS.items()
+    }
+    
+    # Words that disqualify a capitalized sequence as an author name
+    NAME_STOPWORDS = {'The', 'And', 'For', 'With', 'From', 'To', 'In', 'On', 'At', 'By'}
+    
     # Common title indicators
     TITLE_INDICATORS = {
         'english': ['title', 'book', 'guide', 'handbook', 'manual', 'introduction', 'advanced'],
@@ -67,6 +139,10 @@ class EntityDetector:
         'portuguese': ['editora', 'publicado por', 'edições', 'publicações', 'livros']
     }
     
+    # Language detection vocabularies
+    ENGLISH_WORDS = {'the', 'and', 'or', 'by', 'with', 'for', 'in', 'on', 'at', 'to', 'from'}
+    PORTUGUESE_WORDS = {'o', 'a', 'e', 'ou', 'por', 'com', 'para', 'em', 'de', 'do', 'da'}
+    
     @classmethod
     def detect_isbn(cls, text: str) -> List[str]:
         """
@@ -84,72 +160,73 @@ class EntityDetector:
             matches = pattern.findall(text)
             for match in matches:
                 # Clean and validate
-                cleaned = re.sub(r'[^\dXx]', '', match.upper())
+                cleaned = _NON_ISBN_CHARS.sub('', match.upper())
                 if len(cleaned) in [10, 13]:
                     isbns.append(cleaned)
         
         return list(set(isbns))  # Remove duplicates
     
     @classmethod
-    def detect_authors(cls, text: str, language: str = 'english') -> List[str]:
+    def detect_authors(cls, text: str, language: str = 'english',
+                       tokens: Optional[QueryTokens] = None) -> List[str]:
         """
         Detecta nomes de autores no texto.
         
         Args:
             text: Texto para análise
             language: Idioma para contexto
+            tokens: Tokenização já calculada do texto
             
         Returns:
             List[str]: Lista de possíveis autores
         """
+        tokens = tokens or QueryTokens.from_text(text)
         authors = []
-        indicators = cls.AUTHOR_INDICATORS.get(language, cls.AUTHOR_INDICATORS['english'])
+        patterns = cls.AUTHOR_INDICATOR_PATTERNS.get(language, cls.AUTHOR_INDICATOR_PATTERNS['english'])
         
         # Look for patterns like "by John Doe" or "author: Jane Smith"
-        for indicator in indicators:
-            pattern = rf'{re.escape(indicator)}[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            authors.extend(matches)
-        
-        # Look for capitalized names (potential authors)
-        name_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b'
-        potential_names = re.findall(name_pattern, text)
+        for pattern in patterns:
+            authors.extend(pattern.findall(text))
         
-        # Filter out common words that might match the pattern
-        common_words = {'The', 'And', 'For', 'With', 'From', 'To', 'In', 'On', 'At', 'By'}
-        potential_names = [name for name in potential_names if not any(word in common_words for word in name.split())]
+        # Capitalized names (potential authors), filtering common words
+        potential_names = [
+            name for name in tokens.names
+            if not any(word in cls.NAME_STOPWORDS for word in name.split())
+        ]
         
         authors.extend(potential_names[:3])  # Limit to avoid false positives
         
         return list(set(authors))
     
     @classmethod
-    def detect_titles(cls, text: str, language: str = 'english') -> List[str]:
+    def detect_titles(cls, text: str, language: str = 'english',
+                      tokens: Optional[QueryTokens] = None) -> List[str]:
         """
         Detecta possíveis títulos de livros.
         
         Args:
             text: Texto para análise
             language: Idioma para contexto
+            tokens: Tokenização já calculada do texto
             
         Returns:
             List[str]: Lista de possíveis títulos
         """
+        tokens = tokens or QueryTokens.from_text(text)
         titles = []
         indicators = cls.TITLE_INDICATORS.get(language, cls.TITLE_INDICATORS['english'])
         
         # Look for quoted strings (often titles)
-        quoted_pattern = r'["\'"](.*?)["\'""]'
-        quoted_matches = re.findall(quoted_pattern, text)
+        quoted_matches = _QUOTED_PATTERN.findall(text)
         titles.extend([match for match in quoted_matches if len(match) > 5])
         
         # Look for patterns with title indicators
         for indicator in indicators:
-            if indicator in text.lower():
+            if indicator in tokens.lower:
                 # This is a simple heuristic - in practice, would use more sophisticated NLP
-                words = text.split()
-                for i, word in enumerate(words):
-                    if word.lower() == indicator and i < len(words) - 1:
+                words = tokens.words
+                for i, word in enumerate(tokens.lower_words):
+                    if word == indicator and i < len(words) - 1:
                         # Take next few words as potential title
                         potential_title = ' '.join(words[i+1:i+5])
                         if len(potential_title) > 5:
@@ -158,25 +235,22 @@ class EntityDetector:
         return list(set(titles))[:3]  # Limit results
     
     @classmethod
-    def detect_language(cls, text: str) -> str:
+    def detect_language(cls, text: str, tokens: Optional[QueryTokens] = None) -> str:
         """
         Detecta o idioma do texto.
         
         Args:
             text: Texto para análise
+            tokens: Tokenização já calculada do texto
             
         Returns:
             str: Idioma detectado ('english', 'portuguese', ou 'unknown')
         """
         # Simple language detection based on common words
-        english_words = {'the', 'and', 'or', 'by', 'with', 'for', 'in', 'on', 'at', 'to', 'from'}
-        portuguese_words = {'o', 'a', 'e', 'ou', 'por', 'com', 'para', 'em', 'de', 'do', 'da'}
-        
-        text_lower = text.lower()
-        words = set(re.findall(r'\b\w+\b', text_lower))
+        words = (tokens or QueryTokens.from_text(text)).word_set
         
-        english_score = len(words.intersection(english_words))
-        portuguese_score = len(words.intersection(portuguese_words))
+        english_score = len(words.intersection(cls.ENGLISH_WORDS))
+        portuguese_score = len(words.intersection(cls.PORTUGUESE_WORDS))
         
         if english_score > portuguese_score:
             return 'english'
@@ -200,6 +274,9 @@ class QueryCleaner:
         r'\s{2,}',    # Multiple spaces
     ]
     
+    # Compiled once; applied in order by clean_query
+    NOISE_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in NOISE_PATTERNS]
+    
     # Typo correction patterns (common mistakes)
     TYPO_CORRECTIONS = {
         # Programming-related typos
@@ -246,53 +323,44 @@ class QueryCleaner:
         cleaned = query.strip()
         
         # Remove noise patterns
-        for pattern in cls.NOISE_PATTERNS:
-            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+        for pattern in cls.NOISE_REGEXES:
+            cleaned = pattern.sub(' ', cleaned)
         
         # Normalize whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_PATTERN.sub(' ', cleaned).strip()
         
         # Remove leading/trailing punctuation (except ISBN-related)
-        cleaned = re.sub(r'^[^\w\d]+|[^\w\d]+$', '', cleaned)
+        cleaned = _EDGE_PUNCTUATION_PATTERN.sub('', cleaned)
         
         return cleaned
     
     @classmethod
-    def suggest_corrections(cls, query: str) -> List[str]:
+    def suggest_corrections(cls, query: str, tokens: Optional[QueryTokens] = None) -> List[str]:
         """
         Sugere correções para typos na query.
         
         Args:
             query: Query para análise
+            tokens: Tokenização já calculada da query
             
         Returns:
             List[str]: Lista de correções sugeridas
         """
-        suggestions = []
-        words = query.lower().split()
+        words = tokens.lower_words if tokens else query.lower().split()
+        corrected_words = [cls.TYPO_CORRECTIONS.get(word, word) for word in words]
         
-        corrected_words = []
-        has_corrections = False
-        
-        for word in words:
-            if word in cls.TYPO_CORRECTIONS:
-                corrected_words.append(cls.TYPO_CORRECTIONS[word])
-                has_corrections = True
-            else:
-                corrected_words.append(word)
-        
-        if has_corrections:
-            suggestions.append(' '.join(corrected_words))
-        
-        return suggestions
+        if any(word in cls.TYPO_CORRECTIONS for word in words):
+            return [' '.join(corrected_words)]
+        return []
     
     @classmethod
-    def calculate_complexity(cls, query: str) -> float:
+    def calculate_complexity(cls, query: str, tokens: Optional[QueryTokens] = None) -> float:
         """
         Calcula um score de complexidade da query.
         
         Args:
             query: Query para análise
+            tokens: Tokenização já calculada da query
             
         Returns:
             float: Score de complexidade (0.0 - 1.0)
@@ -300,35 +368,61 @@ class QueryCleaner:
         if not query:
             return 0.0
         
+        tokens = tokens or QueryTokens.from_text(query)
         factors = {
             'length': min(len(query) / 100, 1.0) * 0.2,
-            'words': min(len(query.split()) / 20, 1.0) * 0.3,
-            'special_chars': min(len(re.findall(r'[^\w\s]', query)) / 10, 1.0) * 0.2,
+            'words': min(len(tokens.words) / 20, 1.0) * 0.3,
+            'special_chars': min(len(_SPECIAL_CHAR_PATTERN.findall(query)) / 10, 1.0) * 0.2,
             'entities': 0.0,  # Will be calculated based on detected entities
             'structure': 0.0   # Will be calculated based on query structure
         }
         
         # Entity complexity
-        if re.search(r'ISBN|978|979', query, re.IGNORECASE):
+        if _ISBN_HINT_PATTERN.search(query):
             factors['entities'] += 0.1
-        if re.search(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b', query):  # Potential names
+        if tokens.names:  # Potential names
             factors['entities'] += 0.1
         
         # Structure complexity
         if '"' in query or "'" in query:  # Quoted strings
             factors['structure'] += 0.05
-        if re.search(r'\b(?:and|or|not)\b', query, re.IGNORECASE):  # Boolean operators
+        if _BOOLEAN_OPERATOR_PATTERN.search(query):  # Boolean operators
             factors['structure'] += 0.1
         
         return min(sum(factors.values()), 1.0)
 
 
 class AutoCompleter:
-    """Sistema de auto-completar para queries."""
+    """
+    Sistema de auto-completar para queries.
+    
+    Sugestões vêm de um PrefixIndex de frases (queries comuns, títulos,
+    autores e editoras do catálogo, queries já feitas) e as completações da
+    última palavra de um PrefixIndex de termos, ambos ponderados por
+    frequência.
+    """
+    
+    QUERY_WEIGHT = 2.0
+    CATALOG_WEIGHT = 1.0
+    MIN_TERM_LENGTH = 3
     
-    def __init__(self):
+    def __init__(self, catalog_db: Optional[str] = None, top_k: int = 10):
+        """
+        Inicializa o auto-completar.
+        
+        Args:
+            catalog_db: Banco SQLite do catálogo (carregado na primeira sugestão)
+            top_k: Tamanho do cache de melhores termos por nó dos índices
+        """
         self.common_queries = self._load_common_queries()
         self.technical_terms = self._load_technical_terms()
+        self.phrase_index = PrefixIndex(top_k=top_k)
+        self.term_index = PrefixIndex(top_k=top_k)
+        self.phrase_index.extend((query, 1.0) for query in self.common_queries)
+        self.term_index.extend((term, 1.0) for term in self.technical_terms)
+        self.catalog_db = catalog_db
+        self._catalog_loaded = False
+        self._catalog_lock = threading.Lock()
         
     def _load_common_queries(self) -> List[str]:
         """Carrega queries comuns para auto-completar."""
@@ -369,6 +463,51 @@ class AutoCompleter:
             "devops", "ci/cd", "git", "github", "testing", "tdd", "bdd"
         ]
     
+    def load_catalog(self, db_path: Optional[str] = None) -> int:
+        """
+        Indexa títulos, autores e editoras de um banco do catálogo.
+        
+        Aceita tanto a tabela metadata_cache (núcleo) quanto a tabela
+        metadata (MetadataCache do pacote, com metadata_json).
+        
+        Args:
+            db_path: Caminho do banco (padrão: catalog_db)
+            
+        Returns:
+            int: Número de registros lidos
+        """
+        db_path = db_path or self.catalog_db
+        if not db_path or not Path(db_path).exists():
+            return 0
+        
+        phrases: Counter = Counter()
+        terms: Counter = Counter()
+        rows = 0
+        for title, authors, publisher in self._read_catalog(db_path):
+            rows += 1
+            for phrase in [title, publisher, *authors]:
+                if phrase and phrase.strip().lower() != 'unknown':
+                    phrases[phrase.strip()] += self.CATALOG_WEIGHT
+            if title:
+                for word in _WORD_PATTERN.findall(title.lower()):
+                    if len(word) >= self.MIN_TERM_LENGTH and not word.isdigit():
+                        terms[word] += self.CATALOG_WEIGHT
+        
+        self.phrase_index.extend(phrases.items())
+        self.term_index.extend(terms.items())
+        return rows
+    
+    def record_query(self, query_text: str, weight: Optional[float] = None):
+        """
+        Registra uma query executada, reforçando-a nas sugestões futuras.
+        
+        Args:
+            query_text: Texto da query
+            weight: Peso a somar (padrão: QUERY_WEIGHT)
+        """
+        if query_text and query_text.strip():
+            self.phrase_index.add(query_text, weight or self.QUERY_WEIGHT)
+    
     def get_suggestions(self, partial_query: str, max_suggestions: int = 5) -> SuggestionResult:
         """
         Obtém sugestões para uma query parcial.
@@ -383,28 +522,20 @@ class AutoCompleter:
         if not partial_query or len(partial_query) < 2:
             return SuggestionResult()
         
-        partial_lower = partial_query.lower().strip()
+        self._ensure_catalog()
+        partial_lower = ' '.join(partial_query.lower().split())
         
-        # Find matching common queries
-        suggestions = []
-        for query in self.common_queries:
-            if partial_lower in query.lower():
-                suggestions.append(query)
+        # Heaviest phrases starting with the typed text
+        suggestions = [text for text, _ in self.phrase_index.complete(partial_lower, max_suggestions)]
         
-        # Find matching technical terms for completion
+        # Complete the last word with the heaviest matching terms
         completions = []
         words = partial_lower.split()
         if words:
             last_word = words[-1]
-            for term in self.technical_terms:
-                if term.startswith(last_word) and term != last_word:
-                    # Complete the last word
-                    completed_query = ' '.join(words[:-1] + [term])
-                    completions.append(completed_query)
-        
-        # Sort by relevance (simple length-based for now)
-        suggestions.sort(key=len)
-        completions.sort(key=len)
+            for term, _ in self.term_index.complete(last_word, max_suggestions + 1):
+                if term != last_word:
+                    completions.append(' '.join(words[:-1] + [term]))
         
         # Calculate confidence based on match quality
         confidence = 0.0
@@ -417,6 +548,46 @@ class AutoCompleter:
             completions=completions[:max_suggestions],
             confidence=confidence
         )
+    
+    def _ensure_catalog(self):
+        """Carrega o catálogo configurado uma única vez."""
+        if self._catalog_loaded or not self.catalog_db:
+            return
+        with self._catalog_lock:
+            if not self._catalog_loaded:
+                self.load_catalog()
+                self._catalog_loaded = True
+    
+    @staticmethod
+    def _read_catalog(db_path: str) -> Iterator[Tuple[str, List[str], str]]:
+        """Lê (título, autores, editora) das tabelas conhecidas do catálogo."""
+        try:
+            conn = sqlite3.connect(db_path)
+        except sqlite3.Error:
+            return
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            if 'metadata_cache' in tables:
+                for title, authors, publisher in conn.execute(
+                    "SELECT title, authors, publisher FROM metadata_cache"
+                ):
+                    names = [name.strip() for name in (authors or '').split(',') if name.strip()]
+                    yield title or '', names, publisher or ''
+            if 'metadata' in tables:
+                for (raw,) in conn.execute("SELECT metadata_json FROM metadata"):
+                    try:
+                        data = json.loads(raw or '{}')
+                    except ValueError:
+                        continue
+                    authors = data.get('authors') or []
+                    if isinstance(authors, str):
+                        authors = authors.split(',')
+                    names = [str(name).strip() for name in authors if str(name).strip()]
+                    yield data.get('title') or '', names, data.get('publisher') or ''
+        except sqlite3.Error:
+            return
+        finally:
+            conn.close()
 
 
 class QueryPreprocessor:
@@ -431,20 +602,35 @@ class QueryPreprocessor:
     - Sugestões automáticas
     """
     
-    def __init__(self):
+    STAGES = (
+        'tokenize', 'clean', 'language', 'isbns', 'authors',
+        'titles', 'corrections', 'scoring', 'complexity'
+    )
+    
+    def __init__(self, analysis_cache_size: int = 512, catalog_db: Optional[str] = None):
+        """
+        Inicializa o preprocessador.
+        
+        Args:
+            analysis_cache_size: Número máximo de análises mantidas no LRU
+            catalog_db: Banco do catálogo usado pelo auto-completar
+        """
         self.entity_detector = EntityDetector()
         self.query_cleaner = QueryCleaner()
-        self.auto_completer = AutoCompleter()
-        self.processing_stats = {
-            'total_queries': 0,
-            'total_time': 0.0,
-            'average_time': 0.0
-        }
+        self.auto_completer = AutoCompleter(catalog_db=catalog_db)
+        self.analysis_cache_size = analysis_cache_size
+        self._analysis_cache: OrderedDict[str, QueryAnalysis] = OrderedDict()
+        self._lock = threading.Lock()
+        self.processing_stats = self._empty_stats()
     
     def analyze_query(self, query_text: str) -> QueryAnalysis:
         """
         Analisa uma query completamente.
         
+        Análises são memorizadas em um LRU indexado pelo texto normalizado
+        (espaços colapsados), de modo que chamadas repetidas, inclusive via
+        preprocess_for_search, não refazem a detecção.
+        
         Args:
             query_text: Texto da query
             
@@ -460,37 +646,62 @@ class QueryPreprocessor:
                 processing_time=time.time() - start_time
             )
         
+        cache_key = ' '.join(query_text.split())
+        with self._lock:
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(cache_key)
+                self.processing_stats['cache_hits'] += 1
+        if cached is not None:
+            processing_time = time.time() - start_time
+            self._update_stats(processing_time)
+            return _detached(cached, original_query=query_text, processing_time=processing_time)
+        
+        stage_times: Dict[str, float] = {}
+        stage_start = time.perf_counter()
+        
+        def mark(stage: str):
+            nonlocal stage_start
+            now = time.perf_counter()
+            stage_times[stage] = now - stage_start
+            stage_start = now
+        
+        # Single tokenisation pass shared by every detector
+        tokens = QueryTokens.from_text(query_text)
+        mark('tokenize')
+        
         # Clean the query
         cleaned = self.query_cleaner.clean_query(query_text)
+        mark('clean')
         
         # Detect language
-        language = self.entity_detector.detect_language(query_text)
+        language = self.entity_detector.detect_language(query_text, tokens)
+        mark('language')
         
         # Detect entities
-        entities = {
-            'isbns': self.entity_detector.detect_isbn(query_text),
-            'authors': self.entity_detector.detect_authors(query_text, language),
-            'titles': self.entity_detector.detect_titles(query_text, language)
-        }
+        entities = {'isbns': self.entity_detector.detect_isbn(query_text)}
+        mark('isbns')
+        entities['authors'] = self.entity_detector.detect_authors(query_text, language, tokens)
+        mark('authors')
+        entities['titles'] = self.entity_detector.detect_titles(query_text, language, tokens)
+        mark('titles')
         
         # Suggest corrections
-        corrections = self.query_cleaner.suggest_corrections(query_text)
+        corrections = self.query_cleaner.suggest_corrections(query_text, tokens)
+        mark('corrections')
         
-        # Calculate confidence scores
+        # Calculate confidence scores and determine query type
         confidence_scores = self._calculate_confidence_scores(query_text, entities)
-        
-        # Determine query type
         query_type = self._determine_query_type(entities)
+        mark('scoring')
         
         # Calculate complexity
-        complexity = self.query_cleaner.calculate_complexity(query_text)
+        complexity = self.query_cleaner.calculate_complexity(query_text, tokens)
+        mark('complexity')
         
         processing_time = time.time() - start_time
         
-        # Update stats
-        self._update_stats(processing_time)
-        
-        return QueryAnalysis(
+        analysis = QueryAnalysis(
             original_query=query_text,
             cleaned_query=cleaned,
             detected_entities=entities,
@@ -501,6 +712,20 @@ class QueryPreprocessor:
             complexity_score=complexity,
             processing_time=processing_time
         )
+        
+        with self._lock:
+            self.processing_stats['cache_misses'] += 1
+            for stage, elapsed in stage_times.items():
+                self.processing_stats['stage_times'][stage] += elapsed
+            self._analysis_cache[cache_key] = analysis
+            while len(self._analysis_cache) > self.analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
+        
+        # Update stats
+        self._update_stats(processing_time)
+        
+        # The cached entry never leaves the cache: callers get their own copy
+        return _detached(analysis)
     
     def preprocess_for_search(self, query_text: str) -> SearchQuery:
         """
@@ -512,16 +737,45 @@ class QueryPreprocessor:
         Returns:
             SearchQuery: Query preparada para busca
         """
-        analysis = self.analyze_query(query_text)
+        return self.build_search_query(self.analyze_query(query_text))
+    
+    def preprocess_many(self, query_texts: List[str]) -> List[Tuple[QueryAnalysis, SearchQuery]]:
+        """
+        Preprocessa um lote de queries, analisando cada texto distinto uma vez.
+        
+        Args:
+            query_texts: Textos das queries
+            
+        Returns:
+            List[Tuple[QueryAnalysis, SearchQuery]]: Análise e query de busca, na ordem recebida
+        """
+        prepared: Dict[str, Tuple[QueryAnalysis, SearchQuery]] = {}
+        for query_text in query_texts:
+            if query_text not in prepared:
+                analysis = self.analyze_query(query_text)
+                prepared[query_text] = (analysis, self.build_search_query(analysis))
+        return [prepared[query_text] for query_text in query_texts]
+    
+    def build_search_query(self, analysis: QueryAnalysis) -> SearchQuery:
+        """
+        Constrói a SearchQuery a partir de uma análise já calculada.
+        
+        Args:
+            analysis: Análise da query
+            
+        Returns:
+            SearchQuery: Query preparada para busca
+        """
+        entities = analysis.detected_entities
         
         # Extract components for SearchQuery
-        isbn = analysis.detected_entities['isbns'][0] if analysis.detected_entities['isbns'] else None
-        authors = analysis.detected_entities['authors']
+        isbn = entities['isbns'][0] if entities.get('isbns') else None
+        authors = entities.get('authors')
         
         # Determine title from cleaned query or detected titles
         title = None
-        if analysis.detected_entities['titles']:
-            title = analysis.detected_entities['titles'][0]
+        if entities.get('titles'):
+            title = entities['titles'][0]
         elif analysis.cleaned_query and analysis.query_type in ['title', 'mixed']:
             title = analysis.cleaned_query
         
@@ -530,7 +784,7 @@ class QueryPreprocessor:
             authors=authors if authors else None,
             isbn=isbn,
             text_content=analysis.cleaned_query,
-            metadata={'preprocessing_analysis': analysis}
+            options={'preprocessing_analysis': analysis}
         )
     
     def get_auto_suggestions(self, partial_query: str) -> SuggestionResult:
@@ -545,6 +799,15 @@ class QueryPreprocessor:
         """
         return self.auto_completer.get_suggestions(partial_query)
     
+    def record_query(self, query_text: str):
+        """
+        Registra uma query executada no índice de sugestões.
+        
+        Args:
+            query_text: Texto da query
+        """
+        self.auto_completer.record_query(query_text)
+    
     def _calculate_confidence_scores(self, query: str, entities: Dict[str, List[str]]) -> Dict[str, float]:
         """Calcula scores de confiança para diferentes aspectos da query."""
         scores = {}
@@ -571,7 +834,8 @@ class QueryPreprocessor:
         
         return scores
     
-    def _determine_query_type(self, entities: Dict[str, List[str]]) -> str:
+    @staticmethod
+    def _determine_query_type(entities: Dict[str, List[str]]) -> str:
         """Determina o tipo principal da query."""
         if entities['isbns']:
             return 'isbn'
@@ -586,20 +850,39 @@ class QueryPreprocessor:
     
     def _update_stats(self, processing_time: float):
         """Atualiza estatísticas de processamento."""
-        self.processing_stats['total_queries'] += 1
-        self.processing_stats['total_time'] += processing_time
-        self.processing_stats['average_time'] = (
-            self.processing_stats['total_time'] / self.processing_stats['total_queries']
-        )
+        with self._lock:
+            self.processing_stats['total_queries'] += 1
+            self.processing_stats['total_time'] += processing_time
+            self.processing_stats['average_time'] = (
+                self.processing_stats['total_time'] / self.processing_stats['total_queries']
+            )
     
     def get_stats(self) -> Dict[str, Any]:
-        """Retorna estatísticas de processamento."""
-        return self.processing_stats.copy()
+        """Retorna estatísticas de processamento, incluindo tempos por etapa (s)."""
+        with self._lock:
+            stats = self.processing_stats.copy()
+            stats['stage_times'] = self.processing_stats['stage_times'].copy()
+            stats['cache_size'] = len(self._analysis_cache)
+        return stats
     
     def reset_stats(self):
         """Reseta estatísticas."""
-        self.processing_stats = {
+        with self._lock:
+            self.processing_stats = self._empty_stats()
+    
+    def clear_analysis_cache(self):
+        """Descarta as análises memorizadas."""
+        with self._lock:
+            self._analysis_cache.clear()
+    
+    @classmethod
+    def _empty_stats(cls) -> Dict[str, Any]:
+        """Estrutura inicial das estatísticas de processamento."""
+        return {
             'total_queries': 0,
             'total_time': 0.0,
-            'average_time': 0.0
-        }
\ No newline at end of file
+            'average_time': 0.0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'stage_times': {stage: 0.0 for stage in cls.STAGES}
+        }
@@ -10,7 +10,7 @@ Funcionalidades:
 
 import json
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
 from .query_preprocessor import QueryPreprocessor, QueryAnalysis
@@ -40,7 +40,7 @@ class SearchCLIIntegration:
         self.config = self._load_config()
         
         # Initialize components
-        self.preprocessor = QueryPreprocessor()
+        self.preprocessor = QueryPreprocessor(catalog_db=self.config.get('catalog_db'))
         self.orchestrator = SearchOrchestrator(
             max_workers=self.config.get('max_workers', 4)
         )
@@ -89,10 +89,11 @@ class SearchCLIIntegration:
             # Step 1: Preprocess query
             if preprocessing:
                 analysis = self.preprocessor.analyze_query(query_text)
-                search_query = self.preprocessor.preprocess_for_search(query_text)
+                search_query = self.preprocessor.build_search_query(analysis)
             else:
                 analysis = None
                 search_query = SearchQuery(text_content=query_text)
+            self.preprocessor.record_query(query_text)
             
             # Step 2: Check cache
             cached_results = None
@@ -156,6 +157,155 @@ class SearchCLIIntegration:
                 'source': 'error'
             }
     
+    def search_many(self,
+                    query_texts: List[str],
+                    strategy: str = 'auto',
+                    max_results: int = 10,
+                    use_cache: bool = True,
+                    preprocessing: bool = True) -> List[Dict[str, Any]]:
+        """
+        Executa busca inteligente para um lote de queries.
+        
+        Args:
+            query_texts: Textos das queries
+            strategy: Estratégia de busca
+            max_results: Número máximo de resultados por query
+            use_cache: Se deve usar cache
+            preprocessing: Se deve preprocessar as queries
+            
+        Returns:
+            List[Dict[str, Any]]: Um resultado no formato de search_intelligent por query
+        """
+        results: List[Dict[str, Any]] = [{} for _ in query_texts]
+        for index, result in self.iter_search_many(
+            query_texts, strategy, max_results, use_cache, preprocessing
+        ):
+            results[index] = result
+        return results
+    
+    def iter_search_many(self,
+                         query_texts: List[str],
+                         strategy: str = 'auto',
+                         max_results: int = 10,
+                         use_cache: bool = True,
+                         preprocessing: bool = True) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Executa busca em lote entregando cada resultado assim que fica pronto.
+        
+        Textos repetidos são preprocessados e buscados uma vez, o cache é
+        consultado em uma única operação e as buscas restantes compartilham
+        uma distribuição no pool do orquestrador. Os novos resultados são
+        gravados no cache em lote ao final (ou quando o consumidor para).
+        
+        Args:
+            query_texts: Textos das queries
+            strategy: Estratégia de busca
+            max_results: Número máximo de resultados por query
+            use_cache: Se deve usar cache
+            preprocessing: Se deve preprocessar as queries
+            
+        Yields:
+            Tuple[int, Dict[str, Any]]: Índice da query e resultado no formato de search_intelligent
+        """
+        if not query_texts:
+            return
+        
+        start_time = time.time()
+        self.session_stats['queries_processed'] += len(query_texts)
+        
+        # Step 1: Preprocess each distinct text once
+        indices_by_text: Dict[str, List[int]] = {}
+        for index, query_text in enumerate(query_texts):
+            indices_by_text.setdefault(query_text, []).append(index)
+        unique_texts = list(indices_by_text)
+        
+        if preprocessing:
+            prepared = self.preprocessor.preprocess_many(unique_texts)
+        else:
+            prepared = [(None, SearchQuery(text_content=text)) for text in unique_texts]
+        for text in unique_texts:
+            self.preprocessor.record_query(text)
+        
+        # Step 2: One batched cache lookup
+        try:
+            if use_cache:
+                cached = self.cache.get_search_results_many([query for _, query in prepared])
+            else:
+                cached = [None] * len(prepared)
+        except Exception as e:
+            yield from self._batch_error(e, list(range(len(unique_texts))), unique_texts, indices_by_text, start_time)
+            return
+        
+        pending = []
+        for position, cached_results in enumerate(cached):
+            text_indices = indices_by_text[unique_texts[position]]
+            if not cached_results:
+                if use_cache:
+                    self.session_stats['cache_misses'] += len(text_indices)
+                pending.append(position)
+                continue
+            self.session_stats['cache_hits'] += len(text_indices)
+            for index in text_indices:
+                yield index, {
+                    'results': cached_results[:max_results],
+                    'total_found': len(cached_results),
+                    'execution_time': time.time() - start_time,
+                    'source': 'cache',
+                    'query_analysis': prepared[position][0],
+                    'search_strategy': strategy,
+                    'cache_hit': True
+                }
+        
+        # Step 3: Stream the remaining searches from a single fan-out
+        to_cache: List[Tuple[SearchQuery, List[SearchResult]]] = []
+        remaining = set(pending)
+        try:
+            stream = self.orchestrator.iter_search_many(
+                [prepared[position][1] for position in pending],
+                strategy=strategy,
+                max_results=max_results * 2  # Get more for caching
+            )
+            for batch_index, results in stream:
+                position = pending[batch_index]
+                remaining.discard(position)
+                if use_cache and results:
+                    to_cache.append((prepared[position][1], results))
+                for index in indices_by_text[unique_texts[position]]:
+                    yield index, {
+                        'results': results[:max_results],
+                        'total_found': len(results),
+                        'execution_time': time.time() - start_time,
+                        'source': 'search',
+                        'query_analysis': prepared[position][0],
+                        'search_strategy': strategy,
+                        'cache_hit': False,
+                        'algorithms_used': list(set(r.algorithm for r in results))
+                    }
+        except Exception as e:
+            yield from self._batch_error(e, sorted(remaining), unique_texts, indices_by_text, start_time)
+        finally:
+            # Step 4: One batched cache write
+            if to_cache:
+                self.cache.cache_search_results_many(to_cache, self.config.get('cache_ttl', 1800))
+            self._update_session_stats(time.time() - start_time)
+    
+    def _batch_error(self,
+                     error: Exception,
+                     positions: List[int],
+                     unique_texts: List[str],
+                     indices_by_text: Dict[str, List[int]],
+                     start_time: float) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Gera resultados de erro para as queries de um lote que não foram concluídas."""
+        for position in positions:
+            for index in indices_by_text[unique_texts[position]]:
+                yield index, {
+                    'error': str(error),
+                    'execution_time': time.time() - start_time,
+                    'results': [],
+                    'total_found': 0,
+                    'source': 'error'
+                }
+    
     def get_query_suggestions(self, partial_query: str) -> Dict[str, Any]:
         """
         Obtém sugestões para query parcial.
@@ -186,6 +336,7 @@ class SearchCLIIntegration:
             Dict[str, Any]: Análise completa
         """
         analysis = self.preprocessor.analyze_query(query_text)
+        search_query = self.preprocessor.build_search_query(analysis)
         
         return {
             'original_query': analysis.original_query,
@@ -199,7 +350,7 @@ class SearchCLIIntegration:
             'processing_time': analysis.processing_time,
             'suitable_algorithms': [
                 algo.name for algo in self.orchestrator.get_registered_algorithms()
-                if algo.is_suitable_for_query(self.preprocessor.preprocess_for_search(query_text))
+                if algo.is_suitable_for_query(search_query)
             ]
         }
     
@@ -270,6 +421,7 @@ class SearchCLIIntegration:
             'max_workers': 4,
             'cache_dir': '.search_cache',
             'cache_ttl': 1800,
+            'catalog_db': 'metadata_cache.db',
             'algorithms': {
                 'fuzzy': {
                     'similarity_threshold': 0.6,
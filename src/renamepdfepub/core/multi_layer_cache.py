@@ -264,89 +264,140 @@ class DiskCache(CacheLayer):
     def get(self, key: str) -> Optional[Any]:
         """Obtém valor do cache em disco."""
         with self.lock:
-            self.stats.total_requests += 1
+            return self._get_unlocked(key)
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Obtém vários valores, gravando o índice uma única vez.
+        
+        Args:
+            keys: Chaves a consultar
             
-            key_hash = self._hash_key(key)
+        Returns:
+            Dict[str, Any]: Valores encontrados por chave
+        """
+        found = {}
+        with self.lock:
+            for key in keys:
+                value = self._get_unlocked(key, persist_index=False)
+                if value is not None:
+                    found[key] = value
+            if found:
+                self._save_index()
+        return found
+    
+    def _get_unlocked(self, key: str, persist_index: bool = True) -> Optional[Any]:
+        """Obtém valor do cache em disco; o chamador deve deter o lock."""
+        self.stats.total_requests += 1
+        
+        key_hash = self._hash_key(key)
+        
+        if key_hash in self.index:
+            file_path = self.cache_dir / f"{key_hash}.json"
             
-            if key_hash in self.index:
-                file_path = self.cache_dir / f"{key_hash}.json"
-                
-                if file_path.exists():
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        
-                        entry = CacheEntry(**data['entry'])
-                        
-                        # Check if expired
-                        if entry.is_expired():
-                            self.delete(key)
-                            self.stats.misses += 1
-                            return None
-                        
-                        entry.touch()
-                        self._update_index(key_hash, entry)
-                        
-                        self.stats.hits += 1
-                        self.stats.update_hit_rate()
-                        
-                        return data['value']
+            if file_path.exists():
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
                     
-                    except (json.JSONDecodeError, KeyError, FileNotFoundError):
-                        # Corrupted cache entry, remove it
+                    entry = CacheEntry(**data['entry'])
+                    
+                    # Check if expired
+                    if entry.is_expired():
                         self.delete(key)
                         self.stats.misses += 1
                         return None
-                else:
-                    # Index entry exists but file doesn't, clean up
+                    
+                    entry.touch()
+                    self._update_index(key_hash, entry, persist=persist_index)
+                    
+                    self.stats.hits += 1
+                    self.stats.update_hit_rate()
+                    
+                    return data['value']
+                
+                except (json.JSONDecodeError, KeyError, FileNotFoundError):
+                    # Corrupted cache entry, remove it
                     self.delete(key)
                     self.stats.misses += 1
                     return None
             else:
+                # Index entry exists but file doesn't, clean up
+                self.delete(key)
                 self.stats.misses += 1
-                self.stats.update_hit_rate()
                 return None
+        else:
+            self.stats.misses += 1
+            self.stats.update_hit_rate()
+            return None
     
     def put(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
         """Armazena valor no cache em disco."""
         with self.lock:
-            try:
-                key_hash = self._hash_key(key)
-                file_path = self.cache_dir / f"{key_hash}.json"
-                
-                entry = CacheEntry(
-                    key=key,
-                    value=value,
-                    timestamp=time.time(),
-                    ttl=ttl or 3600,  # Default 1 hour
-                    size_bytes=0
-                )
-                
-                data = {
-                    'entry': asdict(entry),
-                    'value': value
-                }
-                
-                # Serialize value if it's a complex object
-                if hasattr(value, '__dict__'):
-                    data['value'] = self._serialize_complex_object(value)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, default=str)
-                
-                # Update size
-                entry.size_bytes = file_path.stat().st_size
-                
-                # Update index
-                self._update_index(key_hash, entry)
-                
-                # Check if we need to evict old entries
+            return self._put_unlocked(key, value, ttl)
+    
+    def put_many(self, items: Dict[str, Any], ttl: Optional[float] = None) -> bool:
+        """
+        Armazena vários valores, gravando o índice e limpando uma única vez.
+        
+        Args:
+            items: Valores por chave
+            ttl: Time to live em segundos
+            
+        Returns:
+            bool: True se todos foram armazenados
+        """
+        with self.lock:
+            success = all([
+                self._put_unlocked(key, value, ttl, persist_index=False)
+                for key, value in items.items()
+            ])
+            if items:
+                self._save_index()
                 self._cleanup_if_needed()
-                
-                return True
-                
-            except Exception:
-                return False
+            return success
+    
+    def _put_unlocked(self, key: str, value: Any, ttl: Optional[float] = None,
+                      persist_index: bool = True) -> bool:
+        """Armazena valor no cache em disco; o chamador deve deter o lock."""
+        try:
+            key_hash = self._hash_key(key)
+            file_path = self.cache_dir / f"{key_hash}.json"
+            
+            entry = CacheEntry(
+                key=key,
+                value=value,
+                timestamp=time.time(),
+                ttl=ttl or 3600,  # Default 1 hour
+                size_bytes=0
+            )
+            
+            data = {
+                'entry': asdict(entry),
+                'value': value
+            }
+            
+            # Serialize value if it's a complex object
+            if hasattr(value, '__dict__'):
+                data['value'] = self._serialize_complex_object(value)
+            
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=str)
+            
+            # Update size
+            entry.size_bytes = file_path.stat().st_size
+            
+            # Update index
+            self._update_index(key_hash, entry, persist=persist_index)
+            
+            # Check if we need to evict old entries
+            if persist_index:
+                self._cleanup_if_needed()
+            
+            return True
+            
+        except Exception:
+            return False
     
     def delete(self, key: str) -> bool:
         """Remove valor do cache em disco."""
@@ -422,10 +473,11 @@ class DiskCache(CacheLayer):
         except:
             pass
     
-    def _update_index(self, key_hash: str, entry: CacheEntry):
+    def _update_index(self, key_hash: str, entry: CacheEntry, persist: bool = True):
         """Atualiza entrada no índice."""
         self.index[key_hash] = asdict(entry)
-        self._save_index()
+        if persist:
+            self._save_index()
     
     def _cleanup_if_needed(self):
         """Limpa entradas antigas se necessário."""
@@ -556,6 +608,62 @@ class MultiLayerCache:
             
             return success
     
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Obtém vários valores em uma única passada pelas camadas.
+        
+        Consulta a memória para todas as chaves e o disco apenas para as
+        restantes, promovendo os valores encontrados no disco.
+        
+        Args:
+            keys: Chaves do cache
+            
+        Returns:
+            Dict[str, Any]: Valores encontrados por chave
+        """
+        start_time = time.time()
+        
+        with self.lock:
+            found: Dict[str, Any] = {}
+            missing = []
+            for key in keys:
+                value = self.memory_cache.get(key)
+                if value is not None:
+                    found[key] = value
+                else:
+                    missing.append(key)
+            
+            if missing:
+                from_disk = self.disk_cache.get_many(missing)
+                for key, value in from_disk.items():
+                    self.memory_cache.put(key, value)
+                found.update(from_disk)
+            
+            self.global_stats.total_requests += len(keys)
+            self.global_stats.hits += len(found)
+            self.global_stats.misses += len(keys) - len(found)
+            if found:
+                self._update_global_stats(start_time)
+            else:
+                self.global_stats.update_hit_rate()
+            return found
+    
+    def put_many(self, items: Dict[str, Any], ttl: Optional[float] = None) -> bool:
+        """
+        Armazena vários valores em todas as camadas.
+        
+        Args:
+            items: Valores por chave
+            ttl: Time to live em segundos
+            
+        Returns:
+            bool: True se pelo menos uma camada teve sucesso para todos
+        """
+        with self.lock:
+            memory_success = all([self.memory_cache.put(key, value, ttl) for key, value in items.items()])
+            disk_success = self.disk_cache.put_many(items, ttl)
+            return memory_success or disk_success
+    
     def delete(self, key: str) -> bool:
         """
         Remove valor de todas as camadas.
@@ -659,21 +767,27 @@ class SearchCache:
         
         cached_data = self.cache.get(query_key)
         if cached_data:
-            # Reconstruct SearchResult objects
-            results = []
-            for result_data in cached_data:
-                result = SearchResult(
-                    score=result_data['score'],
-                    metadata=result_data['metadata'],
-                    algorithm=result_data['algorithm'],
-                    details=result_data.get('details', {})
-                )
-                results.append(result)
-            
-            return results
+            return self._deserialize_results(cached_data)
         
         return None
     
+    def get_search_results_many(self, queries: List[SearchQuery]) -> List[Optional[List[SearchResult]]]:
+        """
+        Obtém resultados de várias queries com uma única consulta ao cache.
+        
+        Args:
+            queries: Queries de busca
+            
+        Returns:
+            List[Optional[List[SearchResult]]]: Resultados ou None, na ordem das queries
+        """
+        keys = [self._generate_query_key(query) for query in queries]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+        return [
+            self._deserialize_results(found[key]) if found.get(key) else None
+            for key in keys
+        ]
+    
     def cache_search_results(self, query: SearchQuery, results: List[SearchResult], ttl: float = 1800):
         """
         Armazena resultados de busca no cache.
@@ -684,18 +798,50 @@ class SearchCache:
             ttl: Time to live em segundos (default: 30 minutos)
         """
         query_key = self._generate_query_key(query)
+        self.cache.put(query_key, self._serialize_results(results), ttl)
+    
+    def cache_search_results_many(self,
+                                  entries: List[Tuple[SearchQuery, List[SearchResult]]],
+                                  ttl: float = 1800):
+        """
+        Armazena resultados de várias queries com uma única gravação de índice.
         
-        # Convert SearchResult objects to serializable format
-        serializable_results = []
-        for result in results[:20]:  # Limit to top 20 results
-            serializable_results.append({
+        Args:
+            entries: Pares (query, resultados)
+            ttl: Time to live em segundos (default: 30 minutos)
+        """
+        items = {
+            self._generate_query_key(query): self._serialize_results(results)
+            for query, results in entries
+        }
+        if items:
+            self.cache.put_many(items, ttl)
+    
+    @staticmethod
+    def _serialize_results(results: List[SearchResult]) -> List[Dict[str, Any]]:
+        """Converte SearchResult para formato serializável."""
+        return [
+            {
                 'score': result.score,
                 'metadata': result.metadata,
                 'algorithm': result.algorithm,
                 'details': result.details
-            })
-        
-        self.cache.put(query_key, serializable_results, ttl)
+            }
+            for result in results[:20]  # Limit to top 20 results
+        ]
+    
+    @staticmethod
+    def _deserialize_results(cached_data: List[Dict[str, Any]]) -> List[SearchResult]:
+        """Reconstrói objetos SearchResult a partir do cache."""
+        return [
+            SearchResult(
+                score=result_data['score'],
+                metadata=result_data['metadata'],
+                algorithm=result_data['algorithm'],
+                details=result_data.get('details', {})
+            )
+            for result_data in cached_data
+        ]
     
     def invalidate_query(self, query: SearchQuery) -> bool:
         """
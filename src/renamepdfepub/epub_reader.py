@@ -0,0 +1,217 @@
+"""Streaming EPUB reader: OPF package metadata and front-matter-first text.
+
+Reads the zip directly instead of loading the whole book: only the container,
+the OPF package document and, on demand, individual content documents are
+decompressed. Parsed packages are cached per (path, size, mtime) so the text
+extractor and the metadata extractors share a single OPF parse per file.
+"""
+from __future__ import annotations
+
+import html
+import posixpath
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+
+CONTAINER_PATH = 'META-INF/container.xml'
+DC_NAMESPACE = 'http://purl.org/dc/elements/1.1/'
+DOCUMENT_MEDIA_TYPES = {'application/xhtml+xml', 'text/html', 'application/x-dtbook+xml'}
+
+# Documents whose name or guide type suggests imprint/copyright information
+FRONT_MATTER_RE = re.compile(
+    r'copyright|colophon|imprint|legal|rights|isbn|title|front|cover|'
+    r'ficha|creditos|cr[eé]ditos|catalog',
+    re.IGNORECASE
+)
+GUIDE_PRIORITY = ('copyright-page', 'colophon', 'imprint', 'title-page', 'titlepage')
+
+ISBN_CANDIDATE_RE = re.compile(r'97[89]\d{10}|\d{9}[\dXx]')
+_SKIP_BLOCK_RE = re.compile(r'<(script|style|head)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_BLOCK_BREAK_RE = re.compile(
+    r'<\s*(?:br|/p|/div|/h[1-6]|/li|/tr|/section|/blockquote|/dd|/dt)\b[^>]*>',
+    re.IGNORECASE
+)
+_TAG_RE = re.compile(r'<[^>]*>')
+_INLINE_SPACES_RE = re.compile(r'[ \t\r\f\v\xa0]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+_PACKAGE_CACHE: 'OrderedDict[Tuple[str, int, int], EpubPackage]' = OrderedDict()
+_PACKAGE_CACHE_SIZE = 64
+_PACKAGE_CACHE_LOCK = threading.Lock()
+
+
+@dataclass
+class EpubPackage:
+    """Parsed OPF package: Dublin Core metadata, spine order and guide."""
+    path: str
+    opf_path: str
+    metadata: Dict[str, List[str]] = field(default_factory=dict)
+    spine: List[str] = field(default_factory=list)
+    guide: Dict[str, str] = field(default_factory=dict)
+
+    def get(self, name: str) -> List[str]:
+        """All values of a Dublin Core element (e.g. 'title', 'creator')."""
+        return self.metadata.get(name, [])
+
+    def first(self, name: str) -> Optional[str]:
+        """First value of a Dublin Core element, or None."""
+        values = self.metadata.get(name)
+        return values[0] if values else None
+
+    @property
+    def isbns(self) -> List[str]:
+        """Checksum-valid ISBNs found in dc:identifier, in document order."""
+        found: List[str] = []
+        for identifier in self.get('identifier'):
+            compact = re.sub(r'[\s-]', '', identifier)
+            for match in ISBN_CANDIDATE_RE.finditer(compact):
+                isbn = match.group(0).upper()
+                if is_valid_isbn(isbn) and isbn not in found:
+                    found.append(isbn)
+        return found
+
+    def reading_order(self, head: int = 5, tail: int = 3) -> List[str]:
+        """
+        Content documents in the order they should be scanned for an ISBN.
+
+        Copyright/front-matter documents come first (guide entries, then names
+        matching FRONT_MATTER_RE in spine order), followed by the first `head`
+        spine documents and finally the last `tail` ones.
+        """
+        ordered: List[str] = []
+        for kind in GUIDE_PRIORITY:
+            href = self.guide.get(kind)
+            if href in self.spine:
+                ordered.append(href)
+        ordered.extend(href for href in self.spine if FRONT_MATTER_RE.search(posixpath.basename(href)))
+        ordered.extend(self.spine[:head])
+        if tail > 0:
+            ordered.extend(self.spine[-tail:])
+        return list(dict.fromkeys(ordered))
+
+
+def is_valid_isbn(isbn: str) -> bool:
+    """Validate an ISBN-10 or ISBN-13 (digits only, optional trailing X) by checksum."""
+    if len(isbn) == 13 and isbn.isdigit() and isbn.startswith(('978', '979')):
+        total = sum(int(digit) * (1 if index % 2 == 0 else 3) for index, digit in enumerate(isbn[:12]))
+        return (10 - total % 10) % 10 == int(isbn[12])
+    if len(isbn) == 10 and isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] in 'Xx'):
+        total = sum((10 - index) * (10 if char in 'Xx' else int(char)) for index, char in enumerate(isbn))
+        return total % 11 == 0
+    return False
+
+
+def strip_tags(markup: str) -> str:
+    """Convert (X)HTML markup to plain text without building a DOM."""
+    text = _SKIP_BLOCK_RE.sub(' ', markup)
+    text = _BLOCK_BREAK_RE.sub('\n', text)
+    text = html.unescape(_TAG_RE.sub(' ', text))
+    text = _INLINE_SPACES_RE.sub(' ', text)
+    lines = [line.strip() for line in text.split('\n')]
+    return _BLANK_LINES_RE.sub('\n', '\n'.join(line for line in lines if line)).strip()
+
+
+def read_package(path: str) -> EpubPackage:
+    """
+    Return the parsed OPF package of an EPUB, shared across callers.
+
+    Raises:
+        zipfile.BadZipFile, KeyError, ET.ParseError: when the file is not a readable EPUB
+    """
+    file_path = Path(path)
+    stat = file_path.stat()
+    key = (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _PACKAGE_CACHE_LOCK:
+        package = _PACKAGE_CACHE.get(key)
+        if package is not None:
+            _PACKAGE_CACHE.move_to_end(key)
+            return package
+
+    with zipfile.ZipFile(path) as archive:
+        package = _parse_package(path, archive)
+
+    with _PACKAGE_CACHE_LOCK:
+        _PACKAGE_CACHE[key] = package
+        while len(_PACKAGE_CACHE) > _PACKAGE_CACHE_SIZE:
+            _PACKAGE_CACHE.popitem(last=False)
+    return package
+
+
+def iter_document_texts(package: EpubPackage, head: int = 5, tail: int = 3) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (href, plain text) for the documents in `package.reading_order()`.
+
+    Documents are decompressed one at a time, so callers that stop iterating
+    (e.g. after finding a valid ISBN) never touch the rest of the book.
+    """
+    with zipfile.ZipFile(package.path) as archive:
+        names = set(archive.namelist())
+        for href in package.reading_order(head, tail):
+            if href not in names:
+                continue
+            markup = archive.read(href).decode('utf-8', errors='ignore')
+            yield href, strip_tags(markup)
+
+
+def clear_cache() -> None:
+    """Drop all cached packages."""
+    with _PACKAGE_CACHE_LOCK:
+        _PACKAGE_CACHE.clear()
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag
+
+
+def _find_opf_path(archive: zipfile.ZipFile) -> str:
+    try:
+        container = ET.fromstring(archive.read(CONTAINER_PATH))
+        for element in container.iter():
+            if _local_name(element.tag) == 'rootfile' and element.get('full-path'):
+                return element.get('full-path')
+    except (KeyError, ET.ParseError):
+        pass
+    for name in archive.namelist():
+        if name.lower().endswith('.opf'):
+            return name
+    raise KeyError(f'No OPF package document in {archive.filename}')
+
+
+def _parse_package(path: str, archive: zipfile.ZipFile) -> EpubPackage:
+    opf_path = _find_opf_path(archive)
+    root = ET.fromstring(archive.read(opf_path))
+    base = posixpath.dirname(opf_path)
+
+    def resolve(href: str) -> str:
+        href = unquote(href.split('#', 1)[0])
+        return posixpath.normpath(posixpath.join(base, href)) if base else posixpath.normpath(href)
+
+    package = EpubPackage(path=path, opf_path=opf_path)
+    manifest: Dict[str, Tuple[str, str]] = {}
+    for element in root.iter():
+        name = _local_name(element.tag)
+        if element.tag.startswith('{' + DC_NAMESPACE + '}'):
+            value = ' '.join((element.text or '').split())
+            if value:
+                package.metadata.setdefault(name, []).append(value)
+        elif name == 'item' and element.get('href'):
+            manifest[element.get('id', '')] = (resolve(element.get('href')), element.get('media-type', ''))
+        elif name == 'itemref':
+            href, media_type = manifest.get(element.get('idref', ''), ('', ''))
+            if href and media_type in DOCUMENT_MEDIA_TYPES:
+                package.spine.append(href)
+        elif name == 'reference' and element.get('href'):
+            package.guide.setdefault(element.get('type', '').lower(), resolve(element.get('href')))
+    return package
+
+
+__all__ = [
+    'EpubPackage', 'is_valid_isbn', 'strip_tags', 'read_package',
+    'iter_document_texts', 'clear_cache'
+]
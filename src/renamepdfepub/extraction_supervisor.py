@@ -0,0 +1,292 @@
+"""Time- and memory-bounded extraction in recyclable worker processes.
+
+ExtractionSupervisor runs a picklable task (one file per call) in a small pool
+of worker processes. While a job runs, the calling thread watches the worker:
+past the wall-clock deadline or the RSS ceiling the worker is killed, the file
+is recorded in the PoisonFileRegistry and SupervisedExtractionError is raised.
+Workers are retired after `recycle_every` jobs so slow leaks in parser
+libraries never accumulate.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_MAX_RSS_MB = 1536
+DEFAULT_RECYCLE_EVERY = 50
+
+
+class SupervisedExtractionError(RuntimeError):
+    """A file exceeded its deadline or memory ceiling, or killed its worker."""
+
+    def __init__(self, file_path: str, reason: str, elapsed: float = 0.0, peak_rss: int = 0):
+        self.file_path = file_path
+        self.reason = reason
+        self.elapsed = elapsed
+        self.peak_rss = peak_rss
+        super().__init__(f"{reason} after {elapsed:.1f}s while extracting {file_path}")
+
+
+class PoisonFileRegistry:
+    """
+    Persistent list of slow/poison files (JSON), keyed by path.
+
+    An entry only applies while the file keeps the size and mtime it had when
+    it was quarantined, so a replaced or repaired file is scanned normally.
+    """
+
+    def __init__(self, path: str = 'poison_files.json'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def is_quarantined(self, file_path: str) -> bool:
+        return self.strikes(file_path) > 0
+
+    def strikes(self, file_path: str) -> int:
+        """Times the current version of the file was killed (0 if not quarantined)."""
+        with self._lock:
+            entry = self._load().get(os.path.abspath(file_path))
+        if not entry or entry.get('fingerprint') != _fingerprint(file_path):
+            return 0
+        return int(entry.get('strikes', 1))
+
+    def add(self, file_path: str, reason: str, elapsed: float = 0.0, peak_rss: int = 0) -> None:
+        key = os.path.abspath(file_path)
+        fingerprint = _fingerprint(file_path)
+        with self._lock:
+            entries = self._load()
+            previous = entries.get(key, {})
+            strikes = previous.get('strikes', 0) if previous.get('fingerprint') == fingerprint else 0
+            entries[key] = {
+                'reason': reason,
+                'elapsed': round(elapsed, 2),
+                'peak_rss_mb': round(peak_rss / (1024 * 1024), 1),
+                'fingerprint': fingerprint,
+                'strikes': strikes + 1,
+                'quarantined_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._save(entries)
+
+    def release(self, file_path: str) -> bool:
+        """Drop a file from quarantine (e.g. after it finished within limits)."""
+        with self._lock:
+            entries = self._load()
+            if entries.pop(os.path.abspath(file_path), None) is None:
+                return False
+            self._save(entries)
+            return True
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._load())
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as handle:
+                    self._entries = dict(json.load(handle))
+            except (OSError, ValueError, TypeError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump(entries, handle, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+class _Worker:
+    __slots__ = ('process', 'conn', 'jobs')
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.jobs = 0
+
+
+def _worker_main(conn, task: Callable[..., Any]) -> None:
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        try:
+            conn.send(('ok', task(*job)))
+        except BaseException as exc:  # report, keep serving
+            conn.send(('error', f"{type(exc).__name__}: {exc}"))
+    conn.close()
+
+
+def _default_context():
+    """Start workers from a clean interpreter, never by forking the threaded scan."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class ExtractionSupervisor:
+    """
+    Bounded pool of recyclable worker processes with per-job watchdog.
+
+    Args:
+        task: Picklable callable run in the worker as task(file_path, *args)
+        max_workers: Concurrent worker processes
+        timeout: Wall-clock deadline per file, in seconds
+        max_rss_mb: Resident memory ceiling per worker, in MiB (None disables it)
+        recycle_every: Jobs served before a worker is replaced
+        registry: Where killed files are quarantined
+        mp_context: multiprocessing context (default: forkserver, or spawn where
+            it is unavailable; never fork, which would copy the scan threads' locks)
+    """
+
+    def __init__(self,
+                 task: Callable[..., Any],
+                 max_workers: int = 4,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_rss_mb: Optional[float] = DEFAULT_MAX_RSS_MB,
+                 recycle_every: int = DEFAULT_RECYCLE_EVERY,
+                 registry: Optional[PoisonFileRegistry] = None,
+                 poll_interval: float = 0.1,
+                 mp_context=None):
+        self.task = task
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_rss = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+        self.recycle_every = max(1, recycle_every)
+        self.registry = registry if registry is not None else PoisonFileRegistry()
+        self.poll_interval = poll_interval
+        self._context = mp_context or _default_context()
+        self._idle: 'queue.LifoQueue[_Worker]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self.stats = {'jobs': 0, 'spawned': 0, 'recycled': 0, 'timeouts': 0, 'memory_kills': 0, 'crashes': 0}
+
+    def run(self, file_path: str, *args: Any) -> Any:
+        """
+        Run the task for one file under the watchdog.
+
+        Raises:
+            SupervisedExtractionError: deadline, memory ceiling or worker crash
+            RuntimeError: the task itself raised (the worker keeps serving)
+        """
+        with self._slots:
+            worker = self._acquire()
+            started = time.monotonic()
+            peak_rss = 0
+            try:
+                worker.conn.send((file_path, *args))
+                while not worker.conn.poll(self.poll_interval):
+                    elapsed = time.monotonic() - started
+                    if not worker.process.is_alive():
+                        self._fail(worker, file_path, 'crashed', elapsed, peak_rss)
+                    if self.timeout and elapsed > self.timeout:
+                        self._fail(worker, file_path, 'timeout', elapsed, peak_rss)
+                    rss = _rss_bytes(worker.process.pid)
+                    peak_rss = max(peak_rss, rss or 0)
+                    if self.max_rss and rss and rss > self.max_rss:
+                        self._fail(worker, file_path, 'memory', elapsed, peak_rss)
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                self._fail(worker, file_path, 'crashed', time.monotonic() - started, peak_rss)
+
+            worker.jobs += 1
+            with self._lock:
+                self.stats['jobs'] += 1
+            self._release(worker)
+
+        if status == 'error':
+            raise RuntimeError(payload)
+        if self.registry.is_quarantined(file_path):
+            # Finished within limits this time: give the file its lane back
+            self.registry.release(file_path)
+        return payload
+
+    def shutdown(self) -> None:
+        """Stop all idle workers."""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(worker)
+
+    def _acquire(self) -> _Worker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_conn, self.task), name='extraction-worker')
+        process.start()
+        child_conn.close()
+        with self._lock:
+            self.stats['spawned'] += 1
+        return _Worker(process, parent_conn)
+
+    def _release(self, worker: _Worker) -> None:
+        if worker.jobs >= self.recycle_every:
+            with self._lock:
+                self.stats['recycled'] += 1
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+
+    def _retire(self, worker: _Worker) -> None:
+        try:
+            worker.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
+
+    def _fail(self, worker: _Worker, file_path: str, reason: str, elapsed: float, peak_rss: int) -> None:
+        worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        counter = {'timeout': 'timeouts', 'memory': 'memory_kills'}.get(reason, 'crashes')
+        with self._lock:
+            self.stats[counter] += 1
+        self.registry.add(file_path, reason, elapsed, peak_rss)
+        raise SupervisedExtractionError(file_path, reason, elapsed, peak_rss)
+
+
+def _fingerprint(file_path: str) -> Optional[list]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except Exception:
+            return None
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+__all__ = ['ExtractionSupervisor', 'PoisonFileRegistry', 'SupervisedExtractionError']
@@ -0,0 +1,314 @@
+"""Zero-I/O fast lane: resolve books from their filenames alone.
+
+parse_filename() merges what several filename heuristics can read from a path
+(the " - "-separated fallback of metadata_extractor plus any extra parsers the
+caller plugs in, e.g. MetadataTextAnalyzer or the V3 extractor) and a
+checksum-validated ISBN embedded in the name. None of this touches the file.
+
+LocalCatalog is an in-memory index (ISBN and title tokens) built in one bulk
+read of the local metadata DB. FilenameLane runs every path through the
+parsers, matches them against the catalog and splits the batch into files
+that are resolved with enough confidence and files that still need their
+content opened.
+"""
+from __future__ import annotations
+
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .epub_reader import is_valid_isbn
+    from .metadata_extractor import _fallback_metadata_from_filename
+except ImportError:
+    from epub_reader import is_valid_isbn
+    from metadata_extractor import _fallback_metadata_from_filename
+
+FilenameParser = Callable[[str], Optional[Dict[str, Any]]]
+
+CATALOG_CONFIDENCE = 0.8
+ISBN_CONFIDENCE = 0.6
+# Title prefix without an agreeing author: a hint, never enough to resolve
+PREFIX_ONLY_CONFIDENCE = 0.7
+
+_FILENAME_ISBN_RE = re.compile(r'(?<![\dXx])(97[89](?:[-_ ]?\d){10}|(?:\d[-_ ]?){9}[\dXx])(?![\dXx])')
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_STOPWORDS = {
+    'a', 'an', 'and', 'the', 'of', 'to', 'in', 'on', 'for', 'with', 'by', 'from',
+    'o', 'os', 'as', 'de', 'do', 'da', 'dos', 'das', 'e', 'em', 'um', 'uma', 'para', 'com',
+    'edition', 'ed', 'edicao', 'pdf', 'epub', 'mobi', 'ebook', 'meap',
+}
+
+
+def normalize_key(text: str) -> str:
+    """Lowercase, accent-free, punctuation-free form used for matching."""
+    folded = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(_TOKEN_RE.findall(folded.lower()))
+
+
+def title_tokens(text: str) -> List[str]:
+    """Significant tokens of a title (no stopwords, years or one-letter words)."""
+    return [token for token in normalize_key(text).split()
+            if len(token) > 1 and token not in _STOPWORDS and not re.fullmatch(r'(19|20)\d{2}', token)]
+
+
+def surnames(authors: Iterable[str]) -> set:
+    """Last name of each author, normalized."""
+    names = set()
+    for author in authors or []:
+        parts = normalize_key(author).split()
+        if parts:
+            names.add(parts[-1])
+    return names
+
+
+def isbn_from_filename(name: str) -> Optional[str]:
+    """First checksum-valid ISBN written in a filename (digits only)."""
+    for match in _FILENAME_ISBN_RE.finditer(name):
+        candidate = re.sub(r'[^0-9Xx]', '', match.group(1)).upper()
+        if is_valid_isbn(candidate):
+            return candidate
+    return None
+
+
+def _as_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in re.split(r'\s*(?:,|;| and | & )\s*', value) if part.strip()]
+    return [str(item).strip() for item in value if item and str(item).strip()]
+
+
+def parse_filename(path: str, parsers: Sequence[FilenameParser] = ()) -> Dict[str, Any]:
+    """
+    Read title/author/publisher/year/ISBN candidates from a path, without I/O.
+
+    Args:
+        path: File path (only the name is used)
+        parsers: Extra parsers called with the file stem; each returns a dict
+            with any of title, authors/author, publisher, year/published_date
+
+    Returns:
+        Dict with the merged fields plus 'titles' (every distinct candidate,
+        best first) and 'swapped' (the "Title - Author" reading, or None) for
+        catalog matching
+    """
+    name = os.path.basename(path)
+    stem = os.path.splitext(name)[0]
+    results = [_fallback_metadata_from_filename(path)]
+    for parser in parsers:
+        try:
+            result = parser(stem)
+        except Exception:
+            result = None
+        if result:
+            results.append(result)
+
+    titles: List[str] = []
+    authors: List[str] = []
+    publisher = year = None
+    for result in results:
+        title = (result.get('title') or '').strip()
+        if title and title != 'Unknown' and normalize_key(title) not in {normalize_key(t) for t in titles}:
+            titles.append(title)
+        for author in _as_list(result.get('authors') or result.get('author')):
+            if author.lower() not in {a.lower() for a in authors}:
+                authors.append(author)
+        publisher = publisher or result.get('publisher') or None
+        year = year or result.get('year') or result.get('published_date') or None
+    # Title-cased heuristics also propose the title itself as an author
+    title_keys = {normalize_key(title) for title in titles}
+    authors = [author for author in authors if normalize_key(author) not in title_keys]
+    # "Title - Author" reads as author="Title", title="Author": keep the other reading too
+    fallback = results[0]
+    swapped = None
+    if fallback.get('authors') and fallback.get('title'):
+        swapped = {'title': fallback['authors'], 'authors': [fallback['title']]}
+
+    return {
+        'title': titles[0] if titles else None,
+        'titles': titles,
+        'authors': authors,
+        'publisher': publisher,
+        'published_date': str(year) if year else None,
+        'isbn': isbn_from_filename(name),
+        'swapped': swapped,
+    }
+
+
+class LocalCatalog:
+    """
+    In-memory ISBN and title-token index over local metadata records.
+
+    Records use the metadata cache layout: title, authors (list),
+    publisher, published_date, isbn_10, isbn_13.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()):
+        self.records: List[Dict[str, Any]] = []
+        self._by_isbn: Dict[str, int] = {}
+        self._by_token: Dict[str, List[int]] = defaultdict(list)
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_cache(cls, cache: Any) -> 'LocalCatalog':
+        """Build the index with a single bulk read (cache.get_all())."""
+        try:
+            records = cache.get_all()
+        except Exception:
+            records = []
+        return cls(records or [])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        if not record or not record.get('title'):
+            return
+        index = len(self.records)
+        self.records.append(record)
+        for key in ('isbn_13', 'isbn_10'):
+            isbn = re.sub(r'[^0-9Xx]', '', str(record.get(key) or '')).upper()
+            if isbn:
+                self._by_isbn.setdefault(isbn, index)
+        for token in set(title_tokens(record['title'])):
+            self._by_token[token].append(index)
+
+    def find_isbn(self, isbn: str) -> Optional[Dict[str, Any]]:
+        index = self._by_isbn.get(isbn)
+        return self.records[index] if index is not None else None
+
+    def match(self, parsed: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Best catalog record for a parsed filename and the match confidence.
+
+        An ISBN hit is near-certain; title hits are scored by similarity of the
+        normalized titles, adjusted by author surname agreement (a surname
+        written into the title counts). A filename title that is only a prefix
+        of the record's (subtitle dropped) needs an agreeing author to score
+        above PREFIX_ONLY_CONFIDENCE. "Title - Author" names are also tried
+        with the two parts swapped.
+        """
+        isbn = parsed.get('isbn')
+        if isbn:
+            record = self.find_isbn(isbn)
+            if record is not None:
+                return record, 0.95
+
+        readings = [(title, surnames(parsed.get('authors') or [])) for title in parsed.get('titles') or []]
+        swapped = parsed.get('swapped')
+        if swapped:
+            readings.append((swapped['title'], surnames(swapped['authors'])))
+        best: Optional[Dict[str, Any]] = None
+        best_score = 0.0
+        for title, wanted_authors in readings:
+            tokens = title_tokens(title)
+            if not tokens:
+                continue
+            # Records sharing at least half of the tokens; edition words or a
+            # surname in the name are tokens the catalog titles do not have
+            hits = Counter(index for token in set(tokens) for index in self._by_token.get(token, ()))
+            needed = (len(set(tokens)) + 1) // 2
+            for index, count in hits.items():
+                if count < needed:
+                    continue
+                record = self.records[index]
+                record_tokens = title_tokens(record['title'])
+                record_key = ' '.join(record_tokens)
+                record_authors = surnames(record.get('authors') or [])
+                extra = set(tokens) - set(record_tokens)
+                agree = bool((wanted_authors | extra) & record_authors)
+                key = ' '.join(token for token in tokens if token not in extra & record_authors)
+                score = SequenceMatcher(None, key, record_key).ratio()
+                if len(tokens) >= 2 and record_key.startswith(key + ' '):
+                    # Filename dropped the subtitle: many books share a title prefix
+                    score = 0.9 if agree else min(score, PREFIX_ONLY_CONFIDENCE)
+                if agree:
+                    score += 0.1
+                elif wanted_authors and record_authors:
+                    score -= 0.3
+                if score > best_score:
+                    best, best_score = record, score
+        return best, min(best_score, 0.95)
+
+
+class FilenameLane:
+    """
+    Resolve a batch of paths from filenames and the local catalog only.
+
+    Args:
+        catalog: Local metadata index
+        parsers: Extra filename parsers (see parse_filename)
+        min_confidence: Catalog matches below this stay unresolved
+    """
+
+    def __init__(self, catalog: Optional[LocalCatalog] = None,
+                 parsers: Sequence[FilenameParser] = (),
+                 min_confidence: float = CATALOG_CONFIDENCE):
+        self.catalog = catalog if catalog is not None else LocalCatalog()
+        self.parsers = list(parsers)
+        self.min_confidence = min_confidence
+
+    def hint_for(self, path: str) -> Dict[str, Any]:
+        """Hint for one path; 'resolved' tells whether content can be skipped."""
+        parsed = parse_filename(path, self.parsers)
+        record, score = self.catalog.match(parsed) if len(self.catalog) else (None, 0.0)
+        if record is not None and score >= self.min_confidence:
+            isbn = record.get('isbn_13') or record.get('isbn_10') or parsed.get('isbn')
+            return {
+                'title': record.get('title'),
+                'authors': _as_list(record.get('authors')),
+                'publisher': record.get('publisher') or parsed.get('publisher'),
+                'published_date': record.get('published_date') or parsed.get('published_date'),
+                'isbn': isbn,
+                'confidence': round(score, 3),
+                'source': 'local_catalog',
+                'resolved': True,
+            }
+        hint = {key: parsed[key] for key in ('title', 'authors', 'publisher', 'published_date', 'isbn')}
+        hint['source'] = 'filename'
+        if parsed.get('isbn'):
+            # A valid ISBN in the name is enough to fetch metadata without opening the file
+            hint['confidence'] = ISBN_CONFIDENCE
+            hint['resolved'] = True
+        else:
+            hint['confidence'] = 0.35 if parsed.get('title') or parsed.get('authors') else 0.0
+            hint['resolved'] = False
+        return hint
+
+    def resolve(self, paths: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str], Dict[str, int]]:
+        """
+        Returns:
+            (hints for every path, paths that still need content extraction, stats)
+        """
+        hints: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+        stats = {'files': 0, 'catalog_hits': 0, 'filename_isbns': 0, 'pending': 0}
+        for path in paths:
+            stats['files'] += 1
+            hint = self.hint_for(path)
+            hints[path] = hint
+            if hint['source'] == 'local_catalog':
+                stats['catalog_hits'] += 1
+            elif hint['resolved']:
+                stats['filename_isbns'] += 1
+            else:
+                pending.append(path)
+                stats['pending'] += 1
+        return hints, pending, stats
+
+
+__all__ = [
+    'CATALOG_CONFIDENCE',
+    'PREFIX_ONLY_CONFIDENCE',
+    'FilenameLane',
+    'LocalCatalog',
+    'isbn_from_filename',
+    'normalize_key',
+    'parse_filename',
+    'title_tokens',
+]
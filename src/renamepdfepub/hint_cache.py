@@ -0,0 +1,97 @@
+"""Persistent cache of preprocessor hints keyed by (path, size, mtime).
+
+The fast preprocessor's content scan is the expensive part of a hint. Hints
+are stored per file version so repeated runs over the same library (e.g.
+scan-cycles) only rescan files that were added or modified since.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+HINT_CACHE_VERSION = 1
+_BATCH = 500
+
+
+def _fingerprint(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class HintCache:
+    """SQLite store of preprocessor hints, invalidated when a file changes."""
+
+    def __init__(self, db_path: str = 'preprocessor_hints.db', version: int = HINT_CACHE_VERSION):
+        self.db_path = db_path
+        self.version = version
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS hints (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                version INTEGER NOT NULL,
+                hint_json TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([path]).get(path)
+
+    def get_many(self, paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached hints of the files whose current version matches the stored one."""
+        wanted = {}
+        for path in paths:
+            fingerprint = _fingerprint(path)
+            if fingerprint is not None:
+                wanted[os.path.abspath(path)] = (path, fingerprint)
+        found: Dict[str, Dict[str, Any]] = {}
+        keys = list(wanted)
+        with self._lock:
+            for start in range(0, len(keys), _BATCH):
+                chunk = keys[start:start + _BATCH]
+                rows = self._conn.execute(
+                    f"SELECT path, size, mtime_ns, version, hint_json FROM hints "
+                    f"WHERE path IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, size, mtime_ns, version, hint_json in rows:
+                    path, fingerprint = wanted[key]
+                    if version != self.version or (size, mtime_ns) != fingerprint:
+                        continue
+                    try:
+                        found[path] = json.loads(hint_json)
+                    except ValueError:
+                        continue
+        return found
+
+    def put(self, path: str, hint: Dict[str, Any]) -> bool:
+        """Store the hint for the current version of the file (False if it vanished)."""
+        fingerprint = _fingerprint(path)
+        if fingerprint is None:
+            return False
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO hints(path, size, mtime_ns, version, hint_json) VALUES (?, ?, ?, ?, ?)',
+                (os.path.abspath(path), fingerprint[0], fingerprint[1], self.version,
+                 json.dumps(hint, ensure_ascii=False)),
+            )
+            self._conn.commit()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ['HintCache', 'HINT_CACHE_VERSION']
@@ -0,0 +1,301 @@
+"""Rolling API statistics published live through a memory-mapped ring buffer.
+
+LiveStats keeps, per API, a call count, success count, an exponentially
+weighted moving average of the latency and a t-digest of latencies, so each
+observation costs O(1) (amortised for the digest) and a snapshot never walks
+the call history.
+
+LiveStatsPublisher writes JSON snapshots into the slots of a small
+memory-mapped file, at most once per min_interval seconds. Readers
+(read_live_stats) map the same file and pick the newest complete slot, so a
+dashboard can poll it without the scan rewriting a JSON document.
+
+File layout: a 32-byte header (magic, slot count, slot size, newest sequence
+number) followed by fixed-size slots, each holding its sequence number, the
+payload length and the UTF-8 JSON payload. A slot's sequence number is
+cleared before its payload is rewritten and set again afterwards, so a reader
+that sees the same number before and after copying the payload has a complete
+snapshot.
+"""
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+DEFAULT_RING_PATH = 'reports/live_api_stats.ring'
+MIN_INTERVAL = 1.0
+RING_SLOTS = 4
+SLOT_SIZE = 256 * 1024
+EWMA_ALPHA = 0.2
+
+_MAGIC = b'RLS1'
+_HEADER = struct.Struct('<4sIIIQQ')
+_SLOT_HEADER = struct.Struct('<QI')
+
+
+class TDigest:
+    """
+    Merging t-digest: approximate quantiles in bounded memory.
+
+    Points are buffered and folded into at most ~compression centroids when
+    the buffer fills; digests built in different places can be merged.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self._centroids: List[List[float]] = []
+        self._buffer: List[List[float]] = []
+        self.count = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        self._buffer.append([float(value), float(weight)])
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Fold another digest into this one."""
+        other._compress()
+        self._buffer.extend([mean, weight] for mean, weight in other._centroids)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        self._compress()
+        if not self._centroids:
+            return 0.0
+        if len(self._centroids) == 1:
+            return self._centroids[0][0]
+        target = min(max(q, 0.0), 1.0) * self.count
+        cumulative = 0.0
+        previous_mean, previous_center = self.min, 0.0
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                fraction = (target - previous_center) / span if span > 0 else 0.0
+                return previous_mean + fraction * (mean - previous_mean)
+            previous_mean, previous_center = mean, center
+            cumulative += weight
+        span = self.count - previous_center
+        fraction = (target - previous_center) / span if span > 0 else 0.0
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def __len__(self) -> int:
+        self._compress()
+        return len(self._centroids)
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+        merged = [list(points[0])]
+        cumulative = 0.0
+        k_left = self._scale(0.0)
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            proposed = current[1] + weight
+            # k1 scale: small centroids at the tails, larger ones around the median
+            if self._scale((cumulative + proposed) / total) - k_left <= 1.0:
+                current[0] += (mean - current[0]) * weight / proposed
+                current[1] = proposed
+            else:
+                cumulative += current[1]
+                k_left = self._scale(cumulative / total)
+                merged.append([mean, weight])
+        self._centroids = merged
+
+    def _scale(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+
+class RollingStats:
+    """Aggregates of one API, updated in O(1) per call."""
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self.count = 0
+        self.success = 0
+        self.ewma_latency: Optional[float] = None
+        self.latency = TDigest()
+        self.errors: Counter = Counter()
+        self.recent_errors: Deque[Dict[str, Any]] = deque(maxlen=10)
+        self.recent_failures: Deque[Dict[str, Any]] = deque(maxlen=20)
+
+    def observe(self, latency: float, success: bool) -> None:
+        self.count += 1
+        self.success += bool(success)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+        self.latency.add(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'total': self.count,
+            'success': self.success,
+            'success_rate': (self.success / self.count * 100) if self.count else 0.0,
+            'avg_time': round(self.ewma_latency or 0.0, 4),
+            'p50': round(self.latency.quantile(0.5), 4),
+            'p95': round(self.latency.quantile(0.95), 4),
+            'p99': round(self.latency.quantile(0.99), 4),
+            'errors': dict(self.errors),
+            'recent_errors': list(self.recent_errors),
+            'recent_failures': list(self.recent_failures),
+        }
+
+
+class LiveStats:
+    """Thread-safe RollingStats per API."""
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._apis: Dict[str, RollingStats] = {}
+
+    def observe(self, api_name: str, latency: float, success: bool) -> None:
+        with self._lock:
+            self._api(api_name).observe(latency, success)
+
+    def error(self, api_name: str, error_type: str, ts: Optional[float] = None) -> None:
+        with self._lock:
+            stats = self._api(api_name)
+            stats.errors[error_type] += 1
+            stats.recent_errors.append({'type': error_type, 'ts': ts or time.time()})
+
+    def failure(self, api_name: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._api(api_name).recent_failures.append(entry)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-API aggregates plus overall totals."""
+        with self._lock:
+            per_api = {api: stats.snapshot() for api, stats in self._apis.items() if stats.count}
+        total = sum(stats['total'] for stats in per_api.values())
+        success = sum(stats['success'] for stats in per_api.values())
+        return {
+            'overall': {
+                'total': total,
+                'success': success,
+                'success_rate': (success / total * 100) if total else 0.0,
+            },
+            'per_api': per_api,
+        }
+
+    def _api(self, api_name: str) -> RollingStats:
+        stats = self._apis.get(api_name)
+        if stats is None:
+            stats = self._apis[api_name] = RollingStats(self.alpha)
+        return stats
+
+
+class LiveStatsPublisher:
+    """
+    Rate-limited writer of JSON snapshots into a memory-mapped ring buffer.
+
+    Args:
+        path: Ring file (created on the first publish)
+        min_interval: Minimum seconds between two publishes
+        slots: Number of ring slots
+        slot_size: Bytes per slot, header included
+        clock: Monotonic time source
+    """
+
+    def __init__(self, path: str = DEFAULT_RING_PATH, min_interval: float = MIN_INTERVAL,
+                 slots: int = RING_SLOTS, slot_size: int = SLOT_SIZE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.path = str(path)
+        self.min_interval = min_interval
+        self.slots = max(2, slots)
+        self.slot_size = slot_size
+        self.clock = clock
+        self.seq = 0
+        self._last_publish: Optional[float] = None
+        self._lock = threading.Lock()
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def due(self) -> bool:
+        return self._last_publish is None or self.clock() - self._last_publish >= self.min_interval
+
+    def maybe_publish(self, build: Callable[[], Dict[str, Any]], force: bool = False) -> bool:
+        """Build and publish a snapshot if min_interval has elapsed (or force)."""
+        if not (force or self.due()):
+            return False
+        return self.publish(build())
+
+    def publish(self, payload: Dict[str, Any]) -> bool:
+        data = json.dumps(payload, ensure_ascii=False, default=str, separators=(',', ':')).encode('utf-8')
+        if len(data) > self.slot_size - _SLOT_HEADER.size:
+            return False
+        with self._lock:
+            self._last_publish = self.clock()
+            ring = self._ring()
+            self.seq += 1
+            offset = _HEADER.size + (self.seq % self.slots) * self.slot_size
+            _SLOT_HEADER.pack_into(ring, offset, 0, 0)
+            ring[offset + _SLOT_HEADER.size:offset + _SLOT_HEADER.size + len(data)] = data
+            _SLOT_HEADER.pack_into(ring, offset, self.seq, len(data))
+            _HEADER.pack_into(ring, 0, _MAGIC, self.slots, self.slot_size, 0, self.seq, 0)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._file.close()
+                self._map = self._file = None
+
+    def _ring(self) -> mmap.mmap:
+        if self._map is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'w+b')
+            self._file.truncate(_HEADER.size + self.slots * self.slot_size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            _HEADER.pack_into(self._map, 0, _MAGIC, self.slots, self.slot_size, 0, 0, 0)
+        return self._map
+
+
+def read_live_stats(path: str = DEFAULT_RING_PATH, retries: int = 3) -> Optional[Dict[str, Any]]:
+    """Newest complete snapshot in a ring file, or None."""
+    try:
+        if os.path.getsize(path) < _HEADER.size:
+            return None
+        with open(path, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as ring:
+            for _ in range(retries):
+                magic, slots, slot_size, _, seq, _ = _HEADER.unpack_from(ring, 0)
+                if magic != _MAGIC or not seq or len(ring) < _HEADER.size + slots * slot_size:
+                    return None
+                offset = _HEADER.size + (seq % slots) * slot_size
+                slot_seq, length = _SLOT_HEADER.unpack_from(ring, offset)
+                start = offset + _SLOT_HEADER.size
+                data = ring[start:start + min(length, slot_size - _SLOT_HEADER.size)]
+                if slot_seq == seq and _SLOT_HEADER.unpack_from(ring, offset)[0] == seq:
+                    return json.loads(data.decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+__all__ = [
+    'TDigest', 'RollingStats', 'LiveStats', 'LiveStatsPublisher', 'read_live_stats',
+    'DEFAULT_RING_PATH', 'MIN_INTERVAL',
+]
@@ -15,31 +15,21 @@ import unicodedata
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-# PDF handling
+# PDF handling: one mapped handle per file, text backends in calibrated order
+# (pdf_backends.json; pypdf/pdfminer before pdfplumber when uncalibrated)
 try:
-    import pdfplumber
-except Exception:
-    pdfplumber = None
-
-# Prefer modern 'pypdf' package (replacement for PyPDF2). Fall back to PyPDF2 if
-# pypdf isn't available. We expose a PdfReader symbol compatible with both.
-PdfReader = None
-try:
-    # pypdf uses the same API name PdfReader
-    from pypdf import PdfReader as _PdfReader  # type: ignore
-    PdfReader = _PdfReader
-except Exception:
-    try:
-        import PyPDF2  # type: ignore
-        PdfReader = PyPDF2.PdfReader
-    except Exception:
-        PdfReader = None
+    from .pdf_backends import extract_text as extract_pdf_text
+    from .pdf_document import open_document as open_pdf_document
+except ImportError:
+    from pdf_backends import extract_text as extract_pdf_text
+    from pdf_document import open_document as open_pdf_document
 
-# EPUB handling
+# EPUB handling (zip + OPF, no optional dependency needed)
 try:
-    from ebooklib import epub
-except Exception:
-    epub = None
+    from .epub_reader import read_package
+except ImportError:
+    # Loaded as a top-level module (src/renamepdfepub on sys.path)
+    from epub_reader import read_package
 
 # HTML parsing
 try:
@@ -292,40 +282,28 @@ def _post_process_extracted_metadata(path: str, result: Dict[str, Optional[str]]
     return cleaned
 
 def extract_from_epub(path: str) -> Dict[str, Optional[str]]:
+    """Extract metadata from the EPUB's OPF package (shared, cached parse)."""
     result = {k: None for k in ['title', 'subtitle', 'authors', 'publisher', 'year', 'isbn10', 'isbn13']}
-    if epub is None:
-        return result
     try:
-        book = epub.read_epub(path)
-        md = book.get_metadata('DC', 'title')
-        if md:
-            title = str(md[0][0])
+        package = read_package(path)
+        title = package.first('title')
+        if title:
             if ':' in title:
                 parts = title.split(':', 1)
                 result['title'] = normalize_spaces(parts[0])
                 result['subtitle'] = normalize_spaces(parts[1])
             else:
                 result['title'] = normalize_spaces(title)
-        creators = book.get_metadata('DC', 'creator')
+        creators = package.get('creator')
         if creators:
-            result['authors'] = ', '.join([str(c[0]) for c in creators])
-        pub = book.get_metadata('DC', 'publisher')
-        if pub:
-            result['publisher'] = str(pub[0][0])
-        dates = book.get_metadata('DC', 'date')
-        if dates:
-            result['year'] = str(dates[0][0])[:4]
-        ids = book.get_metadata('DC', 'identifier')
-        if ids:
-            # try to find ISBN within identifier
-            for ident in ids:
-                txt = str(ident[0])
-                m13 = ISBN13_RE.search(txt)
-                if m13:
-                    result['isbn13'] = re.sub(r'[^0-9Xx]', '', m13.group(1))
-                m10 = ISBN10_RE.search(txt)
-                if m10:
-                    result['isbn10'] = m10.group(1)
+            result['authors'] = ', '.join(creators)
+        result['publisher'] = package.first('publisher')
+        date = package.first('date')
+        if date:
+            result['year'] = date[:4]
+        for isbn in package.isbns:
+            key = 'isbn13' if len(isbn) == 13 else 'isbn10'
+            result[key] = result[key] or isbn
     except Exception:
         pass
     processed = _post_process_extracted_metadata(path, result)
@@ -342,35 +320,12 @@ def extract_from_pdf(path: str, pages_to_scan: int = 7) -> Dict[str, Optional[st
         text = cached_text
     else:
         # Extract text and cache it
-        text = ''
         try:
-            if pdfplumber:
-                with pdfplumber.open(path) as pdf:
-                    for p in pdf.pages[:pages_to_scan]:
-                        t = p.extract_text() or ''
-                        text += '\n' + t
-            elif PdfReader:
-                with open(path, 'rb') as f:
-                    reader = PdfReader(f)
-                    for p in reader.pages[:pages_to_scan]:
-                        # pypdf and PyPDF2 expose extract_text on page objects
-                        t = p.extract_text() or ''
-                        text += '\n' + t
-            else:
-                # Sem extratores disponíveis: seguimos com texto vazio para acionar fallback por nome
-                text = ''
-        except Exception:
-            # fallback: try PyPDF2 if pdfplumber failed
-            try:
-                if PdfReader:
-                    with open(path, 'rb') as f:
-                        reader = PdfReader(f)
-                        for p in reader.pages[:pages_to_scan]:
-                            t = p.extract_text() or ''
-                            text += '\n' + t
-            except Exception:
-                # Mantém texto vazio para permitir pós-processamento com fallback
-                text = ''
+            with open_pdf_document(path) as document:
+                text, _, _ = extract_pdf_text(document, pages_to_scan)
+        except OSError:
+            # Mantém texto vazio para permitir pós-processamento com fallback
+            text = ''
         
         # Cache the extracted text
         if text.strip():
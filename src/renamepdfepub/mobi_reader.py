@@ -0,0 +1,224 @@
+"""Memory-mapped MOBI/AZW/AZW3 header reader.
+
+Parses the PalmDB record table, the PalmDOC/MOBI headers of record 0 and the
+EXTH block (ISBN, title, author, publisher, publication date) straight from an
+mmap, without decoding the text body. Only when a book carries no EXTH data
+do callers need read_text(), which decompresses just the first few PalmDOC
+text records.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+PALMDB_HEADER_SIZE = 78
+MOBI_TYPES = (b'BOOKMOBI', b'TEXtREAd')
+
+COMPRESSION_NONE = 1
+COMPRESSION_PALMDOC = 2
+COMPRESSION_HUFFCDIC = 17480
+
+EXTH_AUTHOR = 100
+EXTH_PUBLISHER = 101
+EXTH_ISBN = 104
+EXTH_PUBLISHED_DATE = 106
+EXTH_UPDATED_TITLE = 503
+EXTH_LANGUAGE = 524
+
+_EXTH_FLAG = 0x40
+_ENCODINGS = {1252: 'cp1252', 65001: 'utf-8'}
+
+
+@dataclass
+class MobiHeader:
+    """Metadata read from the PalmDB/MOBI/EXTH headers."""
+    name: str = ''
+    title: Optional[str] = None
+    authors: List[str] = field(default_factory=list)
+    publisher: Optional[str] = None
+    published_date: Optional[str] = None
+    isbn: Optional[str] = None
+    language: Optional[str] = None
+    encoding: str = 'cp1252'
+    compression: int = COMPRESSION_NONE
+    text_record_count: int = 0
+    extra_data_flags: int = 0
+    exth: Dict[int, List[bytes]] = field(default_factory=dict)
+
+    @property
+    def has_exth(self) -> bool:
+        return bool(self.exth)
+
+
+def read_header(path: str) -> MobiHeader:
+    """
+    Read the headers of a MOBI/AZW file without touching the text records.
+
+    Raises:
+        ValueError: when the file is not a PalmDB MOBI/PalmDOC book
+    """
+    with open(path, 'rb') as handle, _map(handle) as data:
+        offsets = _record_offsets(data)
+        return _parse_record0(data, offsets)
+
+
+def read_text(path: str, max_records: int = 3) -> str:
+    """
+    Decode the first `max_records` text records (uncompressed or PalmDOC).
+
+    HUFF/CDIC compressed books return an empty string.
+    """
+    with open(path, 'rb') as handle, _map(handle) as data:
+        offsets = _record_offsets(data)
+        header = _parse_record0(data, offsets)
+        if header.compression not in (COMPRESSION_NONE, COMPRESSION_PALMDOC):
+            return ''
+        chunks = []
+        last = min(header.text_record_count, max_records, len(offsets) - 1)
+        for index in range(1, last + 1):
+            record = data[offsets[index]:offsets[index + 1]]
+            record = record[:len(record) - _trailing_data_size(record, header.extra_data_flags)]
+            if header.compression == COMPRESSION_PALMDOC:
+                record = palmdoc_decompress(record)
+            chunks.append(record)
+        return b''.join(chunks).decode(header.encoding, errors='ignore')
+
+
+def palmdoc_decompress(data: bytes) -> bytes:
+    """Decompress one PalmDOC (LZ77 variant) record."""
+    out = bytearray()
+    index = 0
+    size = len(data)
+    while index < size:
+        byte = data[index]
+        index += 1
+        if byte == 0 or 0x09 <= byte <= 0x7F:
+            out.append(byte)
+        elif byte <= 0x08:
+            out += data[index:index + byte]
+            index += byte
+        elif byte >= 0xC0:
+            out.append(0x20)
+            out.append(byte ^ 0x80)
+        elif index < size:
+            pair = (byte << 8) | data[index]
+            index += 1
+            distance = (pair >> 3) & 0x07FF
+            length = (pair & 0x07) + 3
+            if distance == 0 or distance > len(out):
+                continue
+            for _ in range(length):
+                out.append(out[-distance])
+    return bytes(out)
+
+
+def _map(handle):
+    try:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError as exc:  # empty file
+        raise ValueError(f'Not a MOBI file: {handle.name}') from exc
+
+
+def _record_offsets(data) -> List[int]:
+    if len(data) < PALMDB_HEADER_SIZE or data[60:68] not in MOBI_TYPES:
+        raise ValueError('Not a PalmDB MOBI/PalmDOC file')
+    (count,) = struct.unpack_from('>H', data, 76)
+    if count == 0 or PALMDB_HEADER_SIZE + count * 8 > len(data):
+        raise ValueError('Corrupt PalmDB record table')
+    offsets = [struct.unpack_from('>I', data, PALMDB_HEADER_SIZE + i * 8)[0] for i in range(count)]
+    offsets.append(len(data))
+    return offsets
+
+
+def _parse_record0(data, offsets: List[int]) -> MobiHeader:
+    start, end = offsets[0], offsets[1]
+    header = MobiHeader(name=bytes(data[0:32]).split(b'\0', 1)[0].decode('latin-1', errors='ignore'))
+    header.compression, = struct.unpack_from('>H', data, start)
+    header.text_record_count, = struct.unpack_from('>H', data, start + 8)
+
+    if data[start + 16:start + 20] != b'MOBI':
+        # Plain PalmDOC: no MOBI header, no EXTH
+        return header
+
+    mobi_length, = struct.unpack_from('>I', data, start + 20)
+    encoding, = struct.unpack_from('>I', data, start + 28)
+    header.encoding = _ENCODINGS.get(encoding, 'cp1252')
+    name_offset, name_length = struct.unpack_from('>II', data, start + 84)
+    if name_length and start + name_offset + name_length <= end:
+        header.title = _decode(data[start + name_offset:start + name_offset + name_length], header.encoding)
+    if mobi_length >= 0xE4 and start + 0xF4 <= end:
+        header.extra_data_flags, = struct.unpack_from('>H', data, start + 0xF2)
+
+    exth_flags, = struct.unpack_from('>I', data, start + 128)
+    exth_start = start + 16 + mobi_length
+    if exth_flags & _EXTH_FLAG and data[exth_start:exth_start + 4] == b'EXTH':
+        header.exth = _parse_exth(data, exth_start, end)
+        _apply_exth(header)
+    return header
+
+
+def _parse_exth(data, start: int, end: int) -> Dict[int, List[bytes]]:
+    records: Dict[int, List[bytes]] = {}
+    count, = struct.unpack_from('>I', data, start + 8)
+    position = start + 12
+    for _ in range(count):
+        if position + 8 > end:
+            break
+        record_type, length = struct.unpack_from('>II', data, position)
+        if length < 8 or position + length > end:
+            break
+        records.setdefault(record_type, []).append(bytes(data[position + 8:position + length]))
+        position += length
+    return records
+
+
+def _apply_exth(header: MobiHeader) -> None:
+    def values(record_type: int) -> List[str]:
+        return [text for text in (_decode(raw, header.encoding) for raw in header.exth.get(record_type, [])) if text]
+
+    header.authors = values(EXTH_AUTHOR)
+    header.publisher = next(iter(values(EXTH_PUBLISHER)), None)
+    header.published_date = next(iter(values(EXTH_PUBLISHED_DATE)), None)
+    header.language = next(iter(values(EXTH_LANGUAGE)), None)
+    header.title = next(iter(values(EXTH_UPDATED_TITLE)), None) or header.title
+    for isbn in values(EXTH_ISBN):
+        compact = ''.join(char for char in isbn.upper() if char.isdigit() or char == 'X')
+        if len(compact) in (10, 13):
+            header.isbn = compact
+            break
+
+
+def _decode(raw: bytes, encoding: str) -> str:
+    return bytes(raw).decode(encoding, errors='ignore').strip('\0 \t\r\n')
+
+
+def _trailing_data_size(record: bytes, flags: int) -> int:
+    # Trailing entries (bits 1..15) store their size as a backward varint;
+    # bit 0 marks multibyte overlap bytes sized by the low two bits.
+    size = 0
+    bits = flags >> 1
+    while bits:
+        if bits & 1:
+            size += _trailing_entry_size(record, len(record) - size)
+        bits >>= 1
+    if flags & 1 and len(record) > size:
+        size += (record[len(record) - size - 1] & 0x03) + 1
+    return min(size, len(record))
+
+
+def _trailing_entry_size(record: bytes, end: int) -> int:
+    value = 0
+    shift = 0
+    while end > 0:
+        byte = record[end - 1]
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        end -= 1
+        if byte & 0x80 or shift >= 28:
+            break
+    return value
+
+
+__all__ = ['MobiHeader', 'read_header', 'read_text', 'palmdoc_decompress']
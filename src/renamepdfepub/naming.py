@@ -0,0 +1,284 @@
+"""Compiled naming templates.
+
+A pattern such as "{publisher}_{year}_{title}" is parsed once into a render
+plan: a positional format string with escaped literals plus the order of the
+fields it uses. Rendering a row is then one str.format() call over the
+prepared field values.
+
+Sanitisation is done by Sanitizer objects built once per style: the
+per-character decisions live in a translation table (ASCII precomputed,
+other characters classified on first sight). Because that step works
+character by character, it runs once per distinct field value (memoised in
+an LRU cache, since publishers, authors and years repeat across a library)
+and once per pattern literal; only whitespace collapse, truncation and
+strip run on each rendered name.
+
+Styles reproduce the naming rules used across the project:
+
+- 'report': raw fields, whole name cleaned like renamer.sanitize_name
+- 'filesystem': ASCII-folded fields and name, title/author truncated
+  (BookMetadataExtractor.suggest_filename)
+- 'ascii' / 'ascii_underscore': ASCII-folded fields, punctuation turned into
+  spaces (or underscores), as in the catalogue preview and rename_from_db.py
+"""
+from __future__ import annotations
+
+import os
+import re
+import string
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+FIELDS = ('title', 'author', 'publisher', 'year', 'isbn')
+FIELD_CACHE_SIZE = 1 << 17
+UNKNOWN_VALUES = frozenset({'unknown'})
+
+
+_MARK = '\x00'
+
+
+class _CharTable(dict):
+    """str.translate() table: kept characters map to themselves, others to the replacement."""
+
+    def __init__(self, allowed: 're.Pattern[str]', replacement: Optional[str]):
+        super().__init__()
+        self._allowed = allowed
+        self._replacement = replacement
+        for code in range(128):
+            self[code]
+
+    def __missing__(self, code: int):
+        char = chr(code)
+        # Whitespace is left to the layout step, which collapses it
+        value = code if char.isspace() or self._allowed.fullmatch(char) else self._replacement
+        self[code] = value
+        return value
+
+
+class Sanitizer:
+    """
+    Filesystem-safe cleaning of one string, in two steps.
+
+    chars(): ASCII folding (NFKD) and the character table. It works
+    character by character, so it can run on the pieces of a name (fields,
+    pattern literals) separately and be memoised per piece.
+
+    layout(): whitespace collapse, spaces to underscores, truncation
+    (optionally with '...' before the extension) and strip, on the whole name.
+
+    Args:
+        allowed: Regex matching one allowed character (None keeps everything)
+        replacement: What disallowed characters become ('' deletes them)
+        fold_ascii: Strip accents and drop non-ASCII characters
+        collapse: Collapse whitespace 'before' or 'after' disallowed
+            characters are deleted ('before' keeps the gap a deleted
+            character leaves between two spaces)
+        underscore: Replace spaces with underscores
+        max_len: Maximum length (None: unlimited)
+        ellipsis: Truncate as name[:n] + '...' + extension
+    """
+
+    def __init__(self, allowed: Optional[str] = None, replacement: str = '', fold_ascii: bool = False,
+                 collapse: str = 'after', underscore: bool = False, max_len: Optional[int] = None,
+                 ellipsis: bool = False):
+        if collapse not in ('before', 'after'):
+            raise ValueError("collapse must be 'before' or 'after'")
+        # Collapsing first means deleting after the layout step: mark now, drop the marks later
+        self._marked = collapse == 'before' and not replacement
+        delete_as = _MARK if self._marked else (replacement or None)
+        self._table = _CharTable(re.compile(allowed), delete_as) if allowed else None
+        self.fold_ascii = fold_ascii
+        self.underscore = underscore
+        self.max_len = max_len
+        self.ellipsis = ellipsis
+
+    def __call__(self, text: Any, max_len: Optional[int] = None) -> str:
+        if not text:
+            return ''
+        return self.layout(self.chars(str(text)), max_len)
+
+    def chars(self, text: str) -> str:
+        if self.fold_ascii and not text.isascii():
+            text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
+        if self._table is not None:
+            text = text.translate(self._table)
+        return text
+
+    def layout(self, text: str, max_len: Optional[int] = None) -> str:
+        text = ' '.join(text.split())
+        if self._marked:
+            text = text.replace(_MARK, '')
+        if self.underscore:
+            text = text.replace(' ', '_')
+        max_len = max_len or self.max_len
+        if max_len and len(text) > max_len:
+            if self.ellipsis:
+                name, ext = os.path.splitext(text)
+                text = name[:max_len - len(ext) - 3] + '...' + ext
+            else:
+                text = text[:max_len]
+        return text.strip()
+
+
+# renamer.sanitize_name: word characters, '-', '.', '_' and spaces
+SAFE_NAME = Sanitizer(r'[\w\-\._ ]', collapse='before', max_len=90)
+# BookMetadataExtractor._clean_filename: Windows-reserved characters, ASCII only
+FILESYSTEM = Sanitizer(r'[^<>:"/\\|?*]', fold_ascii=True, max_len=200, ellipsis=True)
+FILESYSTEM_FIELD = Sanitizer(r'[^<>:"/\\|?*]', fold_ascii=True)
+# Catalogue preview / rename_from_db.py: letters, digits, spaces, '-' and '_'
+ASCII_FIELD = Sanitizer(r'[\w \-]', replacement=' ', fold_ascii=True)
+ASCII_UNDERSCORE_FIELD = Sanitizer(r'[\w \-]', replacement=' ', fold_ascii=True, underscore=True)
+
+STYLES: Dict[str, Dict[str, Any]] = {
+    'report': {'name_sanitizer': SAFE_NAME},
+    'filesystem': {'field_sanitizer': FILESYSTEM_FIELD, 'name_sanitizer': FILESYSTEM,
+                   'limits': {'title': 50, 'author': 30}},
+    'ascii': {'field_sanitizer': ASCII_FIELD},
+    'ascii_underscore': {'field_sanitizer': ASCII_UNDERSCORE_FIELD},
+}
+
+
+class NameTemplate:
+    """
+    Naming pattern compiled into a render plan.
+
+    Literals go through name_sanitizer.chars() once, here; each distinct
+    field value is prepared once (field_sanitizer, length limit,
+    name_sanitizer.chars()) and memoised in an LRU cache; per name only
+    str.format() and name_sanitizer.layout() remain.
+
+    Args:
+        pattern: Placeholders {title}, {author}, {publisher}, {year}, {isbn}
+            (case-insensitive, format specs allowed)
+        field_sanitizer: Applied to every field value before substitution
+        name_sanitizer: Applied to the rendered name
+        limits: Maximum length per field, applied after field_sanitizer
+        cache_size: Memoised values per field
+
+    Raises:
+        ValueError: Unknown or positional placeholder, or broken braces
+    """
+
+    def __init__(self, pattern: str, field_sanitizer: Optional[Sanitizer] = None,
+                 name_sanitizer: Optional[Sanitizer] = None, limits: Optional[Mapping[str, int]] = None,
+                 cache_size: int = FIELD_CACHE_SIZE):
+        self.pattern = pattern
+        self.field_sanitizer = field_sanitizer
+        self.name_sanitizer = name_sanitizer
+        fields: List[str] = []
+        plan: List[str] = []
+        try:
+            parsed = list(string.Formatter().parse(pattern))
+        except ValueError as e:
+            raise ValueError(f"Invalid pattern {pattern!r}: {e}") from e
+        for literal, field, spec, conversion in parsed:
+            if name_sanitizer is not None:
+                literal = name_sanitizer.chars(literal)
+            plan.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+            key = field.strip().lower()
+            if key not in FIELDS:
+                raise ValueError(f"Invalid placeholder {{{field}}}; allowed: "
+                                 + ', '.join('{%s}' % name for name in FIELDS))
+            if key not in fields:
+                fields.append(key)
+            plan.append('{%d%s%s}' % (fields.index(key), f'!{conversion}' if conversion else '',
+                                      f':{spec}' if spec else ''))
+        self.fields = tuple(fields)
+        self._format = ''.join(plan)
+        # One single-argument memo per field: hits cost one C-level lookup
+        self._preparers = tuple(
+            (key, lru_cache(maxsize=cache_size)(self._preparer((limits or {}).get(key))))
+            for key in self.fields
+        )
+
+    def _preparer(self, limit: Optional[int]):
+        field_sanitizer = self.field_sanitizer
+        chars = self.name_sanitizer.chars if self.name_sanitizer is not None else None
+        if field_sanitizer is None and not limit:
+            if chars is None:
+                return str
+            return lambda value: chars(str(value))
+
+        def prepare(value: Any) -> str:
+            value = str(value)
+            if field_sanitizer is not None:
+                value = field_sanitizer(value)
+            if limit:
+                value = value[:limit]
+            return chars(value) if chars is not None else value
+        return prepare
+
+    def values(self, row: Mapping[str, Any]) -> List[str]:
+        """
+        Prepared field values, in the order the render plan uses them.
+
+        Field values must be strings or numbers (join author lists first,
+        see first_authors()); missing values render as ''.
+        """
+        get = row.get
+        return [prepare(get(key) or '') for key, prepare in self._preparers]
+
+    def render(self, row: Mapping[str, Any]) -> str:
+        """Base name (no extension) of one row of field values."""
+        name = self._format.format(*self.values(row))
+        if self.name_sanitizer is not None:
+            return self.name_sanitizer.layout(name)
+        return name.strip()
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> List[str]:
+        """render() over a batch of rows."""
+        fmt = self._format.format
+        values = self.values
+        if self.name_sanitizer is None:
+            return [fmt(*values(row)).strip() for row in rows]
+        layout = self.name_sanitizer.layout
+        return [layout(fmt(*values(row))) for row in rows]
+
+    def cache_info(self) -> Dict[str, Any]:
+        """LRU statistics of the memoised values, per field."""
+        return {key: prepare.cache_info() for key, prepare in self._preparers}
+
+
+@lru_cache(maxsize=128)
+def compile_template(pattern: str, style: str = 'report') -> NameTemplate:
+    """Compiled (and cached) template of a pattern in one of STYLES."""
+    if style not in STYLES:
+        raise ValueError(f"Unknown naming style {style!r}; expected one of {sorted(STYLES)}")
+    return NameTemplate(pattern, **STYLES[style])
+
+
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
+def _first_authors(authors: str, count: int) -> str:
+    parts = [part.strip() for part in authors.split(',') if part.strip()]
+    return ', '.join(parts[:count])
+
+
+def first_authors(authors: Any, count: int = 2) -> str:
+    """First authors of a list or a comma-separated string, joined with ', '."""
+    if not authors:
+        return ''
+    if isinstance(authors, (list, tuple)):
+        return ', '.join(str(author).strip() for author in authors[:count] if author and str(author).strip())
+    return _first_authors(str(authors), count)
+
+
+def known(value: Any) -> str:
+    """'' for missing values and placeholders such as 'Unknown'."""
+    if value is None:
+        return ''
+    text = str(value)
+    return '' if text.strip().lower() in UNKNOWN_VALUES else text
+
+
+def year_of(date: Any) -> str:
+    """Year part of an ISO-like date ('2015-08-01' -> '2015')."""
+    return known(date).split('-')[0] if date else ''
+
+
+__all__ = [
+    'NameTemplate', 'Sanitizer', 'compile_template', 'first_authors', 'known', 'year_of',
+    'FIELDS', 'STYLES', 'SAFE_NAME', 'FILESYSTEM',
+]
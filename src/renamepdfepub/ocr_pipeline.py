@@ -0,0 +1,277 @@
+"""Bounded, parallel OCR for PDFs without a text layer.
+
+Pages are rasterised one at a time at reduced DPI inside a process pool, so
+at most `max_workers` page images exist at once. Lines carrying an ISBN label
+are re-read with Tesseract restricted to digits, scanning stops as soon as a
+checksum-valid ISBN appears, and every page's text is cached persistently by
+(document digest, page, dpi) so a scanned book is never OCR'd twice.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+try:
+    from pdf2image import convert_from_path, pdfinfo_from_path
+except Exception:
+    convert_from_path = None
+    pdfinfo_from_path = None
+
+try:
+    import pytesseract
+except Exception:
+    pytesseract = None
+
+try:
+    from .epub_reader import is_valid_isbn
+except ImportError:
+    from epub_reader import is_valid_isbn
+
+DEFAULT_DPI = 150
+ISBN_LABEL_RE = re.compile(r'ISBN', re.IGNORECASE)
+ISBN_CANDIDATE_RE = re.compile(r'97[89](?:[\s-]?\d){10}|(?<![\d-])\d(?:[\s-]?\d){8}[\s-]?[\dXx](?![\dXx])')
+DIGITS_CONFIG = '--psm 7 -c tessedit_char_whitelist=0123456789-Xx'
+
+
+def find_valid_isbn(text: str) -> Optional[str]:
+    """Return the first checksum-valid ISBN-10/13 in (possibly noisy) text."""
+    for match in ISBN_CANDIDATE_RE.finditer(text or ''):
+        candidate = re.sub(r'[\s-]', '', match.group(0)).upper()
+        if is_valid_isbn(candidate):
+            return candidate
+    return None
+
+
+def document_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ocr_page(pdf_path: str, page_number: int, dpi: int = DEFAULT_DPI) -> str:
+    """
+    Rasterise and OCR a single page (runs inside a worker process).
+
+    When the page mentions an ISBN label but no valid ISBN was read, each
+    labelled line is cropped and re-read with a digits-only whitelist.
+    """
+    images = convert_from_path(
+        pdf_path, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True
+    )
+    if not images:
+        return ''
+    image = images[0]
+    try:
+        text = pytesseract.image_to_string(image)
+        if ISBN_LABEL_RE.search(text) and not find_valid_isbn(text):
+            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+            for box in _label_line_boxes(data, image.width):
+                digits = pytesseract.image_to_string(image.crop(box), config=DIGITS_CONFIG)
+                text += '\nISBN ' + digits.strip()
+        return text
+    finally:
+        image.close()
+
+
+def _label_line_boxes(data: Dict[str, list], width: int, padding: int = 6):
+    """Bounding boxes (full remaining width) of the lines containing an ISBN label."""
+    lines: Dict[tuple, list] = {}
+    for index, word in enumerate(data.get('text', [])):
+        key = (data['block_num'][index], data['par_num'][index], data['line_num'][index])
+        lines.setdefault(key, []).append(index)
+    for indices in lines.values():
+        labels = [i for i in indices if ISBN_LABEL_RE.search(data['text'][i] or '')]
+        if not labels:
+            continue
+        left = min(data['left'][i] for i in labels)
+        top = min(data['top'][i] for i in indices)
+        bottom = max(data['top'][i] + data['height'][i] for i in indices)
+        yield (max(0, left - padding), max(0, top - padding), width, bottom + padding)
+
+
+class OcrCache:
+    """Persistent OCR text cache (SQLite) keyed by page hash."""
+
+    def __init__(self, db_path: str = 'ocr_cache.db'):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS ocr_pages (
+                page_key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, page_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT text FROM ocr_pages WHERE page_key = ?', (page_key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, page_key: str, text: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO ocr_pages(page_key, text) VALUES (?, ?)', (page_key, text)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class OcrResult:
+    """Outcome of one OCR run over a document."""
+    text: str = ''
+    isbn: Optional[str] = None
+    pages_processed: int = 0
+    cache_hits: int = 0
+
+
+class OcrPipeline:
+    """
+    OCR stage with its own process pool and bounded in-flight pages.
+
+    Args:
+        max_workers: Worker processes (and pages in flight per document)
+        dpi: Rasterisation resolution
+        cache_path: SQLite file for the persistent page cache (None disables it)
+        page_reader: Function (pdf_path, page_number, dpi) -> text run in the pool
+        executor_factory: Callable creating the executor (defaults to a process pool)
+    """
+
+    def __init__(self,
+                 max_workers: int = 2,
+                 dpi: int = DEFAULT_DPI,
+                 cache_path: Optional[str] = 'ocr_cache.db',
+                 page_reader: Callable[[str, int, int], str] = ocr_page,
+                 executor_factory: Optional[Callable[[int], Executor]] = None):
+        self.max_workers = max(1, max_workers)
+        self.dpi = dpi
+        self.page_reader = page_reader
+        self.cache_path = cache_path
+        self._cache: Optional[OcrCache] = None
+        self._executor_factory = executor_factory or (lambda workers: ProcessPoolExecutor(max_workers=workers))
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self.stats = {'documents': 0, 'pages_ocr': 0, 'cache_hits': 0, 'early_stops': 0, 'errors': 0}
+
+    @property
+    def cache(self) -> Optional[OcrCache]:
+        """Page cache, opened on first use."""
+        if self._cache is None and self.cache_path:
+            with self._executor_lock:
+                if self._cache is None:
+                    self._cache = OcrCache(self.cache_path)
+        return self._cache
+
+    @property
+    def available(self) -> bool:
+        """Whether the OCR dependencies (or a custom page reader) are usable."""
+        if self.page_reader is not ocr_page:
+            return True
+        return pytesseract is not None and convert_from_path is not None
+
+    def extract(self, pdf_path: str, max_pages: int = 10) -> OcrResult:
+        """
+        OCR up to `max_pages` pages, stopping once a valid ISBN is read.
+
+        Returns:
+            OcrResult: Text of the processed pages (in page order) and the ISBN found
+        """
+        result = OcrResult()
+        last_page = min(max_pages, self._page_count(pdf_path))
+        if last_page <= 0:
+            return result
+
+        self.stats['documents'] += 1
+        digest = document_digest(pdf_path) if self.cache else ''
+        texts: Dict[int, str] = {}
+        pending: Dict[Future, int] = {}
+        next_page = 1
+
+        while True:
+            # Keep at most max_workers pages rasterised/OCR'd at a time
+            while len(pending) < self.max_workers and next_page <= last_page and result.isbn is None:
+                page = next_page
+                next_page += 1
+                cached = self.cache.get(self._page_key(digest, page)) if self.cache else None
+                if cached is not None:
+                    texts[page] = cached
+                    result.cache_hits += 1
+                    result.isbn = find_valid_isbn(cached)
+                    continue
+                future = self._get_executor().submit(self.page_reader, pdf_path, page, self.dpi)
+                future.add_done_callback(self._store_callback(digest, page))
+                pending[future] = page
+
+            if not pending or result.isbn is not None:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = pending.pop(future)
+                try:
+                    texts[page] = future.result()
+                except Exception:
+                    self.stats['errors'] += 1
+                    texts[page] = ''
+                result.pages_processed += 1
+                result.isbn = result.isbn or find_valid_isbn(texts[page])
+
+        if result.isbn is not None and (pending or next_page <= last_page):
+            self.stats['early_stops'] += 1
+        for future in pending:
+            # Already-running pages still finish and land in the cache
+            future.cancel()
+
+        self.stats['pages_ocr'] += result.pages_processed
+        self.stats['cache_hits'] += result.cache_hits
+        result.text = '\n'.join(texts[page] for page in sorted(texts))
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = self._executor_factory(self.max_workers)
+            return self._executor
+
+    def _page_key(self, digest: str, page: int) -> str:
+        return f"{digest}:{page}:{self.dpi}"
+
+    def _store_callback(self, digest: str, page: int) -> Callable[[Future], None]:
+        def store(future: Future) -> None:
+            if self.cache is None or future.cancelled() or future.exception() is not None:
+                return
+            self.cache.put(self._page_key(digest, page), future.result())
+        return store
+
+    def _page_count(self, pdf_path: str) -> int:
+        if pdfinfo_from_path is None or self.page_reader is not ocr_page:
+            return 10 ** 6
+        try:
+            return int(pdfinfo_from_path(pdf_path).get('Pages', 0))
+        except Exception:
+            return 10 ** 6
+
+
+__all__ = ['OcrPipeline', 'OcrResult', 'OcrCache', 'ocr_page', 'find_valid_isbn', 'document_digest']
@@ -0,0 +1,326 @@
+"""Local offline catalogue: bulk ISBN-to-metadata resolution without the network.
+
+import_dump() streams a large dump into an indexed SQLite table, one batch at
+a time, so memory stays flat however big the file is. Supported inputs (plain
+or .gz):
+
+- OpenLibrary dumps (TSV: type, key, revision, last_modified, JSON). Edition
+  records give the ISBNs; author records, when present in the same or a later
+  import, provide the names referenced by the editions.
+- JSON Lines exports with title/authors/publisher/published_date and
+  isbn_13/isbn_10 (or isbn13/isbn10/isbn) keys.
+- TSV exports with a header row using the same column names.
+
+ISBN-10s are stored as their ISBN-13 so one indexed lookup serves both forms.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .epub_reader import is_valid_isbn
+except ImportError:
+    from epub_reader import is_valid_isbn
+
+DEFAULT_DB_PATH = 'offline_catalog.db'
+BATCH_SIZE = 5000
+
+
+def isbn10_to_isbn13(isbn10: str) -> str:
+    body = '978' + isbn10[:9]
+    total = sum(int(digit) * (1 if index % 2 == 0 else 3) for index, digit in enumerate(body))
+    return body + str((10 - total % 10) % 10)
+
+
+def isbn13_to_isbn10(isbn13: str) -> Optional[str]:
+    if not isbn13.startswith('978'):
+        return None
+    body = isbn13[3:12]
+    check = (11 - sum((10 - index) * int(digit) for index, digit in enumerate(body)) % 11) % 11
+    return body + ('X' if check == 10 else str(check))
+
+
+def normalize_isbn(value: Any) -> Optional[str]:
+    """Checksum-valid ISBN-13 for any ISBN-10/13 spelling, or None."""
+    if not value:
+        return None
+    isbn = re.sub(r'[^0-9Xx]', '', str(value)).upper()
+    if not is_valid_isbn(isbn):
+        return None
+    return isbn10_to_isbn13(isbn) if len(isbn) == 10 else isbn
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace', newline='')
+    return open(path, 'r', encoding='utf-8', errors='replace', newline='')
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None or value == '':
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _names(value: Any) -> List[str]:
+    names = []
+    for item in _as_list(value):
+        if isinstance(item, dict):
+            item = item.get('name') or ''
+        if isinstance(item, str):
+            names.extend(part.strip() for part in re.split(r'\s*;\s*|\s*\|\s*', item) if part.strip())
+    return names
+
+
+def _author_keys(value: Any) -> List[str]:
+    keys = []
+    for item in _as_list(value):
+        if isinstance(item, dict):
+            # Editions: {"key": "/authors/OL1A"}; works: {"author": {"key": ...}}
+            key = item.get('key') or (item.get('author') or {}).get('key')
+            if key:
+                keys.append(key)
+    return keys
+
+
+class OfflineCatalog:
+    """
+    SQLite table of editions keyed by ISBN-13.
+
+    Args:
+        db_path: Catalogue database file
+        publisher_normalizer: Canonicalises publisher names at import time
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH,
+                 publisher_normalizer: Optional[Callable[[Optional[str]], str]] = None):
+        self.db_path = db_path
+        self.publisher_normalizer = publisher_normalizer
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def available(self) -> bool:
+        """True once a catalogue has been imported (never creates the file)."""
+        return self._conn is not None or os.path.exists(self.db_path)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS editions (
+                    isbn_13 TEXT PRIMARY KEY,
+                    isbn_10 TEXT,
+                    title TEXT NOT NULL,
+                    subtitle TEXT,
+                    authors TEXT,
+                    author_keys TEXT,
+                    publisher TEXT,
+                    published_date TEXT,
+                    source TEXT
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS authors (
+                    key TEXT PRIMARY KEY,
+                    name TEXT NOT NULL
+                )
+            ''')
+            self._conn.commit()
+        return self._conn
+
+    def __len__(self) -> int:
+        if not self.available:
+            return 0
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM editions').fetchone()[0]
+
+    def import_dump(self, path: str, fmt: Optional[str] = None, source: Optional[str] = None,
+                    batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+        """
+        Stream a dump into the catalogue (existing ISBNs are replaced).
+
+        Args:
+            path: Dump file (.jsonl, .tsv, .txt, optionally .gz)
+            fmt: 'openlibrary', 'jsonl' or 'tsv' (detected when omitted)
+            source: Value stored in the source column (default: file name)
+            batch_size: Rows per transaction
+
+        Returns:
+            Counters: lines, editions, authors, skipped
+        """
+        fmt = fmt or self._detect_format(path)
+        source = source or os.path.basename(path)
+        stats = {'lines': 0, 'editions': 0, 'authors': 0, 'skipped': 0}
+        editions: List[tuple] = []
+        authors: List[tuple] = []
+
+        with _open_text(path) as handle:
+            for kind, row in self._records(handle, fmt, stats):
+                if kind == 'author':
+                    authors.append(row)
+                else:
+                    editions.extend(self._edition_rows(row, source, stats))
+                if len(editions) >= batch_size or len(authors) >= batch_size:
+                    self._flush(editions, authors)
+        self._flush(editions, authors)
+        stats['editions_total'] = len(self)
+        return stats
+
+    def lookup(self, isbn: str) -> Optional[Dict[str, Any]]:
+        return self.lookup_many([isbn]).get(isbn)
+
+    def lookup_many(self, isbns: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Bulk join of ISBNs (any spelling) against the catalogue."""
+        if not self.available:
+            return {}
+        wanted: Dict[str, List[str]] = {}
+        for isbn in isbns:
+            normalized = normalize_isbn(isbn)
+            if normalized:
+                wanted.setdefault(normalized, []).append(isbn)
+        found: Dict[str, Dict[str, Any]] = {}
+        keys = list(wanted)
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT isbn_13, isbn_10, title, subtitle, authors, author_keys, publisher, "
+                    f"published_date, source FROM editions WHERE isbn_13 IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    record = self._record(row)
+                    for original in wanted[row[0]]:
+                        found[original] = record
+        return found
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _record(self, row: tuple) -> Dict[str, Any]:
+        isbn_13, isbn_10, title, subtitle, authors, author_keys, publisher, published_date, source = row
+        names = json.loads(authors or '[]')
+        keys = json.loads(author_keys or '[]')
+        if not names and keys:
+            # Caller holds the lock
+            placeholders = ','.join('?' * len(keys))
+            resolved = dict(self.conn.execute(
+                f"SELECT key, name FROM authors WHERE key IN ({placeholders})", keys
+            ).fetchall())
+            names = [resolved[key] for key in keys if key in resolved]
+        return {
+            'isbn_13': isbn_13,
+            'isbn_10': isbn_10,
+            'title': title,
+            'subtitle': subtitle,
+            'authors': names,
+            'publisher': publisher,
+            'published_date': published_date,
+            'source': source,
+        }
+
+    @staticmethod
+    def _detect_format(path: str) -> str:
+        name = path[:-3] if path.endswith('.gz') else path
+        if name.endswith(('.jsonl', '.json', '.ndjson')):
+            return 'jsonl'
+        with _open_text(path) as handle:
+            first = handle.readline()
+        fields = first.split('\t')
+        if len(fields) >= 5 and fields[0].startswith('/type/'):
+            return 'openlibrary'
+        return 'tsv'
+
+    def _records(self, handle, fmt: str, stats: Dict[str, int]) -> Iterator[tuple]:
+        if fmt == 'tsv':
+            for row in csv.DictReader(handle, delimiter='\t'):
+                stats['lines'] += 1
+                yield 'edition', row
+            return
+        for line in handle:
+            stats['lines'] += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                if fmt == 'openlibrary':
+                    fields = line.split('\t')
+                    kind, key, data = fields[0], fields[1], json.loads(fields[-1])
+                    if kind == '/type/author':
+                        if data.get('name'):
+                            stats['authors'] += 1
+                            yield 'author', (key, data['name'])
+                        continue
+                    if kind != '/type/edition':
+                        continue
+                else:
+                    data = json.loads(line)
+            except (ValueError, IndexError):
+                stats['skipped'] += 1
+                continue
+            yield 'edition', data
+
+    def _edition_rows(self, data: Dict[str, Any], source: str, stats: Dict[str, int]) -> List[tuple]:
+        title = (data.get('title') or '').strip()
+        isbns = []
+        for key in ('isbn_13', 'isbn13', 'isbn_10', 'isbn10', 'isbn'):
+            for value in _as_list(data.get(key)):
+                if isinstance(value, str):
+                    isbns.extend(part for part in re.split(r'[;,|\s]+', value) if part)
+        normalized = list(dict.fromkeys(filter(None, (normalize_isbn(isbn) for isbn in isbns))))
+        if not title or not normalized:
+            stats['skipped'] += 1
+            return []
+
+        publishers = _names(data.get('publishers')) or _names(data.get('publisher'))
+        publisher = publishers[0] if publishers else None
+        if self.publisher_normalizer is not None:
+            publisher = self.publisher_normalizer(publisher) or None
+        authors = _names(data.get('authors'))
+        if not authors and data.get('by_statement'):
+            authors = _names(re.sub(r'^\s*by\s+', '', data['by_statement'], flags=re.IGNORECASE).rstrip('. '))
+        row = (
+            title,
+            (data.get('subtitle') or '').strip() or None,
+            json.dumps(authors, ensure_ascii=False),
+            json.dumps(_author_keys(data.get('authors')), ensure_ascii=False),
+            publisher,
+            str(data.get('publish_date') or data.get('published_date') or data.get('year') or '').strip() or None,
+            source,
+        )
+        stats['editions'] += 1
+        return [(isbn, isbn13_to_isbn10(isbn)) + row for isbn in normalized]
+
+    def _flush(self, editions: List[tuple], authors: List[tuple]) -> None:
+        if not editions and not authors:
+            return
+        with self._lock:
+            with self.conn:
+                if authors:
+                    self.conn.executemany('INSERT OR REPLACE INTO authors(key, name) VALUES (?, ?)', authors)
+                if editions:
+                    self.conn.executemany(
+                        'INSERT OR REPLACE INTO editions(isbn_13, isbn_10, title, subtitle, authors, author_keys, '
+                        'publisher, published_date, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        editions,
+                    )
+        editions.clear()
+        authors.clear()
+
+
+__all__ = ['OfflineCatalog', 'normalize_isbn', 'isbn10_to_isbn13', 'isbn13_to_isbn10', 'DEFAULT_DB_PATH']
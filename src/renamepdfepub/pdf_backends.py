@@ -0,0 +1,265 @@
+"""Pluggable PDF text backends with a calibrated, persisted preference order.
+
+Every backend extracts the text of the first pages of an already open
+PdfDocumentHandle. The registry holds pypdf, pdfminer (layout analysis off),
+pdfplumber and, when installed, the compiled PyMuPDF backend. calibrate() runs
+each available backend over a sample of the user's PDFs, measures chars/sec and
+ISBN hit-rate, and saves the resulting order so later scans try the best
+backend first.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .pdf_document import PdfDocumentHandle, PdfReader, open_document, pdfplumber
+    from .ocr_pipeline import find_valid_isbn
+except ImportError:
+    from pdf_document import PdfDocumentHandle, PdfReader, open_document, pdfplumber
+    from ocr_pipeline import find_valid_isbn
+
+try:
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+except Exception:
+    PDFPage = None
+
+try:
+    import fitz  # PyMuPDF
+except Exception:
+    fitz = None
+
+DEFAULT_ORDER = ('pymupdf', 'pypdf', 'pdfminer', 'pdfplumber')
+DEFAULT_ORDER_PATH = 'pdf_backends.json'
+
+
+class PdfTextBackend(ABC):
+    """Common interface: name, availability and first-pages text extraction."""
+
+    name = ''
+
+    @property
+    def available(self) -> bool:
+        return False
+
+    @abstractmethod
+    def extract(self, document: PdfDocumentHandle, max_pages: int) -> str:
+        """Text of the first max_pages pages; raises when the document cannot be read."""
+
+
+class PypdfBackend(PdfTextBackend):
+    name = 'pypdf'
+
+    @property
+    def available(self) -> bool:
+        return PdfReader is not None
+
+    def extract(self, document: PdfDocumentHandle, max_pages: int) -> str:
+        if document.reader is None:
+            raise ValueError(document.reader_error or 'pypdf could not open the document')
+        return ''.join(text + '\n' for text in document.iter_page_texts(max_pages))
+
+
+class PdfminerBackend(PdfTextBackend):
+    name = 'pdfminer'
+
+    @property
+    def available(self) -> bool:
+        return PDFPage is not None
+
+    def extract(self, document: PdfDocumentHandle, max_pages: int) -> str:
+        # Layout analysis dominates pdfminer's cost. high_level.extract_text turns
+        # laparams=None into LAParams(), so the pipeline is assembled here instead
+        output = io.StringIO()
+        manager = PDFResourceManager(caching=True)
+        converter = TextConverter(manager, output, laparams=None)
+        interpreter = PDFPageInterpreter(manager, converter)
+        try:
+            for page in PDFPage.get_pages(document.stream(), maxpages=max_pages):
+                interpreter.process_page(page)
+        finally:
+            converter.close()
+        return output.getvalue().replace('\f', '\n')
+
+
+class PdfplumberBackend(PdfTextBackend):
+    name = 'pdfplumber'
+
+    @property
+    def available(self) -> bool:
+        return pdfplumber is not None
+
+    def extract(self, document: PdfDocumentHandle, max_pages: int) -> str:
+        pdf = document.plumber()
+        return ''.join((page.extract_text() or '') + '\n' for page in pdf.pages[:max_pages])
+
+
+class PymupdfBackend(PdfTextBackend):
+    name = 'pymupdf'
+
+    @property
+    def available(self) -> bool:
+        return fitz is not None
+
+    def extract(self, document: PdfDocumentHandle, max_pages: int) -> str:
+        with fitz.open(document.path) as pdf:
+            return ''.join(pdf[index].get_text() + '\n' for index in range(min(max_pages, pdf.page_count)))
+
+
+_BACKENDS: 'OrderedDict[str, PdfTextBackend]' = OrderedDict()
+_SAVED_ORDERS: Dict[str, Tuple[int, List[str]]] = {}
+
+
+def register_backend(backend: PdfTextBackend) -> None:
+    """Add (or replace) a backend in the registry."""
+    _BACKENDS[backend.name] = backend
+
+
+def get_backend(name: str) -> Optional[PdfTextBackend]:
+    return _BACKENDS.get(name)
+
+
+def available_backends() -> List[str]:
+    return [name for name, backend in _BACKENDS.items() if backend.available]
+
+
+for _backend in (PymupdfBackend(), PypdfBackend(), PdfminerBackend(), PdfplumberBackend()):
+    register_backend(_backend)
+
+
+def load_order(path: str = DEFAULT_ORDER_PATH) -> List[str]:
+    """
+    Persisted backend order (calibrated), restricted to available backends.
+
+    Backends missing from the saved order (e.g. installed later) are appended
+    in their default position.
+    """
+    saved = _read_saved_order(path)
+    available = available_backends()
+    order = [name for name in saved if name in available]
+    defaults = [name for name in DEFAULT_ORDER if name in available and name not in order]
+    others = [name for name in available if name not in order and name not in defaults]
+    return order + defaults + others
+
+
+def _read_saved_order(path: str) -> List[str]:
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+    cached = _SAVED_ORDERS.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, 'r', encoding='utf-8') as handle:
+            saved = [str(name) for name in json.load(handle).get('order', [])]
+    except (OSError, ValueError, AttributeError):
+        saved = []
+    _SAVED_ORDERS[path] = (mtime, saved)
+    return saved
+
+
+def save_order(order: Sequence[str], scores: Iterable['BackendScore'] = (), path: str = DEFAULT_ORDER_PATH) -> None:
+    payload = {
+        'order': list(order),
+        'calibrated_at': datetime.now().isoformat(timespec='seconds'),
+        'scores': [asdict(score) for score in scores],
+    }
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(payload, handle, indent=2, ensure_ascii=False)
+
+
+def extract_text(document: PdfDocumentHandle,
+                 max_pages: int = 10,
+                 order: Optional[Sequence[str]] = None) -> Tuple[str, List[str], Optional[str]]:
+    """
+    Try the backends in order until one returns text.
+
+    Returns:
+        Tuple[str, List[str], Optional[str]]: text, backends tried, backend that succeeded
+    """
+    tried: List[str] = []
+    for name in order if order is not None else load_order():
+        backend = _BACKENDS.get(name)
+        if backend is None or not backend.available:
+            continue
+        tried.append(name)
+        try:
+            text = backend.extract(document, max_pages)
+        except Exception:
+            continue
+        if text.strip():
+            return text, tried, name
+    return '', tried, None
+
+
+@dataclass
+class BackendScore:
+    """Calibration result of one backend over the sample."""
+    name: str
+    files: int = 0
+    failures: int = 0
+    chars: int = 0
+    seconds: float = 0.0
+    isbn_hits: int = 0
+
+    @property
+    def chars_per_sec(self) -> float:
+        return self.chars / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def isbn_hit_rate(self) -> float:
+        return self.isbn_hits / self.files if self.files else 0.0
+
+
+def calibrate(sample: Sequence[str],
+              max_pages: int = 5,
+              backends: Optional[Sequence[str]] = None,
+              persist_path: Optional[str] = DEFAULT_ORDER_PATH) -> List[BackendScore]:
+    """
+    Benchmark the backends over `sample` and persist the winning order.
+
+    Backends are ranked by ISBN hit-rate first (finding the ISBN is what the
+    scan needs), then by throughput in chars/sec.
+
+    Returns:
+        List[BackendScore]: scores in the chosen order
+    """
+    names = [name for name in (backends or available_backends()) if name in _BACKENDS and _BACKENDS[name].available]
+    scores = {name: BackendScore(name) for name in names}
+    for path in sample:
+        if not os.path.isfile(path):
+            continue
+        with open_document(path) as document:
+            for name in names:
+                score = scores[name]
+                score.files += 1
+                started = time.perf_counter()
+                try:
+                    text = _BACKENDS[name].extract(document, max_pages)
+                except Exception:
+                    score.failures += 1
+                    text = ''
+                score.seconds += time.perf_counter() - started
+                score.chars += len(text)
+                if find_valid_isbn(text):
+                    score.isbn_hits += 1
+    ranked = sorted(scores.values(), key=lambda s: (-s.isbn_hit_rate, -s.chars_per_sec, s.failures))
+    if persist_path and ranked and any(score.files for score in ranked):
+        save_order([score.name for score in ranked], ranked, persist_path)
+    return ranked
+
+
+__all__ = [
+    'PdfTextBackend', 'BackendScore', 'register_backend', 'get_backend', 'available_backends',
+    'load_order', 'save_order', 'extract_text', 'calibrate',
+]
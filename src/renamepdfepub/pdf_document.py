@@ -0,0 +1,242 @@
+"""Single-open PDF document handle shared by every consumer of a file.
+
+A PdfDocumentHandle opens the file once, memory-maps it when possible and
+lazily exposes page text (cached per page), the Info dictionary, XMP metadata,
+the outline and the page count. open_document() makes that handle the
+per-file context: while a block is open, every nested open_document() call for
+the same path in the same thread receives the same handle, so text extraction,
+metadata reading and ISBN lookup parse the PDF only once.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from pypdf import PdfReader
+except Exception:
+    try:
+        from PyPDF2 import PdfReader  # type: ignore
+    except Exception:
+        PdfReader = None
+
+try:
+    import pdfplumber
+except Exception:
+    pdfplumber = None
+
+_XMP_PACKET_RE = re.compile(rb'<x:xmpmeta\b.*?</x:xmpmeta>', re.DOTALL)
+_PAGE_OBJECT_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+_RDF_LI = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}li'
+_XMP_NAMESPACES = (
+    'http://purl.org/dc/elements/1.1/',
+    'http://prismstandard.org/namespaces/basic/2.0/',
+    'http://prismstandard.org/namespaces/basic/3.0/',
+    'http://ns.adobe.com/pdf/1.3/',
+    'http://ns.adobe.com/xap/1.0/',
+)
+
+_local = threading.local()
+
+
+class PdfDocumentHandle:
+    """Lazily parsed view over one PDF file, opened (and mapped) once."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._data: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty file or mmap unsupported
+            self._data = None
+        self._streams: List[mmap.mmap] = []
+        self._reader = None
+        self._reader_loaded = False
+        self._plumber = None
+        self._page_texts: Dict[int, str] = {}
+        self._info: Optional[Dict[str, str]] = None
+        self._xmp: Optional[Dict[str, List[str]]] = None
+        self._outline: Optional[List[str]] = None
+        self._page_count: Optional[int] = None
+        self.reader_error: Optional[str] = None
+
+    def __enter__(self) -> 'PdfDocumentHandle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def reader(self):
+        """PdfReader over the mapped file (None when unavailable or unparsable)."""
+        if not self._reader_loaded:
+            self._reader_loaded = True
+            if PdfReader is not None:
+                try:
+                    self._reader = PdfReader(self.stream())
+                except Exception as exc:
+                    self.reader_error = str(exc)
+        return self._reader
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            reader = self.reader
+            if reader is not None:
+                try:
+                    self._page_count = len(reader.pages)
+                except Exception as exc:
+                    self.reader_error = str(exc)
+            if self._page_count is None:
+                # Rough count from the raw objects when no parser is usable
+                self._page_count = len(_PAGE_OBJECT_RE.findall(self._data)) if self._data is not None else 0
+        return self._page_count
+
+    def page_text(self, index: int) -> str:
+        """Text of page `index` (0-based), extracted once."""
+        if index not in self._page_texts:
+            reader = self.reader
+            text = ''
+            if reader is not None and 0 <= index < self.page_count:
+                text = reader.pages[index].extract_text() or ''
+            self._page_texts[index] = text
+        return self._page_texts[index]
+
+    def iter_page_texts(self, max_pages: int = 10) -> Iterator[str]:
+        for index in range(min(max_pages, self.page_count)):
+            yield self.page_text(index)
+
+    @property
+    def info(self) -> Dict[str, str]:
+        """Document Info dictionary with the leading '/' stripped from keys."""
+        if self._info is None:
+            self._info = {}
+            reader = self.reader
+            try:
+                metadata = reader.metadata if reader is not None else None
+            except Exception:
+                metadata = None
+            for key, value in (metadata or {}).items():
+                if value is not None:
+                    self._info[str(key).lstrip('/')] = str(value)
+        return self._info
+
+    @property
+    def xmp(self) -> Dict[str, List[str]]:
+        """XMP properties (dc, prism, pdf, xmp namespaces) keyed by local name."""
+        if self._xmp is None:
+            self._xmp = {}
+            if self._data is not None:
+                for packet in _XMP_PACKET_RE.finditer(self._data):
+                    _parse_xmp(packet.group(0), self._xmp)
+        return self._xmp
+
+    def xmp_values(self, *names: str) -> List[str]:
+        return [value for name in names for value in self.xmp.get(name, [])]
+
+    @property
+    def outline(self) -> List[str]:
+        """Flattened outline (bookmark) titles."""
+        if self._outline is None:
+            self._outline = []
+            reader = self.reader
+            try:
+                self._flatten_outline(reader.outline if reader is not None else [], self._outline)
+            except Exception:
+                pass
+        return self._outline
+
+    def plumber(self):
+        """pdfplumber document over its own view of the mapped file (or None)."""
+        if self._plumber is None and pdfplumber is not None:
+            self._plumber = pdfplumber.open(self.stream())
+        return self._plumber
+
+    def close(self) -> None:
+        if self._plumber is not None:
+            try:
+                self._plumber.close()
+            except Exception:
+                pass
+            self._plumber = None
+        self._reader = None
+        for stream in self._streams:
+            stream.close()
+        self._streams.clear()
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def stream(self):
+        """New read-only view of the file; each parser gets its own position."""
+        if self._data is None:
+            return self._file
+        stream = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._streams.append(stream)
+        return stream
+
+    def _flatten_outline(self, items, titles: List[str]) -> None:
+        for item in items:
+            if isinstance(item, list):
+                self._flatten_outline(item, titles)
+            else:
+                title = getattr(item, 'title', None)
+                if title:
+                    titles.append(str(title))
+
+
+@contextmanager
+def open_document(path: str) -> Iterator[PdfDocumentHandle]:
+    """
+    Yield the handle already open for `path` in this thread, or open one
+    for the duration of the block.
+    """
+    key = os.path.abspath(path)
+    handles = _local.__dict__.setdefault('handles', {})
+    handle = handles.get(key)
+    if handle is not None:
+        yield handle
+        return
+    handle = PdfDocumentHandle(path)
+    handles[key] = handle
+    try:
+        yield handle
+    finally:
+        handles.pop(key, None)
+        handle.close()
+
+
+def _parse_xmp(packet: bytes, properties: Dict[str, List[str]]) -> None:
+    try:
+        root = ET.fromstring(packet)
+    except ET.ParseError:
+        return
+    for element in root.iter():
+        for attribute, value in element.attrib.items():
+            name = _local_name(attribute)
+            if name and value.strip():
+                properties.setdefault(name, []).append(value.strip())
+        name = _local_name(element.tag)
+        if not name:
+            continue
+        items = [item.text.strip() for item in element.iter(_RDF_LI) if item.text and item.text.strip()]
+        if not items and element.text and element.text.strip():
+            items = [element.text.strip()]
+        if items:
+            properties.setdefault(name, []).extend(items)
+
+
+def _local_name(tag: str) -> Optional[str]:
+    if not tag.startswith('{'):
+        return None
+    namespace, _, name = tag[1:].partition('}')
+    return name if namespace in _XMP_NAMESPACES else None
+
+
+__all__ = ['PdfDocumentHandle', 'open_document']
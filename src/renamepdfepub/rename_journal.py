@@ -0,0 +1,278 @@
+"""Write-ahead journal for bulk renames.
+
+Each run gets one append-only JSON Lines file, <journal_dir>/<run_id>.jsonl:
+
+    {"type": "begin", "run": ..., "ts": ..., "ops": N}
+    {"type": "intent", "seq": i, "src": ..., "dst": ..., "inode": ..., "size": ..., "mtime_ns": ...}
+    {"type": "done", "seq": i}            # or {"type": "error", "seq": i, "error": ...}
+    {"type": "commit", "ts": ..., "stats": {...}}
+    {"type": "rollback", "run": ..., "ts": ...}  # appended when the run is undone
+
+Every intent is written and fsynced before the first rename. Completion
+records are fsynced in batches, so a crash loses at most one batch of
+"done" lines. recover() rebuilds those lines from the filesystem: an intent
+whose source is gone and whose destination exists was applied.
+
+Single renames (RenameJournal.rename) append their intent right before the
+rename; the line is flushed to the OS at once and fsynced in batches.
+
+The journal is also the undo log: rollback_moves() folds the applied steps of
+a run into (current path, original path) pairs, which
+rename_plan.rollback_run() renames back, so no file is copied for safety.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_JOURNAL_DIR = 'reports/rename_journal'
+SYNC_EVERY = 500
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+
+class RenameJournal:
+    """
+    Append-only rename journal of one run.
+
+    Args:
+        journal_dir: Directory holding one file per run
+        run_id: Run identifier (default: timestamp)
+        sync_every: Completion records written between two fsyncs
+    """
+
+    def __init__(self, journal_dir: str = DEFAULT_JOURNAL_DIR, run_id: Optional[str] = None,
+                 sync_every: int = SYNC_EVERY):
+        self.journal_dir = Path(journal_dir)
+        self.run_id = run_id or new_run_id()
+        self.path = self.journal_dir / f"{self.run_id}.jsonl"
+        self.sync_every = max(1, sync_every)
+        self._lock = threading.Lock()
+        self._handle = None
+        self._unsynced = 0
+        self._next_seq = 0
+
+    def begin(self, intents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write the begin record and every intent, then fsync.
+
+        Args:
+            intents: Dicts with src, dst and optionally inode, size, mtime_ns
+
+        Returns:
+            Number of intents written (their seq is 0..n-1 in order)
+        """
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        lines = []
+        for seq, intent in enumerate(intents):
+            record = {'type': 'intent', 'seq': seq}
+            record.update(intent)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        with self._lock:
+            self._open(len(lines))
+            if lines:
+                self._handle.write('\n'.join(lines) + '\n')
+            self._next_seq = len(lines)
+            self._sync()
+        return len(lines)
+
+    def intent(self, src: str, dst: str, inode: Optional[int] = None, size: Optional[int] = None,
+               mtime_ns: Optional[int] = None) -> int:
+        """
+        Append one intent (the journal is opened on the first call).
+
+        The line is flushed before returning, so it survives a crash of the
+        process; fsync is batched with the completion records.
+
+        Returns:
+            seq of the intent
+        """
+        with self._lock:
+            if self._handle is None:
+                self.journal_dir.mkdir(parents=True, exist_ok=True)
+                self._open(None)
+            seq = self._next_seq
+            self._next_seq += 1
+            self._handle.write(json.dumps({'type': 'intent', 'seq': seq, 'src': src, 'dst': dst, 'inode': inode,
+                                           'size': size, 'mtime_ns': mtime_ns}, ensure_ascii=False) + '\n')
+            self._handle.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._sync()
+        return seq
+
+    def rename(self, src: str, dst: str) -> None:
+        """os.rename() journaled as one intent; a failure is recorded and re-raised."""
+        stat = os.lstat(src)
+        seq = self.intent(str(src), str(dst), inode=stat.st_ino, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        try:
+            os.rename(src, dst)
+        except OSError as e:
+            self.error(seq, str(e))
+            raise
+        self.done(seq)
+
+    def done(self, seq: int) -> None:
+        self._append({'type': 'done', 'seq': seq})
+
+    def error(self, seq: int, error: str) -> None:
+        self._append({'type': 'error', 'seq': seq, 'error': error})
+
+    def commit(self, stats: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            if self._handle is None:
+                return
+            self._handle.write(json.dumps({'type': 'commit', 'ts': time.time(), 'stats': stats or {}}) + '\n')
+            self._sync()
+            self._handle.close()
+            self._handle = None
+
+    def close(self) -> None:
+        """Flush pending records without committing (the run stays incomplete)."""
+        with self._lock:
+            if self._handle is not None:
+                self._sync()
+                self._handle.close()
+                self._handle = None
+
+    def _open(self, ops: Optional[int]) -> None:
+        # Caller holds the lock
+        self._handle = open(self.path, 'a', encoding='utf-8')
+        self._handle.write(json.dumps({'type': 'begin', 'run': self.run_id, 'ts': time.time(), 'ops': ops}) + '\n')
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._handle is None:
+                return
+            self._handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._sync()
+
+    def _sync(self) -> None:
+        # Caller holds the lock
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._unsynced = 0
+
+
+def read_run(journal_dir: str, run_id: str) -> Dict[str, Any]:
+    """
+    Parse a run journal.
+
+    Returns:
+        {'run_id', 'committed', 'stats', 'rolled_back_by', 'ops': [{seq, src, dst, ..., 'state'}]}
+        where state is 'done', 'error' or 'pending'. A torn last line is ignored.
+    """
+    path = Path(journal_dir) / f"{run_id}.jsonl"
+    ops: Dict[int, Dict[str, Any]] = {}
+    committed, stats, rollbacks = False, {}, []
+    with open(path, 'r', encoding='utf-8') as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            kind = record.pop('type', None)
+            if kind == 'intent':
+                record['state'] = 'pending'
+                ops[record['seq']] = record
+            elif kind in ('done', 'error') and record.get('seq') in ops:
+                ops[record['seq']]['state'] = kind
+                if kind == 'error':
+                    ops[record['seq']]['error'] = record.get('error')
+            elif kind == 'commit':
+                committed, stats = True, record.get('stats', {})
+            elif kind == 'rollback':
+                rollbacks.append(record.get('run'))
+    return {'run_id': run_id, 'committed': committed, 'stats': stats, 'rolled_back_by': rollbacks,
+            'ops': [ops[seq] for seq in sorted(ops)]}
+
+
+def list_runs(journal_dir: str = DEFAULT_JOURNAL_DIR) -> List[str]:
+    """Run ids with a journal, oldest first."""
+    directory = Path(journal_dir)
+    if not directory.is_dir():
+        return []
+    return sorted(path.stem for path in directory.glob('*.jsonl'))
+
+
+def _applied(op: Dict[str, Any]) -> bool:
+    try:
+        dst_inode = os.lstat(op['dst']).st_ino
+    except OSError:
+        return False
+    if op.get('inode'):
+        return dst_inode == op['inode']
+    return not os.path.lexists(op['src'])
+
+
+def recover(journal_dir: str, run_id: str) -> Dict[str, Any]:
+    """
+    Settle the pending intents of an interrupted run against the filesystem.
+
+    A pending intent was applied when its destination now holds the source's
+    inode (or, without a usable inode, when the source is gone and the
+    destination exists); those are marked done in the journal, the others
+    stay pending.
+    """
+    run = read_run(journal_dir, run_id)
+    settled = []
+    for op in run['ops']:
+        if op['state'] == 'pending' and _applied(op):
+            op['state'] = 'done'
+            settled.append(op['seq'])
+    if settled:
+        _append_records(journal_dir, run_id, [{'type': 'done', 'seq': seq, 'recovered': True} for seq in settled])
+    run['recovered'] = len(settled)
+    return run
+
+
+def mark_rolled_back(journal_dir: str, run_id: str, rollback_run_id: str) -> None:
+    """Record in a run's journal that rollback_run_id undid it."""
+    _append_records(journal_dir, run_id, [{'type': 'rollback', 'run': rollback_run_id, 'ts': time.time()}])
+
+
+def rollback_moves(run: Dict[str, Any]) -> List[Tuple[str, str, Optional[int]]]:
+    """
+    Undo pairs of a run parsed by read_run()/recover().
+
+    Applied steps are folded in seq order, so chains and cycle parking
+    collapse into one move per file.
+
+    Returns:
+        (current path, original path, inode) for every file the run moved
+    """
+    origin: Dict[str, Tuple[str, Optional[int]]] = {}
+    for op in run['ops']:
+        if op['state'] != 'done':
+            continue
+        original, inode = origin.pop(op['src'], (op['src'], op.get('inode')))
+        origin[op['dst']] = (original, inode)
+    return [(current, original, inode) for current, (original, inode) in origin.items() if current != original]
+
+
+def _append_records(journal_dir: str, run_id: str, records: List[Dict[str, Any]]) -> None:
+    path = Path(journal_dir) / f"{run_id}.jsonl"
+    with open(path, 'rb') as handle:
+        handle.seek(-1, os.SEEK_END)
+        torn = handle.read(1) != b'\n'
+    with open(path, 'a', encoding='utf-8') as handle:
+        # A torn last line must not swallow the first appended record
+        handle.write('\n' if torn else '')
+        handle.write(''.join(json.dumps(record) + '\n' for record in records))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+__all__ = [
+    'RenameJournal', 'read_run', 'list_runs', 'recover', 'mark_rolled_back', 'rollback_moves', 'new_run_id',
+    'DEFAULT_JOURNAL_DIR',
+]
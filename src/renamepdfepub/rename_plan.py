@@ -0,0 +1,415 @@
+"""Planned, journaled and parallel bulk renames.
+
+plan_renames() turns (source, destination) pairs into an executable plan:
+
+- each directory is listed once (no exists() call per file), so missing
+  sources and occupied destinations are found in bulk;
+- destinations claimed twice, or held by a file that is not moving away,
+  get a " (n)" suffix or are skipped;
+- renames into a name that another rename frees are ordered after it
+  (chains), and cycles such as a swap go through a temporary name in the
+  same directory (a cycle that fails halfway is renamed back, so no file is
+  left under the temporary name);
+- chains are batched per destination directory.
+
+execute_plan() writes every step to a RenameJournal before touching the
+disk, runs the batches on a bounded thread pool (steps inside a batch run in
+order, so a chain stops at its first failure) and reports throughput.
+
+rollback_run() undoes a journaled run the same way: the applied steps are
+folded back into (current, original) pairs, files that were changed since are
+left alone, and the reverse renames are planned and run in parallel as a new
+journaled run.
+"""
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .rename_journal import RenameJournal, mark_rolled_back, new_run_id, recover, rollback_moves
+except ImportError:
+    from rename_journal import RenameJournal, mark_rolled_back, new_run_id, recover, rollback_moves
+
+MAX_WORKERS = 8
+BATCH_OPS = 256
+ON_CONFLICT = ('suffix', 'skip')
+
+
+@dataclass
+class RenameStep:
+    """One os.rename call. target is the requested destination (differs from dst for cycle parking)."""
+    src: str
+    dst: str
+    target: str
+    inode: Optional[int] = None
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+
+
+@dataclass
+class RenamePlan:
+    batches: List[List[RenameStep]] = field(default_factory=list)
+    skipped: List[Tuple[str, str, str]] = field(default_factory=list)
+    conflicts: int = 0
+    cycles: int = 0
+
+    @property
+    def steps(self) -> List[RenameStep]:
+        return [step for batch in self.batches for step in batch]
+
+    def moves(self) -> List[Tuple[str, str]]:
+        """Final (source, destination) pairs, temporary steps folded in."""
+        origin: Dict[str, str] = {}
+        moves = []
+        for step in self.steps:
+            src = origin.pop(step.src, step.src)
+            if step.dst != step.target:
+                origin[step.dst] = src
+            else:
+                moves.append((src, step.dst))
+        return moves
+
+
+class _Listing:
+    """Directory entries fetched once per directory."""
+
+    def __init__(self):
+        self._dirs: Dict[str, Tuple[Dict[str, os.DirEntry], Dict[str, os.DirEntry]]] = {}
+
+    def entry(self, path: str, ignore_case: bool = False) -> Optional[os.DirEntry]:
+        directory, name = os.path.split(path)
+        entries = self._dirs.get(directory)
+        if entries is None:
+            try:
+                with os.scandir(directory) as iterator:
+                    exact = {item.name: item for item in iterator}
+            except OSError:
+                exact = {}
+            entries = self._dirs[directory] = (exact, {key.lower(): item for key, item in exact.items()})
+        found = entries[0].get(name)
+        if found is None and ignore_case:
+            found = entries[1].get(name.lower())
+        return found
+
+
+def _suffixed(path: str, index: int) -> str:
+    stem, ext = os.path.splitext(path)
+    return f"{stem} ({index}){ext}"
+
+
+def plan_renames(pairs: Iterable[Tuple[str, str]], on_conflict: str = 'suffix',
+                 batch_ops: int = BATCH_OPS) -> RenamePlan:
+    """
+    Build a rename plan.
+
+    Args:
+        pairs: (source, destination) paths
+        on_conflict: 'suffix' adds " (n)" to taken destinations, 'skip' drops them
+        batch_ops: Steps per worker batch (chains are never split)
+
+    Returns:
+        RenamePlan; skipped holds (src, dst, reason) with reason in
+        'unchanged', 'missing', 'duplicate_source', 'exists'
+    """
+    if on_conflict not in ON_CONFLICT:
+        raise ValueError(f"on_conflict must be one of {ON_CONFLICT}")
+    listing = _Listing()
+    plan = RenamePlan()
+    requested: Dict[str, str] = {}
+    for src, dst in pairs:
+        src, dst = os.path.abspath(src), os.path.abspath(dst)
+        if src in requested:
+            plan.skipped.append((src, dst, 'duplicate_source'))
+        elif src == dst:
+            plan.skipped.append((src, dst, 'unchanged'))
+        elif listing.entry(src) is None:
+            plan.skipped.append((src, dst, 'missing'))
+        else:
+            requested[src] = dst
+
+    # Skipping a rename pins its source, which can take a destination another rename relied on
+    while True:
+        moves, pinned = _assign(requested, listing, on_conflict, plan)
+        if not pinned:
+            break
+        for src in pinned:
+            plan.skipped.append((src, requested.pop(src), 'exists'))
+
+    # Case-insensitive keys, as in _assign
+    source_of = {src.lower(): src for src in moves}
+    by_dst = {dst.lower(): src for src, dst in moves.items()}
+    chains: List[List[RenameStep]] = []
+    visited = set()
+
+    def feeder(path: str) -> Optional[str]:
+        """Rename waiting for path to be freed."""
+        src = by_dst.get(path.lower())
+        return src if src is not None and src != path else None
+
+    def step(src: str, dst: str, target: Optional[str] = None) -> RenameStep:
+        entry = listing.entry(src)
+        stat = entry.stat(follow_symlinks=False) if entry is not None else None
+        return RenameStep(src, dst, target or dst, inode=entry.inode() if entry is not None else None,
+                          size=stat.st_size if stat else None, mtime_ns=stat.st_mtime_ns if stat else None)
+
+    # A chain starts with the rename whose destination is free, then walks back
+    for src, dst in moves.items():
+        if source_of.get(dst.lower(), src) != src:
+            continue
+        chain, current = [], src
+        while current is not None:
+            visited.add(current)
+            chain.append(step(current, moves[current]))
+            current = feeder(current)
+        chains.append(chain)
+
+    # What is left are cycles: park one file under a temporary name to open the loop
+    for src in moves:
+        if src in visited:
+            continue
+        plan.cycles += 1
+        directory, name = os.path.split(src)
+        temp = os.path.join(directory, f".{name}.renametmp-{uuid.uuid4().hex[:8]}")
+        chain = [step(src, temp, moves[src])]
+        visited.add(src)
+        current = feeder(src)
+        while current != src:
+            visited.add(current)
+            chain.append(step(current, moves[current]))
+            current = feeder(current)
+        chain.append(RenameStep(temp, moves[src], moves[src], inode=chain[0].inode,
+                                size=chain[0].size, mtime_ns=chain[0].mtime_ns))
+        chains.append(chain)
+
+    per_directory: Dict[str, List[List[RenameStep]]] = {}
+    for chain in chains:
+        per_directory.setdefault(os.path.dirname(chain[0].target), []).append(chain)
+    for directory_chains in per_directory.values():
+        batch: List[RenameStep] = []
+        for chain in directory_chains:
+            if batch and len(batch) + len(chain) > batch_ops:
+                plan.batches.append(batch)
+                batch = []
+            batch.extend(chain)
+        if batch:
+            plan.batches.append(batch)
+    return plan
+
+
+def _assign(requested: Dict[str, str], listing: _Listing, on_conflict: str,
+            plan: RenamePlan) -> Tuple[Dict[str, str], List[str]]:
+    moves: Dict[str, str] = {}
+    claimed = set()
+    pinned = []
+    plan.conflicts = 0
+
+    def taken(path: str, src: str) -> bool:
+        # Compared case-insensitively so the plan is also safe on Windows/macOS volumes
+        if path.lower() in claimed:
+            return True
+        if path in requested:
+            return False  # freed by its own rename
+        occupant = listing.entry(path, ignore_case=True)
+        if occupant is None or occupant.path in requested:
+            return False
+        # Case-only rename: the occupant is the source itself
+        return occupant.inode() != listing.entry(src).inode()
+
+    for src, dst in requested.items():
+        final = dst
+        if taken(dst, src):
+            plan.conflicts += 1
+            if on_conflict == 'skip':
+                pinned.append(src)
+                continue
+            index = 2
+            while taken(_suffixed(dst, index), src):
+                index += 1
+            final = _suffixed(dst, index)
+        claimed.add(final.lower())
+        moves[src] = final
+    return moves, pinned
+
+
+def execute_plan(plan: RenamePlan, journal: Optional[RenameJournal] = None,
+                 max_workers: int = MAX_WORKERS) -> Dict[str, Any]:
+    """
+    Run a plan.
+
+    Args:
+        plan: Output of plan_renames()
+        journal: Write-ahead journal (intents are fsynced before the first rename)
+        max_workers: Concurrent batches
+
+    Returns:
+        Stats: planned, renamed, errors, skipped, conflicts, cycles,
+        elapsed, files_per_second, run_id and results [(src, dst, status)]
+    """
+    started = time.perf_counter()
+    steps = plan.steps
+    seq = {id(step): index for index, step in enumerate(steps)}
+    if journal is not None:
+        journal.begin({'src': step.src, 'dst': step.dst, 'inode': step.inode,
+                       'size': step.size, 'mtime_ns': step.mtime_ns} for step in steps)
+
+    def rename(item: RenameStep) -> Optional[str]:
+        try:
+            os.rename(item.src, item.dst)
+        except OSError as e:
+            return str(e)
+        if journal is not None:
+            journal.done(seq[id(item)])
+        return None
+
+    def run_cycle(cycle: List[RenameStep]) -> List[Tuple[RenameStep, Optional[str]]]:
+        # All or nothing: after a failure the applied steps are renamed back in
+        # reverse order, so no file is left under the temporary name
+        for index, item in enumerate(cycle):
+            error = rename(item)
+            if error is not None:
+                break
+        else:
+            return [(item, None) for item in cycle]
+        if journal is not None:
+            journal.error(seq[id(item)], error)
+        status = f"error: {error} (cycle undone)"
+        for applied in reversed(cycle[:index]):
+            try:
+                os.rename(applied.dst, applied.src)
+            except OSError as e:
+                # Still journaled as done, so rollback_run() can finish the undo
+                status = f"error: {error} (undo failed: {e})"
+                break
+            if journal is not None:
+                journal.error(seq[id(applied)], 'undone')
+        # The parking step stands for the parked file; the step out of the temporary name is not reported
+        return [(step, status) for step in cycle[:-1]]
+
+    def run(batch: List[RenameStep]) -> List[Tuple[RenameStep, Optional[str]]]:
+        outcome = []
+        occupied = set()
+        index = 0
+        while index < len(batch):
+            item = batch[index]
+            if item.dst != item.target:
+                # A cycle runs from its parking step to the step leaving the temporary name
+                end = next(i for i in range(index + 1, len(batch)) if batch[i].src == item.dst)
+                outcome.extend(run_cycle(batch[index:end + 1]))
+                index = end + 1
+                continue
+            index += 1
+            if item.dst in occupied:
+                # An earlier link of this chain failed, so its source still holds this name
+                error = 'chain interrupted'
+            else:
+                error = rename(item)
+            if error is not None:
+                outcome.append((item, f"error: {error}"))
+                occupied.add(item.src)
+                if journal is not None:
+                    journal.error(seq[id(item)], error)
+                continue
+            outcome.append((item, None))
+        return outcome
+
+    statuses: Dict[str, Tuple[str, str]] = {}
+    origin: Dict[str, str] = {}
+    renamed = errors = 0
+    workers = max(1, min(max_workers, len(plan.batches) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch_outcome in pool.map(run, plan.batches):
+            for item, error in batch_outcome:
+                src = origin.pop(item.src, item.src)
+                if item.dst != item.target and error is None:
+                    origin[item.dst] = src
+                    continue
+                statuses[src] = (item.target, error or 'renamed')
+                if error:
+                    errors += 1
+                else:
+                    renamed += 1
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'planned': len(statuses),
+        'renamed': renamed,
+        'errors': errors,
+        'skipped': len(plan.skipped),
+        'conflicts': plan.conflicts,
+        'cycles': plan.cycles,
+        'elapsed': round(elapsed, 3),
+        'files_per_second': round(renamed / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    if journal is not None:
+        journal.commit(stats)
+        stats['run_id'] = journal.run_id
+    stats['results'] = [(src, dst, status) for src, (dst, status) in statuses.items()]
+    return stats
+
+
+def bulk_rename(pairs: Iterable[Tuple[str, str]], on_conflict: str = 'suffix',
+                journal_dir: Optional[str] = None, max_workers: int = MAX_WORKERS,
+                run_id: Optional[str] = None) -> Dict[str, Any]:
+    """plan_renames() + execute_plan(), journaled under journal_dir when given."""
+    plan = plan_renames(pairs, on_conflict=on_conflict)
+    journal = RenameJournal(journal_dir, run_id=run_id) if journal_dir else None
+    stats = execute_plan(plan, journal=journal, max_workers=max_workers)
+    stats['results'] += [(src, dst, reason) for src, dst, reason in plan.skipped]
+    return stats
+
+
+def rollback_run(journal_dir: str, run_id: str, max_workers: int = MAX_WORKERS,
+                 dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Rename the files of a journaled run back to their original paths.
+
+    Pending intents of an interrupted run are settled first (recover()).
+    A file is only moved back when its current path still holds the inode
+    the journal recorded; otherwise it is skipped as 'changed' ('missing'
+    when the path is gone). Original paths taken in the meantime are skipped
+    as 'exists', never overwritten.
+
+    Args:
+        journal_dir: Journal directory of the run
+        run_id: Run to undo
+        max_workers: Concurrent batches
+        dry_run: Only report what would be renamed back
+
+    Returns:
+        execute_plan() stats (results hold (current, original, status)) plus
+        'rolled_back' (run_id); the rollback itself is journaled as a new run
+    """
+    run = recover(journal_dir, run_id)
+    pairs, skipped = [], []
+    for current, original, inode in rollback_moves(run):
+        try:
+            current_inode = os.lstat(current).st_ino
+        except OSError:
+            skipped.append((current, original, 'missing'))
+            continue
+        if inode and current_inode != inode:
+            skipped.append((current, original, 'changed'))
+            continue
+        pairs.append((current, original))
+
+    if dry_run:
+        stats: Dict[str, Any] = {'planned': len(pairs), 'renamed': 0, 'errors': 0,
+                                 'results': [(current, original, 'pending') for current, original in pairs]}
+    else:
+        stats = bulk_rename(pairs, on_conflict='skip', journal_dir=journal_dir, max_workers=max_workers,
+                            run_id=f"{new_run_id()}_rollback")
+        mark_rolled_back(journal_dir, run_id, stats['run_id'])
+    stats['skipped'] = stats.get('skipped', 0) + len(skipped)
+    stats['results'] += skipped
+    stats['rolled_back'] = run_id
+    return stats
+
+
+__all__ = [
+    'RenameStep', 'RenamePlan', 'plan_renames', 'execute_plan', 'bulk_rename', 'rollback_run', 'MAX_WORKERS',
+]
@@ -9,15 +9,19 @@ Supports two JSON input formats:
   where each item contains fields like: title, authors, publisher, published_date,
   isbn_10, isbn_13, file_path. This is the report generated under reports/report_*.json.
 
-The tool normalizes either format and generates rename proposals based on a pattern.
+A scan results database (reports/scan_results.db) can be given instead of a JSON
+report; resolved rows of one run are read with an indexed query.
+
+The tool normalizes either format and generates rename proposals based on a pattern
+(compiled once by the naming module and rendered over the whole report).
 """
 import argparse
 import json
+import os
 import shutil
-import re
 import logging
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 try:
     from .logging_config import configure_logging
 except Exception:  # pragma: no cover - fallback for direct module import
@@ -26,9 +30,16 @@ except Exception:  # pragma: no cover - fallback for direct module import
     except Exception:
         def configure_logging():  # type: ignore
             pass
-
-INVALID_CHARS_RE = re.compile(r'[^\w\-\._ ]')
-WHITESPACE_RE = re.compile(r"\s+")
+try:
+    from .results_store import ResultsStore
+    from .rename_journal import DEFAULT_JOURNAL_DIR
+    from .rename_plan import MAX_WORKERS, bulk_rename
+    from .naming import SAFE_NAME, compile_template
+except ImportError:  # pragma: no cover - fallback for direct module import
+    from results_store import ResultsStore  # type: ignore
+    from rename_journal import DEFAULT_JOURNAL_DIR  # type: ignore
+    from rename_plan import MAX_WORKERS, bulk_rename  # type: ignore
+    from naming import SAFE_NAME, compile_template  # type: ignore
 
 
 def sanitize_name(s: str, max_len: int = 90) -> str:
@@ -36,11 +47,21 @@ def sanitize_name(s: str, max_len: int = 90) -> str:
 
     Removes disallowed characters, normalizes whitespace, and trims length.
     """
-    if not s:
-        return ''
-    s = WHITESPACE_RE.sub(' ', s.strip())
-    s = INVALID_CHARS_RE.sub('', s)
-    return s[:max_len].strip()
+    return SAFE_NAME(s, max_len)
+
+
+def _name_fields(md: Dict[str, Any]) -> Dict[str, Any]:
+    """Placeholder values of one metadata dict."""
+    authors = md.get('authors') or ''
+    if isinstance(authors, list):
+        authors = ', '.join([str(a) for a in authors if a])
+    return {
+        'title': md.get('title') or '',
+        'author': authors,
+        'publisher': md.get('publisher') or '',
+        'year': md.get('year') or '',
+        'isbn': md.get('isbn10') or md.get('isbn13') or '',
+    }
 
 
 def format_name(pattern: str, metadata: dict) -> str:
@@ -49,16 +70,7 @@ def format_name(pattern: str, metadata: dict) -> str:
     Placeholders: {title}, {author}, {publisher}, {year}, {isbn}
     """
     md = metadata.get('metadata', metadata)
-    title = md.get('title') or ''
-    authors = md.get('authors') or ''
-    if isinstance(authors, list):
-        authors = ', '.join([str(a) for a in authors if a])
-    author = authors
-    publisher = md.get('publisher') or ''
-    year = md.get('year') or ''
-    isbn = md.get('isbn10') or md.get('isbn13') or ''
-    name = pattern.format(title=title, author=author, publisher=publisher, year=year, isbn=isbn)
-    return sanitize_name(name)
+    return compile_template(pattern, 'report').render(_name_fields(md))
 
 
 def _from_scan_item(item: Dict[str, Any]) -> Dict[str, Any]:
@@ -74,11 +86,36 @@ def _from_scan_item(item: Dict[str, Any]) -> Dict[str, Any]:
     return md
 
 
-def load_report(report_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+def load_results(db_path: str, run_id: Optional[str] = None,
+                 min_confidence: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """Load resolved files of one run (default: latest) from a scan results database."""
+    store = ResultsStore(db_path)
+    try:
+        rows = store.query(run_id=run_id, status='resolved', min_confidence=min_confidence)
+    finally:
+        store.close()
+    return [
+        (row['path'], {
+            'title': row['title'] or '',
+            'authors': row['authors'],
+            'publisher': row['publisher'] or '',
+            'year': str(row['year'] or ''),
+            'isbn10': row['isbn_10'] or '',
+            'isbn13': row['isbn_13'] or '',
+        })
+        for row in rows if row['path']
+    ]
+
+
+def load_report(report_path: str, run_id: Optional[str] = None,
+                min_confidence: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
     """Load report file and return a list of (path, metadata_dict) pairs.
 
-    Accepts legacy list format or scan combined dict format.
+    Accepts legacy list format, scan combined dict format or a scan results
+    database (.db); run_id and min_confidence only apply to the database.
     """
+    if Path(report_path).suffix.lower() in ('.db', '.sqlite'):
+        return load_results(report_path, run_id=run_id, min_confidence=min_confidence)
     data = json.loads(Path(report_path).read_text(encoding='utf-8'))
     items: List[Tuple[str, Dict[str, Any]]] = []
     if isinstance(data, list):
@@ -119,13 +156,14 @@ def load_report(report_path: str) -> List[Tuple[str, Dict[str, Any]]]:
     raise ValueError("Unsupported report format: expected list or dict with 'successful_extractions'.")
 
 
-def dry_run(report_path: str, pattern: str) -> List[Tuple[str, str]]:
+def dry_run(report_path: str, pattern: str, run_id: Optional[str] = None,
+            min_confidence: Optional[float] = None) -> List[Tuple[str, str]]:
     """Create rename proposals from report without modifying files."""
-    pairs = load_report(report_path)
+    pairs = load_report(report_path, run_id=run_id, min_confidence=min_confidence)
+    names = compile_template(pattern, 'report').render_many(_name_fields(md) for _, md in pairs)
     proposals: List[Tuple[str, str]] = []
-    for src, md in pairs:
+    for (src, _), newbase in zip(pairs, names):
         p = Path(src)
-        newbase = format_name(pattern, {'metadata': md})
         if not newbase:
             continue
         dst = str(p.with_name(newbase + p.suffix))
@@ -133,21 +171,32 @@ def dry_run(report_path: str, pattern: str) -> List[Tuple[str, str]]:
     return proposals
 
 
-def apply_changes(proposals, copy=False):
+def apply_changes(proposals, copy=False, journal_dir: Optional[str] = None,
+                  max_workers: int = MAX_WORKERS):
+    """Apply proposals and return (src, dst, status) tuples in proposal order.
+
+    Renames go through the bulk planner (swaps and chains are ordered, taken
+    destinations are reported as 'exists') and are journaled under
+    journal_dir when given. Copies are done one by one.
+    """
+    if not copy:
+        stats = bulk_rename(proposals, on_conflict='skip', journal_dir=journal_dir, max_workers=max_workers)
+        by_src: Dict[str, Tuple[str, str]] = {}
+        for src, dst, status in stats['results']:
+            by_src.setdefault(src, (dst, status))
+        results = []
+        for src, dst in proposals:
+            final, status = by_src[os.path.abspath(src)]
+            results.append((src, final, status))
+        return results
     results = []
     for src, dst in proposals:
-        srcp = Path(src)
-        dstp = Path(dst)
-        if dstp.exists():
+        if Path(dst).exists():
             results.append((src, dst, 'exists'))
             continue
         try:
-            if copy:
-                shutil.copy(src, dst)
-                results.append((src, dst, 'copied'))
-            else:
-                srcp.rename(dstp)
-                results.append((src, dst, 'renamed'))
+            shutil.copy(src, dst)
+            results.append((src, dst, 'copied'))
         except Exception as e:
             results.append((src, dst, f'error: {e}'))
     return results
@@ -155,7 +204,7 @@ def apply_changes(proposals, copy=False):
 
 def main():
     parser = argparse.ArgumentParser(description='Rename files according to metadata report')
-    parser.add_argument('report', help='JSON report produced by extractor_cli.py')
+    parser.add_argument('report', help='JSON report produced by extractor_cli.py or reports/scan_results.db')
     parser.add_argument(
         '--pattern',
         default='{publisher}_{year}_{title}_{author}_{isbn}',
@@ -164,18 +213,22 @@ def main():
     parser.add_argument('--dry-run', action='store_true', default=False, help='Only show proposals (use --apply to perform)')
     parser.add_argument('--apply', action='store_true', help='Apply renaming')
     parser.add_argument('--copy', action='store_true', help='Copy files instead of rename')
+    parser.add_argument('--run-id', help='Run to read from a results database (default: latest)')
+    parser.add_argument('--min-confidence', type=float, help='Skip results below this confidence (database only)')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='Parallel rename workers')
+    parser.add_argument('--journal-dir', default=DEFAULT_JOURNAL_DIR, help='Write-ahead rename journal directory')
     args = parser.parse_args()
 
     configure_logging()
     logger = logging.getLogger(__name__)
 
-    proposals = dry_run(args.report, args.pattern)
+    proposals = dry_run(args.report, args.pattern, run_id=args.run_id, min_confidence=args.min_confidence)
     logger.info('Proposals: %d', len(proposals))
     for src, dst in proposals[:50]:
         logger.info('%s -> %s', src, dst)
 
     if args.apply:
-        res = apply_changes(proposals, copy=args.copy)
+        res = apply_changes(proposals, copy=args.copy, journal_dir=args.journal_dir, max_workers=args.workers)
         logger.info('Results:')
         for r in res:
             logger.info('%s', r)
@@ -0,0 +1,206 @@
+"""Incremental report writer for large scans.
+
+StreamingReportWriter appends one JSON line per finished file to
+report_<timestamp>.jsonl and buffers HTML table rows that are flushed in
+chunks to report_<timestamp>.html, so neither report is ever held in memory.
+Aggregates (success/failure counts, sources, missing fields, processing
+times) are updated as records arrive and written at the end: a final
+{"type": "summary"} line in the JSONL file and a summary card closing the
+HTML page.
+
+Compact mode leaves out failure text samples and other bulky diagnostics.
+"""
+from __future__ import annotations
+
+import html
+import json
+import re
+import threading
+from collections import Counter
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+HTML_CHUNK_ROWS = 200
+BULKY_FAILURE_KEYS = ('text_sample', 'methods_tried', 'traceback')
+
+_CTRL_RE = re.compile(r'[\x00-\x1F\x7F]')
+_WS_RE = re.compile(r'\s+')
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Book Metadata Report</title>
+<style>
+body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }
+.card { background: #fff; padding: 20px; margin: 20px 0; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+table { width: 100%; border-collapse: collapse; margin: 10px 0; }
+th, td { padding: 12px 8px; text-align: left; border-bottom: 1px solid #ddd; }
+th { background-color: #f5f5f5; }
+.success { color: #28a745; }
+.failure { color: #dc3545; }
+</style>
+</head>
+<body>
+<h1>Book Metadata Report</h1>
+<p><a href="#summary">Summary</a> (written when the scan finishes)</p>
+<div class="card">
+<h2>Results</h2>
+<table>
+<tr><th>File</th><th>Status</th><th>Title / Error</th><th>Authors / Details</th><th>ISBN</th><th>Source</th></tr>
+"""
+
+
+def _clean(value: Any, max_len: int) -> str:
+    text = _WS_RE.sub(' ', _CTRL_RE.sub('', str(value if value is not None else ''))).strip()
+    return html.escape(text[:max_len])
+
+
+def _is_missing(value: Any) -> bool:
+    return (not value) or str(value).strip().lower() in ('unknown', 'n/a', 'na')
+
+
+class StreamingReportWriter:
+    """
+    Write JSONL and HTML reports while files complete.
+
+    Args:
+        reports_dir: Output directory
+        timestamp: Suffix shared by both files (report_<timestamp>.*)
+        compact: Leave out text samples and other bulky failure details
+        chunk_rows: HTML rows buffered before each write
+    """
+
+    def __init__(self, reports_dir: Path, timestamp: Optional[str] = None,
+                 compact: bool = False, chunk_rows: int = HTML_CHUNK_ROWS):
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.reports_dir = Path(reports_dir)
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.jsonl_path = self.reports_dir / f"report_{self.timestamp}.jsonl"
+        self.html_path = self.reports_dir / f"report_{self.timestamp}.html"
+        self.compact = compact
+        self.chunk_rows = max(1, chunk_rows)
+        self._lock = threading.Lock()
+        self._jsonl = open(self.jsonl_path, 'w', encoding='utf-8')
+        self._html = open(self.html_path, 'w', encoding='utf-8')
+        self._html.write(_HTML_HEAD)
+        self._rows: list = []
+        self._closed = False
+        self.counts = Counter()
+        self.source_stats = Counter()
+        self.error_stats = Counter()
+        self.missing_fields = Counter({'title': 0, 'authors': 0, 'publisher': 0, 'year': 0, 'isbn': 0})
+
+    def record_success(self, metadata: Any, status: str = 'success') -> None:
+        """Record a resolved file (BookMetadata or dict)."""
+        record = asdict(metadata) if is_dataclass(metadata) else dict(metadata)
+        file_path = record.get('file_path') or ''
+        authors = [a if isinstance(a, str) else str(a) for a in (record.get('authors') or [])]
+        isbn = record.get('isbn_13') or record.get('isbn_10') or ''
+        line = {
+            'type': status,
+            'file': file_path,
+            'title': record.get('title'),
+            'authors': authors,
+            'publisher': record.get('publisher'),
+            'published_date': record.get('published_date'),
+            'isbn_13': record.get('isbn_13'),
+            'isbn_10': record.get('isbn_10'),
+            'source': record.get('source'),
+            'confidence_score': round(record.get('confidence_score') or 0.0, 3),
+        }
+        row = (
+            f"<tr><td>{_clean(Path(file_path).name, 140)}</td><td class=\"success\">{status}</td>"
+            f"<td>{_clean(record.get('title'), 120)}</td><td>{_clean(', '.join(authors), 120)}</td>"
+            f"<td>{_clean(isbn, 32)}</td><td>{_clean(record.get('source'), 40)}</td></tr>\n"
+        )
+        with self._lock:
+            self.counts[status] += 1
+            self.source_stats[record.get('source') or 'unknown'] += 1
+            for field, value in (('title', record.get('title')), ('authors', ','.join(authors)),
+                                 ('publisher', record.get('publisher')),
+                                 ('year', record.get('published_date')), ('isbn', isbn)):
+                if _is_missing(value):
+                    self.missing_fields[field] += 1
+            self._write(line, row)
+
+    def record_failure(self, file_path: str, details: Optional[Dict[str, Any]] = None) -> None:
+        """Record a file that could not be resolved."""
+        details = dict(details or {})
+        if self.compact:
+            for key in BULKY_FAILURE_KEYS:
+                details.pop(key, None)
+        error = details.pop('error', 'unknown_error')
+        line = {'type': 'failure', 'file': file_path, 'error': error, 'details': details}
+        summary = ', '.join(f"{key}={value}" for key, value in details.items() if key != 'text_sample')
+        row = (
+            f"<tr><td>{_clean(Path(file_path).name, 140)}</td><td class=\"failure\">failure</td>"
+            f"<td>{_clean(error, 120)}</td><td>{_clean(summary, 200)}</td><td></td><td></td></tr>\n"
+        )
+        with self._lock:
+            self.counts['failure'] += 1
+            self.error_stats[error] += 1
+            self._write(line, row)
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Write the aggregates and close both files.
+
+        Args:
+            summary: Extra aggregates to include (format stats, timings, ...)
+
+        Returns:
+            The summary that was written
+        """
+        with self._lock:
+            if self._closed:
+                return {}
+            self._closed = True
+            self._flush_html()
+            # Recovered files were first reported as failures
+            processed = self.counts['success'] + self.counts['failure']
+            resolved = self.counts['success'] + self.counts['recovered']
+            final = {
+                'type': 'summary',
+                'generated_at': datetime.now().isoformat(),
+                'files_reported': processed,
+                'successful': self.counts['success'],
+                'recovered': self.counts['recovered'],
+                'failed': max(0, self.counts['failure'] - self.counts['recovered']),
+                'success_rate': round(resolved / processed * 100, 2) if processed else 0.0,
+                'source_stats': dict(self.source_stats),
+                'error_stats': dict(self.error_stats),
+                'missing_fields': dict(self.missing_fields),
+            }
+            final.update(summary or {})
+            self._jsonl.write(json.dumps(final, ensure_ascii=False, default=str) + '\n')
+            self._jsonl.close()
+
+            self._html.write('</table>\n</div>\n<div class="card" id="summary">\n<h2>Summary</h2>\n<table>\n')
+            for key, value in final.items():
+                if key == 'type':
+                    continue
+                if isinstance(value, dict):
+                    value = ', '.join(f"{k}: {v}" for k, v in value.items()) or '-'
+                self._html.write(f"<tr><th>{_clean(key, 60)}</th><td>{_clean(value, 2000)}</td></tr>\n")
+            self._html.write('</table>\n</div>\n</body>\n</html>\n')
+            self._html.close()
+        return final
+
+    def _write(self, line: Dict[str, Any], row: str) -> None:
+        self._jsonl.write(json.dumps(line, ensure_ascii=False, default=str) + '\n')
+        self._rows.append(row)
+        if len(self._rows) >= self.chunk_rows:
+            self._flush_html()
+
+    def _flush_html(self) -> None:
+        if self._rows:
+            self._html.write(''.join(self._rows))
+            self._rows.clear()
+            self._html.flush()
+        self._jsonl.flush()
+
+
+__all__ = ['StreamingReportWriter', 'HTML_CHUNK_ROWS']
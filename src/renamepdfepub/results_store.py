@@ -0,0 +1,292 @@
+"""Per-file scan results as a typed, queryable table.
+
+Each scan writes one row per file into a SQLite table (path, ISBNs, title,
+authors, publisher, year, confidence, source, elapsed time, failure code)
+keyed by run, next to the JSON/HTML reports. Dashboards and the renamer can
+then filter and aggregate a run with a single indexed query instead of
+loading and re-parsing whole report_*.json documents.
+
+Rows are buffered and inserted in batches. A file that fails and is later
+recovered keeps one row: status becomes 'recovered' and the original failure
+code is preserved.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DB_PATH = 'reports/scan_results.db'
+BATCH_SIZE = 500
+
+RESULT_COLUMNS = (
+    'run_id', 'path', 'file_name', 'format', 'status', 'isbn_13', 'isbn_10', 'title',
+    'authors', 'publisher', 'year', 'confidence', 'source', 'elapsed', 'failure_code',
+)
+GROUP_COLUMNS = ('status', 'source', 'publisher', 'year', 'format', 'failure_code')
+ORDER_COLUMNS = ('path', 'confidence', 'elapsed', 'year', 'title', 'publisher')
+
+_YEAR_RE = re.compile(r'\b(1[5-9]\d\d|20\d\d)\b')
+
+
+def _year(value: Any) -> Optional[int]:
+    match = _YEAR_RE.search(str(value or ''))
+    return int(match.group(1)) if match else None
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text if text and text.lower() not in ('unknown', 'n/a') else None
+
+
+class ResultsStore:
+    """
+    SQLite table of per-file results, partitioned by run_id.
+
+    Args:
+        db_path: Database file (created on first write)
+        batch_size: Rows buffered before each insert
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, batch_size: int = BATCH_SIZE):
+        self.db_path = str(db_path)
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[tuple] = []
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT,
+                    config TEXT,
+                    summary TEXT
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS results (
+                    run_id TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    file_name TEXT,
+                    format TEXT,
+                    status TEXT NOT NULL,
+                    isbn_13 TEXT,
+                    isbn_10 TEXT,
+                    title TEXT,
+                    authors TEXT,
+                    publisher TEXT,
+                    year INTEGER,
+                    confidence REAL,
+                    source TEXT,
+                    elapsed REAL,
+                    failure_code TEXT,
+                    PRIMARY KEY (run_id, path)
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_results_status ON results(run_id, status)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_results_isbn ON results(isbn_13)')
+            self._conn.commit()
+        return self._conn
+
+    def start_run(self, run_id: Optional[str] = None, config: Optional[Dict[str, Any]] = None) -> str:
+        """Register a run and return its id (default: timestamp)."""
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO runs(run_id, started_at, config) VALUES (?, ?, ?)',
+                    (run_id, datetime.now().isoformat(), json.dumps(config or {}, default=str)),
+                )
+        return run_id
+
+    def record_success(self, run_id: str, metadata: Any, elapsed: Optional[float] = None,
+                       status: str = 'success') -> None:
+        """Buffer a resolved file (BookMetadata or dict)."""
+        record = asdict(metadata) if is_dataclass(metadata) else dict(metadata)
+        path = record.get('file_path') or ''
+        authors = [str(author) for author in (record.get('authors') or []) if author]
+        self._add((
+            run_id, path, Path(path).name, Path(path).suffix.lower().lstrip('.') or None, status,
+            _text(record.get('isbn_13')), _text(record.get('isbn_10')), _text(record.get('title')),
+            json.dumps(authors, ensure_ascii=False), _text(record.get('publisher')),
+            _year(record.get('published_date')), float(record.get('confidence_score') or 0.0),
+            _text(record.get('source')), elapsed, None,
+        ))
+
+    def record_failure(self, run_id: str, path: str, failure_code: Optional[str] = None,
+                       elapsed: Optional[float] = None) -> None:
+        """Buffer a file that could not be resolved."""
+        self._add((
+            run_id, path, Path(path).name, Path(path).suffix.lower().lstrip('.') or None, 'failure',
+            None, None, None, '[]', None, None, 0.0, None, elapsed,
+            (str(failure_code)[:120] if failure_code else 'unknown_error'),
+        ))
+
+    def finish_run(self, run_id: str, summary: Optional[Dict[str, Any]] = None) -> None:
+        """Flush buffered rows and store the run summary."""
+        self.flush()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    'UPDATE runs SET finished_at = ?, summary = ? WHERE run_id = ?',
+                    (datetime.now().isoformat(), json.dumps(summary or {}, default=str), run_id),
+                )
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if not rows:
+                return
+            with self.conn:
+                # Recovered rows replace the failure but keep its code
+                self.conn.executemany(
+                    f"INSERT INTO results({', '.join(RESULT_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(RESULT_COLUMNS))}) "
+                    "ON CONFLICT(run_id, path) DO UPDATE SET "
+                    + ', '.join(f"{column} = excluded.{column}" for column in RESULT_COLUMNS[2:-2])
+                    + ", elapsed = COALESCE(excluded.elapsed, results.elapsed)"
+                    + ", failure_code = COALESCE(excluded.failure_code, results.failure_code)",
+                    rows,
+                )
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Runs, newest first."""
+        self.flush()
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT run_id, started_at, finished_at, config, summary FROM runs '
+                'ORDER BY started_at DESC, run_id DESC'
+            ).fetchall()
+        return [
+            {
+                'run_id': row['run_id'],
+                'started_at': row['started_at'],
+                'finished_at': row['finished_at'],
+                'config': json.loads(row['config'] or '{}'),
+                'summary': json.loads(row['summary'] or '{}'),
+            }
+            for row in rows
+        ]
+
+    def latest_run(self, finished_only: bool = True) -> Optional[str]:
+        for run in self.runs():
+            if run['finished_at'] or not finished_only:
+                return run['run_id']
+        return None
+
+    def query(self, run_id: Optional[str] = None, status: Optional[str] = None,
+              source: Optional[str] = None, publisher: Optional[str] = None,
+              min_confidence: Optional[float] = None, isbn: Optional[str] = None,
+              order_by: str = 'path', limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rows of one run matching every given filter.
+
+        Args:
+            run_id: Run to read (default: latest finished run)
+            status: 'success', 'recovered' or 'failure'; 'resolved' matches the first two
+            source, publisher: Exact matches
+            min_confidence: Lower bound on the confidence column
+            isbn: ISBN-13 or ISBN-10
+            order_by: One of ORDER_COLUMNS, prefix with '-' for descending
+            limit: Maximum number of rows
+        """
+        where, params = self._where(run_id, status)
+        for column, value in (('source', source), ('publisher', publisher)):
+            if value is not None:
+                where.append(f'{column} = ?')
+                params.append(value)
+        if min_confidence is not None:
+            where.append('confidence >= ?')
+            params.append(float(min_confidence))
+        if isbn:
+            where.append('(isbn_13 = ? OR isbn_10 = ?)')
+            params.extend([isbn, isbn])
+        column = order_by.lstrip('-')
+        if column not in ORDER_COLUMNS:
+            raise ValueError(f"order_by must be one of {ORDER_COLUMNS}")
+        sql = (f"SELECT {', '.join(RESULT_COLUMNS)} FROM results WHERE {' AND '.join(where)} "
+               f"ORDER BY {column} {'DESC' if order_by.startswith('-') else 'ASC'}")
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._row(row) for row in rows]
+
+    def aggregate(self, by: str = 'status', run_id: Optional[str] = None,
+                  status: Optional[str] = None) -> Dict[Any, Dict[str, Any]]:
+        """
+        Count, mean confidence and mean elapsed time per value of one column.
+
+        Args:
+            by: One of GROUP_COLUMNS
+            run_id: Run to read (default: latest finished run)
+            status: Same filter as query()
+        """
+        if by not in GROUP_COLUMNS:
+            raise ValueError(f"by must be one of {GROUP_COLUMNS}")
+        where, params = self._where(run_id, status)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {by}, COUNT(*), AVG(confidence), AVG(elapsed) FROM results "
+                f"WHERE {' AND '.join(where)} GROUP BY {by} ORDER BY COUNT(*) DESC",
+                params,
+            ).fetchall()
+        return {
+            row[0]: {
+                'count': row[1],
+                'avg_confidence': round(row[2] or 0.0, 3),
+                'avg_elapsed': round(row[3], 3) if row[3] is not None else None,
+            }
+            for row in rows
+        }
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _add(self, row: tuple) -> None:
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def _where(self, run_id: Optional[str], status: Optional[str]) -> tuple:
+        self.flush()
+        run_id = run_id or self.latest_run() or self.latest_run(finished_only=False)
+        where, params = ['run_id = ?'], [run_id]
+        if status == 'resolved':
+            where.append("status IN ('success', 'recovered')")
+        elif status is not None:
+            where.append('status = ?')
+            params.append(status)
+        return where, params
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record['authors'] = json.loads(record['authors'] or '[]')
+        return record
+
+
+__all__ = ['ResultsStore', 'DEFAULT_DB_PATH', 'RESULT_COLUMNS', 'GROUP_COLUMNS', 'ORDER_COLUMNS']
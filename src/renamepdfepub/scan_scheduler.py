@@ -0,0 +1,259 @@
+"""Cost-aware, work-stealing scheduler for directory scans.
+
+estimate_cost() predicts how expensive a file is to process from what the
+directory listing already gives (stat size, format, filename and
+preprocessor hints), so queueing a large library costs no extra reads.
+ScanScheduler runs cheap, high-yield files first on the light lane and keeps
+expensive ones (huge, previously quarantined) on a separate lane whose
+concurrency is bounded. A light worker that picks a PDF first probes it
+(probe_cost: page count and font/image markers from the head and tail of the
+file); one that looks scanned moves to the heavy lane. Idle light workers
+steal heavy work while the heavy bound allows it, and workers waiting for a
+heavy slot sleep on a condition. Every item gets a Future, so callers consume
+results with concurrent.futures.as_completed.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+HEAVY_COST = 5.0
+SAMPLE_BYTES = 256 * 1024
+OCR_SECONDS_PER_PAGE = 3.0
+OCR_PAGES = 10
+
+_FILENAME_ISBN_RE = re.compile(r'(?<!\d)(97[89][-_ ]?(?:\d[-_ ]?){9}\d|\d{9}[\dXx])(?![\dXx])')
+_PAGE_COUNT_RE = re.compile(rb'/Count\s+(\d+)')
+
+
+@dataclass(order=True)
+class FileCost:
+    """Estimated processing cost of one file (ordered by scheduling priority)."""
+    priority: float
+    path: str = field(compare=False)
+    fmt: str = field(default='', compare=False)
+    size: int = field(default=0, compare=False)
+    pages: int = field(default=0, compare=False)
+    ocr_likely: bool = field(default=False, compare=False)
+    isbn_known: bool = field(default=False, compare=False)
+    deferred: bool = field(default=False, compare=False)
+    cost: float = field(default=0.0, compare=False)
+    heavy: bool = field(default=False, compare=False)
+    payload: Any = field(default=None, compare=False, repr=False)
+    probed: bool = field(default=False, compare=False)
+
+
+def estimate_cost(path: str, hint: Optional[Dict] = None, deferred: bool = False,
+                  heavy_cost: float = HEAVY_COST, payload: Any = None,
+                  size: Optional[int] = None) -> FileCost:
+    """
+    Estimate the cost of processing `path` from its stat size and name only.
+
+    Args:
+        path: File to schedule
+        hint: Preprocessor hint for the file (an 'isbn' key marks a high-yield file)
+        deferred: Previously quarantined; always scheduled last on the heavy lane
+        heavy_cost: Cost from which a file goes to the heavy lane
+        payload: Opaque value carried along for the caller
+        size: File size when the caller already has it (skips the stat)
+    """
+    fmt = os.path.splitext(path)[1].lower().lstrip('.')
+    if size is None:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+    isbn_known = bool(hint and hint.get('isbn')) or bool(_FILENAME_ISBN_RE.search(os.path.basename(path)))
+    item = FileCost(0.0, path, fmt, size, isbn_known=isbn_known, deferred=deferred, payload=payload)
+    return _priced(item, heavy_cost)
+
+
+def probe_cost(item: FileCost, heavy_cost: float = HEAVY_COST) -> FileCost:
+    """
+    Refine a PDF's estimate with its page count and scan markers (reads head and tail).
+
+    Runs on the worker that picked the item; the item is updated in place.
+    """
+    if not item.probed:
+        item.probed = True
+        if item.fmt == 'pdf':
+            item.pages, item.ocr_likely = _pdf_signals(item.path, item.size)
+            _priced(item, heavy_cost)
+    return item
+
+
+def _priced(item: FileCost, heavy_cost: float) -> FileCost:
+    megabytes = item.size / (1024 * 1024)
+    if item.fmt == 'pdf':
+        pages = item.pages
+        scanned = min(pages, OCR_PAGES) if pages else OCR_PAGES
+        bytes_per_page = item.size / pages if pages else 200 * 1024
+        cost = 0.1 + 0.05 * scanned * max(1.0, bytes_per_page / (200 * 1024))
+        if item.ocr_likely:
+            cost += OCR_SECONDS_PER_PAGE * scanned
+    elif item.fmt == 'epub':
+        cost = 0.05 + 0.02 * megabytes
+    elif item.fmt in ('mobi', 'azw', 'azw3'):
+        cost = 0.05 + 0.01 * megabytes
+    else:
+        cost = 0.1 + 0.05 * megabytes
+
+    # High-yield files (ISBN already known) go first: one API call, no heavy text work
+    item.cost = cost
+    item.priority = cost * (0.1 if item.isbn_known else 1.0) + (1e9 if item.deferred else 0.0)
+    item.heavy = item.deferred or item.ocr_likely or cost >= heavy_cost
+    return item
+
+
+def _pdf_signals(path: str, size: int) -> Tuple[int, bool]:
+    """Page count (largest /Count in head/tail) and whether the PDF looks scanned."""
+    try:
+        with open(path, 'rb') as handle:
+            head = handle.read(SAMPLE_BYTES)
+            tail = b''
+            if size > SAMPLE_BYTES:
+                handle.seek(max(SAMPLE_BYTES, size - SAMPLE_BYTES))
+                tail = handle.read(SAMPLE_BYTES)
+    except OSError:
+        return 0, False
+    sample = head + tail
+    counts = [int(value) for value in _PAGE_COUNT_RE.findall(sample)]
+    pages = max(counts) if counts else 0
+    has_images = b'/Image' in sample or b'/DCTDecode' in sample or b'/JBIG2Decode' in sample
+    ocr_likely = has_images and b'/Font' not in sample
+    return pages, ocr_likely
+
+
+class ScanScheduler:
+    """
+    Two-lane priority scheduler with work stealing.
+
+    Args:
+        max_workers: Light-lane worker threads
+        heavy_workers: Threads dedicated to the heavy lane
+        heavy_limit: Maximum heavy items running at once (dedicated + stolen)
+        probe: Called by a light worker on each item before running it (default:
+            probe_cost); an item it marks heavy moves to the heavy lane
+    """
+
+    def __init__(self, max_workers: int = 4, heavy_workers: int = 1, heavy_limit: Optional[int] = None,
+                 probe: Optional[Callable[[FileCost], FileCost]] = probe_cost):
+        self.max_workers = max(1, max_workers)
+        self.heavy_workers = max(1, heavy_workers)
+        self.heavy_limit = max(self.heavy_workers, heavy_limit or max(1, self.max_workers // 2))
+        self.probe = probe
+        self._light: List[Tuple[FileCost, int, Future]] = []
+        self._heavy: List[Tuple[FileCost, int, Future]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._heavy_running = 0
+        self._threads: List[threading.Thread] = []
+        self.stats = {'light': 0, 'heavy': 0, 'stolen': 0, 'promoted': 0}
+
+    def submit(self, items: Iterable[FileCost], fn: Callable[[FileCost], Any]) -> Dict[Future, FileCost]:
+        """
+        Queue all items and start the lanes.
+
+        Returns:
+            Dict mapping each item's Future to its FileCost (use as_completed on it)
+        """
+        futures: Dict[Future, FileCost] = {}
+        with self._lock:
+            for item in items:
+                future: Future = Future()
+                futures[future] = item
+                lane = self._heavy if item.heavy else self._light
+                heapq.heappush(lane, (item, next(self._counter), future))
+        for index in range(self.max_workers):
+            self._start(fn, heavy=False, name=f'scan-light-{index}')
+        for index in range(self.heavy_workers):
+            self._start(fn, heavy=True, name=f'scan-heavy-{index}')
+        return futures
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel queued items and (optionally) wait for running ones."""
+        with self._ready:
+            for _, _, future in self._light + self._heavy:
+                future.cancel()
+            self._light.clear()
+            self._heavy.clear()
+            self._ready.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads.clear()
+
+    def _start(self, fn: Callable[[FileCost], Any], heavy: bool, name: str) -> None:
+        thread = threading.Thread(target=self._worker, args=(fn, heavy), name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _take(self, heavy_lane: bool) -> Optional[Tuple[FileCost, Future, bool]]:
+        # Caller holds the lock
+        if not heavy_lane and self._light:
+            item, _, future = heapq.heappop(self._light)
+            return item, future, False
+        if self._heavy and self._heavy_running < self.heavy_limit:
+            # Dedicated heavy workers, or idle light workers stealing
+            if heavy_lane or not self._light:
+                item, _, future = heapq.heappop(self._heavy)
+                self._heavy_running += 1
+                if not heavy_lane:
+                    self.stats['stolen'] += 1
+                return item, future, True
+        if heavy_lane and self._light and not self._heavy:
+            # Heavy lane drained: help with the light queue
+            item, _, future = heapq.heappop(self._light)
+            return item, future, False
+        return None
+
+    def _next(self, heavy_lane: bool) -> Optional[Tuple[FileCost, Future, bool]]:
+        """Next job for this worker; waits while heavy work is queued but no slot is free."""
+        with self._ready:
+            while True:
+                job = self._take(heavy_lane)
+                if job is not None or not self._heavy:
+                    return job
+                self._ready.wait()
+
+    def _worker(self, fn: Callable[[FileCost], Any], heavy_lane: bool) -> None:
+        while True:
+            job = self._next(heavy_lane)
+            if job is None:
+                return
+            item, future, is_heavy = job
+            if not is_heavy and self.probe is not None and not item.heavy:
+                try:
+                    self.probe(item)
+                except Exception:
+                    pass
+                if item.heavy:
+                    # Looked light from the listing, heavy once probed
+                    with self._ready:
+                        heapq.heappush(self._heavy, (item, next(self._counter), future))
+                        self.stats['promoted'] += 1
+                        self._ready.notify_all()
+                    continue
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(item))
+                except BaseException as exc:
+                    future.set_exception(exc)
+            finally:
+                with self._ready:
+                    self.stats['heavy' if is_heavy else 'light'] += 1
+                    if is_heavy:
+                        self._heavy_running -= 1
+                        self._ready.notify_all()
+
+
+__all__ = ['FileCost', 'ScanScheduler', 'estimate_cost', 'probe_cost', 'HEAVY_COST']
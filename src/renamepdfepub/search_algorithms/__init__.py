@@ -11,6 +11,7 @@ Módulos disponíveis:
 - isbn_search: Busca especializada por ISBN
 - hybrid_search: Combinação de múltiplos algoritmos
 - search_orchestrator: Coordenação inteligente de algoritmos
+- cost_model: Estatísticas online para seleção de estratégia
 """
 
 from .base_search import BaseSearchAlgorithm
@@ -110,6 +110,22 @@ class BaseSearchAlgorithm(ABC):
         """
         pass
     
+    def search_many(self, queries: List[SearchQuery]) -> List[List[SearchResult]]:
+        """
+        Executa busca para um lote de queries.
+        
+        A implementação padrão chama search() para cada query. Algoritmos com
+        preparação cara (bases de candidatos, vetores) devem sobrescrever este
+        método para reaproveitar a preparação em todo o lote.
+        
+        Args:
+            queries: Lista de queries
+            
+        Returns:
+            List[List[SearchResult]]: Resultados de cada query, na mesma ordem
+        """
+        return [self.search(query) for query in queries]
+    
     @abstractmethod
     def is_suitable_for_query(self, query: SearchQuery) -> bool:
         """
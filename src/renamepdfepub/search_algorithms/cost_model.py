@@ -0,0 +1,266 @@
+"""
+Cost Model - Estatísticas online por algoritmo e tipo de query.
+
+Mantém, para cada par (algoritmo, tipo de query):
+- Distribuição de latência (média móvel exponencial e janela recente para percentis)
+- Probabilidade de acerto (resultado acima do limiar de confiança)
+- Score médio do melhor resultado
+
+Usado pelo SearchOrchestrator para escolher o plano de execução com a maior
+precisão esperada por milissegundo.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional, Sequence, Tuple
+
+
+class AlgorithmQueryStats:
+    """Estatísticas online de um algoritmo para um tipo de query."""
+
+    def __init__(self, window: int = 200, alpha: float = 0.2):
+        """
+        Inicializa as estatísticas.
+
+        Args:
+            window: Tamanho da janela de latências usada para percentis
+            alpha: Fator de suavização da média móvel de latência
+        """
+        self.alpha = alpha
+        self.count = 0
+        self.hits = 0
+        self.failures = 0
+        self.score_sum = 0.0
+        self.ewma_latency_ms = 0.0
+        self.recent_latencies_ms: Deque[float] = deque(maxlen=window)
+
+    def observe(self, latency_ms: float, top_score: float, hit: bool, failed: bool = False):
+        """Registra uma execução do algoritmo."""
+        self.count += 1
+        self.hits += int(hit)
+        self.failures += int(failed)
+        self.score_sum += top_score
+        if self.count == 1:
+            self.ewma_latency_ms = latency_ms
+        else:
+            self.ewma_latency_ms += self.alpha * (latency_ms - self.ewma_latency_ms)
+        self.recent_latencies_ms.append(latency_ms)
+
+    @property
+    def hit_probability(self) -> float:
+        """Probabilidade de acerto com prior de Laplace (1 acerto em 2 tentativas)."""
+        return (self.hits + 1) / (self.count + 2)
+
+    @property
+    def average_score(self) -> float:
+        """Score médio do melhor resultado retornado."""
+        return self.score_sum / self.count if self.count else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Percentil de latência (ms) sobre a janela recente."""
+        if not self.recent_latencies_ms:
+            return 0.0
+        ordered = sorted(self.recent_latencies_ms)
+        index = min(len(ordered) - 1, int(round(percentile / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Exporta as estatísticas como dicionário."""
+        return {
+            'count': self.count,
+            'hits': self.hits,
+            'failures': self.failures,
+            'hit_probability': self.hit_probability,
+            'average_score': self.average_score,
+            'latency_ms': {
+                'ewma': self.ewma_latency_ms,
+                'p50': self.latency_percentile(50),
+                'p95': self.latency_percentile(95),
+                'max': max(self.recent_latencies_ms) if self.recent_latencies_ms else 0.0
+            }
+        }
+
+
+class SearchCostModel:
+    """
+    Modelo de custo aprendido online para seleção de estratégia.
+
+    Para cada plano candidato ('best_match', 'sequential', 'parallel', 'adaptive')
+    estima a probabilidade de encontrar um resultado confiável e o tempo de
+    parede esperado, escolhendo o maior quociente precisão/ms.
+    """
+
+    PLANS = ('best_match', 'sequential', 'parallel', 'adaptive')
+
+    def __init__(self,
+                 hit_threshold: float = 0.8,
+                 min_samples: int = 5,
+                 min_cost_ms: float = 0.05):
+        """
+        Inicializa o modelo.
+
+        Args:
+            hit_threshold: Score mínimo para considerar a execução um acerto
+            min_samples: Observações mínimas por algoritmo antes de usar o modelo
+            min_cost_ms: Piso de custo para evitar divisão por valores ínfimos
+        """
+        self.hit_threshold = hit_threshold
+        self.min_samples = min_samples
+        self.min_cost_ms = min_cost_ms
+        self._stats: Dict[Tuple[str, str], AlgorithmQueryStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self,
+                algorithm_name: str,
+                query_type: str,
+                latency_ms: float,
+                top_score: float,
+                failed: bool = False):
+        """
+        Atualiza as estatísticas com uma execução observada.
+
+        Args:
+            algorithm_name: Nome do algoritmo executado
+            query_type: Tipo da query (ver QueryPreprocessor._determine_query_type)
+            latency_ms: Latência da execução em milissegundos
+            top_score: Score do melhor resultado (0.0 se vazio)
+            failed: Se a execução lançou exceção
+        """
+        hit = not failed and top_score >= self.hit_threshold
+        with self._lock:
+            stats = self._stats.get((algorithm_name, query_type))
+            if stats is None:
+                stats = self._stats[(algorithm_name, query_type)] = AlgorithmQueryStats()
+            stats.observe(latency_ms, top_score, hit, failed)
+
+    def get(self, algorithm_name: str, query_type: str) -> Optional[AlgorithmQueryStats]:
+        """Retorna as estatísticas de um par (algoritmo, tipo) ou None."""
+        return self._stats.get((algorithm_name, query_type))
+
+    def is_warm(self, algorithm_names: Sequence[str], query_type: str) -> bool:
+        """Verifica se todos os algoritmos têm observações suficientes."""
+        for name in algorithm_names:
+            stats = self._stats.get((name, query_type))
+            if stats is None or stats.count < self.min_samples:
+                return False
+        return True
+
+    def rank_algorithms(self, algorithm_names: Sequence[str], query_type: str) -> List[str]:
+        """
+        Ordena algoritmos por probabilidade de acerto por milissegundo.
+
+        Algoritmos sem observações mantêm a ordem recebida, após os conhecidos.
+        """
+        def efficiency(name: str) -> float:
+            stats = self._stats.get((name, query_type))
+            if stats is None or stats.count == 0:
+                return -1.0
+            return stats.hit_probability / max(stats.ewma_latency_ms, self.min_cost_ms)
+
+        return sorted(algorithm_names, key=efficiency, reverse=True)
+
+    def estimate_plans(self,
+                       algorithm_names: Sequence[str],
+                       query_type: str,
+                       max_workers: int) -> Dict[str, Dict[str, float]]:
+        """
+        Estima precisão esperada e custo (ms) de cada plano.
+
+        Args:
+            algorithm_names: Algoritmos adequados à query
+            query_type: Tipo da query
+            max_workers: Workers paralelos disponíveis
+
+        Returns:
+            Dict[str, Dict[str, float]]: Estimativas por plano
+        """
+        ranked = self.rank_algorithms(algorithm_names, query_type)
+        if not ranked:
+            return {}
+
+        probabilities = []
+        latencies = []
+        for name in ranked:
+            stats = self._stats.get((name, query_type)) or AlgorithmQueryStats()
+            probabilities.append(stats.hit_probability)
+            latencies.append(max(stats.ewma_latency_ms, self.min_cost_ms))
+
+        estimates = {
+            'best_match': self._estimate(probabilities[0], latencies[0]),
+            'sequential': self._estimate(
+                self._any_hit(probabilities), self._sequential_cost(probabilities, latencies)
+            ),
+            'parallel': self._estimate(
+                self._any_hit(probabilities), self._parallel_cost(latencies, max_workers)
+            )
+        }
+
+        # Adaptive: best algorithm first, then up to two more in parallel on a miss
+        rest_latencies = latencies[1:3]
+        adaptive_cost = latencies[0]
+        if rest_latencies:
+            adaptive_cost += (1.0 - probabilities[0]) * self._parallel_cost(rest_latencies, max_workers)
+        estimates['adaptive'] = self._estimate(self._any_hit(probabilities[:3]), adaptive_cost)
+        return estimates
+
+    def choose_plan(self,
+                    algorithm_names: Sequence[str],
+                    query_type: str,
+                    max_workers: int) -> Tuple[str, Dict[str, float]]:
+        """
+        Escolhe o plano com maior precisão esperada por milissegundo.
+
+        Returns:
+            Tuple[str, Dict[str, float]]: Plano escolhido e sua estimativa
+        """
+        estimates = self.estimate_plans(algorithm_names, query_type, max_workers)
+        plan = max(self.PLANS, key=lambda name: (estimates[name]['precision_per_ms'], -self.PLANS.index(name)))
+        return plan, estimates[plan]
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Exporta o estado do modelo agrupado por tipo de query."""
+        with self._lock:
+            items = list(self._stats.items())
+        state: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (algorithm_name, query_type), stats in items:
+            state.setdefault(query_type, {})[algorithm_name] = stats.to_dict()
+        return state
+
+    def reset(self):
+        """Descarta todas as observações."""
+        with self._lock:
+            self._stats.clear()
+
+    def _estimate(self, precision: float, cost_ms: float) -> Dict[str, float]:
+        cost_ms = max(cost_ms, self.min_cost_ms)
+        return {
+            'expected_precision': precision,
+            'expected_cost_ms': cost_ms,
+            'precision_per_ms': precision / cost_ms
+        }
+
+    @staticmethod
+    def _any_hit(probabilities: Sequence[float]) -> float:
+        miss = 1.0
+        for probability in probabilities:
+            miss *= (1.0 - probability)
+        return 1.0 - miss
+
+    @staticmethod
+    def _sequential_cost(probabilities: Sequence[float], latencies: Sequence[float]) -> float:
+        # Each algorithm only runs if all previous ones missed
+        cost = 0.0
+        reach = 1.0
+        for probability, latency in zip(probabilities, latencies):
+            cost += reach * latency
+            reach *= (1.0 - probability)
+        return cost
+
+    @staticmethod
+    def _parallel_cost(latencies: Sequence[float], max_workers: int) -> float:
+        # Wall time of running the batch in waves of max_workers
+        if not latencies:
+            return 0.0
+        workers = max(1, max_workers)
+        ordered = sorted(latencies, reverse=True)
+        return sum(ordered[i] for i in range(0, len(ordered), workers))
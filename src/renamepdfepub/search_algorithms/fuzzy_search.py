@@ -7,7 +7,7 @@ para encontrar correspondências aproximadas em títulos, autores e outros metad
 
 import re
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any
 from .base_search import BaseSearchAlgorithm, SearchQuery, SearchResult
 
 
@@ -205,29 +205,104 @@ class FuzzySearchAlgorithm(BaseSearchAlgorithm):
         Args:
             query: Query com critérios de busca
             
+        Returns:
+            List[SearchResult]: Resultados ordenados por similaridade
+        """
+        # Para demonstração, vamos simular alguns resultados
+        # Em implementação real, seria busca em base de dados/APIs
+        candidates = self._prepare_candidates(self._get_mock_database())
+        return self._search_prepared(query, candidates)
+    
+    def search_many(self, queries: List[SearchQuery]) -> List[List[SearchResult]]:
+        """
+        Executa busca fuzzy para um lote de queries.
+        
+        A base de candidatos é carregada e normalizada uma única vez para o lote.
+        
+        Args:
+            queries: Lista de queries
+            
+        Returns:
+            List[List[SearchResult]]: Resultados de cada query, na mesma ordem
+        """
+        candidates = self._prepare_candidates(self._get_mock_database())
+        return [self._search_prepared(query, candidates) for query in queries]
+    
+    def _prepare_candidates(self, database: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Pré-normaliza os campos comparáveis de cada candidato.
+        
+        Args:
+            database: Candidatos da base de dados
+            
+        Returns:
+            List[Dict[str, Any]]: Candidatos com campos normalizados
+        """
+        prepared = []
+        for candidate in database:
+            prepared.append({
+                'metadata': candidate,
+                'title': normalize_text_for_comparison(candidate.get('title') or ''),
+                'authors': [normalize_text_for_comparison(a) for a in candidate.get('authors') or []],
+                'publisher': normalize_text_for_comparison(candidate.get('publisher') or ''),
+                'year': candidate.get('year')
+            })
+        return prepared
+    
+    def _search_prepared(self, query: SearchQuery, candidates: List[Dict[str, Any]]) -> List[SearchResult]:
+        """
+        Pontua a query contra candidatos pré-normalizados.
+        
+        Args:
+            query: Query com critérios de busca
+            candidates: Candidatos retornados por _prepare_candidates
+            
         Returns:
             List[SearchResult]: Resultados ordenados por similaridade
         """
         start_time = time.time()
         results = []
         
-        # Para demonstração, vamos simular alguns resultados
-        # Em implementação real, seria busca em base de dados/APIs
-        mock_database = self._get_mock_database()
+        query_title = normalize_text_for_comparison(query.title) if query.title else ''
+        query_authors = [normalize_text_for_comparison(a) for a in query.authors or []]
+        query_publisher = normalize_text_for_comparison(query.publisher) if query.publisher else ''
         
-        for candidate in mock_database:
-            similarity_score = self._calculate_similarity(query, candidate)
+        for candidate in candidates:
+            title_sim = 0.0
+            if query.title and candidate['metadata'].get('title'):
+                title_sim = jaro_winkler_similarity(query_title, candidate['title'])
+            
+            author_sim = 0.0
+            if query_authors and candidate['authors']:
+                author_sim = sum(
+                    max(jaro_winkler_similarity(author, other) for other in candidate['authors'])
+                    for author in query_authors
+                ) / len(query_authors)
+            
+            pub_sim = 0.0
+            if query.publisher and candidate['metadata'].get('publisher'):
+                pub_sim = jaro_winkler_similarity(query_publisher, candidate['publisher'])
+            
+            year_match = bool(query.year) and query.year == candidate['year']
+            
+            similarity_score = min(
+                title_sim * self.title_weight +
+                author_sim * self.author_weight +
+                pub_sim * self.publisher_weight +
+                (1.0 if year_match else 0.0) * self.year_weight,
+                1.0
+            )
             
             if similarity_score >= self.min_similarity_threshold:
                 result = SearchResult(
                     score=similarity_score,
-                    metadata=candidate,
+                    metadata=candidate['metadata'],
                     algorithm=self.name,
                     details={
-                        'title_similarity': self._title_similarity(query.title, candidate.get('title')),
-                        'author_similarity': self._author_similarity(query.authors, candidate.get('authors', [])),
-                        'publisher_similarity': self._publisher_similarity(query.publisher, candidate.get('publisher')),
-                        'year_match': query.year == candidate.get('year')
+                        'title_similarity': title_sim,
+                        'author_similarity': author_sim,
+                        'publisher_similarity': pub_sim,
+                        'year_match': query.year == candidate['year']
                     }
                 )
                 results.append(result)
@@ -265,83 +340,6 @@ class FuzzySearchAlgorithm(BaseSearchAlgorithm):
             'partial_matching'
         ]
     
-    def _calculate_similarity(self, query: SearchQuery, candidate: Dict[str, Any]) -> float:
-        """
-        Calcula similaridade total entre query e candidato.
-        
-        Args:
-            query: Query de busca
-            candidate: Candidato da base de dados
-            
-        Returns:
-            float: Score de similaridade ponderado
-        """
-        total_score = 0.0
-        
-        # Title similarity
-        if query.title and candidate.get('title'):
-            title_sim = self._title_similarity(query.title, candidate['title'])
-            total_score += title_sim * self.title_weight
-        
-        # Author similarity
-        if query.authors and candidate.get('authors'):
-            author_sim = self._author_similarity(query.authors, candidate['authors'])
-            total_score += author_sim * self.author_weight
-        
-        # Publisher similarity
-        if query.publisher and candidate.get('publisher'):
-            pub_sim = self._publisher_similarity(query.publisher, candidate['publisher'])
-            total_score += pub_sim * self.publisher_weight
-        
-        # Year match
-        if query.year and candidate.get('year'):
-            year_match = 1.0 if query.year == candidate['year'] else 0.0
-            total_score += year_match * self.year_weight
-        
-        return min(total_score, 1.0)
-    
-    def _title_similarity(self, title1: Optional[str], title2: Optional[str]) -> float:
-        """Calcula similaridade entre títulos."""
-        if not title1 or not title2:
-            return 0.0
-        
-        norm1 = normalize_text_for_comparison(title1)
-        norm2 = normalize_text_for_comparison(title2)
-        
-        return jaro_winkler_similarity(norm1, norm2)
-    
-    def _author_similarity(self, authors1: Optional[List[str]], authors2: Optional[List[str]]) -> float:
-        """Calcula similaridade entre listas de autores."""
-        if not authors1 or not authors2:
-            return 0.0
-        
-        # Find best matches between author lists
-        max_similarities = []
-        
-        for author1 in authors1:
-            norm1 = normalize_text_for_comparison(author1)
-            best_sim = 0.0
-            
-            for author2 in authors2:
-                norm2 = normalize_text_for_comparison(author2)
-                sim = jaro_winkler_similarity(norm1, norm2)
-                best_sim = max(best_sim, sim)
-            
-            max_similarities.append(best_sim)
-        
-        # Return average of best similarities
-        return sum(max_similarities) / len(max_similarities) if max_similarities else 0.0
-    
-    def _publisher_similarity(self, pub1: Optional[str], pub2: Optional[str]) -> float:
-        """Calcula similaridade entre editoras."""
-        if not pub1 or not pub2:
-            return 0.0
-        
-        norm1 = normalize_text_for_comparison(pub1)
-        norm2 = normalize_text_for_comparison(pub2)
-        
-        return jaro_winkler_similarity(norm1, norm2)
-    
     def _get_mock_database(self) -> List[Dict[str, Any]]:
         """
         Retorna base de dados mock para demonstração.
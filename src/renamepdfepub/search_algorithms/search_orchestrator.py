@@ -10,18 +10,14 @@ Responsável por:
 
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from .base_search import BaseSearchAlgorithm, SearchQuery, SearchResult
+from .cost_model import SearchCostModel
 from .fuzzy_search import FuzzySearchAlgorithm
 from .isbn_search import ISBNSearchAlgorithm
 from .semantic_search import SemanticSearchAlgorithm
 
-import time
-from typing import Dict, List, Any, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from .base_search import BaseSearchAlgorithm, SearchQuery, SearchResult
-
 
 class SearchOrchestrator:
     """
@@ -34,26 +30,66 @@ class SearchOrchestrator:
     - Aplicar estratégias de fallback
     """
     
-    def __init__(self, max_workers: int = 4):
+    def __init__(self,
+                 max_workers: int = 4,
+                 default_timeout: float = 30.0,
+                 confidence_threshold: float = 0.8):
         """
         Inicializa o orquestrador.
         
         Args:
             max_workers: Número máximo de workers paralelos
+            default_timeout: Prazo total por query, em segundos
+            confidence_threshold: Score a partir do qual a busca termina antecipadamente
         """
         self.algorithms: Dict[str, BaseSearchAlgorithm] = {}
         self.max_workers = max_workers
-        self.default_timeout = 30.0  # seconds
+        self.default_timeout = default_timeout  # seconds, deadline for the whole query
+        self.confidence_threshold = confidence_threshold
         self.result_combination_strategy = 'weighted_merge'  # 'weighted_merge', 'best_of_each', 'consensus'
         self.performance_stats = {
             'total_searches': 0,
             'total_time': 0.0,
-            'average_time': 0.0
+            'average_time': 0.0,
+            'deadline_exceeded': 0,
+            'early_terminations': 0
         }
+        self.strategy_choices: Dict[str, int] = {}
+        self.last_plan: Dict[str, Any] = {}
+        self.cost_model = SearchCostModel(hit_threshold=confidence_threshold)
         self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
         
         # Initialize default algorithms
         self._initialize_default_algorithms()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Retorna o pool de workers persistente, criando-o na primeira chamada."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.max_workers),
+                    thread_name_prefix='search-orchestrator'
+                )
+            return self._executor
+
+    def shutdown(self, wait: bool = True):
+        """
+        Encerra o pool de workers do orquestrador.
+        
+        Args:
+            wait: Se deve aguardar a conclusão das buscas em andamento
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> 'SearchOrchestrator':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
         
     def register_algorithm(self, algorithm: BaseSearchAlgorithm) -> bool:
         """
@@ -108,27 +144,150 @@ class SearchOrchestrator:
         """
         if strategy == 'auto':
             strategy = self._select_optimal_strategy(query)
+        self._record_strategy_choice(strategy)
         
         start_time = time.time()
+        deadline = time.monotonic() + self.default_timeout
 
         if strategy == 'parallel':
-            results = self._parallel_search(query, max_results)
+            results = self._parallel_search(query, max_results, deadline)
         elif strategy == 'sequential':
-            results = self._sequential_search(query, max_results)
+            results = self._sequential_search(query, max_results, deadline)
         elif strategy == 'best_match':
-            results = self._best_match_search(query, max_results)
+            results = self._best_match_search(query, max_results, deadline)
         else:
             # Default to adaptive strategy
-            results = self._adaptive_search(query, max_results)
+            results = self._adaptive_search(query, max_results, deadline)
 
         elapsed = time.time() - start_time
         self._record_performance(elapsed)
         return results
     
+    def search_many(self,
+                    queries: List[SearchQuery],
+                    strategy: str = 'auto',
+                    max_results: int = 10,
+                    chunk_size: Optional[int] = None) -> List[List[SearchResult]]:
+        """
+        Executa busca coordenada para um lote de queries.
+        
+        Args:
+            queries: Lista de queries
+            strategy: Estratégia ('auto', 'best_match' ou qualquer outra para todos os adequados)
+            max_results: Número máximo de resultados por query
+            chunk_size: Queries por tarefa do pool (padrão calculado pelo tamanho do lote)
+            
+        Returns:
+            List[List[SearchResult]]: Resultados de cada query, na mesma ordem
+        """
+        results: List[List[SearchResult]] = [[] for _ in queries]
+        for index, query_results in self.iter_search_many(queries, strategy, max_results, chunk_size):
+            results[index] = query_results
+        return results
+
+    def iter_search_many(self,
+                         queries: List[SearchQuery],
+                         strategy: str = 'auto',
+                         max_results: int = 10,
+                         chunk_size: Optional[int] = None) -> Iterator[Tuple[int, List[SearchResult]]]:
+        """
+        Executa busca em lote entregando resultados à medida que ficam prontos.
+        
+        As queries são divididas em blocos submetidos de uma vez ao pool
+        persistente. Dentro de cada bloco, cada algoritmo recebe todas as
+        queries para as quais é adequado via search_many, amortizando sua
+        preparação. Em lote não há término antecipado: 'best_match' executa
+        apenas o melhor algoritmo de cada query e as demais estratégias
+        executam todos os adequados.
+        
+        Args:
+            queries: Lista de queries
+            strategy: Estratégia ('auto' consulta o modelo de custo por query)
+            max_results: Número máximo de resultados por query
+            chunk_size: Queries por tarefa do pool
+            
+        Yields:
+            Tuple[int, List[SearchResult]]: Índice da query no lote e seus resultados
+        """
+        if not queries:
+            return
+        
+        if chunk_size is None:
+            # Several chunks per worker so results start flowing early
+            chunk_size = min(64, max(1, -(-len(queries) // (max(1, self.max_workers) * 4))))
+        
+        plans = []
+        for index, query in enumerate(queries):
+            plan = self._select_optimal_strategy(query) if strategy == 'auto' else strategy
+            self._record_strategy_choice(plan)
+            if plan == 'best_match':
+                best = self._select_best_algorithm(query)
+                algorithms = [best] if best else []
+            else:
+                algorithms = self._get_ordered_algorithms(query)
+            plans.append((index, query, algorithms))
+        
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._search_chunk, plans[start:start + chunk_size], max_results)
+            for start in range(0, len(plans), chunk_size)
+        ]
+        try:
+            for future in as_completed(futures):
+                for index, query_results in future.result():
+                    yield index, query_results
+        finally:
+            # Consumer stopped early: drop chunks that have not started
+            for future in futures:
+                future.cancel()
+
+    def _search_chunk(self,
+                      plans: List[Tuple[int, SearchQuery, List[BaseSearchAlgorithm]]],
+                      max_results: int) -> List[Tuple[int, List[SearchResult]]]:
+        """
+        Executa um bloco do lote agrupando as queries por algoritmo.
+        
+        Args:
+            plans: Tuplas (índice, query, algoritmos a executar)
+            max_results: Número máximo de resultados por query
+            
+        Returns:
+            List[Tuple[int, List[SearchResult]]]: Resultados combinados por índice
+        """
+        start_time = time.time()
+        by_algorithm: Dict[str, Tuple[BaseSearchAlgorithm, List[Tuple[int, SearchQuery]]]] = {}
+        for index, query, algorithms in plans:
+            for algorithm in algorithms:
+                by_algorithm.setdefault(algorithm.name, (algorithm, []))[1].append((index, query))
+        
+        collected: Dict[int, List[SearchResult]] = {index: [] for index, _, _ in plans}
+        for algorithm, items in by_algorithm.values():
+            try:
+                batch_results = self._execute_algorithm_many(algorithm, [query for _, query in items])
+            except Exception as e:
+                print(f"Algorithm {algorithm.name} failed: {e}")
+                continue
+            for (index, _), results in zip(items, batch_results):
+                collected[index].extend(results)
+        
+        combined = [
+            (index, self._combine_and_rank_results(collected[index], max_results))
+            for index, _, _ in plans
+        ]
+        
+        elapsed = time.time() - start_time
+        for _ in plans:
+            self._record_performance(elapsed / len(plans))
+        return combined
+
     def _select_optimal_strategy(self, query: SearchQuery) -> str:
         """
         Seleciona a estratégia ótima baseada na query.
         
+        Usa o modelo de custo aprendido (precisão esperada por milissegundo)
+        quando há observações suficientes para o tipo de query; caso
+        contrário recorre à heurística por número de algoritmos adequados.
+        
         Args:
             query: Query a ser analisada
             
@@ -139,7 +298,21 @@ class SearchOrchestrator:
             algo for algo in self.algorithms.values()
             if algo.is_suitable_for_query(query)
         ]
+        query_type = self._classify_query(query)
+        names = [algo.name for algo in suitable_algorithms]
         
+        if names and self.cost_model.is_warm(names, query_type):
+            strategy, estimate = self.cost_model.choose_plan(names, query_type, self.max_workers)
+            plan = {'query_type': query_type, 'strategy': strategy, 'source': 'cost_model', **estimate}
+        else:
+            strategy = self._select_heuristic_strategy(suitable_algorithms)
+            plan = {'query_type': query_type, 'strategy': strategy, 'source': 'heuristic'}
+        with self._lock:
+            self.last_plan = plan
+        return strategy
+
+    def _select_heuristic_strategy(self, suitable_algorithms: List[BaseSearchAlgorithm]) -> str:
+        """Heurística de partida: escolhe estratégia pelo número de algoritmos adequados."""
         if len(suitable_algorithms) <= 1:
             return 'best_match'
         elif len(suitable_algorithms) <= 3:
@@ -147,171 +320,315 @@ class SearchOrchestrator:
         else:
             return 'adaptive'
     
-    def _parallel_search(self, query: SearchQuery, max_results: int) -> List[SearchResult]:
+    def _parallel_search(self,
+                         query: SearchQuery,
+                         max_results: int,
+                         deadline: Optional[float] = None) -> List[SearchResult]:
         """
         Executa busca paralela em todos os algoritmos adequados.
         
+        Os algoritmos são submetidos na ordem do modelo de custo, a mesma
+        usada para estimar o plano.
+        
         Args:
             query: Query de busca
             max_results: Máximo de resultados
+            deadline: Instante limite (time.monotonic) para a query inteira
             
         Returns:
-            List[SearchResult]: Resultados combinados
+            List[SearchResult]: Resultados combinados (parciais se o prazo expirar)
         """
-        suitable_algorithms = [
-            algo for algo in self.algorithms.values()
-            if algo.is_suitable_for_query(query)
-        ]
+        suitable_algorithms = self._get_ordered_algorithms(query)
         
         if not suitable_algorithms:
             return []
         
-        all_results = []
+        all_results = self._run_with_deadline(query, suitable_algorithms, deadline)
+        return self._combine_and_rank_results(all_results, max_results)
+
+    def _run_with_deadline(self,
+                           query: SearchQuery,
+                           algorithms: List[BaseSearchAlgorithm],
+                           deadline: Optional[float] = None,
+                           stop_on_confident: bool = False) -> List[SearchResult]:
+        """
+        Executa algoritmos no pool persistente respeitando o prazo da query.
+        
+        Buscas que não terminam até o prazo são abandonadas e os resultados
+        já coletados são retornados.
+        
+        Args:
+            query: Query de busca
+            algorithms: Algoritmos a executar
+            deadline: Instante limite (time.monotonic); usa default_timeout se None
+            stop_on_confident: Interrompe ao obter resultado acima de confidence_threshold
+            
+        Returns:
+            List[SearchResult]: Resultados brutos coletados
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.default_timeout
         
-        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(suitable_algorithms))) as executor:
-            # Submit search tasks
-            future_to_algorithm = {
-                executor.submit(algorithm.search, query): algorithm
-                for algorithm in suitable_algorithms
-            }
+        executor = self._get_executor()
+        future_to_algorithm = {
+            executor.submit(self._execute_algorithm, algorithm, query): algorithm
+            for algorithm in algorithms
+        }
+        pending = set(future_to_algorithm)
+        all_results: List[SearchResult] = []
+        
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._record_event('deadline_exceeded')
+                break
             
-            # Collect results as they complete
-            for future in as_completed(future_to_algorithm):
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
                 algorithm = future_to_algorithm[future]
                 try:
-                    results = future.result(timeout=30)  # 30 second timeout
-                    all_results.extend(results)
+                    all_results.extend(future.result())
                 except Exception as e:
                     # Log error but continue with other algorithms
                     print(f"Algorithm {algorithm.name} failed: {e}")
+            
+            if stop_on_confident and pending and self._has_confident_result(all_results):
+                self._record_event('early_terminations')
+                break
         
-        return self._combine_and_rank_results(all_results, max_results)
+        # Abandon anything still queued; running searches finish in background
+        for future in pending:
+            future.cancel()
+        
+        return all_results
+
+    def _has_confident_result(self, results: List[SearchResult]) -> bool:
+        """Verifica se algum resultado atinge o limiar de confiança."""
+        return any(result.score >= self.confidence_threshold for result in results)
+
+    def _record_event(self, key: str):
+        """Incrementa um contador de eventos nas estatísticas."""
+        with self._lock:
+            self.performance_stats[key] += 1
+
+    def get_performance_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas agregadas do orquestrador.
+        
+        Inclui as escolhas de estratégia, o último plano decidido e o estado
+        do modelo de custo por tipo de query e algoritmo.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = self.performance_stats.copy()
+            stats['strategy_choices'] = self.strategy_choices.copy()
+            stats['last_plan'] = self.last_plan.copy()
+        stats['cost_model'] = self.cost_model.snapshot()
+        return stats
+
+    def _execute_algorithm(self, algorithm: BaseSearchAlgorithm, query: SearchQuery) -> List[SearchResult]:
+        """
+        Executa um algoritmo e alimenta o modelo de custo com latência e score.
+        
+        Args:
+            algorithm: Algoritmo a executar
+            query: Query de busca
+            
+        Returns:
+            List[SearchResult]: Resultados do algoritmo
+        """
+        query_type = self._classify_query(query)
+        start = time.perf_counter()
+        try:
+            results = algorithm.search(query)
+        except Exception:
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            self.cost_model.observe(algorithm.name, query_type, latency_ms, 0.0, failed=True)
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        top_score = max((result.score for result in results), default=0.0)
+        self.cost_model.observe(algorithm.name, query_type, latency_ms, top_score)
+        return results
 
-    def get_performance_stats(self) -> Dict[str, float]:
-        """Retorna estatísticas agregadas do orquestrador."""
-        return self.performance_stats.copy()
+    def _execute_algorithm_many(self,
+                                algorithm: BaseSearchAlgorithm,
+                                queries: List[SearchQuery]) -> List[List[SearchResult]]:
+        """
+        Executa search_many de um algoritmo e alimenta o modelo de custo.
+        
+        A latência do lote é distribuída igualmente entre as queries.
+        
+        Args:
+            algorithm: Algoritmo a executar
+            queries: Lote de queries
+            
+        Returns:
+            List[List[SearchResult]]: Resultados de cada query
+        """
+        query_types = [self._classify_query(query) for query in queries]
+        start = time.perf_counter()
+        try:
+            batch_results = algorithm.search_many(queries)
+        except Exception:
+            latency_ms = (time.perf_counter() - start) * 1000.0 / max(1, len(queries))
+            for query_type in query_types:
+                self.cost_model.observe(algorithm.name, query_type, latency_ms, 0.0, failed=True)
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000.0 / max(1, len(queries))
+        for query_type, results in zip(query_types, batch_results):
+            top_score = max((result.score for result in results), default=0.0)
+            self.cost_model.observe(algorithm.name, query_type, latency_ms, top_score)
+        return batch_results
+
+    @staticmethod
+    def _classify_query(query: SearchQuery) -> str:
+        """
+        Classifica a query com as mesmas regras de QueryPreprocessor._determine_query_type.
+        
+        Args:
+            query: Query de busca
+            
+        Returns:
+            str: Tipo da query ('isbn', 'author', 'title', 'mixed', 'text')
+        """
+        # Imported lazily: the preprocessor module imports this package
+        from ..cli.query_preprocessor import QueryPreprocessor
+        
+        entities = {
+            'isbns': [query.isbn] if query.isbn else [],
+            'authors': [author for author in (query.authors or []) if author],
+            'titles': [query.title] if query.title and query.title.strip() else []
+        }
+        return QueryPreprocessor._determine_query_type(entities)
+
+    def _record_strategy_choice(self, strategy: str):
+        """Contabiliza a estratégia efetivamente executada."""
+        with self._lock:
+            self.strategy_choices[strategy] = self.strategy_choices.get(strategy, 0) + 1
     
-    def _sequential_search(self, query: SearchQuery, max_results: int) -> List[SearchResult]:
+    def _sequential_search(self,
+                           query: SearchQuery,
+                           max_results: int,
+                           deadline: Optional[float] = None) -> List[SearchResult]:
         """
         Executa busca sequencial com estratégia de fallback.
         
         Args:
             query: Query de busca
             max_results: Máximo de resultados
+            deadline: Instante limite (time.monotonic) para a query inteira
             
         Returns:
             List[SearchResult]: Resultados da busca
         """
+        if deadline is None:
+            deadline = time.monotonic() + self.default_timeout
+        
         # Order algorithms by preference/reliability
         ordered_algorithms = self._get_ordered_algorithms(query)
         
+        all_results = []
         for algorithm in ordered_algorithms:
+            if time.monotonic() >= deadline:
+                self._record_event('deadline_exceeded')
+                break
             try:
-                results = algorithm.search(query)
-                if results and results[0].score >= 0.8:
-                    # High confidence result found, return immediately
-                    return results[:max_results]
+                results = self._execute_algorithm(algorithm, query)
             except Exception as e:
                 print(f"Algorithm {algorithm.name} failed: {e}")
                 continue
+            if results and results[0].score >= self.confidence_threshold:
+                # High confidence result found, return immediately
+                return results[:max_results]
+            all_results.extend(results)
         
-        # If no high-confidence results, collect all results
-        all_results = []
-        for algorithm in ordered_algorithms:
-            try:
-                results = algorithm.search(query)
-                all_results.extend(results)
-            except Exception:
-                continue
-        
+        # No high-confidence result: combine what the single pass collected
         return self._combine_and_rank_results(all_results, max_results)
     
-    def _best_match_search(self, query: SearchQuery, max_results: int) -> List[SearchResult]:
+    def _best_match_search(self,
+                           query: SearchQuery,
+                           max_results: int,
+                           deadline: Optional[float] = None) -> List[SearchResult]:
         """
         Seleciona o melhor algoritmo para a query e executa apenas ele.
         
         Args:
             query: Query de busca
             max_results: Máximo de resultados
+            deadline: Instante limite (time.monotonic) para a query inteira
             
         Returns:
-            List[SearchResult]: Resultados do melhor algoritmo
+            List[SearchResult]: Resultados do melhor algoritmo (vazio se o prazo expirar)
         """
         best_algorithm = self._select_best_algorithm(query)
         
         if not best_algorithm:
             return []
         
-        try:
-            results = best_algorithm.search(query)
-            return results[:max_results]
-        except Exception as e:
-            print(f"Best algorithm {best_algorithm.name} failed: {e}")
-            return []
+        # Same watchdog as the other strategies: a hung algorithm is abandoned at the deadline
+        results = self._run_with_deadline(query, [best_algorithm], deadline)
+        return results[:max_results]
     
-    def _adaptive_search(self, query: SearchQuery, max_results: int) -> List[SearchResult]:
+    def _adaptive_search(self,
+                         query: SearchQuery,
+                         max_results: int,
+                         deadline: Optional[float] = None) -> List[SearchResult]:
         """
         Estratégia adaptativa que combina sequential e parallel baseado no contexto.
         
         Args:
             query: Query de busca
             max_results: Máximo de resultados
+            deadline: Instante limite (time.monotonic) para a query inteira
             
         Returns:
             List[SearchResult]: Resultados adaptados
         """
-        # Start with best algorithm
-        best_algorithm = self._select_best_algorithm(query)
+        # Start with best algorithm (ranked order, as estimated by the cost model)
+        ordered_algorithms = self._get_ordered_algorithms(query)
+        best_algorithm = ordered_algorithms[0] if ordered_algorithms else None
+        initial_results: List[SearchResult] = []
         
         if best_algorithm:
-            try:
-                initial_results = best_algorithm.search(query)
-                if initial_results and initial_results[0].score >= 0.9:
-                    # Very high confidence, return immediately
-                    return initial_results[:max_results]
-            except Exception:
-                pass
-        
-        # If no high confidence result, run parallel search with limited algorithms
-        suitable_algorithms = [
-            algo for algo in self.algorithms.values()
-            if algo.is_suitable_for_query(query)
-        ][:3]  # Limit to top 3 algorithms
+            initial_results = self._run_with_deadline(query, [best_algorithm], deadline)
+            if initial_results and initial_results[0].score >= 0.9:
+                # Very high confidence, return immediately
+                return initial_results[:max_results]
         
-        return self._parallel_search_limited(query, suitable_algorithms, max_results)
+        # If no high confidence result, run parallel search with limited algorithms,
+        # reusing the results already obtained from the best algorithm
+        suitable_algorithms = ordered_algorithms[1:3]  # Limit to top 3 algorithms including the best one
+        
+        return self._parallel_search_limited(
+            query, suitable_algorithms, max_results, deadline, initial_results
+        )
     
     def _parallel_search_limited(self, 
                                query: SearchQuery, 
                                algorithms: List[BaseSearchAlgorithm],
-                               max_results: int) -> List[SearchResult]:
+                               max_results: int,
+                               deadline: Optional[float] = None,
+                               seed_results: Optional[List[SearchResult]] = None) -> List[SearchResult]:
         """
         Executa busca paralela em conjunto limitado de algoritmos.
         
+        Termina antecipadamente quando algum resultado atinge o limiar de confiança.
+        
         Args:
             query: Query de busca
             algorithms: Lista de algoritmos a executar
             max_results: Máximo de resultados
+            deadline: Instante limite (time.monotonic) para a query inteira
+            seed_results: Resultados já obtidos que devem entrar na combinação
             
         Returns:
             List[SearchResult]: Resultados combinados
         """
-        if not algorithms:
-            return []
-        
-        all_results = []
+        all_results = list(seed_results or [])
         
-        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(algorithms))) as executor:
-            future_to_algorithm = {
-                executor.submit(algorithm.search, query): algorithm
-                for algorithm in algorithms
-            }
-            
-            for future in as_completed(future_to_algorithm):
-                try:
-                    results = future.result(timeout=30)
-                    all_results.extend(results)
-                except Exception:
-                    continue
+        if algorithms:
+            all_results.extend(
+                self._run_with_deadline(query, algorithms, deadline, stop_on_confident=True)
+            )
         
         return self._combine_and_rank_results(all_results, max_results)
     
@@ -472,14 +789,19 @@ class SearchOrchestrator:
         Returns:
             List[BaseSearchAlgorithm]: Algoritmos ordenados por preferência
         """
-        suitable = [
-            algo for algo in self.algorithms.values()
-            if algo.is_suitable_for_query(query)
-        ]
+        suitable = sorted(
+            (algo for algo in self.algorithms.values() if algo.is_suitable_for_query(query)),
+            key=lambda x: x.name
+        )
         
-        # Simple ordering by name for now
-        # In real implementation, would use algorithm stats and suitability scores
-        return sorted(suitable, key=lambda x: x.name)
+        # Once learned statistics exist, prefer the best hit probability per millisecond
+        query_type = self._classify_query(query)
+        names = [algo.name for algo in suitable]
+        if names and self.cost_model.is_warm(names, query_type):
+            ranked = self.cost_model.rank_algorithms(names, query_type)
+            by_name = {algo.name: algo for algo in suitable}
+            return [by_name[name] for name in ranked]
+        return suitable
     
     def _select_best_algorithm(self, query: SearchQuery) -> Optional[BaseSearchAlgorithm]:
         """
@@ -507,9 +829,10 @@ class SearchOrchestrator:
         }
     
     def reset_all_stats(self):
-        """Reseta estatísticas de todos os algoritmos."""
+        """Reseta estatísticas de todos os algoritmos e o modelo de custo."""
         for algorithm in self.algorithms.values():
             algorithm.reset_stats()
+        self.cost_model.reset()
     
     def _initialize_default_algorithms(self):
         """Inicializa algoritmos padrão."""
@@ -549,9 +872,10 @@ class SearchOrchestrator:
 
     def _record_performance(self, elapsed: float):
         """Atualiza estatísticas agregadas de desempenho."""
-        self.performance_stats['total_searches'] += 1
-        self.performance_stats['total_time'] += elapsed
-        total = self.performance_stats['total_searches']
-        self.performance_stats['average_time'] = (
-            self.performance_stats['total_time'] / total if total else 0.0
-        )
+        with self._lock:
+            self.performance_stats['total_searches'] += 1
+            self.performance_stats['total_time'] += elapsed
+            total = self.performance_stats['total_searches']
+            self.performance_stats['average_time'] = (
+                self.performance_stats['total_time'] / total if total else 0.0
+            )
@@ -386,19 +386,54 @@ class SemanticSearchAlgorithm(BaseSearchAlgorithm):
         Returns:
             List[SearchResult]: Resultados ordenados por relevância semântica
         """
-        start_time = time.time()
-        results = []
-        
         # Initialize corpus if needed
         if not self.corpus_initialized:
             self._initialize_corpus(query)
         
-        # Normalize query components
-        normalized_query = self._normalize_query(query)
-        
         # Generate mock candidate documents for demonstration
         candidates = self._get_candidate_documents(query)
         
+        return self._search_prepared(query, candidates)
+    
+    def search_many(self, queries: List[SearchQuery]) -> List[List[SearchResult]]:
+        """
+        Executa busca semântica para um lote de queries.
+        
+        Os documentos candidatos e seus vetores TF-IDF são calculados uma
+        única vez para o lote.
+        
+        Args:
+            queries: Lista de queries
+            
+        Returns:
+            List[List[SearchResult]]: Resultados de cada query, na mesma ordem
+        """
+        if not queries:
+            return []
+        
+        if not self.corpus_initialized:
+            self._initialize_corpus(queries[0])
+        
+        candidates = self._get_candidate_documents(queries[0])
+        return [self._search_prepared(query, candidates) for query in queries]
+    
+    def _search_prepared(self, query: SearchQuery, candidates: List[Dict[str, Any]]) -> List[SearchResult]:
+        """
+        Pontua a query contra documentos candidatos já vetorizados.
+        
+        Args:
+            query: Query com critérios de busca
+            candidates: Candidatos retornados por _get_candidate_documents
+            
+        Returns:
+            List[SearchResult]: Resultados ordenados por relevância semântica
+        """
+        start_time = time.time()
+        results = []
+        
+        # Normalize query components
+        normalized_query = self._normalize_query(query)
+        
         # Calculate semantic similarity for each candidate
         for candidate in candidates:
             similarity_score = self._calculate_semantic_similarity(normalized_query, candidate)
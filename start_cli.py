@@ -30,7 +30,7 @@ Exemplos:
     )
     
     parser.add_argument('command', nargs='?', default='help',
-                       choices=['algorithms', 'scan', 'scan-cycles', 'rename-existing', 'rename-search', 'launch', 'help'],
+                       choices=['algorithms', 'scan', 'scan-cycles', 'rename-existing', 'rename-search', 'rollback', 'launch', 'help'],
                        help='Comando a executar (default: help)')
     parser.add_argument('extra', nargs=argparse.REMAINDER,
                        help='Argumentos adicionais (diretorio, flags, etc.)')
@@ -177,7 +177,8 @@ Exemplos:
         try:
             rp = Path(report_path)
             converted = None
-            if rp.exists():
+            # Banco de resultados (reports/scan_results.db) é lido direto pelo renamer
+            if rp.exists() and rp.suffix.lower() not in ('.db', '.sqlite'):
                 try:
                     data = _json.loads(rp.read_text(encoding='utf-8'))
                 except Exception:
@@ -245,6 +246,15 @@ Exemplos:
             except Exception:
                 pass
     
+    elif args.command == 'rollback':
+        # Desfaz uma execução de renomeação a partir do journal (sem cópias de backup)
+        import subprocess
+        script = Path(__file__).parent / 'scripts' / 'rollback_renames.py'
+        if not extras:
+            print("Uso: python start_cli.py rollback --run <id> [--dry-run] [--journal-dir DIR] | --list")
+            return
+        subprocess.run([sys.executable, str(script)] + extras)
+
     elif args.command == 'launch':
         try:
             from src.cli.launch_system import main as launch_system
@@ -265,7 +275,9 @@ def print_usage_examples():
     print("  python start_cli.py scan-cycles '/caminho/livros' --cycles 3   # N ciclos")
     print("  python start_cli.py scan-cycles '/caminho/livros' --time-seconds 120   # Por tempo")
     print("  python start_cli.py rename-existing --report relatorio.json --apply     # Renomear por relatório (aceita JSON do scan)")
+    print("  python start_cli.py rename-existing --report reports/scan_results.db --min-confidence 0.8  # Renomear pelo banco de resultados")
     print("  python start_cli.py rename-search '/caminho/livros' --rename           # Buscar e renomear (gera book_metadata_report.json)")
+    print("  python start_cli.py rollback --run <id>                               # Desfazer uma renomeação (ver --list)")
     print("\nOutros pontos de entrada:")
     print("  python start_web.py       # Interface web Streamlit")
     print("  python start_gui.py       # Interface grafica")
@@ -317,15 +317,13 @@ def status_action(args, cache_dir):
 
 def get_predictions_count(system) -> int:
     """Obtém número de predições no cache"""
-    import sqlite3
-    with sqlite3.connect(system.predictions_db) as conn:
+    with system._db() as conn:
         cursor = conn.execute('SELECT COUNT(*) FROM prediction_cache')
         return cursor.fetchone()[0]
 
 def get_consolidated_count(system) -> int:
     """Obtém número de dados consolidados"""
-    import sqlite3
-    with sqlite3.connect(system.consolidated_db) as conn:
+    with system._db() as conn:
         cursor = conn.execute('SELECT COUNT(*) FROM consolidated_cache')
         return cursor.fetchone()[0]
 
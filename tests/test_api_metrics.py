@@ -0,0 +1,66 @@
+"""
+Testes das métricas de API em janela deslizante (memória fixa, sketches e exportação Prometheus).
+"""
+
+from renamepdfepub.api_metrics import WindowedMetrics, WindowedSeries, prometheus_text
+
+
+def test_window_expires_old_buckets_and_keeps_memory_fixed():
+    now = [0.0]
+    series = WindowedSeries(window=60, bucket_seconds=10, clock=lambda: now[0])
+    assert series.size == 6
+
+    for second in range(120):
+        now[0] = float(second)
+        series.add(1.0 if second < 60 else 3.0, success=second % 2 == 0)
+    assert len(series._buckets) == 6
+    count, success, latency_sum = series.totals()
+    assert (count, success, latency_sum) == (60, 30, 180.0)
+    assert series.quantiles((0.5,))[0.5] == 3.0
+
+    now[0] = 125.0
+    assert series.totals()[0] == 50
+    now[0] = 1000.0
+    assert series.totals() == (0, 0, 0.0)
+
+
+def test_windowed_stats_percentiles_and_prometheus_text():
+    now = [0.0]
+    metrics = WindowedMetrics(window=600, bucket_seconds=60, clock=lambda: now[0])
+    assert metrics.stats("openlibrary") == {}
+    for index in range(1000):
+        now[0] = index * 0.5
+        metrics.add("openlibrary", (index % 100) / 100, success=index % 4 != 0)
+    metrics.add('we"ird', 2.0, success=True)
+
+    stats = metrics.stats("openlibrary")
+    assert stats["total_calls"] == 1000 and stats["success_count"] == 750
+    assert stats["success_rate"] == 75.0 and abs(stats["avg_response_time"] - 0.495) < 1e-9
+    quantiles = metrics.quantiles("openlibrary")
+    assert abs(quantiles[0.5] - 0.5) < 0.03 and abs(quantiles[0.95] - 0.95) < 0.03
+
+    text = prometheus_text(metrics, {"openlibrary": {"Timeout": 3}})
+    assert "# TYPE renamepdfepub_api_latency_seconds summary" in text
+    assert 'renamepdfepub_api_latency_seconds_count{api="openlibrary"} 1000' in text
+    assert 'renamepdfepub_api_success_ratio{api="openlibrary"} 0.75' in text
+    assert 'renamepdfepub_api_errors_total{api="openlibrary",type="Timeout"} 3' in text
+    assert 'api="we\\"ird"' in text and text.endswith("\n")
+
+
+def test_prometheus_summary_sum_and_count_never_decrease():
+    now = [0.0]
+    metrics = WindowedMetrics(window=120, bucket_seconds=60, clock=lambda: now[0])
+    for index in range(10):
+        metrics.add("openlibrary", 0.5, success=True)
+    now[0] = 1000.0  # janela expirou: quantis e razão somem, contadores seguem
+    assert metrics.stats("openlibrary") == {}
+    assert metrics.lifetime("openlibrary") == (10, 10, 5.0)
+    text = prometheus_text(metrics)
+    assert 'renamepdfepub_api_latency_seconds_count{api="openlibrary"} 10' in text
+    assert 'renamepdfepub_api_latency_seconds_sum{api="openlibrary"} 5' in text
+    assert 'quantile=' not in text and 'success_ratio{' not in text
+
+    metrics.add("openlibrary", 1.0, success=False)
+    text = prometheus_text(metrics)
+    assert 'renamepdfepub_api_latency_seconds_count{api="openlibrary"} 11' in text
+    assert 'renamepdfepub_api_success_ratio{api="openlibrary"} 0' in text
@@ -0,0 +1,93 @@
+"""
+Testes do leitor EPUB em streaming (OPF compartilhado, front matter primeiro).
+"""
+
+import zipfile
+
+from renamepdfepub import epub_reader
+from renamepdfepub.metadata_extractor import extract_from_epub
+
+
+CONTAINER = """<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>"""
+
+OPF = """<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="2.0">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:title>Python Fluente: Programação Clara</dc:title>
+    <dc:creator>Luciano Ramalho</dc:creator>
+    <dc:publisher>Novatec</dc:publisher>
+    <dc:date>2015-08-01</dc:date>
+    {identifier}
+  </metadata>
+  <manifest>
+    {items}
+    <item id="css" href="style.css" media-type="text/css"/>
+  </manifest>
+  <spine>{itemrefs}</spine>
+  <guide><reference type="copyright-page" href="Text/ch08.xhtml#top"/></guide>
+</package>"""
+
+
+def _make_epub(path, identifier='<dc:identifier>urn:isbn:978-85-7522-462-5</dc:identifier>', chapters=10):
+    names = [f"Text/ch{index:02d}.xhtml" for index in range(chapters)]
+    items = "\n".join(
+        f'<item id="c{index}" href="{name}" media-type="application/xhtml+xml"/>' for index, name in enumerate(names)
+    )
+    itemrefs = "".join(f'<itemref idref="c{index}"/>' for index in range(chapters))
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('mimetype', 'application/epub+zip')
+        archive.writestr('META-INF/container.xml', CONTAINER)
+        archive.writestr('OEBPS/content.opf', OPF.format(identifier=identifier, items=items, itemrefs=itemrefs))
+        for index, name in enumerate(names):
+            body = f"<p>Chapter {index}</p>"
+            if index == 8:
+                body = "<p>Copyright &copy; 2015</p><p>ISBN: 978-85-7522-462-5</p>"
+            archive.writestr(f"OEBPS/{name}", f"<html><head><style>p{{}}</style></head><body>{body}</body></html>")
+    return str(path)
+
+
+def test_package_is_parsed_once_and_shared(tmp_path):
+    epub_reader.clear_cache()
+    path = _make_epub(tmp_path / "book.epub")
+
+    package = epub_reader.read_package(path)
+    assert epub_reader.read_package(path) is package
+    assert package.first('title') == "Python Fluente: Programação Clara"
+    assert package.get('creator') == ["Luciano Ramalho"]
+    assert package.isbns == ["9788575224625"]
+    assert len(package.spine) == 10
+
+
+def test_reading_order_puts_copyright_first(tmp_path):
+    path = _make_epub(tmp_path / "book.epub", identifier='<dc:identifier>urn:uuid:1234</dc:identifier>')
+    package = epub_reader.read_package(path)
+
+    order = package.reading_order(head=2, tail=1)
+    assert order == ["OEBPS/Text/ch08.xhtml", "OEBPS/Text/ch00.xhtml", "OEBPS/Text/ch01.xhtml", "OEBPS/Text/ch09.xhtml"]
+    assert package.isbns == []
+
+    href, text = next(epub_reader.iter_document_texts(package))
+    assert href == "OEBPS/Text/ch08.xhtml"
+    assert text == "Copyright © 2015\nISBN: 978-85-7522-462-5"
+
+
+def test_strip_tags_and_isbn_validation():
+    markup = "<div><script>var x = '<p>';</script><h1>T&iacute;tulo</h1>linha<br/>outra</div>"
+    assert epub_reader.strip_tags(markup) == "Título\nlinha\noutra"
+    assert epub_reader.is_valid_isbn("9788575224625")
+    assert epub_reader.is_valid_isbn("8575224621") is False
+    assert epub_reader.is_valid_isbn("0306406152")
+
+
+def test_metadata_extractor_uses_opf(tmp_path):
+    path = _make_epub(tmp_path / "book.epub")
+    result = extract_from_epub(path)
+
+    assert result['title'] == "Python Fluente"
+    assert result['subtitle'] == "Programação Clara"
+    assert result['publisher'] == "Novatec"
+    assert result['year'] == "2015"
+    assert result['isbn13'] == "9788575224625"
@@ -0,0 +1,96 @@
+"""
+Testes da extração supervisionada (prazo, teto de memória, quarentena, reciclagem).
+"""
+
+import os
+import time
+
+import pytest
+
+from renamepdfepub.extraction_supervisor import (
+    ExtractionSupervisor,
+    PoisonFileRegistry,
+    SupervisedExtractionError,
+)
+
+
+def _task(file_path, mode="ok"):
+    if mode == "slow":
+        time.sleep(30)
+    elif mode == "hog":
+        hog = bytearray(400 * 1024 * 1024)
+        time.sleep(30)
+        return len(hog)
+    elif mode == "crash":
+        os._exit(3)
+    elif mode == "error":
+        raise ValueError("bad xref")
+    return (os.getpid(), os.path.basename(file_path))
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(b"%PDF-1.4 body")
+    return str(path)
+
+
+def _supervisor(tmp_path, **kwargs):
+    registry = PoisonFileRegistry(str(tmp_path / "poison_files.json"))
+    options = dict(max_workers=1, timeout=1.0, max_rss_mb=200, recycle_every=50, poll_interval=0.02)
+    options.update(kwargs)
+    return ExtractionSupervisor(_task, registry=registry, **options)
+
+
+def test_runs_jobs_and_recycles_workers(tmp_path, book):
+    supervisor = _supervisor(tmp_path, recycle_every=2)
+    try:
+        pids = [supervisor.run(book)[0] for _ in range(5)]
+        assert supervisor.run(book)[1] == "book.pdf"
+        with pytest.raises(RuntimeError, match="bad xref"):
+            supervisor.run(book, "error")
+    finally:
+        supervisor.shutdown()
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+    assert supervisor.stats["recycled"] >= 3
+    assert supervisor.registry.entries() == {}
+
+
+@pytest.mark.parametrize("mode, reason", [("slow", "timeout"), ("hog", "memory"), ("crash", "crashed")])
+def test_offending_file_is_killed_and_quarantined(tmp_path, book, mode, reason):
+    supervisor = _supervisor(tmp_path)
+    try:
+        with pytest.raises(SupervisedExtractionError) as info:
+            supervisor.run(book, mode)
+        assert info.value.reason == reason
+        assert info.value.elapsed < 10
+        assert supervisor.registry.strikes(book) == 1
+        # The pool replaces the killed worker
+        assert supervisor.run(book)[1] == "book.pdf"
+    finally:
+        supervisor.shutdown()
+    assert supervisor.registry.entries() == {}  # released after finishing within limits
+
+
+def test_registry_persists_strikes_per_file_version(tmp_path, book):
+    registry = PoisonFileRegistry(str(tmp_path / "poison_files.json"))
+    registry.add(book, "timeout", elapsed=120.5)
+    registry.add(book, "memory")
+
+    reloaded = PoisonFileRegistry(str(tmp_path / "poison_files.json"))
+    assert reloaded.strikes(book) == 2
+    assert reloaded.entries()[os.path.abspath(book)]["reason"] == "memory"
+
+    with open(book, "ab") as handle:
+        handle.write(b"repaired")
+    assert reloaded.strikes(book) == 0
+    assert reloaded.is_quarantined(str(tmp_path / "other.pdf")) is False
+
+
+def test_workers_never_fork_the_scanning_process(tmp_path, book):
+    supervisor = _supervisor(tmp_path)
+    assert supervisor._context.get_start_method() in ("forkserver", "spawn")
+    try:
+        assert supervisor.run(book)[1] == "book.pdf"
+    finally:
+        supervisor.shutdown()
@@ -0,0 +1,123 @@
+"""
+Testes da faixa rápida por nome de arquivo (sem abrir os arquivos).
+"""
+
+from renamepdfepub.filename_lane import (
+    CATALOG_CONFIDENCE, PREFIX_ONLY_CONFIDENCE, FilenameLane, LocalCatalog, isbn_from_filename, parse_filename,
+)
+
+RECORDS = [
+    {
+        "title": "Python Fluente: Programação Clara, Concisa e Eficaz",
+        "authors": ["Luciano Ramalho"],
+        "publisher": "Novatec",
+        "published_date": "2015",
+        "isbn_13": "9788575224625",
+        "isbn_10": None,
+    },
+    {
+        "title": "Designing Data-Intensive Applications",
+        "authors": ["Martin Kleppmann"],
+        "publisher": "O'Reilly Media",
+        "published_date": "2017",
+        "isbn_13": "9781449373320",
+        "isbn_10": "1449373321",
+    },
+]
+
+
+class _Cache:
+    def __init__(self, records):
+        self.records = records
+        self.calls = 0
+
+    def get_all(self):
+        self.calls += 1
+        return self.records
+
+
+def test_parse_filename_merges_parsers_and_validates_isbn():
+    parsed = parse_filename(
+        "/books/Luciano Ramalho - Python Fluente (2015).pdf",
+        parsers=[lambda stem: {"author": "Luciano Ramalho", "publisher": "Novatec"}, lambda stem: 1 / 0],
+    )
+    assert parsed["title"] == "Python Fluente"
+    assert parsed["authors"] == ["Luciano Ramalho"]
+    assert (parsed["publisher"], parsed["published_date"], parsed["isbn"]) == ("Novatec", "2015", None)
+
+    assert isbn_from_filename("Livro 978-85-7522-462-5.pdf") == "9788575224625"
+    assert isbn_from_filename("Livro 978-85-7522-462-4.pdf") is None
+    assert isbn_from_filename("scan_20240101123456.pdf") is None
+
+
+def test_lane_resolves_from_catalog_in_one_bulk_read(tmp_path):
+    cache = _Cache(RECORDS)
+    lane = FilenameLane(LocalCatalog.from_cache(cache))
+    paths = [
+        str(tmp_path / "Martin Kleppmann - Designing Data Intensive Applications.pdf"),
+        str(tmp_path / "Luciano Ramalho - Python Fluente.epub"),
+        str(tmp_path / "anything 9781449373320.pdf"),
+        str(tmp_path / "Book 978-85-7522-462-5 copy.mobi"),
+        str(tmp_path / "Clean Code.pdf"),
+        str(tmp_path / "Someone Else - Designing Data Intensive Applications.pdf"),
+    ]
+
+    hints, pending, stats = lane.resolve(paths)
+
+    assert cache.calls == 1
+    assert not any(path.exists() for path in tmp_path.iterdir())  # nothing was opened or created
+    kleppmann = hints[paths[0]]
+    assert kleppmann["source"] == "local_catalog" and kleppmann["isbn"] == "9781449373320"
+    assert kleppmann["confidence"] >= 0.8
+    assert hints[paths[1]]["title"].startswith("Python Fluente:")  # subtitle dropped in the filename
+    assert hints[paths[2]]["authors"] == ["Martin Kleppmann"]
+    assert hints[paths[3]]["source"] == "local_catalog"
+    assert pending == [paths[4], paths[5]]  # unknown title, conflicting author
+    assert hints[paths[4]]["resolved"] is False and hints[paths[4]]["title"] == "Clean Code"
+    assert stats == {"files": 6, "catalog_hits": 4, "filename_isbns": 0, "pending": 2}
+
+
+def test_title_prefix_alone_does_not_resolve_a_book():
+    # Mesmo prefixo de título, livros diferentes: só o autor decide
+    records = RECORDS + [{"title": "Python Fluente: Segunda Edição", "authors": ["Outra Pessoa"]}]
+    catalog = LocalCatalog(records)
+    record, score = catalog.match(parse_filename("Python Fluente.epub"))
+    assert score <= PREFIX_ONLY_CONFIDENCE < CATALOG_CONFIDENCE
+    record, score = catalog.match(parse_filename("Fulano de Tal - Python Fluente.epub"))
+    assert score < CATALOG_CONFIDENCE
+    record, score = catalog.match(parse_filename("Outra Pessoa - Python Fluente.epub"))
+    assert record["title"] == "Python Fluente: Segunda Edição" and score >= CATALOG_CONFIDENCE
+
+    hints, pending, stats = FilenameLane(catalog).resolve(["Python Fluente.epub"])
+    assert pending == ["Python Fluente.epub"]
+    assert hints["Python Fluente.epub"]["source"] == "filename"
+    assert stats["catalog_hits"] == 0
+
+
+def test_unknown_tokens_and_title_author_order_still_match():
+    catalog = LocalCatalog(RECORDS + [
+        {"title": "Python Crash Course", "authors": ["Eric Matthes"], "isbn_13": "9781593279288"},
+        {"title": "Python Tricks", "authors": ["Dan Bader"]},
+    ])
+    names = [
+        "Eric Matthes - Python Crash Course 2nd.pdf",    # edição fora do catálogo
+        "Eric Matthes - Python Crash Course Third.pdf",
+        "Python Crash Course Matthes.pdf",               # sobrenome dentro do título
+        "Python Crash Course - Eric Matthes.pdf",        # "Título - Autor"
+    ]
+    for name in names:
+        record, score = catalog.match(parse_filename(name))
+        assert record["isbn_13"] == "9781593279288", name
+        assert score >= CATALOG_CONFIDENCE, name
+    assert parse_filename(names[3])["swapped"] == {"title": "Python Crash Course", "authors": ["Eric Matthes"]}
+
+    # Um único token em comum não basta
+    record, score = catalog.match(parse_filename("Python Cookbook Recipes.pdf"))
+    assert score < CATALOG_CONFIDENCE
+
+
+def test_filename_isbn_without_catalog_skips_content():
+    hints, pending, stats = FilenameLane().resolve(["Unknown 978-85-7522-462-5.pdf"])
+    assert pending == []
+    assert hints["Unknown 978-85-7522-462-5.pdf"]["isbn"] == "9788575224625"
+    assert stats["filename_isbns"] == 1
@@ -0,0 +1,37 @@
+"""
+Testes do cache persistente de dicas do pré-processador (por caminho e mtime).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from renamepdfepub.hint_cache import HintCache
+
+
+def _book(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"%PDF-1.4 body")
+    return str(path)
+
+
+def test_hints_survive_reopen_and_expire_when_file_changes(tmp_path):
+    books = [_book(tmp_path, f"book{index}.pdf") for index in range(3)]
+    db_path = str(tmp_path / "hints.db")
+    cache = HintCache(db_path)
+    hint = {"title": "Python Fluente", "authors": ["Luciano Ramalho"], "isbn": "9788575224625"}
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert all(pool.map(lambda path: cache.put(path, hint), books))
+    assert cache.put(str(tmp_path / "missing.pdf"), hint) is False
+    cache.close()
+
+    reopened = HintCache(db_path)
+    assert reopened.get_many(books + [str(tmp_path / "missing.pdf")]) == {path: hint for path in books}
+
+    with open(books[0], "ab") as handle:
+        handle.write(b"more")
+    stat = os.stat(books[1])
+    os.utime(books[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert list(reopened.get_many(books)) == [books[2]]
+
+    assert HintCache(db_path, version=2).get(books[2]) is None
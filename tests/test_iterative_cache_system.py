@@ -0,0 +1,158 @@
+"""
+Testes do cache iterativo: banco único com conexão persistente, consultas
+indexadas, lote, hash parcial e agendamento por convergência.
+"""
+
+import hashlib
+import sqlite3
+import time
+from collections import Counter
+
+from core.iterative_cache_system import (
+    IterationConfig, IterativeCacheSystem, create_iterative_cache_system,
+)
+
+
+def test_iterations_reuse_one_connection_to_the_single_database(tmp_path, monkeypatch):
+    opened = []
+    real_connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        opened.append(args[0])
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, 'connect', counting_connect)
+    system = create_iterative_cache_system(tmp_path / 'cache')
+    files = [f'/biblioteca/Autor {i} - Livro {i} ({1990 + i % 30}).pdf' for i in range(3000)]
+    assert system.add_file_list(files) == 3000
+
+    stats = system.run_iterative_processing(
+        IterationConfig(max_iterations=2, batch_size=1000, cache_interval=1)
+    )
+
+    assert opened == [system.db_path]
+    assert stats['iterations_completed'] == 2
+    # Segunda iteração: arquivos novos e os que ainda rendem ganho por custo
+    assert 1000 < stats['consolidated_entries'] <= 2000
+    prediction = system._load_current_prediction(files[0])
+    assert prediction['metadata']['genre'] == 'technical_book'
+    assert system._load_predictions(files[:2000]).keys() == set(files[:2000])
+    with system._db() as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    system.close()
+
+
+def test_selection_is_indexed_and_legacy_databases_are_merged(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    with sqlite3.connect(cache_dir / 'best_guess_predictions.db') as conn:
+        conn.execute('''
+            CREATE TABLE prediction_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, file_path TEXT UNIQUE NOT NULL,
+                predicted_metadata TEXT NOT NULL, confidence_score REAL NOT NULL,
+                prediction_basis TEXT, iteration_created INTEGER NOT NULL,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP, remote_source TEXT,
+                is_downloaded BOOLEAN DEFAULT FALSE)
+        ''')
+        conn.executemany(
+            'INSERT INTO prediction_cache (file_path, predicted_metadata, confidence_score, '
+            'iteration_created) VALUES (?, ?, ?, 0)',
+            [('/antigo/a.pdf', '{}', 0.2), ('/antigo/b.pdf', '{}', 0.9)]
+        )
+    conn.close()
+
+    system = create_iterative_cache_system(cache_dir)
+    assert not (cache_dir / 'best_guess_predictions.db').exists()
+    assert (cache_dir / 'best_guess_predictions.db.migrated').exists()
+    system.add_file_list(['/novo/Autor - Livro (2020).pdf'])
+    assert system._select_files_for_iteration(2, None) == ['/antigo/a.pdf', '/novo/Autor - Livro (2020).pdf']
+
+    with system._db() as conn:
+        plan = ' '.join(row[-1] for row in conn.execute('''
+            EXPLAIN QUERY PLAN
+            SELECT file_path, confidence_score FROM prediction_cache
+            WHERE is_downloaded = FALSE AND next_round <= 1
+            ORDER BY priority DESC, last_updated ASC LIMIT 10
+        '''))
+    assert 'idx_prediction_schedule' in plan and 'TEMP B-TREE' not in plan
+
+    # Promoção das linhas gravadas desde a última consolidação, acima do limiar
+    system.current_iteration = 1
+    system._save_iteration_results({'processed_files': [
+        {'file_path': '/antigo/a.pdf', 'metadata': {'title': 'A'},
+         'old_confidence': 0.2, 'new_confidence': 0.95},
+        {'file_path': '/novo/Autor - Livro (2020).pdf', 'metadata': {},
+         'old_confidence': 0.8, 'new_confidence': 0.5},
+    ]}, IterationConfig())
+    assert system._consolidate_predictions(since_iteration=0) == 1
+    with system._db() as conn:
+        rows = conn.execute(
+            'SELECT file_path, confidence_score, metadata, iteration_created FROM consolidated_cache'
+        ).fetchall()
+    assert rows == [('/antigo/a.pdf', 0.95, '{"title": "A"}', 1)]
+    system.close()
+
+
+def test_scheduler_backs_off_plateaus_and_reuses_unchanged_algorithm_outputs(tmp_path):
+    calls = Counter()
+
+    def capped(file_path, prediction):
+        # livro_N melhora 0.1 por iteração até 1.0; os demais nunca melhoram
+        calls[file_path] += 1
+        confidence = prediction.get('confidence_score', 0.1)
+        cap = 1.0 if 'livro_' in file_path else confidence
+        return {'confidence': min(confidence + 0.1, cap), 'metadata': prediction.get('metadata', {})}
+
+    system = IterativeCacheSystem(tmp_path / 'cache')
+    system.register_algorithm('capped', capped)
+    improving = [f'/biblioteca/livro_{i}.pdf' for i in range(20)]
+    stuck = [f'/biblioteca/Autor {i} - Livro (2020).pdf' for i in range(20)]
+    system.add_file_list(stuck + improving)
+    # Mais margem de melhoria (confiança inicial menor) vem primeiro
+    assert set(system._select_files_for_iteration(10, None)) <= set(improving)
+
+    started = time.perf_counter()
+    stats = system.run_iterative_processing(
+        IterationConfig(max_iterations=200, batch_size=10, cache_interval=5)
+    )
+    elapsed = time.perf_counter() - started
+
+    # Convergiu antes do limite, sem pausa fixa por iteração
+    assert stats['iterations_completed'] < 200
+    assert elapsed < stats['iterations_completed'] * 0.1
+    assert stats['consolidated_entries'] == 40
+    predictions = system._load_predictions(stuck + improving)
+    assert all(predictions[path]['confidence_score'] > 0.99 for path in improving)
+    # Arquivos em platô voltaram, mas com a mesma entrada o algoritmo não rodou de novo
+    assert all(calls[path] == 1 for path in stuck)
+    assert all(calls[path] <= 10 for path in improving)
+
+    # Nova sessão: tudo convergido, nenhuma execução nova dos algoritmos
+    total_calls = sum(calls.values())
+    system.run_iterative_processing(IterationConfig(max_iterations=50, batch_size=10))
+    assert sum(calls.values()) == total_calls
+    system.close()
+
+
+def test_file_hash_is_full_for_small_files_and_sampled_for_large_ones(tmp_path):
+    system = create_iterative_cache_system(tmp_path / 'cache')
+    small = tmp_path / 'small.pdf'
+    small.write_bytes(b'%PDF-1.4 pequeno')
+    assert system._calculate_file_hash(str(small)) == hashlib.md5(small.read_bytes()).hexdigest()
+    assert system._calculate_file_hash(str(tmp_path / 'nao_existe.pdf')) is None
+    assert system._calculate_file_hash(str(tmp_path)) is None
+
+    large = tmp_path / 'large.pdf'
+    data = bytearray(b'x' * 40_000)
+    large.write_bytes(data)
+    first = system._calculate_file_hash(str(large), sample_size=4096)
+    data[-1:] = b'y'  # fim amostrado
+    large.write_bytes(data)
+    assert system._calculate_file_hash(str(large), sample_size=4096) != first
+    data[10_000:10_001] = b'z'  # fora das amostras
+    large.write_bytes(data)
+    unsampled_change = system._calculate_file_hash(str(large), sample_size=4096)
+    data[10_000:10_001] = b'x'
+    large.write_bytes(data)
+    assert system._calculate_file_hash(str(large), sample_size=4096) == unsampled_change
+    system.close()
@@ -0,0 +1,65 @@
+"""
+Testes das métricas vivas (t-digest, agregados incrementais e anel mapeado em memória).
+"""
+
+import random
+
+from renamepdfepub.live_stats import LiveStats, LiveStatsPublisher, TDigest, read_live_stats
+
+
+def test_tdigest_quantiles_stay_accurate_and_merge():
+    rng = random.Random(7)
+    left, right = TDigest(), TDigest()
+    for index in range(20000):
+        (left if index % 2 else right).add(rng.random())
+    assert len(left) < 200
+
+    merged = left.merge(right)
+    assert merged.count == 20000
+    for q in (0.5, 0.95, 0.99):
+        assert abs(merged.quantile(q) - q) < 0.01
+    assert TDigest().quantile(0.5) == 0.0
+
+
+def test_live_stats_rolls_aggregates_per_api():
+    stats = LiveStats(alpha=0.5)
+    for latency, success in ((1.0, True), (3.0, False), (2.0, True)):
+        stats.observe("openlibrary", latency, success)
+    stats.error("openlibrary", "Timeout", ts=1.0)
+    stats.failure("openlibrary", {"type": "Timeout", "isbn": None})
+    stats.error("isbndb", "HTTPError")
+
+    snapshot = stats.snapshot()
+    assert snapshot["overall"] == {"total": 3, "success": 2, "success_rate": 2 / 3 * 100}
+    api = snapshot["per_api"]["openlibrary"]
+    assert api["avg_time"] == 2.0 and api["p50"] == 2.0
+    assert api["errors"] == {"Timeout": 1}
+    assert api["recent_errors"] == [{"type": "Timeout", "ts": 1.0}]
+    assert len(api["recent_failures"]) == 1
+    assert "isbndb" not in snapshot["per_api"]
+
+
+def test_publisher_is_rate_limited_and_ring_wraps(tmp_path):
+    now = [0.0]
+    ring = str(tmp_path / "reports" / "live.ring")
+    publisher = LiveStatsPublisher(ring, min_interval=1.0, slots=2, slot_size=256, clock=lambda: now[0])
+    assert read_live_stats(ring) is None
+
+    built = []
+    def build():
+        built.append(now[0])
+        return {"n": len(built)}
+
+    assert publisher.maybe_publish(build)
+    now[0] = 0.5
+    assert not publisher.maybe_publish(build)
+    assert publisher.maybe_publish(build, force=True)
+    for step in range(3):
+        now[0] += 1.0
+        assert publisher.maybe_publish(build)
+    assert built == [0.0, 0.5, 1.5, 2.5, 3.5]
+    assert read_live_stats(ring) == {"n": 5}
+
+    assert not publisher.publish({"blob": "x" * 300})
+    publisher.close()
+    assert read_live_stats(ring) == {"n": 5}
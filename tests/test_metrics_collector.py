@@ -18,3 +18,46 @@ def test_metrics_collector_errors_and_recent():
     assert 'recent_errors' in stats
     assert len(stats['recent_errors']) >= 2
 
+
+
+def test_live_stats_export_rewrites_files_only_at_the_end(tmp_path):
+    import json
+    import types
+    from renamepdfepub.live_stats import LiveStatsPublisher, read_live_stats
+    core = importlib.import_module('src.core.renomeia_livro')
+    now = [0.0]
+    calls = []
+    extractor = types.SimpleNamespace(
+        reports_dir=tmp_path,
+        live_publisher=LiveStatsPublisher(str(tmp_path / 'live.ring'), min_interval=1.0, clock=lambda: now[0]),
+        logger=types.SimpleNamespace(debug=calls.append),
+        _live_stats_payload=lambda: {'overall': {'total': now[0]}},
+        _write_prometheus_metrics=lambda: calls.append('prom'),
+    )
+    export = core.BookMetadataExtractor._export_live_stats
+    for tick in range(5):
+        now[0] = tick * 0.5
+        export(extractor)
+    # Durante a varredura so o anel muda (uma vez por segundo)
+    assert read_live_stats(str(tmp_path / 'live.ring')) == {'overall': {'total': 2.0}}
+    assert not (tmp_path / 'live_api_stats.json').exists() and calls == []
+    export(extractor, final=True)
+    assert json.loads((tmp_path / 'live_api_stats.json').read_text()) == {'overall': {'total': 2.0}}
+    assert calls == ['prom']
+
+
+def test_live_snapshot_and_prometheus_share_the_window():
+    core = importlib.import_module('src.core.renomeia_livro')
+    mc = core.MetricsCollector()
+    for i in range(4):
+        mc.add_metric('openlibrary', 0.2, success=(i != 0))
+    mc.add_error('openlibrary', 'Timeout')
+    mc.add_failure('openlibrary', error_type='http', status=500, message='erro')
+    assert not hasattr(mc, 'live')
+
+    snapshot = mc.live_snapshot()
+    api = snapshot['per_api']['openlibrary']
+    assert (api['total'], api['success'], api['success_rate']) == (4, 3, 75.0)
+    assert api['errors'] == {'Timeout': 1} and len(api['recent_failures']) == 1
+    assert snapshot['overall'] == {'total': 4, 'success': 3, 'success_rate': 75.0}
+    assert 'renamepdfepub_api_success_ratio{api="openlibrary"} 0.75' in mc.to_prometheus()
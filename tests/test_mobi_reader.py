@@ -0,0 +1,84 @@
+"""
+Testes do leitor de cabeçalhos MOBI/AZW via mmap.
+"""
+
+import struct
+
+import pytest
+
+from renamepdfepub import mobi_reader
+
+
+def _exth(records):
+    body = b''.join(struct.pack('>II', kind, len(value) + 8) + value for kind, value in records)
+    block = b'EXTH' + struct.pack('>II', 12 + len(body), len(records)) + body
+    return block + b'\0' * (-len(block) % 4)
+
+
+def _make_mobi(path, exth_records=None, text_records=(), compression=2, name=b'Clean Code'):
+    mobi_length = 0xE8
+    record0 = bytearray(16 + mobi_length)
+    struct.pack_into('>HHIHHH', record0, 0, compression, 0, 0, len(text_records), 4096, 0)
+    record0[16:20] = b'MOBI'
+    struct.pack_into('>III', record0, 20, mobi_length, 2, 65001)
+    struct.pack_into('>I', record0, 128, 0x40 if exth_records else 0)
+    exth = _exth(exth_records) if exth_records else b''
+    struct.pack_into('>II', record0, 84, len(record0) + len(exth), len(name))
+    record0 += exth + name + b'\0\0'
+
+    records = [bytes(record0), *text_records]
+    offset = 78 + 8 * len(records) + 2
+    table = b''
+    for index, record in enumerate(records):
+        table += struct.pack('>IB3s', offset, 0, index.to_bytes(3, 'big'))
+        offset += len(record)
+    header = bytearray(78)
+    header[:len(b'clean_code')] = b'clean_code'
+    header[60:68] = b'BOOKMOBI'
+    struct.pack_into('>H', header, 76, len(records))
+    path.write_bytes(bytes(header) + table + b'\0\0' + b''.join(records))
+    return str(path)
+
+
+def test_reads_exth_metadata_without_text(tmp_path):
+    path = _make_mobi(tmp_path / "book.mobi", exth_records=[
+        (100, b'Robert C. Martin'),
+        (101, b'Prentice Hall'),
+        (104, b'978-0-13-235088-4'),
+        (106, b'2008-08-01'),
+        (503, 'Código Limpo'.encode('utf-8')),
+    ])
+
+    header = mobi_reader.read_header(path)
+
+    assert header.has_exth
+    assert header.isbn == '9780132350884'
+    assert header.title == 'Código Limpo'
+    assert header.authors == ['Robert C. Martin']
+    assert header.publisher == 'Prentice Hall'
+    assert header.published_date == '2008-08-01'
+    assert header.encoding == 'utf-8'
+
+
+def test_palmdoc_fallback_without_exth(tmp_path):
+    # "abcabcabc": literals, then a back-reference of distance 3, length 6
+    compressed = b'abc' + struct.pack('>H', 0x8000 | (3 << 3) | (6 - 3)) + b'\xc9'
+    path = _make_mobi(tmp_path / "book.azw3", text_records=[compressed, b'<p>ISBN 978</p>'])
+
+    header = mobi_reader.read_header(path)
+    assert not header.has_exth
+    assert header.title == 'Clean Code'
+    assert mobi_reader.palmdoc_decompress(compressed) == b'abcabcabc I'
+    assert mobi_reader.read_text(path, max_records=1) == 'abcabcabc I'
+    assert mobi_reader.read_text(path) == 'abcabcabc I<p>ISBN 978</p>'
+
+
+def test_rejects_non_mobi(tmp_path):
+    path = tmp_path / "fake.mobi"
+    path.write_bytes(b'not a palm database' * 10)
+    with pytest.raises(ValueError):
+        mobi_reader.read_header(str(path))
+    empty = tmp_path / "empty.mobi"
+    empty.write_bytes(b'')
+    with pytest.raises(ValueError):
+        mobi_reader.read_header(str(empty))
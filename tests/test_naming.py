@@ -0,0 +1,61 @@
+"""
+Testes do motor de templates de nomes (plano compilado, saneamento e lote).
+"""
+
+import time
+
+import pytest
+
+from renamepdfepub.naming import (
+    FILESYSTEM, SAFE_NAME, NameTemplate, Sanitizer, compile_template, first_authors, known,
+)
+
+
+def test_sanitizers_keep_the_existing_naming_rules():
+    # renamer.sanitize_name: espaços colapsados antes de remover caracteres
+    assert SAFE_NAME('  This is / a ? title:  ') == 'This is  a  title'
+    assert SAFE_NAME('Programação  Avançada', 12) == 'Programação'
+    # _clean_filename: ASCII, reservados removidos, reticências antes da extensão
+    assert FILESYSTEM('File: "Test" /> .pdf') == 'File Test .pdf'
+    assert FILESYSTEM('áéíóú.pdf') == 'aeiou.pdf'
+    long_name = FILESYSTEM('x' * 300 + '.pdf')
+    assert len(long_name) == 200 and long_name.endswith('....pdf')
+
+    ascii_under = Sanitizer(r'[\w \-]', replacement=' ', fold_ascii=True, underscore=True)
+    assert ascii_under("O'Reilly: Guia (2ª ed.)") == 'O_Reilly_Guia_2a_ed'
+
+    template = compile_template('{publisher}_{year}_{title}_{author}_{ISBN}', 'report')
+    assert template.fields == ('publisher', 'year', 'title', 'author', 'isbn')
+    row = {'title': 'Python: Fluente / 2', 'author': 'Luciano Ramalho', 'publisher': 'Novatec',
+           'year': 2015, 'isbn': '9788575224625'}
+    # Mesmo resultado que sanear o nome inteiro de uma vez
+    assert template.render(row) == SAFE_NAME('Novatec_2015_Python: Fluente / 2_Luciano Ramalho_9788575224625')
+    assert compile_template('{title} {{v2}}', 'ascii').render({'title': 'Édition'}) == 'Edition {v2}'
+    assert compile_template('{publisher}_{year}_{title}_{author}_{ISBN}', 'report') is template
+    with pytest.raises(ValueError):
+        NameTemplate('{title}_{editora}')
+    with pytest.raises(ValueError):
+        NameTemplate('{title')
+
+
+def test_batch_preview_of_100k_rows_reuses_the_field_cache():
+    publishers = ['Novatec', "O'Reilly Media", 'Casa do Código', 'Packt Publishing', 'Manning']
+    rows = [{
+        'title': f'Livro número {i % 5000} — edição {i % 7}',
+        'author': first_authors(f'Autor {i % 300}, Coautor {i % 17}, Terceiro'),
+        'publisher': publishers[i % 5],
+        'year': known(str(1990 + i % 30)),
+    } for i in range(100_000)]
+    template = compile_template('{title} - {author} - {publisher} ({year})', 'ascii_underscore')
+
+    started = time.perf_counter()
+    names = template.render_many(rows)
+    elapsed = time.perf_counter() - started
+
+    assert len(names) == 100_000
+    assert names[1] == 'Livro_numero_1_edicao_1 - Autor_1_Coautor_1 - O_Reilly_Media (1991)'
+    assert names[5001] == template.render(rows[5001])
+    cache = template.cache_info()
+    assert cache['publisher'].currsize == 5 and cache['title'].misses == 35_000
+    # Margem generosa para máquinas lentas; a meta é < 1s
+    assert elapsed < 3.0, f"100k previews took {elapsed:.2f}s"
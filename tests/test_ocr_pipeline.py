@@ -0,0 +1,82 @@
+"""
+Testes do estágio de OCR limitado (parada no ISBN, cache persistente por página).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from renamepdfepub.ocr_pipeline import OcrPipeline, find_valid_isbn
+
+
+class _FakePages:
+    """Leitor de páginas que registra chamadas e o pico de páginas simultâneas."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, pdf_path, page_number, dpi):
+        with self._lock:
+            self.calls.append(page_number)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return self.pages.get(page_number, f"page {page_number}")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _pipeline(reader, tmp_path, workers=2):
+    return OcrPipeline(
+        max_workers=workers,
+        cache_path=str(tmp_path / "ocr_cache.db"),
+        page_reader=reader,
+        executor_factory=lambda n: ThreadPoolExecutor(max_workers=n),
+    )
+
+
+def test_find_valid_isbn_in_noisy_text():
+    assert find_valid_isbn("ISBN 978-85-7522-462-5 Novatec") == "9788575224625"
+    assert find_valid_isbn("ISBN: 0 306 40615 2") == "0306406152"
+    assert find_valid_isbn("ISBN 978-85-7522-462-0 / 8575224621") is None
+
+
+def test_stops_after_valid_isbn_and_caches_pages(tmp_path):
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4 scanned")
+    reader = _FakePages({3: "Copyright 2015\nISBN 978-85-7522-462-5"})
+    pipeline = _pipeline(reader, tmp_path)
+
+    result = pipeline.extract(str(pdf), max_pages=10)
+    pipeline.shutdown()
+    assert result.isbn == "9788575224625"
+    assert "ISBN 978-85-7522-462-5" in result.text
+    assert reader.peak <= 2
+    assert max(reader.calls) <= 4
+    assert result.text.index("page 1") < result.text.index("Copyright")
+
+    rerun = _pipeline(reader, tmp_path)
+    calls_before = len(reader.calls)
+    cached = rerun.extract(str(pdf), max_pages=10)
+    rerun.shutdown()
+    assert cached.isbn == "9788575224625"
+    assert cached.cache_hits >= 3
+    assert len(reader.calls) == calls_before
+
+
+def test_scans_every_page_without_isbn(tmp_path):
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4 no isbn")
+    reader = _FakePages({})
+    pipeline = _pipeline(reader, tmp_path, workers=3)
+
+    result = pipeline.extract(str(pdf), max_pages=5)
+    pipeline.shutdown()
+    assert result.isbn is None
+    assert sorted(reader.calls) == [1, 2, 3, 4, 5]
+    assert result.text.splitlines() == [f"page {n}" for n in range(1, 6)]
+    assert reader.peak <= 3
@@ -0,0 +1,106 @@
+"""
+Testes do catálogo offline (importação em streaming de dumps e busca por ISBN).
+"""
+
+import gzip
+import json
+
+from renamepdfepub.offline_catalog import OfflineCatalog, isbn13_to_isbn10, normalize_isbn
+
+
+def _canonical(name):
+    return {"O'REILLY MEDIA": "OReilly"}.get((name or "").upper(), name or "")
+
+
+def test_isbn_normalization():
+    assert normalize_isbn("1-4493-7332-1") == "9781449373320"
+    assert normalize_isbn("978-85-7522-462-5") == "9788575224625"
+    assert normalize_isbn("9788575224624") is None
+    assert isbn13_to_isbn10("9781449373320") == "1449373321"
+    assert isbn13_to_isbn10("9798886450000") is None
+
+
+def test_imports_openlibrary_dump_and_resolves_author_keys(tmp_path):
+    lines = [
+        ["/type/edition", "/books/OL1M", "3", "2020-01-01", {
+            "title": "Designing Data-Intensive Applications",
+            "isbn_10": ["1449373321"], "isbn_13": ["9781449373320"],
+            "publishers": ["O'Reilly Media"], "publish_date": "2017",
+            "authors": [{"key": "/authors/OL7A"}],
+        }],
+        ["/type/work", "/works/OL2W", "1", "2020-01-01", {"title": "ignored"}],
+        ["/type/edition", "/books/OL3M", "1", "2020-01-01", {"title": "No ISBN"}],
+        ["/type/author", "/authors/OL7A", "1", "2020-01-01", {"name": "Martin Kleppmann"}],
+    ]
+    dump = tmp_path / "ol_dump.txt.gz"
+    with gzip.open(dump, "wt", encoding="utf-8") as handle:
+        for *fields, data in lines:
+            handle.write("\t".join(fields + [json.dumps(data)]) + "\nbroken line\n")
+
+    catalog = OfflineCatalog(str(tmp_path / "catalog.db"), publisher_normalizer=_canonical)
+    stats = catalog.import_dump(str(dump), batch_size=1)
+
+    assert stats["editions"] == 1 and stats["authors"] == 1 and stats["editions_total"] == 1
+    found = catalog.lookup_many(["1-4493-7332-1", "9781449373320", "9788575224625"])
+    assert set(found) == {"1-4493-7332-1", "9781449373320"}
+    record = found["1-4493-7332-1"]
+    assert record["authors"] == ["Martin Kleppmann"]
+    assert record["publisher"] == "OReilly"
+    assert (record["isbn_10"], record["published_date"]) == ("1449373321", "2017")
+
+
+def test_imports_jsonl_and_tsv_exports(tmp_path):
+    jsonl = tmp_path / "export.jsonl"
+    jsonl.write_text(json.dumps({
+        "title": "Python Fluente", "authors": ["Luciano Ramalho"], "publisher": "Novatec",
+        "published_date": "2015", "isbn_13": "978-85-7522-462-5",
+    }) + "\n\n", encoding="utf-8")
+    tsv = tmp_path / "export.tsv"
+    tsv.write_text(
+        "title\tauthors\tpublisher\tpublished_date\tisbn_13\tisbn_10\n"
+        "Refactoring\tMartin Fowler; Kent Beck\tAddison-Wesley\t1999\t\t0201485672\n",
+        encoding="utf-8",
+    )
+
+    catalog = OfflineCatalog(str(tmp_path / "catalog.db"))
+    assert catalog.available is False and len(catalog) == 0
+    catalog.import_dump(str(jsonl))
+    catalog.import_dump(str(tsv))
+
+    assert catalog.lookup("9788575224625")["authors"] == ["Luciano Ramalho"]
+    refactoring = catalog.lookup("0201485672")
+    assert refactoring["authors"] == ["Martin Fowler", "Kent Beck"]
+    assert refactoring["isbn_13"] == "9780201485677" and refactoring["source"] == "export.tsv"
+    assert len(OfflineCatalog(str(tmp_path / "catalog.db"))) == 2
+
+
+def test_scan_resolves_hinted_isbns_in_one_batch(tmp_path):
+    import importlib
+    import types
+
+    core = importlib.import_module("src.core.renomeia_livro")
+    jsonl = tmp_path / "export.jsonl"
+    jsonl.write_text(json.dumps({
+        "title": "Python Fluente", "authors": ["Luciano Ramalho"], "publisher": "Novatec",
+        "published_date": "2015", "isbn_13": "978-85-7522-462-5",
+    }) + "\n", encoding="utf-8")
+    catalog = OfflineCatalog(str(tmp_path / "catalog.db"))
+    catalog.import_dump(str(jsonl))
+    batches = []
+    lookup_many = catalog.lookup_many
+    catalog.lookup_many = lambda isbns: batches.append(sorted(isbns)) or lookup_many(isbns)
+
+    fetcher = types.SimpleNamespace(
+        offline_catalog=catalog,
+        _offline_prefetched={},
+        confidence_adjustments={"offline_catalog": 0.93},
+    )
+    fetcher_cls = core.MetadataFetcher
+    assert fetcher_cls.prefetch_offline_catalog(fetcher, ["9788575224625", None, "9781449373320"]) == 1
+    assert fetcher_cls.fetch_offline_catalog(fetcher, "9788575224625").authors == ["Luciano Ramalho"]
+    assert fetcher_cls.fetch_offline_catalog(fetcher, "9781449373320") is None
+    assert batches == [["9781449373320", "9788575224625"]]
+
+    # ISBNs descobertos depois (no conteúdo) ainda são consultados um a um
+    assert fetcher_cls.fetch_offline_catalog(fetcher, "1449373321") is None
+    assert len(batches) == 2
@@ -0,0 +1,124 @@
+"""
+Testes do registro de backends de texto PDF (ordem calibrada e persistida).
+"""
+
+import json
+import time
+
+import pytest
+
+from renamepdfepub import pdf_backends
+from renamepdfepub.pdf_backends import PdfTextBackend, calibrate, extract_text, load_order, register_backend
+from renamepdfepub.pdf_document import open_document
+
+
+class _Backend(PdfTextBackend):
+    def __init__(self, name, text, delay=0.0, fail=False):
+        self.name = name
+        self.text = text
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    @property
+    def available(self):
+        return True
+
+    def extract(self, document, max_pages):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("broken backend")
+        return self.text
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    monkeypatch.setattr(pdf_backends, "_BACKENDS", pdf_backends.OrderedDict())
+    backends = {
+        "fast": _Backend("fast", "x" * 5000),
+        "accurate": _Backend("accurate", "ISBN 978-85-7522-462-5\n" + "y" * 100, delay=0.01),
+        "broken": _Backend("broken", "", fail=True),
+    }
+    for backend in backends.values():
+        register_backend(backend)
+    return backends
+
+
+def test_calibration_ranks_isbn_hits_then_speed_and_persists(tmp_path, fake_backends):
+    sample = []
+    for index in range(3):
+        path = tmp_path / f"book{index}.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        sample.append(str(path))
+    order_path = str(tmp_path / "pdf_backends.json")
+
+    scores = calibrate(sample + [str(tmp_path / "missing.pdf")], persist_path=order_path)
+
+    assert [score.name for score in scores] == ["accurate", "fast", "broken"]
+    assert scores[0].isbn_hit_rate == 1.0 and scores[0].files == 3
+    assert scores[2].failures == 3
+    saved = json.loads((tmp_path / "pdf_backends.json").read_text(encoding="utf-8"))
+    assert saved["order"] == ["accurate", "fast", "broken"]
+    assert load_order(order_path) == ["accurate", "fast", "broken"]
+
+
+def test_extract_text_follows_order_and_skips_failures(tmp_path, fake_backends):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    (tmp_path / "order.json").write_text(json.dumps({"order": ["broken", "unknown", "accurate"]}))
+
+    order = load_order(str(tmp_path / "order.json"))
+    assert order == ["broken", "accurate", "fast"]
+
+    with open_document(str(path)) as document:
+        text, tried, backend = extract_text(document, 5, order=order)
+    assert backend == "accurate"
+    assert tried == ["broken", "accurate"]
+    assert text.startswith("ISBN")
+    assert fake_backends["fast"].calls == 0
+
+
+def _text_pdf(path, text):
+    """PDF de uma pagina com `text` em Helvetica (xref com offsets corretos)."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(data))
+
+
+def test_backends_must_implement_extract():
+    class Incomplete(PdfTextBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_pdfminer_backend_skips_layout_analysis(tmp_path, monkeypatch):
+    layout = pytest.importorskip("pdfminer.layout")
+
+    def no_layout(self, laparams):
+        raise AssertionError("layout analysis should be off")
+
+    monkeypatch.setattr(layout.LTLayoutContainer, "analyze", no_layout)
+    path = tmp_path / "book.pdf"
+    _text_pdf(path, "ISBN 978-85-7522-462-5")
+    with open_document(str(path)) as document:
+        text = pdf_backends.PdfminerBackend().extract(document, 5)
+    assert "978-85-7522-462-5" in text
@@ -0,0 +1,72 @@
+"""
+Testes do handle único de PDF (mmap, XMP, contexto compartilhado por arquivo).
+"""
+
+import threading
+
+from renamepdfepub import pdf_document
+from renamepdfepub.pdf_document import PdfDocumentHandle, open_document
+
+
+XMP = b"""<?xpacket begin="" id="W5M0MpCehiHzreSzNTczkc9d"?>
+<x:xmpmeta xmlns:x="adobe:ns:meta/">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+  <rdf:Description rdf:about="" xmlns:dc="http://purl.org/dc/elements/1.1/"
+      xmlns:prism="http://prismstandard.org/namespaces/basic/2.0/" prism:isbn="978-85-7522-462-5">
+   <dc:title><rdf:Alt><rdf:li xml:lang="x-default">Python Fluente</rdf:li></rdf:Alt></dc:title>
+   <dc:creator><rdf:Seq><rdf:li>Luciano Ramalho</rdf:li></rdf:Seq></dc:creator>
+  </rdf:Description>
+ </rdf:RDF>
+</x:xmpmeta>
+<?xpacket end="w"?>"""
+
+
+def _make_pdf(path, pages=3):
+    kids = " ".join(f"{3 + n} 0 R" for n in range(pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R /Metadata 99 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode(),
+    ]
+    objects += [b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"] * pages
+    body = b"%PDF-1.4\n"
+    for number, obj in enumerate(objects, start=1):
+        body += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    body += b"99 0 obj\n<< /Type /Metadata /Subtype /XML >>\nstream\n" + XMP + b"\nendstream\nendobj\n%%EOF\n"
+    path.write_bytes(body)
+    return str(path)
+
+
+def test_xmp_and_page_count_from_mapped_file(tmp_path):
+    path = _make_pdf(tmp_path / "book.pdf", pages=3)
+
+    with PdfDocumentHandle(path) as document:
+        assert document.xmp_values('title') == ["Python Fluente"]
+        assert document.xmp_values('creator') == ["Luciano Ramalho"]
+        assert document.xmp_values('isbn') == ["978-85-7522-462-5"]
+        assert document.page_count == 3
+        if pdf_document.PdfReader is None:
+            assert document.info == {}
+            assert document.page_text(0) == ""
+
+
+def test_open_document_shares_one_handle_per_thread(tmp_path):
+    path = _make_pdf(tmp_path / "book.pdf")
+
+    with open_document(path) as outer:
+        with open_document(str(tmp_path / "." / "book.pdf")) as inner:
+            assert inner is outer
+        seen = []
+
+        def other_thread():
+            with open_document(path) as document:
+                seen.append(document is outer)
+
+        worker = threading.Thread(target=other_thread)
+        worker.start()
+        worker.join()
+        assert seen == [False]
+        assert outer._data is not None
+    assert outer._data is None
+
+    with open_document(path) as again:
+        assert again is not outer
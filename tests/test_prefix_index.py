@@ -0,0 +1,60 @@
+"""
+Testes do índice de prefixos e do auto-completar alimentado pelo catálogo.
+"""
+
+import random
+import sqlite3
+
+from src.renamepdfepub.cli.prefix_index import PrefixIndex
+from src.renamepdfepub.cli.query_preprocessor import AutoCompleter
+
+
+def _brute_force(index, prefix, k):
+    key = index.normalize(prefix)
+    entries = sorted((-weight, term) for term, weight in index._weights.items() if term.startswith(key))
+    return [term for _, term in entries[:k]]
+
+
+def test_complete_orders_by_weight_and_keeps_display_form():
+    index = PrefixIndex(top_k=3)
+    index.extend([("Clean Code", 5.0), ("Clean Architecture", 8.0), ("Cloud Native", 1.0), ("Code Complete", 2.0)])
+
+    assert index.complete("cl", 3) == [("Clean Architecture", 8.0), ("Clean Code", 5.0), ("Cloud Native", 1.0)]
+    assert index.complete("CLEAN  c", 5) == [("Clean Code", 5.0)]
+    assert index.complete("zz") == []
+    assert "clean code" in index
+    assert len(index) == 4
+
+
+def test_incremental_updates_match_brute_force():
+    rng = random.Random(7)
+    vocabulary = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 6))) for _ in range(300)]
+    index = PrefixIndex(top_k=4)
+    for _ in range(2000):
+        index.add(rng.choice(vocabulary), rng.random() + 0.01)
+
+    for prefix in ["", "a", "ab", "bca", "cc", "abcabc"]:
+        for k in (4, 12):
+            assert [term for term, _ in index.complete(prefix, k)] == _brute_force(index, prefix, k)
+
+
+def test_autocompleter_learns_from_catalog_and_queries(tmp_path):
+    db_path = tmp_path / "metadata_cache.db"
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("CREATE TABLE metadata_cache (title TEXT, authors TEXT, publisher TEXT)")
+        conn.executemany("INSERT INTO metadata_cache VALUES (?, ?, ?)", [
+            ("Pythonic Patterns", "Ana Souza, Bruno Lima", "Novatec"),
+            ("Pythonic Patterns", "Ana Souza", "Novatec"),
+            ("Python Cookbook", "David Beazley", "O'Reilly"),
+        ])
+
+    completer = AutoCompleter(catalog_db=str(db_path))
+    result = completer.get_suggestions("pyth")
+    assert result.suggestions[0] == "Pythonic Patterns"
+    assert "Python Cookbook" in result.suggestions
+    assert "pythonic" in result.completions
+    assert completer.get_suggestions("nova").suggestions == ["Novatec"]
+
+    for _ in range(3):
+        completer.record_query("python cookbook")
+    assert completer.get_suggestions("pyth").suggestions[0] == "Python Cookbook"
@@ -0,0 +1,81 @@
+"""
+Testes do pipeline de detecção do QueryPreprocessor.
+"""
+
+from src.renamepdfepub.cli.query_preprocessor import (
+    EntityDetector,
+    QueryCleaner,
+    QueryPreprocessor,
+    QueryTokens,
+)
+
+
+def test_detectors_accept_shared_tokens():
+    text = "Clean Architecture by Robert Martin guide to software design"
+    tokens = QueryTokens.from_text(text)
+
+    assert EntityDetector.detect_authors(text, 'english', tokens) == EntityDetector.detect_authors(text)
+    assert EntityDetector.detect_titles(text, 'english', tokens) == EntityDetector.detect_titles(text)
+    assert EntityDetector.detect_language(text, tokens) == 'english'
+    assert QueryCleaner.calculate_complexity(text, tokens) == QueryCleaner.calculate_complexity(text)
+    assert QueryCleaner.suggest_corrections("pythno programing", None) == ["python programming"]
+
+
+def test_analysis_is_memoised_by_normalised_text():
+    preprocessor = QueryPreprocessor()
+
+    first = preprocessor.analyze_query("Python Programming by John Smith")
+    second = preprocessor.analyze_query("  Python   Programming by John Smith ")
+
+    stats = preprocessor.get_stats()
+    assert stats['cache_misses'] == 1
+    assert stats['cache_hits'] == 1
+    assert stats['total_queries'] == 2
+    assert second.original_query == "  Python   Programming by John Smith "
+    assert second.detected_entities == first.detected_entities
+    assert second.query_type == first.query_type
+
+
+def test_cached_analysis_is_not_shared_with_callers():
+    preprocessor = QueryPreprocessor()
+    query = "Python Programming by John Smith"
+
+    first = preprocessor.analyze_query(query)
+    expected = {kind: list(values) for kind, values in first.detected_entities.items()}
+    first.detected_entities['authors'].append("Intruso")
+    first.detected_entities['isbns'] = ["0000000000"]
+    first.suggested_corrections.append("lixo")
+    first.confidence_scores['title'] = -1.0
+
+    second = preprocessor.analyze_query(query)
+    assert preprocessor.get_stats()['cache_hits'] == 1
+    assert second.detected_entities == expected
+    assert "lixo" not in second.suggested_corrections and second.confidence_scores.get('title') != -1.0
+    second.detected_entities['titles'].append("Outro")
+    assert preprocessor.analyze_query(query).detected_entities == expected
+
+
+def test_preprocess_for_search_reuses_analysis():
+    preprocessor = QueryPreprocessor()
+    analysis = preprocessor.analyze_query("ISBN 978-85-7522-888-8 JavaScript Moderno")
+
+    search_query = preprocessor.preprocess_for_search("ISBN 978-85-7522-888-8 JavaScript Moderno")
+
+    assert preprocessor.get_stats()['cache_misses'] == 1
+    assert search_query.isbn == "9788575228888"
+    assert search_query.options['preprocessing_analysis'].query_type == analysis.query_type == 'isbn'
+
+
+def test_stage_timings_and_lru_bound():
+    preprocessor = QueryPreprocessor(analysis_cache_size=2)
+    for text in ("first query", "second query", "third query"):
+        preprocessor.analyze_query(text)
+
+    stats = preprocessor.get_stats()
+    assert set(stats['stage_times']) == set(QueryPreprocessor.STAGES)
+    assert all(value >= 0.0 for value in stats['stage_times'].values())
+    assert sum(stats['stage_times'].values()) > 0.0
+    assert stats['cache_size'] == 2
+
+    preprocessor.analyze_query("first query")
+    assert preprocessor.get_stats()['cache_misses'] == 4
@@ -0,0 +1,109 @@
+"""
+Testes do planejador de renomeação em lote (colisões, ciclos, diário e recuperação).
+"""
+
+import json
+import os
+
+import pytest
+
+from renamepdfepub.rename_journal import RenameJournal, list_runs, read_run, recover, rollback_moves
+from renamepdfepub.rename_plan import bulk_rename, execute_plan, plan_renames
+
+
+def _files(tmp_path, **contents):
+    for name, text in contents.items():
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    return {name: str(tmp_path / name) for name in contents}
+
+
+def _state(tmp_path):
+    return {path.name: path.read_text(encoding="utf-8") for path in tmp_path.iterdir() if path.is_file()}
+
+
+def test_swaps_chains_and_collisions_are_planned_and_journaled(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    p = _files(books, a="A", b="B", c="C", d="D", e="E", taken="T")
+    pairs = [
+        (p["a"], p["b"]), (p["b"], p["a"]),           # swap
+        (p["c"], str(books / "x")), (p["d"], p["c"]),  # chain: d waits for c
+        (p["e"], p["taken"]),                          # occupied by a file that stays
+        (str(books / "missing"), str(books / "y")),
+        (p["a"], str(books / "z")),                    # duplicate source
+    ]
+    plan = plan_renames(pairs)
+    assert (plan.cycles, plan.conflicts) == (1, 1)
+    assert {reason for _, _, reason in plan.skipped} == {"missing", "duplicate_source"}
+    assert len(plan.steps) == 6 and len(plan.moves()) == 5
+
+    journal_dir = str(tmp_path / "journal")
+    stats = execute_plan(plan, journal=RenameJournal(journal_dir, run_id="r1"), max_workers=4)
+    assert (stats["renamed"], stats["errors"], stats["run_id"]) == (5, 0, "r1")
+    assert _state(books) == {"a": "B", "b": "A", "x": "C", "c": "D", "taken": "T", "taken (2)": "E"}
+
+    run = read_run(journal_dir, "r1")
+    assert run["committed"] and run["stats"]["renamed"] == 5
+    assert [op["state"] for op in run["ops"]] == ["done"] * 6
+    assert all(op["inode"] and op["size"] == 1 for op in run["ops"])
+    assert list_runs(journal_dir) == ["r1"]
+
+
+def test_skip_mode_and_failed_link_do_not_overwrite(tmp_path):
+    p = _files(tmp_path, a="A", b="B", keep="K", other="O")
+    stats = bulk_rename([(p["other"], p["keep"]), (p["keep"], p["keep"])], on_conflict="skip")
+    assert stats["renamed"] == 0
+    assert sorted(reason for _, _, reason in stats["results"]) == ["exists", "unchanged"]
+
+    plan = plan_renames([(p["b"], str(tmp_path / "c")), (p["a"], p["b"])])
+    (tmp_path / "c").mkdir()
+    (tmp_path / "c" / "inside").write_text("x", encoding="utf-8")
+    stats = execute_plan(plan)
+    assert stats["errors"] == 2 and stats["renamed"] == 0
+    assert sorted(status.split(":")[0] for _, _, status in stats["results"]) == ["error", "error"]
+    assert _state(tmp_path)["a"] == "A" and _state(tmp_path)["b"] == "B"
+
+
+@pytest.mark.parametrize("failing_src, failing_dst", [("b", "c"), (".a.renametmp-", "b")])
+def test_failed_cycle_is_undone_and_leaves_no_parked_file(tmp_path, monkeypatch, failing_src, failing_dst):
+    p = _files(tmp_path, a="A", b="B", c="C")
+    plan = plan_renames([(p["a"], p["b"]), (p["b"], p["c"]), (p["c"], p["a"])])
+    assert plan.cycles == 1 and len(plan.steps) == 4
+    real_rename = os.rename
+
+    def flaky_rename(src, dst):
+        if os.path.basename(src).startswith(failing_src) and os.path.basename(dst) == failing_dst:
+            raise PermissionError("denied")
+        real_rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", flaky_rename)
+    journal_dir = str(tmp_path / "journal")
+    stats = execute_plan(plan, journal=RenameJournal(journal_dir, run_id="r1"))
+
+    # Nada fica escondido sob o nome temporário: o ciclo volta ao estado original
+    assert _state(tmp_path) == {"a": "A", "b": "B", "c": "C"}
+    assert (stats["renamed"], stats["errors"]) == (0, 3)
+    assert sorted(src for src, _, _ in stats["results"]) == [p["a"], p["b"], p["c"]]
+    assert all(status.endswith("(cycle undone)") for _, _, status in stats["results"])
+    # Passos desfeitos não contam como aplicados para o rollback
+    run = read_run(journal_dir, "r1")
+    assert "done" not in [op["state"] for op in run["ops"]]
+    assert rollback_moves(run) == []
+
+
+def test_recover_settles_interrupted_runs_from_the_filesystem(tmp_path):
+    p = _files(tmp_path, a="A", b="B")
+    journal_dir = str(tmp_path / "journal")
+    journal = RenameJournal(journal_dir, run_id="crash", sync_every=1)
+    inode = os.lstat(p["a"]).st_ino
+    journal.begin([{"src": p["a"], "dst": str(tmp_path / "a2"), "inode": inode},
+                   {"src": p["b"], "dst": str(tmp_path / "b2")}])
+    os.rename(p["a"], tmp_path / "a2")  # applied, but the crash lost its "done" line
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as handle:
+        handle.write('{"type": "do')
+
+    run = recover(journal_dir, "crash")
+    assert run["recovered"] == 1 and not run["committed"]
+    assert [op["state"] for op in read_run(journal_dir, "crash")["ops"]] == ["done", "pending"]
+    assert json.loads(open(journal.path, encoding="utf-8").read().splitlines()[-1])["recovered"] is True
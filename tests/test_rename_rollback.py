@@ -0,0 +1,76 @@
+"""
+Testes do rollback de renomeações pelo diário (sem cópias de backup).
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from renamepdfepub.rename_journal import RenameJournal, list_runs, read_run
+from renamepdfepub.rename_plan import bulk_rename, rollback_run
+
+
+def _files(directory, **contents):
+    for name, text in contents.items():
+        (directory / name).write_text(text, encoding="utf-8")
+    return {name: str(directory / name) for name in contents}
+
+
+def _state(directory):
+    return {path.name: path.read_text(encoding="utf-8") for path in directory.iterdir() if path.is_file()}
+
+
+def test_rollback_restores_swaps_and_chains_and_skips_changed_files(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    journal_dir = str(tmp_path / "journal")
+    p = _files(books, a="A", b="B", c="C", d="D", e="E")
+    before = _state(books)
+    stats = bulk_rename([
+        (p["a"], p["b"]), (p["b"], p["a"]),           # swap (cycle via nome temporário)
+        (p["c"], str(books / "x")), (p["d"], p["c"]),  # cadeia
+        (p["e"], str(books / "y")),
+    ], journal_dir=journal_dir)
+    assert stats["renamed"] == 5
+
+    # y foi substituído depois da execução: não pode voltar para e
+    (books / "y.new").write_text("novo", encoding="utf-8")
+    (books / "y.new").replace(books / "y")
+
+    preview = rollback_run(journal_dir, stats["run_id"], dry_run=True)
+    assert preview["planned"] == 4 and _state(books)["a"] == "B"
+
+    undo = rollback_run(journal_dir, stats["run_id"], max_workers=4)
+    assert (undo["renamed"], undo["errors"]) == (4, 0)
+    assert (str(books / "y"), p["e"], "changed") in undo["results"]
+    after = _state(books)
+    assert {name: after[name] for name in "abcd"} == {name: before[name] for name in "abcd"}
+    assert after["y"] == "novo" and "e" not in after
+
+    assert read_run(journal_dir, stats["run_id"])["rolled_back_by"] == [undo["run_id"]]
+    assert set(list_runs(journal_dir)) == {stats["run_id"], undo["run_id"]}
+    # O rollback também é uma execução no diário e pode ser desfeito
+    redo = rollback_run(journal_dir, undo["run_id"])
+    assert redo["renamed"] == 4 and _state(books)["c"] == "D"
+
+
+def test_interrupted_single_renames_roll_back_from_script(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    journal_dir = tmp_path / "journal"
+    p = _files(books, **{"livro.pdf": "PDF", "outro.epub": "EPUB"})
+    journal = RenameJournal(str(journal_dir), run_id="run1", sync_every=10)
+    journal.rename(p["livro.pdf"], str(books / "Editora_2020_Livro.pdf"))
+    journal.rename(p["outro.epub"], str(books / "Outro.epub"))
+    journal.close()  # sem commit: execução interrompida
+
+    run = read_run(str(journal_dir), "run1")
+    assert [op["state"] for op in run["ops"]] == ["done", "done"] and not run["committed"]
+    assert run["ops"][0]["size"] == 3
+
+    script = Path(__file__).resolve().parents[1] / "scripts" / "rollback_renames.py"
+    result = subprocess.run([sys.executable, str(script), "--run", "run1", "--journal-dir", str(journal_dir)],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Restored: 2" in result.stdout
+    assert _state(books) == {"livro.pdf": "PDF", "outro.epub": "EPUB"}
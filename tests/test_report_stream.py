@@ -0,0 +1,62 @@
+"""
+Testes do escritor de relatórios incremental (JSONL + HTML em blocos).
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from renamepdfepub.report_stream import StreamingReportWriter
+
+
+@dataclass
+class _Book:
+    title: str
+    authors: List[str] = field(default_factory=list)
+    publisher: str = "Unknown"
+    published_date: str = "Unknown"
+    isbn_10: Optional[str] = None
+    isbn_13: Optional[str] = None
+    confidence_score: float = 0.0
+    source: str = "unknown"
+    file_path: Optional[str] = None
+
+
+def test_streams_records_and_writes_summary_last(tmp_path):
+    writer = StreamingReportWriter(tmp_path / "reports", timestamp="t1", chunk_rows=2)
+    writer.record_success(_Book("Python Fluente", ["Luciano Ramalho"], "Novatec", "2015",
+                                isbn_13="9788575224625", confidence_score=0.9,
+                                source="offline_catalog", file_path="/lib/a.pdf"))
+    writer.record_failure("/lib/b.pdf", {"error": "no_isbn_found", "text_sample": "x" * 500})
+    writer.record_failure("/lib/<c>.pdf", {"error": "no_isbn_found", "text_sample": "y"})
+
+    # Two rows already flushed before the scan finishes
+    partial = writer.html_path.read_text(encoding="utf-8")
+    assert "Python Fluente" in partial and "</html>" not in partial
+    assert len(writer.jsonl_path.read_text(encoding="utf-8").splitlines()) >= 2
+
+    writer.record_success(_Book("Recovered", file_path="/lib/b.pdf", source="recovery"), status="recovered")
+    summary = writer.close({"total_files": 3})
+
+    lines = [json.loads(line) for line in writer.jsonl_path.read_text(encoding="utf-8").splitlines()]
+    assert [line["type"] for line in lines] == ["success", "failure", "failure", "recovered", "summary"]
+    assert lines[1]["details"]["text_sample"] == "x" * 500
+    assert summary == lines[-1]
+    assert (summary["successful"], summary["recovered"], summary["failed"]) == (1, 1, 1)
+    assert summary["success_rate"] == 66.67 and summary["total_files"] == 3
+    assert summary["error_stats"] == {"no_isbn_found": 2}
+    assert summary["missing_fields"]["publisher"] == 1
+
+    page = writer.html_path.read_text(encoding="utf-8")
+    assert page.rstrip().endswith("</html>") and 'id="summary"' in page
+    assert "&lt;c&gt;.pdf" in page and "x" * 300 not in page
+    assert writer.close() == {}
+
+
+def test_compact_mode_drops_text_samples(tmp_path):
+    writer = StreamingReportWriter(tmp_path, timestamp="t2", compact=True)
+    writer.record_failure("/lib/b.pdf", {"error": "no_isbn_found", "text_sample": "x" * 500, "format": "pdf"})
+    writer.close()
+
+    failure = json.loads(writer.jsonl_path.read_text(encoding="utf-8").splitlines()[0])
+    assert failure["details"] == {"format": "pdf"}
@@ -0,0 +1,93 @@
+"""
+Testes da tabela de resultados por execução (consultas e agregações sem reler o JSON).
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pytest
+
+from renamepdfepub.renamer import dry_run, load_report
+from renamepdfepub.results_store import ResultsStore
+
+
+@dataclass
+class _Book:
+    title: str
+    authors: List[str] = field(default_factory=list)
+    publisher: str = "Unknown"
+    published_date: str = "Unknown"
+    isbn_10: Optional[str] = None
+    isbn_13: Optional[str] = None
+    confidence_score: float = 0.0
+    source: str = "unknown"
+    file_path: Optional[str] = None
+
+
+def _scan(store):
+    run_id = store.start_run("r2", config={"directory": "/lib"})
+    store.record_success(run_id, _Book("Python Fluente", ["Luciano Ramalho"], "Novatec", "2015-08-01",
+                                       isbn_13="9788575224625", confidence_score=0.95,
+                                       source="offline_catalog", file_path="/lib/a.pdf"), elapsed=0.2)
+    store.record_success(run_id, _Book("Refactoring", ["Martin Fowler"], "Addison-Wesley", "1999",
+                                       isbn_10="0201485672", confidence_score=0.6,
+                                       source="google_books", file_path="/lib/b.epub"), elapsed=1.0)
+    store.record_failure(run_id, "/lib/c.pdf", "no_isbn_found", elapsed=3.0)
+    store.record_failure(run_id, "/lib/d.pdf", None)
+    store.record_success(run_id, _Book("Recovered", source="recovery", file_path="/lib/c.pdf",
+                                       confidence_score=0.5), status="recovered")
+    store.finish_run(run_id, {"total_files": 4})
+    return run_id
+
+
+def test_queries_and_aggregates_one_run(tmp_path):
+    db_path = str(tmp_path / "reports" / "scan_results.db")
+    store = ResultsStore(db_path, batch_size=2)
+    store.start_run("r1")
+    store.record_failure("r1", "/old/x.pdf", "timeout")
+    store.finish_run("r1")
+    _scan(store)
+    store.close()
+
+    reopened = ResultsStore(db_path)
+    assert [run["run_id"] for run in reopened.runs()] == ["r2", "r1"]
+    assert reopened.runs()[0]["config"] == {"directory": "/lib"}
+
+    rows = reopened.query()
+    assert [row["path"] for row in rows] == ["/lib/a.pdf", "/lib/b.epub", "/lib/c.pdf", "/lib/d.pdf"]
+    first = rows[0]
+    assert (first["year"], first["format"], first["authors"]) == (2015, "pdf", ["Luciano Ramalho"])
+    assert rows[1]["publisher"] == "Addison-Wesley" and rows[1]["isbn_13"] is None
+
+    recovered = rows[2]
+    assert (recovered["status"], recovered["failure_code"], recovered["elapsed"]) == ("recovered", "no_isbn_found", 3.0)
+    assert rows[3]["failure_code"] == "unknown_error"
+
+    confident = reopened.query(status="resolved", min_confidence=0.9)
+    assert [row["title"] for row in confident] == ["Python Fluente"]
+    assert reopened.query(isbn="0201485672")[0]["source"] == "google_books"
+    assert [row["path"] for row in reopened.query(order_by="-elapsed", limit=1)] == ["/lib/c.pdf"]
+    assert reopened.query(run_id="r1")[0]["failure_code"] == "timeout"
+
+    by_status = reopened.aggregate("status")
+    assert {status: stats["count"] for status, stats in by_status.items()} == {
+        "success": 2, "recovered": 1, "failure": 1,
+    }
+    assert by_status["success"]["avg_confidence"] == 0.775
+    assert set(reopened.aggregate("format", status="resolved")) == {"pdf", "epub"}
+    with pytest.raises(ValueError):
+        reopened.aggregate("title; DROP TABLE results")
+
+
+def test_renamer_reads_resolved_rows_from_database(tmp_path):
+    db_path = str(tmp_path / "scan_results.db")
+    store = ResultsStore(db_path)
+    _scan(store)
+    store.close()
+
+    pairs = dict(load_report(db_path, min_confidence=0.55))
+    assert set(pairs) == {"/lib/a.pdf", "/lib/b.epub"}
+    assert pairs["/lib/b.epub"]["year"] == "1999" and pairs["/lib/b.epub"]["isbn10"] == "0201485672"
+
+    proposals = dict(dry_run(db_path, "{publisher}_{year}_{title}"))
+    assert proposals["/lib/a.pdf"] == "/lib/Novatec_2015_Python Fluente.pdf"
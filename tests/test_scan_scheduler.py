@@ -0,0 +1,98 @@
+"""
+Testes do agendador de varredura por custo (faixa leve/pesada, roubo de trabalho).
+"""
+
+import threading
+import time
+from concurrent.futures import as_completed
+
+from renamepdfepub.scan_scheduler import FileCost, ScanScheduler, estimate_cost, probe_cost
+
+
+def _pdf(path, body):
+    path.write_bytes(b"%PDF-1.4\n" + body + b"\n%%EOF\n")
+    return str(path)
+
+
+def test_estimate_cost_signals(tmp_path, monkeypatch):
+    text_pdf = _pdf(tmp_path / "texto.pdf", b"<< /Type /Pages /Count 12 >> << /Font /F1 >>")
+    scanned_pdf = _pdf(tmp_path / "scan.pdf", b"<< /Type /Pages /Count 300 >> << /Subtype /Image /Filter /DCTDecode >>")
+    epub = tmp_path / "book.epub"
+    epub.write_bytes(b"PK")
+    named = _pdf(tmp_path / "Livro 978-85-7522-462-5.pdf", b"<< /Count 12 >> /Font")
+
+    # A estimativa usa so stat e nome: nenhum arquivo e aberto
+    def no_open(*args, **kwargs):
+        raise AssertionError("estimate_cost nao deve ler arquivos")
+
+    monkeypatch.setattr("builtins.open", no_open)
+    light = estimate_cost(text_pdf)
+    heavy = estimate_cost(scanned_pdf)
+    book = estimate_cost(str(epub))
+    hinted = estimate_cost(text_pdf, hint={"isbn": "9788575224625"})
+    deferred = estimate_cost(text_pdf, deferred=True)
+    monkeypatch.undo()
+
+    assert (heavy.pages, heavy.ocr_likely, heavy.heavy, heavy.probed) == (0, False, False, False)
+    assert estimate_cost(named).isbn_known and hinted.isbn_known and not book.isbn_known
+    assert hinted.priority < light.priority
+    assert deferred.heavy and deferred.priority > light.priority
+    assert sorted([deferred, light, book]) == [book, light, deferred]
+
+    # A sondagem (feita no worker) refina paginas e marcas de digitalizacao
+    assert probe_cost(light) is light
+    assert (light.pages, light.ocr_likely, light.heavy) == (12, False, False)
+    probe_cost(heavy)
+    assert (heavy.pages, heavy.ocr_likely, heavy.heavy, heavy.probed) == (300, True, True, True)
+
+
+def test_scanned_pdf_moves_to_heavy_lane_after_probe(tmp_path):
+    scanned = _pdf(tmp_path / "scan.pdf", b"<< /Count 300 >> << /Subtype /Image /Filter /DCTDecode >>")
+    text = _pdf(tmp_path / "texto.pdf", b"<< /Count 12 >> /Font")
+    def work(item):
+        return item.heavy
+
+    scheduler = ScanScheduler(max_workers=1, heavy_workers=1)
+    pending = scheduler.submit([estimate_cost(scanned), estimate_cost(text)], work)
+    results = {pending[future].path: future.result() for future in as_completed(pending)}
+    scheduler.shutdown()
+
+    assert results == {scanned: True, text: False}
+    assert scheduler.stats["promoted"] == 1 and scheduler.stats["heavy"] == 1
+    assert scheduler.stats["light"] == 1
+
+
+def test_cheap_files_run_first_and_heavy_lane_is_bounded():
+    lock = threading.Lock()
+    running_heavy = []
+    peak = [0]
+    order = []
+
+    def work(item):
+        if item.heavy:
+            with lock:
+                running_heavy.append(item.path)
+                peak[0] = max(peak[0], len(running_heavy))
+            time.sleep(0.2)
+            with lock:
+                running_heavy.remove(item.path)
+        with lock:
+            order.append(item.path)
+        return item.path.upper()
+
+    items = [FileCost(10.0 + n, f"heavy{n}", heavy=True) for n in range(4)]
+    items += [FileCost(float(n), f"light{n}") for n in (3, 1, 2, 0)]
+    scheduler = ScanScheduler(max_workers=1, heavy_workers=1, heavy_limit=2)
+    pending = scheduler.submit(items, work)
+
+    results = [future.result() for future in as_completed(pending)]
+    scheduler.shutdown()
+
+    assert sorted(results) == sorted(item.path.upper() for item in items)
+    light_order = [path for path in order if path.startswith("light")]
+    assert light_order == ["light0", "light1", "light2", "light3"]
+    # Light files finish while the first heavy one is still running
+    assert order.index("light3") < order.index("heavy0")
+    assert peak[0] == 2  # dedicated heavy worker plus one stolen by the idle light worker
+    assert scheduler.stats == {"light": 4, "heavy": 4, "stolen": scheduler.stats["stolen"], "promoted": 0}
+    assert scheduler.stats["stolen"] >= 1
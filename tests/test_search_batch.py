@@ -0,0 +1,69 @@
+"""
+Testes da API de busca em lote (search_many) em toda a pilha de busca.
+"""
+
+import json
+
+from src.renamepdfepub.cli.search_integration import SearchCLIIntegration
+from src.renamepdfepub.search_algorithms.base_search import SearchQuery
+from src.renamepdfepub.search_algorithms.fuzzy_search import FuzzySearchAlgorithm
+from src.renamepdfepub.search_algorithms.search_orchestrator import SearchOrchestrator
+from src.renamepdfepub.search_algorithms.semantic_search import SemanticSearchAlgorithm
+
+
+QUERIES = [
+    SearchQuery(title="Python Programming", authors=["John Smith"]),
+    SearchQuery(isbn="9781234567890"),
+    SearchQuery(title="Machine Learning Basics", text_content="machine learning algorithms guide"),
+    SearchQuery(title="Web Development Guide", authors=["Alice Johnson"]),
+]
+
+
+def _summary(results):
+    return [(round(r.score, 6), r.metadata.get('title')) for r in results]
+
+
+def test_algorithm_search_many_matches_single_search():
+    for algorithm in (FuzzySearchAlgorithm(), SemanticSearchAlgorithm()):
+        algorithm.configure({})
+        batch = algorithm.search_many(QUERIES)
+        single = [algorithm.search(query) for query in QUERIES]
+        assert [_summary(r) for r in batch] == [_summary(r) for r in single]
+
+
+def test_orchestrator_search_many_matches_parallel_search():
+    # Separate instances: ISBNSearch keeps an internal cache that raises repeat scores
+    with SearchOrchestrator(max_workers=2) as orchestrator:
+        batch = orchestrator.search_many(QUERIES, strategy='parallel', max_results=5)
+    with SearchOrchestrator(max_workers=2) as orchestrator:
+        single = [orchestrator.search(query, strategy='parallel', max_results=5) for query in QUERIES]
+
+    assert len(batch) == len(QUERIES)
+    for batch_results, single_results in zip(batch, single):
+        assert sorted(_summary(batch_results)) == sorted(_summary(single_results))
+
+
+def test_orchestrator_iter_search_many_streams_every_query():
+    with SearchOrchestrator(max_workers=2) as orchestrator:
+        streamed = list(orchestrator.iter_search_many(QUERIES * 3, strategy='parallel', chunk_size=2))
+
+    assert sorted(index for index, _ in streamed) == list(range(len(QUERIES) * 3))
+    assert orchestrator.get_performance_stats()['total_searches'] == len(QUERIES) * 3
+
+
+def test_cli_integration_search_many_uses_shared_preprocessing_and_cache(tmp_path):
+    config_file = tmp_path / "search_config.json"
+    config_file.write_text(json.dumps({'cache_dir': str(tmp_path / "cache")}), encoding='utf-8')
+    integration = SearchCLIIntegration(config_file=str(config_file))
+    texts = ["Python Programming by John Smith", "ISBN 9781234567890", "Python Programming by John Smith"]
+
+    first = integration.search_many(texts, strategy='parallel', max_results=3)
+    second = integration.search_many(texts, strategy='parallel', max_results=3)
+
+    assert [r['source'] for r in first] == ['search', 'search', 'search']
+    assert all(r['results'] for r in first)
+    assert _summary(first[0]['results']) == _summary(first[2]['results'])
+    assert [r['source'] for r in second] == ['cache', 'cache', 'cache']
+    assert integration.preprocessor.get_stats()['total_queries'] == 4
+    assert integration.session_stats['queries_processed'] == 6
+    integration.orchestrator.shutdown()
@@ -0,0 +1,147 @@
+"""
+Testes do modelo de custo aprendido usado pelo SearchOrchestrator.
+"""
+
+import time
+import unittest
+from typing import Any, Dict, List
+
+from src.renamepdfepub.search_algorithms.base_search import (
+    BaseSearchAlgorithm,
+    SearchQuery,
+    SearchResult,
+)
+from src.renamepdfepub.search_algorithms.cost_model import SearchCostModel
+from src.renamepdfepub.search_algorithms.search_orchestrator import SearchOrchestrator
+
+
+class _StubAlgorithm(BaseSearchAlgorithm):
+    """Algoritmo controlado para testes: score e atraso configuráveis."""
+
+    def __init__(self, name: str, score: float, delay: float = 0.0):
+        super().__init__(name)
+        self.score = score
+        self.delay = delay
+
+    def configure(self, config: Dict[str, Any]) -> bool:
+        return True
+
+    def search(self, query: SearchQuery) -> List[SearchResult]:
+        if self.delay:
+            time.sleep(self.delay)
+        return [SearchResult(score=self.score, metadata={'title': self.name}, algorithm=self.name)]
+
+    def is_suitable_for_query(self, query: SearchQuery) -> bool:
+        return True
+
+
+class TestSearchCostModel(unittest.TestCase):
+    """Testes unitários das estimativas do modelo."""
+
+    def test_observe_tracks_hits_scores_and_latency(self):
+        model = SearchCostModel(hit_threshold=0.8)
+        model.observe('A', 'title', 10.0, 0.9)
+        model.observe('A', 'title', 30.0, 0.5)
+
+        stats = model.get('A', 'title')
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.hits, 1)
+        self.assertAlmostEqual(stats.average_score, 0.7)
+        self.assertAlmostEqual(stats.hit_probability, 0.5)
+        self.assertEqual(stats.latency_percentile(95), 30.0)
+        self.assertIsNone(model.get('A', 'isbn'))
+
+    def test_fast_reliable_algorithm_prefers_best_match(self):
+        model = SearchCostModel(min_samples=3)
+        for _ in range(5):
+            model.observe('Fast', 'isbn', 1.0, 0.95)
+            model.observe('Slow', 'isbn', 50.0, 0.2)
+
+        self.assertTrue(model.is_warm(['Fast', 'Slow'], 'isbn'))
+        self.assertEqual(model.rank_algorithms(['Slow', 'Fast'], 'isbn'), ['Fast', 'Slow'])
+        plan, estimate = model.choose_plan(['Fast', 'Slow'], 'isbn', max_workers=4)
+        self.assertEqual(plan, 'best_match')
+        self.assertGreater(estimate['precision_per_ms'], 0.0)
+
+    def test_similar_algorithms_prefer_parallel(self):
+        model = SearchCostModel(min_samples=3)
+        for _ in range(5):
+            model.observe('A', 'text', 10.0, 0.9 if _ % 2 else 0.1)
+            model.observe('B', 'text', 10.0, 0.9 if _ % 2 == 0 else 0.1)
+
+        plan, _ = model.choose_plan(['A', 'B'], 'text', max_workers=4)
+        self.assertEqual(plan, 'parallel')
+
+
+class TestOrchestratorLearnedSelection(unittest.TestCase):
+    """Testes da seleção de estratégia com estatísticas online."""
+
+    def setUp(self):
+        self.orchestrator = SearchOrchestrator(max_workers=4)
+        for name in list(self.orchestrator.algorithms):
+            self.orchestrator.unregister_algorithm(name)
+        self.orchestrator.register_algorithm(_StubAlgorithm('Precise', 0.95))
+        self.orchestrator.register_algorithm(_StubAlgorithm('Lagging', 0.3, delay=0.01))
+
+    def tearDown(self):
+        self.orchestrator.shutdown(wait=False)
+
+    def test_cold_start_uses_heuristic(self):
+        self.orchestrator.search(SearchQuery(title='Some Title'))
+
+        stats = self.orchestrator.get_performance_stats()
+        self.assertEqual(stats['last_plan']['source'], 'heuristic')
+        self.assertEqual(stats['strategy_choices'], {'parallel': 1})
+
+    def test_warm_model_selects_cheapest_precise_plan(self):
+        query = SearchQuery(title='Some Title')
+        for _ in range(self.orchestrator.cost_model.min_samples):
+            self.orchestrator.search(query, strategy='parallel')
+
+        self.orchestrator.search(query)
+
+        stats = self.orchestrator.get_performance_stats()
+        self.assertEqual(stats['last_plan']['source'], 'cost_model')
+        self.assertEqual(stats['last_plan']['query_type'], 'title')
+        self.assertEqual(stats['last_plan']['strategy'], 'best_match')
+        self.assertEqual(self.orchestrator._select_best_algorithm(query).name, 'Precise')
+        self.assertIn('Precise', stats['cost_model']['title'])
+        self.assertEqual(stats['cost_model']['title']['Precise']['hits'], 6)
+
+    def test_parallel_and_adaptive_run_in_ranked_order(self):
+        calls = []
+
+        class _Recording(_StubAlgorithm):
+            def search(self, query):
+                calls.append(self.name)
+                return super().search(query)
+
+        orchestrator = SearchOrchestrator(max_workers=1)
+        self.addCleanup(orchestrator.shutdown, False)
+        for name in list(orchestrator.algorithms):
+            orchestrator.unregister_algorithm(name)
+        # Registro em ordem inversa à do modelo de custo
+        for name, score in (('Costly', 0.3), ('Middle', 0.5), ('Cheap', 0.6)):
+            orchestrator.register_algorithm(_Recording(name, score))
+        for _ in range(orchestrator.cost_model.min_samples):
+            orchestrator.cost_model.observe('Cheap', 'title', 1.0, 0.95)
+            orchestrator.cost_model.observe('Middle', 'title', 10.0, 0.95)
+            orchestrator.cost_model.observe('Costly', 'title', 100.0, 0.3)
+
+        query = SearchQuery(title='Some Title')
+        orchestrator.search(query, strategy='parallel')
+        self.assertEqual(calls, ['Cheap', 'Middle', 'Costly'])
+        calls.clear()
+        orchestrator.search(query, strategy='adaptive')
+        self.assertEqual(calls, ['Cheap', 'Middle', 'Costly'])
+
+    def test_query_classification_matches_preprocessor(self):
+        classify = SearchOrchestrator._classify_query
+        self.assertEqual(classify(SearchQuery(isbn='9781234567890', title='x')), 'isbn')
+        self.assertEqual(classify(SearchQuery(authors=['Jane Doe'])), 'author')
+        self.assertEqual(classify(SearchQuery(title='T', authors=['Jane Doe'])), 'mixed')
+        self.assertEqual(classify(SearchQuery(text_content='free text')), 'text')
+
+
+if __name__ == '__main__':
+    unittest.main()
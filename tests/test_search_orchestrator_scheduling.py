@@ -0,0 +1,133 @@
+"""
+Testes de agendamento do SearchOrchestrator.
+
+Cobre:
+- Pool de workers persistente entre queries
+- Prazo total por query com resultados parciais
+- Término antecipado ao atingir o limiar de confiança
+- Reuso dos resultados da primeira passada sequencial
+"""
+
+import time
+import unittest
+from typing import Any, Dict, List
+
+from src.renamepdfepub.search_algorithms.base_search import (
+    BaseSearchAlgorithm,
+    SearchQuery,
+    SearchResult,
+)
+from src.renamepdfepub.search_algorithms.search_orchestrator import SearchOrchestrator
+
+
+class _StubAlgorithm(BaseSearchAlgorithm):
+    """Algoritmo controlado para testes: score e atraso configuráveis."""
+
+    def __init__(self, name: str, score: float, delay: float = 0.0):
+        super().__init__(name)
+        self.score = score
+        self.delay = delay
+        self.calls = 0
+
+    def configure(self, config: Dict[str, Any]) -> bool:
+        return True
+
+    def search(self, query: SearchQuery) -> List[SearchResult]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return [SearchResult(
+            score=self.score,
+            metadata={'title': f'{self.name} title', 'authors': [self.name]},
+            algorithm=self.name,
+        )]
+
+    def is_suitable_for_query(self, query: SearchQuery) -> bool:
+        return True
+
+
+class TestSearchOrchestratorScheduling(unittest.TestCase):
+    """Testes de pool persistente, prazo e término antecipado."""
+
+    def setUp(self):
+        self.orchestrator = SearchOrchestrator(max_workers=4)
+        for name in list(self.orchestrator.algorithms):
+            self.orchestrator.unregister_algorithm(name)
+
+    def tearDown(self):
+        self.orchestrator.shutdown(wait=False)
+
+    def test_executor_is_reused_across_queries(self):
+        self.orchestrator.register_algorithm(_StubAlgorithm('A', 0.5))
+        self.orchestrator.register_algorithm(_StubAlgorithm('B', 0.4))
+
+        self.orchestrator.search(SearchQuery(title='one'), strategy='parallel')
+        executor = self.orchestrator._executor
+        self.orchestrator.search(SearchQuery(title='two'), strategy='parallel')
+
+        self.assertIsNotNone(executor)
+        self.assertIs(executor, self.orchestrator._executor)
+
+    def test_deadline_returns_partial_results(self):
+        self.orchestrator.register_algorithm(_StubAlgorithm('Fast', 0.5))
+        self.orchestrator.register_algorithm(_StubAlgorithm('Slow', 0.6, delay=1.0))
+        self.orchestrator.default_timeout = 0.2
+
+        start = time.monotonic()
+        results = self.orchestrator.search(SearchQuery(title='query'), strategy='parallel')
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual([r.algorithm for r in results], ['Fast'])
+        self.assertEqual(self.orchestrator.get_performance_stats()['deadline_exceeded'], 1)
+
+    def test_best_match_and_adaptive_respect_the_deadline(self):
+        self.orchestrator.register_algorithm(_StubAlgorithm('Slow', 0.95, delay=1.0))
+        self.orchestrator.default_timeout = 0.2
+
+        for strategy in ('best_match', 'adaptive'):
+            start = time.monotonic()
+            results = self.orchestrator.search(SearchQuery(title='query'), strategy=strategy)
+            self.assertLess(time.monotonic() - start, 0.8)
+            self.assertEqual(results, [])
+        self.assertEqual(self.orchestrator.get_performance_stats()['deadline_exceeded'], 2)
+
+    def test_limited_parallel_stops_on_confident_result(self):
+        confident = _StubAlgorithm('Confident', 0.85)
+        slow = _StubAlgorithm('Slow', 0.3, delay=1.0)
+
+        start = time.monotonic()
+        results = self.orchestrator._parallel_search_limited(
+            SearchQuery(title='query'), [confident, slow], max_results=5
+        )
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(results[0].algorithm, 'Confident')
+        self.assertEqual(self.orchestrator.get_performance_stats()['early_terminations'], 1)
+
+    def test_sequential_runs_each_algorithm_once(self):
+        first = _StubAlgorithm('A', 0.5)
+        second = _StubAlgorithm('B', 0.4)
+        self.orchestrator.register_algorithm(first)
+        self.orchestrator.register_algorithm(second)
+
+        results = self.orchestrator.search(SearchQuery(title='query'), strategy='sequential')
+
+        self.assertEqual(first.calls, 1)
+        self.assertEqual(second.calls, 1)
+        self.assertEqual(len(results), 2)
+
+    def test_adaptive_reuses_best_algorithm_results(self):
+        algorithms = [_StubAlgorithm(name, 0.5) for name in ('A', 'B', 'C', 'D')]
+        for algorithm in algorithms:
+            self.orchestrator.register_algorithm(algorithm)
+
+        self.orchestrator.search(SearchQuery(title='query'), strategy='adaptive')
+
+        self.assertEqual(algorithms[0].calls, 1)
+        self.assertEqual(sum(a.calls for a in algorithms), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Testes da interface Streamlit executada como 'streamlit run': apenas src/gui
+no sys.path, sem o pacote instalado. O streamlit real e trocado por um modulo
+minimo para que o teste rode mesmo sem a dependencia opcional.
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parents[1] / 'src' / 'gui'
+
+FAKE_STREAMLIT = '''
+def set_page_config(**kwargs):
+    pass
+
+
+def cache_resource(**kwargs):
+    return lambda func: func
+'''
+
+
+def _run_with_gui_dir_only(tmp_path, body: str) -> subprocess.CompletedProcess:
+    stub_dir = tmp_path / 'stubs'
+    (stub_dir / 'streamlit').mkdir(parents=True)
+    (stub_dir / 'streamlit' / '__init__.py').write_text(FAKE_STREAMLIT, encoding='utf-8')
+    script = textwrap.dedent(f'''
+        import sys
+        sys.path[:0] = [{str(stub_dir)!r}, {str(GUI_DIR)!r}]
+        import streamlit_interface as si
+    ''') + textwrap.dedent(body)
+    # -I: sem PYTHONPATH nem diretorio corrente, como o processo do streamlit
+    return subprocess.run([sys.executable, '-I', '-c', script], cwd=tmp_path,
+                          capture_output=True, text=True, timeout=60)
+
+
+def test_naming_helpers_import_with_only_the_gui_dir_on_path(tmp_path):
+    result = _run_with_gui_dir_only(tmp_path, '''
+        ui = si.RenamePDFEPUBInterface()
+        rows = [{'T\\u00edtulo': 'Python Fluente', 'Autores': 'Luciano Ramalho',
+                 'Editora': 'Novatec', 'Ano': '2015', 'ISBN-13': '9788575224625'}]
+        print(ui._build_names(rows, '{author} - {title} ({year})', False)[0])
+    ''')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'Luciano Ramalho - Python Fluente (2015)'
+
+
+def test_autocompleter_loads_and_import_failures_are_logged(tmp_path):
+    result = _run_with_gui_dir_only(tmp_path, '''
+        import logging
+        print(type(si._load_autocompleter('nao_existe.db', 0.0)).__name__)
+        # Modulo indisponivel: sem sugestoes, mas o motivo vai para o log
+        logging.basicConfig(format='%(levelname)s %(message)s')
+        sys.modules['renamepdfepub.cli.query_preprocessor'] = None
+        print(si._load_autocompleter('nao_existe.db', 0.0))
+    ''')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['AutoCompleter', 'None']
+    assert 'WARNING Sugestoes do catalogo desativadas' in result.stderr
+    assert 'ModuleNotFoundError' in result.stderr
+
+
+def test_live_panel_reads_the_ring_and_falls_back_to_the_json(tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    (reports / 'live_api_stats.json').write_text('{"overall": {"total": 1}}', encoding='utf-8')
+    result = _run_with_gui_dir_only(tmp_path, f'''
+        import logging
+        from pathlib import Path
+        from renamepdfepub.live_stats import LiveStatsPublisher
+        logging.basicConfig(format='%(levelname)s %(message)s')
+        ui = si.RenamePDFEPUBInterface()
+        ui.live_stats_file = Path({str(reports / 'live_api_stats.json')!r})
+        ui.live_stats_ring = Path({str(reports / 'live_api_stats.ring')!r})
+        print(ui._load_live_stats())
+        publisher = LiveStatsPublisher(str(ui.live_stats_ring))
+        publisher.publish({{'overall': {{'total': 2}}}})
+        publisher.close()
+        print(ui._load_live_stats())
+        sys.modules['renamepdfepub.live_stats'] = None
+        print(ui._load_live_stats())
+    ''')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == [
+        "{'overall': {'total': 1}}", "{'overall': {'total': 2}}", "{'overall': {'total': 1}}",
+    ]
+    assert 'WARNING Painel em tempo real sem o anel' in result.stderr
+
+
+def test_dashboard_reads_the_latest_run_from_the_results_store(tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    (reports / 'metadata_report_20240101.json').write_text(
+        '{"summary": {"total_files": 9}}', encoding='utf-8')
+    result = _run_with_gui_dir_only(tmp_path, f'''
+        from pathlib import Path
+        from renamepdfepub.results_store import ResultsStore
+        ui = si.RenamePDFEPUBInterface()
+        ui.reports_dir = Path({str(reports)!r})
+        ui.results_db = ui.reports_dir / 'scan_results.db'
+        print(ui._load_latest_report()['summary'])
+        store = ResultsStore(str(ui.results_db))
+        run = store.start_run()
+        store.record_success(run, {{'file_path': '/b/a.pdf', 'title': 'A', 'authors': ['X'],
+                                    'publisher': 'Novatec', 'published_date': '2015',
+                                    'isbn_13': '9788575224625'}})
+        store.record_success(run, {{'file_path': '/b/b.pdf', 'title': 'B', 'publisher': 'Novatec'}})
+        store.record_failure(run, '/b/c.pdf', 'no_isbn')
+        store.finish_run(run)
+        store.close()
+        data = ui._load_latest_report()
+        print(data['run_id'] == run, data['summary'], data['publisher_stats'])
+    ''')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == [
+        "{'total_files': 9}",
+        "True {'total_files': 3, 'successful': 2, 'failed': 1, "
+        "'missing_fields': {'authors': 1, 'year': 1, 'isbn': 1}} {'Novatec': 2}",
+    ]